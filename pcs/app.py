@@ -16,10 +16,12 @@ from pcs.cli.common import (
     parse_args,
     routing,
 )
+from pcs.cli.common.communication_timing import timing_stats_to_lines
 from pcs.cli.reports import process_library_reports
 from pcs.cli.routing import (
     acl,
     alert,
+    batch,
     booth,
     client,
     cluster,
@@ -37,7 +39,9 @@ from pcs.cli.routing import (
     stonith,
     tag,
 )
+from pcs.common.node_communicator import CommunicationTimingStats
 from pcs.lib.errors import LibraryError
+from pcs.lib.pacemaker.live import set_tool_help_cache
 
 
 def _non_root_run(argv_cmd):
@@ -131,6 +135,7 @@ def main(argv=None):
 
     argv = argv if argv else sys.argv[1:]
     utils.subprocess_setup()
+    set_tool_help_cache(settings.pacemaker_tool_help_cache)
     global filename, usefile
     utils.pcs_options = {}
 
@@ -226,6 +231,40 @@ def main(argv=None):
                         "a positive integer"
                     ).format(val)
                 )
+        elif opt == "--request-concurrency":
+            request_concurrency_valid = False
+            try:
+                concurrency = int(val)
+                if concurrency > 0:
+                    utils.pcs_options[opt] = concurrency
+                    request_concurrency_valid = True
+            except ValueError:
+                pass
+            if not request_concurrency_valid:
+                utils.err(
+                    (
+                        "'{0}' is not a valid --request-concurrency value, use "
+                        "a positive integer"
+                    ).format(val)
+                )
+        elif opt == "--request-relay-fanout":
+            relay_fanout_valid = False
+            try:
+                relay_fanout = int(val)
+                if relay_fanout > 0:
+                    utils.pcs_options[opt] = relay_fanout
+                    relay_fanout_valid = True
+            except ValueError:
+                pass
+            if not relay_fanout_valid:
+                utils.err(
+                    (
+                        "'{0}' is not a valid --request-relay-fanout value, "
+                        "use a positive integer"
+                    ).format(val)
+                )
+        elif opt == "--debug-timing":
+            utils.communication_timing_stats = CommunicationTimingStats()
 
     logger = logging.getLogger("pcs")
     logger.propagate = 0
@@ -252,6 +291,7 @@ def main(argv=None):
         "client": client.client_cmd,
         "dr": dr.dr_cmd,
         "tag": tag.tag_cmd,
+        "batch": batch.batch_cmd,
         "help": lambda lib, argv, modifiers: usage.main(),
     }
     try:
@@ -266,3 +306,9 @@ def main(argv=None):
         else:
             usage.main()
         sys.exit(1)
+    finally:
+        # print the timing even if the command failed, a slow or unreachable
+        # node may be the reason
+        if utils.communication_timing_stats is not None:
+            for line in timing_stats_to_lines(utils.communication_timing_stats):
+                sys.stderr.write(line + "\n")
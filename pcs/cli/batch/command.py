@@ -0,0 +1,230 @@
+import getopt
+import shlex
+from typing import (
+    Any,
+    Callable,
+    List,
+    NamedTuple,
+    Sequence,
+)
+
+from pcs import resource
+from pcs.cli.common.errors import CmdLineInputError
+from pcs.cli.common.lib_wrapper import run_cib_transaction
+from pcs.cli.common.parse_args import (
+    InputModifiers,
+    PCS_LONG_OPTIONS,
+    PCS_SHORT_OPTIONS,
+    filter_out_non_option_negative_numbers,
+    filter_out_options,
+)
+from pcs.cli.constraint_colocation import command as colocation_command
+from pcs.cli.constraint_order import command as order_command
+from pcs.cli.constraint_ticket import command as ticket_command
+from pcs.cli.reports.output import error, warn
+from pcs.cli.tag import command as tag_command
+from pcs.lib.errors import LibraryError
+
+CommandHandler = Callable[[Any, Sequence[str], InputModifiers], Any]
+
+# Only commands implemented in the library can share one CIB, the rest of pcs
+# loads and pushes the CIB on its own.
+_BATCH_COMMANDS = {
+    ("resource", "create"): resource.resource_create,
+    (
+        "resource",
+        "defaults",
+        "set",
+        "create",
+    ): resource.resource_defaults_set_create_cmd,
+    (
+        "resource",
+        "defaults",
+        "set",
+        "delete",
+    ): resource.resource_defaults_set_remove_cmd,
+    (
+        "resource",
+        "defaults",
+        "set",
+        "remove",
+    ): resource.resource_defaults_set_remove_cmd,
+    (
+        "resource",
+        "defaults",
+        "set",
+        "update",
+    ): resource.resource_defaults_set_update_cmd,
+    (
+        "resource",
+        "op",
+        "defaults",
+        "set",
+        "create",
+    ): resource.resource_op_defaults_set_create_cmd,
+    (
+        "resource",
+        "op",
+        "defaults",
+        "set",
+        "delete",
+    ): resource.resource_op_defaults_set_remove_cmd,
+    (
+        "resource",
+        "op",
+        "defaults",
+        "set",
+        "remove",
+    ): resource.resource_op_defaults_set_remove_cmd,
+    (
+        "resource",
+        "op",
+        "defaults",
+        "set",
+        "update",
+    ): resource.resource_op_defaults_set_update_cmd,
+    ("constraint", "order", "set"): order_command.create_with_set,
+    ("constraint", "colocation", "set"): colocation_command.create_with_set,
+    ("constraint", "ticket", "set"): ticket_command.create_with_set,
+    ("constraint", "ticket", "add"): ticket_command.add,
+    ("tag", "create"): tag_command.tag_create,
+    ("tag", "delete"): tag_command.tag_remove,
+    ("tag", "remove"): tag_command.tag_remove,
+    ("tag", "update"): tag_command.tag_update,
+}
+
+# options which make sense only for the whole batch
+_BATCH_ONLY_OPTIONS = frozenset(
+    (
+        "-f",
+        "--corosync_conf",
+        "--debug",
+        "--debug-timing",
+        "--request-concurrency",
+        "--request-relay-fanout",
+        "--request-timeout",
+        "--wait",
+    )
+)
+
+
+class BatchCommand(NamedTuple):
+    line_number: int
+    handler: CommandHandler
+    argv: List[str]
+    modifiers: InputModifiers
+
+
+def parse_batch_line(line: str) -> Sequence[str]:
+    """
+    Split a line of a batch file to command line arguments
+
+    line -- a line of a batch file
+    """
+    try:
+        return shlex.split(line, comments=True)
+    except ValueError as e:
+        raise CmdLineInputError(str(e))
+
+
+def parse_batch_command(argv: Sequence[str]) -> BatchCommand:
+    """
+    Find a handler for a command and parse its options
+
+    argv -- command line arguments of the command including options
+    """
+    argv = list(argv)
+    if argv and argv[0] == "pcs":
+        argv = argv[1:]
+    try:
+        option_list, dummy_argv = getopt.gnu_getopt(
+            filter_out_non_option_negative_numbers(argv),
+            PCS_SHORT_OPTIONS,
+            PCS_LONG_OPTIONS,
+        )
+    except getopt.GetoptError as e:
+        raise CmdLineInputError(str(e))
+    options = {}
+    for option, value in option_list:
+        if option in _BATCH_ONLY_OPTIONS:
+            raise CmdLineInputError(
+                f"Option '{option}' can be specified only for the whole batch"
+            )
+        if option in options:
+            raise CmdLineInputError(f"{option} can only be used once")
+        options[option] = value
+    argv = filter_out_options(argv)
+    for prefix_len in range(len(argv), 0, -1):
+        handler = _BATCH_COMMANDS.get(tuple(argv[:prefix_len]))
+        if handler:
+            return BatchCommand(
+                0, handler, list(argv[prefix_len:]), InputModifiers(options)
+            )
+    raise CmdLineInputError("Unsupported command '{0}'".format(" ".join(argv)))
+
+
+def parse_batch(content: str) -> List[BatchCommand]:
+    """
+    Parse commands from a batch file, skip empty lines and comments
+
+    content -- content of a batch file
+    """
+    command_list = []
+    for line_number, line in enumerate(content.splitlines(), 1):
+        try:
+            argv = parse_batch_line(line)
+            if argv:
+                command_list.append(
+                    parse_batch_command(argv)._replace(line_number=line_number)
+                )
+        except CmdLineInputError as e:
+            raise error(
+                "line {0}: {1}".format(
+                    line_number, e.message or "invalid command"
+                )
+            )
+    return command_list
+
+
+def batch_run(lib: Any, argv: Sequence[str], modifiers: InputModifiers) -> None:
+    """
+    Options:
+      * --wait
+      * -f - CIB file
+    """
+    modifiers.ensure_only_supported("--wait", "-f")
+    if len(argv) != 1:
+        raise CmdLineInputError()
+    try:
+        with open(argv[0], "r") as batch_file:
+            command_list = parse_batch(batch_file.read())
+    except EnvironmentError as e:
+        raise error(
+            "Unable to read batch file '{0}': {1}".format(argv[0], e.strerror)
+        )
+
+    def run_commands(batch_lib):
+        for command in command_list:
+            try:
+                command.handler(
+                    batch_lib, list(command.argv), command.modifiers
+                )
+            except CmdLineInputError as e:
+                raise error(
+                    "line {0}: {1}".format(
+                        command.line_number, e.message or "invalid command"
+                    )
+                )
+            except (LibraryError, SystemExit):
+                warn(
+                    "Command on line {0} failed, the batch has been "
+                    "aborted".format(command.line_number)
+                )
+                raise
+
+    run_cib_transaction(
+        lib.env,
+        lib.middleware_factory,
+        run_commands,
+        wait=modifiers.get("--wait"),
+    )
@@ -0,0 +1,87 @@
+from typing import (
+    Dict,
+    List,
+    Sequence,
+)
+
+from pcs.common.node_communicator import (
+    CommunicationTimingRecord,
+    CommunicationTimingStats,
+)
+
+_COLUMN_LIST = (
+    "Requests",
+    "Failed",
+    "DNS",
+    "Connect",
+    "TLS",
+    "1st byte",
+    "Avg",
+    "Max",
+    "Sent",
+    "Received",
+)
+
+
+def timing_stats_to_lines(stats: CommunicationTimingStats) -> List[str]:
+    """
+    Return lines of tables describing timing of requests sent to nodes
+
+    Nodes and actions are sorted from the slowest ones. All times but the
+    maximal one are averages of all requests, in milliseconds.
+
+    stats -- timing of all requests sent by a command
+    """
+    host_records = stats.get_host_records()
+    if not host_records:
+        return []
+    return (
+        ["Node communication timing (ms):"]
+        + _records_to_table("Node", host_records)
+        + [""]
+        + _records_to_table("Action", stats.get_action_records())
+    )
+
+
+def _records_to_table(
+    title: str, record_dict: Dict[str, CommunicationTimingRecord]
+) -> List[str]:
+    row_list = [[title, *_COLUMN_LIST]] + [
+        [name, *_record_to_columns(record)]
+        for name, record in sorted(
+            record_dict.items(), key=lambda item: (-item[1].total_max, item[0]),
+        )
+    ]
+    width_list = [
+        max(len(row[index]) for row in row_list)
+        for index in range(len(row_list[0]))
+    ]
+    return [_format_row(row, width_list) for row in row_list]
+
+
+def _record_to_columns(record: CommunicationTimingRecord) -> List[str]:
+    count = record.request_count
+
+    def avg_ms(value: float) -> str:
+        return f"{value / count * 1000:.1f}"
+
+    return [
+        str(count),
+        str(record.failed_count),
+        avg_ms(record.name_lookup),
+        avg_ms(record.connect),
+        avg_ms(record.tls_handshake),
+        avg_ms(record.first_byte),
+        avg_ms(record.total),
+        f"{record.total_max * 1000:.1f}",
+        str(record.bytes_sent),
+        str(record.bytes_received),
+    ]
+
+
+def _format_row(row: Sequence[str], width_list: Sequence[int]) -> str:
+    # names are aligned to the left, numbers to the right
+    return "  ".join(
+        [row[0].ljust(width_list[0])]
+        + [value.rjust(width) for value, width in zip(row[1:], width_list[1:])]
+    ).rstrip()
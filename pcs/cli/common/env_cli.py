@@ -10,3 +10,7 @@ class Env:
         self.known_hosts_getter = None
         self.debug = False
         self.request_timeout = None
+        self.request_concurrency = None
+        self.communication_metrics = None
+        self.request_relay_fanout = None
+        self.batch_lib_env = None
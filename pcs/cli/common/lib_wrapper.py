@@ -1,3 +1,4 @@
+import copy
 import logging
 from collections import namedtuple
 from typing import Dict, Any
@@ -32,10 +33,6 @@ from pcs.lib.commands.constraint import (
 from pcs.lib.env import LibraryEnvironment
 
 
-# Note: not properly typed
-_CACHE: Dict[Any, Any] = {}
-
-
 def wrapper(dictionary):
     return namedtuple("wrapper", dictionary.keys())(**dictionary)
 
@@ -51,6 +48,9 @@ def cli_env_to_lib_env(cli_env):
         booth_files_data=cli_env.booth,
         known_hosts_getter=cli_env.known_hosts_getter,
         request_timeout=cli_env.request_timeout,
+        request_concurrency=cli_env.request_concurrency,
+        communication_metrics=cli_env.communication_metrics,
+        request_relay_fanout=cli_env.request_relay_fanout,
     )
 
 
@@ -77,6 +77,11 @@ def lib_env_to_cli_env(lib_env, cli_env):
 
 def bind(cli_env, run_with_middleware, run_library_command):
     def run(cli_env, *args, **kwargs):
+        if cli_env.batch_lib_env is not None:
+            # the environment is shared by all commands of a batch, changes
+            # are reflected to cli_env once the whole batch has been run
+            return run_library_command(cli_env.batch_lib_env, *args, **kwargs)
+
         lib_env = cli_env_to_lib_env(cli_env)
 
         lib_call_result = run_library_command(lib_env, *args, **kwargs)
@@ -102,10 +107,49 @@ def bind_all(env, run_with_middleware, dictionary):
     )
 
 
-def get_module(env, middleware_factory, name):
-    if name not in _CACHE:
-        _CACHE[name] = load_module(env, middleware_factory, name)
-    return _CACHE[name]
+def _passthrough_middleware(next_in_line, env, *args, **kwargs):
+    return next_in_line(env, *args, **kwargs)
+
+
+def run_cib_transaction(cli_env, middleware_factory, run_commands, wait=False):
+    """
+    Run library commands sharing one CIB which is pushed once at the end
+
+    cli_env -- cli environment
+    middleware_factory -- middlewares wrapping the whole transaction
+    callable run_commands -- takes a Library, runs the commands using it
+    mixed wait -- how many seconds to wait for pacemaker to process new CIB
+        or False for not waiting at all
+    """
+
+    def run(cli_env):
+        lib_env = cli_env_to_lib_env(cli_env)
+        lib_env.ensure_wait_satisfiable(wait)
+        batch_cli_env = copy.copy(cli_env)
+        batch_cli_env.batch_lib_env = lib_env
+        batch_library = Library(
+            batch_cli_env,
+            middleware.create_middleware_factory(
+                **{
+                    name: _passthrough_middleware
+                    for name in middleware_factory._fields
+                }
+            ),
+        )
+        lib_env.begin_cib_transaction()
+        # pylint: disable=bare-except
+        try:
+            result = run_commands(batch_library)
+        except:
+            lib_env.cancel_cib_transaction()
+            raise
+        lib_env.commit_cib_transaction(wait=wait)
+        lib_env_to_cli_env(lib_env, cli_env)
+        return result
+
+    return middleware.build(
+        middleware_factory.cib, middleware_factory.corosync_conf_existing
+    )(run, cli_env)
 
 
 def load_module(env, middleware_factory, name):
@@ -183,6 +227,7 @@ def load_module(env, middleware_factory, name):
                 "add_link": cluster.add_link,
                 "add_nodes": cluster.add_nodes,
                 "node_clear": cluster.node_clear,
+                "relay_requests": cluster.relay_requests,
                 "remove_links": cluster.remove_links,
                 "remove_nodes": cluster.remove_nodes,
                 "remove_nodes_from_cib": cluster.remove_nodes_from_cib,
@@ -481,6 +526,12 @@ class Library:
     def __init__(self, env, middleware_factory):
         self.env = env
         self.middleware_factory = middleware_factory
+        # Note: not properly typed
+        self._module_cache: Dict[Any, Any] = {}
 
     def __getattr__(self, name):
-        return get_module(self.env, self.middleware_factory, name)
+        if name not in self._module_cache:
+            self._module_cache[name] = load_module(
+                self.env, self.middleware_factory, name
+            )
+        return self._module_cache[name]
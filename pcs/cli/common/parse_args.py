@@ -22,6 +22,7 @@ ARG_TYPE_DELIMITER = "%"
 PCS_SHORT_OPTIONS = "hf:p:u:"
 PCS_LONG_OPTIONS = [
     "debug",
+    "debug-timing",
     "version",
     "help",
     "fullhelp",
@@ -40,6 +41,8 @@ PCS_LONG_OPTIONS = [
     "disabled",
     "off",
     "request-timeout=",
+    "request-concurrency=",
+    "request-relay-fanout=",
     "brief",
     # resource (safe-)disable
     "safe",
@@ -410,6 +413,7 @@ class InputModifiers:
                 "--config": "--config" in options,
                 "--corosync": "--corosync" in options,
                 "--debug": "--debug" in options,
+                "--debug-timing": "--debug-timing" in options,
                 "--defaults": "--defaults" in options,
                 "--disabled": "--disabled" in options,
                 "--enable": "--enable" in options,
@@ -448,6 +452,12 @@ class InputModifiers:
                 "--group": options.get("--group", None),
                 "--name": options.get("--name", None),
                 "--node": options.get("--node", None),
+                "--request-concurrency": options.get(
+                    "--request-concurrency", None
+                ),
+                "--request-relay-fanout": options.get(
+                    "--request-relay-fanout", None
+                ),
                 "--request-timeout": options.get("--request-timeout", None),
                 "--to": options.get("--to", None),
                 "--wait": options.get("--wait", False),
@@ -468,10 +478,18 @@ class InputModifiers:
         self, *supported_options, hint_syntax_changed: bool = False
     ):
         unsupported_options = (
-            # --debug is supported in all commands
+            # --debug, --debug-timing, --request-concurrency and
+            # --request-relay-fanout are supported in all commands
             self._defined_options
             - set(supported_options)
-            - set(["--debug"])
+            - set(
+                [
+                    "--debug",
+                    "--debug-timing",
+                    "--request-concurrency",
+                    "--request-relay-fanout",
+                ]
+            )
         )
         if unsupported_options:
             pluralize = lambda word: format_plural(unsupported_options, word)
@@ -17,6 +17,9 @@ class ReportProcessorToConsole(ReportProcessor):
         super().__init__()
         self.debug = debug
 
+    def is_debug_enabled(self) -> bool:
+        return self.debug
+
     def _do_report(self, report_item: ReportItem) -> None:
         report_dto = report_item.to_dto()
         msg = report_item_msg_from_dto(report_dto.message).message
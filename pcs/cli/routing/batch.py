@@ -0,0 +1,12 @@
+from pcs import usage
+from pcs.cli.batch import command as batch
+from pcs.cli.common.routing import create_router
+
+
+batch_cmd = create_router(
+    {
+        "help": lambda lib, argv, modifiers: usage.batch(argv),
+        "run": batch.batch_run,
+    },
+    ["batch"],
+)
@@ -7,7 +7,6 @@ import re
 import subprocess
 import sys
 import tempfile
-import time
 import xml.dom.minidom
 from typing import cast
 
@@ -15,7 +14,6 @@ from pcs import (
     settings,
     utils,
 )
-from pcs.utils import parallel_for_nodes
 from pcs.cli.common import parse_args
 from pcs.cli.common.errors import (
     CmdLineInputError,
@@ -261,13 +259,12 @@ def start_cluster_nodes(nodes):
     # 17 - 24 nodes: 3 * timeout
     # and so on
     # Users can override this and set their own timeout by specifying
-    # the --request-timeout option (see utils.sendHTTPRequest).
+    # the --request-timeout option (see utils.run_node_requests).
     timeout = int(
         settings.default_request_timeout * math.ceil(len(nodes) / 8.0)
     )
-    utils.read_known_hosts_file()  # cache known hosts
-    node_errors = parallel_for_nodes(
-        utils.startCluster, nodes, quiet=True, timeout=timeout
+    node_errors = utils.send_http_request_to_nodes(
+        nodes, "remote/cluster_start", timeout=timeout
     )
     if node_errors:
         utils.err(
@@ -287,20 +284,18 @@ def is_node_fully_started(node_status):
     )
 
 
-def wait_for_local_node_started(stop_at, interval):
+def wait_for_local_node_started(stop_at):
     """
     Commandline options: no options
     """
     try:
-        while True:
-            time.sleep(interval)
-            node_status = lib_pacemaker.get_local_node_status(
-                utils.cmd_runner()
-            )
-            if is_node_fully_started(node_status):
-                return 0, "Started"
-            if datetime.datetime.now() > stop_at:
-                return 1, "Waiting timeout"
+        node_status = lib_pacemaker.wait_for_local_node_started(
+            utils.cmd_runner(),
+            max(0, (stop_at - datetime.datetime.now()).total_seconds()),
+        )
+        if is_node_fully_started(node_status):
+            return 0, "Started"
+        return 1, "Waiting timeout"
     except LibraryError as e:
         return (
             1,
@@ -316,28 +311,79 @@ def wait_for_local_node_started(stop_at, interval):
         )
 
 
-def wait_for_remote_node_started(node, stop_at, interval):
+def get_remote_node_start_result(code, output, stop_at):
+    """
+    Return a code and a message if waiting for a node to start is over, None
+    if the node is to be checked again
+
+    Commandline options: no options
+
+    int code -- result code of a node status request
+    string output -- output of the node status request
+    datetime stop_at -- time when the waiting times out
     """
+    # HTTP error, permission denied or unable to auth
+    # there is no point in trying again as it won't get magically fixed
+    if code in [1, 3, 4]:
+        return 1, output
+    if code == 0:
+        try:
+            node_status = json.loads(output)
+            if is_node_fully_started(node_status):
+                return 0, "Started"
+        except (ValueError, KeyError):
+            # this won't get fixed either
+            return 1, "Unable to get node status"
+    if datetime.datetime.now() > stop_at:
+        return 1, "Waiting timeout"
+    return None
+
+
+def wait_for_remote_nodes_started(node_list, stop_at, interval):
+    """
+    Wait for nodes to start, return error messages of failed nodes
+
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    while True:
-        time.sleep(interval)
-        code, output = utils.getPacemakerNodeStatus(node)
-        # HTTP error, permission denied or unable to auth
-        # there is no point in trying again as it won't get magically fixed
-        if code in [1, 3, 4]:
-            return 1, output
-        if code == 0:
-            try:
-                node_status = json.loads(output)
-                if is_node_fully_started(node_status):
-                    return 0, "Started"
-            except (ValueError, KeyError):
-                # this won't get fixed either
-                return 1, "Unable to get node status"
-        if datetime.datetime.now() > stop_at:
-            return 1, "Waiting timeout"
+    node_errors = dict()
+    request_timeout = utils.pcs_options.get(
+        "--request-timeout",
+        settings.node_start_wait_request_max + settings.default_request_timeout,
+    )
+    # Nodes respond once pacemaker has started on them or once the wait timed
+    # out. Nodes running an older pcsd respond right away and are polled in the
+    # interval. The nodes hold the requests for at most half of the request
+    # timeout, so that they have time to respond before the requests time out.
+    wait_timeout = min(
+        settings.node_start_wait_request_max,
+        max(1, math.ceil((stop_at - datetime.datetime.now()).total_seconds())),
+        request_timeout // 2,
+    )
+
+    def process_result(node, code, output):
+        result = get_remote_node_start_result(code, output, stop_at)
+        if result is None:
+            return interval
+        message = "{0}: {1}".format(node, result[1].strip())
+        print(message)
+        if result[0] != 0:
+            node_errors[node] = message
+        return None
+
+    utils.run_node_requests(
+        [
+            utils.get_node_request(
+                node,
+                "remote/pacemaker_node_status",
+                [("wait", str(wait_timeout))],
+            )
+            for node in node_list
+        ],
+        process_result,
+        timeout=request_timeout,
+    )
+    return node_errors
 
 
 def wait_for_nodes_started(node_list, timeout=None):
@@ -351,15 +397,14 @@ def wait_for_nodes_started(node_list, timeout=None):
     stop_at = datetime.datetime.now() + datetime.timedelta(seconds=timeout)
     print("Waiting for node(s) to start...")
     if not node_list:
-        code, output = wait_for_local_node_started(stop_at, interval)
+        code, output = wait_for_local_node_started(stop_at)
         if code != 0:
             utils.err(output)
         else:
             print(output)
     else:
-        utils.read_known_hosts_file()  # cache known hosts
-        node_errors = parallel_for_nodes(
-            wait_for_remote_node_started, node_list, stop_at, interval
+        node_errors = wait_for_remote_nodes_started(
+            node_list, stop_at, interval
         )
         if node_errors:
             utils.err("unable to verify all nodes have started")
@@ -404,7 +449,6 @@ def stop_cluster_nodes(nodes):
             % "', '".join(sorted(unknown_nodes))
         )
 
-    utils.read_known_hosts_file()  # cache known hosts
     stopping_all = set(nodes) >= set(all_nodes)
     if "--force" not in utils.pcs_options and not stopping_all:
         error_list = []
@@ -442,8 +486,8 @@ def stop_cluster_nodes(nodes):
             )
 
     was_error = False
-    node_errors = parallel_for_nodes(
-        utils.repeat_if_timeout(utils.stopPacemaker), nodes, quiet=True
+    node_errors = utils.stop_cluster_on_nodes(
+        nodes, pacemaker=True, corosync=False, repeat_on_timeout=True
     )
     accessible_nodes = [
         node for node in nodes if node not in node_errors.keys()
@@ -458,8 +502,8 @@ def stop_cluster_nodes(nodes):
     for node in node_errors:
         print("{0}: Not stopping cluster - node is unreachable".format(node))
 
-    node_errors = parallel_for_nodes(
-        utils.stopCorosync, accessible_nodes, quiet=True
+    node_errors = utils.stop_cluster_on_nodes(
+        accessible_nodes, pacemaker=False, corosync=True
     )
     if node_errors:
         utils.err(
@@ -546,9 +590,13 @@ def enable_cluster_nodes(nodes):
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    error_list = utils.map_for_error_list(utils.enableCluster, nodes)
-    if error_list:
-        utils.err("unable to enable all nodes\n" + "\n".join(error_list))
+    node_errors = utils.send_http_request_to_nodes(
+        nodes, "remote/cluster_enable"
+    )
+    if node_errors:
+        utils.err(
+            "unable to enable all nodes\n" + "\n".join(node_errors.values())
+        )
 
 
 def disable_cluster_nodes(nodes):
@@ -556,9 +604,13 @@ def disable_cluster_nodes(nodes):
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    error_list = utils.map_for_error_list(utils.disableCluster, nodes)
-    if error_list:
-        utils.err("unable to disable all nodes\n" + "\n".join(error_list))
+    node_errors = utils.send_http_request_to_nodes(
+        nodes, "remote/cluster_disable"
+    )
+    if node_errors:
+        utils.err(
+            "unable to disable all nodes\n" + "\n".join(node_errors.values())
+        )
 
 
 def destroy_cluster(argv):
@@ -567,16 +619,15 @@ def destroy_cluster(argv):
       * --request-timeout - timeout for HTTP requests
     """
     if argv:
-        utils.read_known_hosts_file()  # cache known hosts
         # stop pacemaker and resources while cluster is still quorate
         nodes = argv
-        node_errors = parallel_for_nodes(
-            utils.repeat_if_timeout(utils.stopPacemaker), nodes, quiet=True
+        node_errors = utils.stop_cluster_on_nodes(
+            nodes, pacemaker=True, corosync=False, repeat_on_timeout=True
         )
         # proceed with destroy regardless of errors
         # destroy will stop any remaining cluster daemons
-        node_errors = parallel_for_nodes(
-            utils.destroyCluster, nodes, quiet=True
+        node_errors = utils.send_http_request_to_nodes(
+            nodes, "remote/cluster_destroy"
         )
         if node_errors:
             utils.err(
@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+from types import MappingProxyType
+from typing import (
+    Dict,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from pcs.common.file import (
+    FileMetadata,
+    RawFile,
+    RawFileError,
+)
+from pcs.common.host import PcsKnownHost
+from pcs.common.tools import format_os_error
+
+
+class KnownHostsStore:
+    """
+    Hosts stored in a known-hosts file, parsed once per process
+
+    Parsed hosts are kept until the file is replaced or modified, which is
+    detected by its inode, size and modification time. Checking the file
+    costs a single stat call, so the store may be asked for hosts as often as
+    needed. The file is written by pcsd, which replaces it atomically.
+
+    The store is thread-safe, use get_known_hosts_store to get one.
+    """
+
+    def __init__(self, metadata: FileMetadata):
+        """
+        metadata -- describes the known-hosts file
+        """
+        self._metadata = metadata
+        self._lock = threading.Lock()
+        self._identity: Optional[Tuple[int, int, int]] = None
+        self._hosts: Mapping[str, PcsKnownHost] = MappingProxyType({})
+
+    def get_all(self) -> Mapping[str, PcsKnownHost]:
+        """
+        Return a read-only mapping of host names to known hosts
+
+        Raises RawFileError if the file cannot be read, json.JSONDecodeError
+        if it is not a valid json, KeyError or TypeError if it does not
+        describe known hosts
+        """
+        with self._lock:
+            identity = self._get_identity()
+            if identity != self._identity:
+                # Identity of the file may change before it is read. The hosts
+                # are then read again next time, they are never outdated.
+                self._hosts = MappingProxyType(
+                    _parse(RawFile(self._metadata).read())
+                )
+                self._identity = identity
+            return self._hosts
+
+    def get(self, name: str) -> Optional[PcsKnownHost]:
+        """
+        Return a known host of the specified name, None if it is not known
+
+        Raises the same exceptions as get_all
+        """
+        return self.get_all().get(name)
+
+    def _get_identity(self) -> Tuple[int, int, int]:
+        try:
+            stat = os.stat(self._metadata.path)
+        except OSError as e:
+            raise RawFileError(
+                self._metadata, RawFileError.ACTION_READ, format_os_error(e)
+            )
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def _parse(file_data: bytes) -> Dict[str, PcsKnownHost]:
+    # json.loads handles bytes, it expects utf-8, 16 or 32 encoding
+    known_hosts_struct = json.loads(file_data)
+    # TODO use known hosts facade for getting info from json struct once the
+    # facade exists
+    return {
+        name: PcsKnownHost.from_known_host_file_dict(name, host)
+        for name, host in known_hosts_struct["known_hosts"].items()
+    }
+
+
+_store_dict_lock = threading.Lock()
+_store_dict: Dict[str, KnownHostsStore] = {}
+
+
+def get_known_hosts_store(metadata: FileMetadata) -> KnownHostsStore:
+    """
+    Return the store of a known-hosts file, shared by the whole process
+
+    metadata -- describes the known-hosts file
+    """
+    with _store_dict_lock:
+        if metadata.path not in _store_dict:
+            _store_dict[metadata.path] = KnownHostsStore(metadata)
+        return _store_dict[metadata.path]
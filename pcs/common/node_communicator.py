@@ -1,7 +1,32 @@
+import asyncio
 import base64
+import gzip
+import heapq
 import io
+import itertools
+import json
 import re
-from collections import namedtuple
+import threading
+import time
+from collections import (
+    deque,
+    namedtuple,
+    OrderedDict,
+)
+from dataclasses import (
+    dataclass,
+    replace,
+)
+from enum import auto
+from typing import (
+    Deque,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
 from urllib.parse import urlencode
 
 # We should ignore SIGPIPE when using pycurl.NOSIGNAL - see the libcurl tutorial
@@ -16,6 +41,7 @@ except ImportError:
 from pcs import settings
 from pcs.common import pcs_pycurl as pycurl
 from pcs.common.host import Destination
+from pcs.common.tools import AutoNameEnum
 
 
 def _find_value_for_possible_keys(value_dict, possible_key_list):
@@ -25,6 +51,19 @@ def _find_value_for_possible_keys(value_dict, possible_key_list):
     return None
 
 
+class DebugCaptureLevel(AutoNameEnum):
+    """
+    Communication debug info to be captured by node communicators
+    """
+
+    # nothing, the debug info is not going to be used
+    OFF = auto()
+    # connection info and HTTP headers without transferred data
+    HEADERS = auto()
+    # connection info, HTTP headers and transferred data
+    FULL = auto()
+
+
 class HostNotFound(Exception):
     def __init__(self, name):
         super(HostNotFound, self).__init__()
@@ -119,6 +158,32 @@ class Request:
         """
         self._current_dest = next(self._current_dest_iterator)
 
+    def copy(self):
+        """
+        Return a new request with the same target and data starting with the
+        first host connection
+        """
+        return Request(self._target, self._data)
+
+    def retry_dests(self, dest_list):
+        """
+        Put host connections back to be used before the remaining ones
+
+        iterable dest_list -- host connections given up without being used
+        """
+        self._current_dest_iterator = itertools.chain(
+            list(dest_list), self._current_dest_iterator
+        )
+
+    def use_dest(self, dest):
+        """
+        Make an already used host connection the current one without moving
+        to the next available ones
+
+        Destination dest -- one of the host connections used so far
+        """
+        self._current_dest = dest
+
     @property
     def url(self):
         """
@@ -144,6 +209,10 @@ class Request:
     def target(self):
         return self._target
 
+    @property
+    def request_data(self):
+        return self._data
+
     @property
     def data(self):
         return self._data.data
@@ -163,6 +232,46 @@ class Request:
         return str("Request({0}, {1})").format(self._target, self._data)
 
 
+class ResponseTiming(NamedTuple):
+    """
+    Timing of a request as measured by libcurl
+
+    Times are in seconds since the start of the request and include the times
+    of the previous phases, see curl_easy_getinfo(3).
+    """
+
+    # name resolving completed
+    name_lookup: float
+    # connection to the host established
+    connect: float
+    # TLS handshake completed
+    tls_handshake: float
+    # the first byte of the response received
+    first_byte: float
+    # the whole request completed
+    total: float
+    bytes_sent: int
+    bytes_received: int
+
+    @classmethod
+    def from_handle(cls, handle):
+        return cls(
+            handle.getinfo(pycurl.NAMELOOKUP_TIME),
+            handle.getinfo(pycurl.CONNECT_TIME),
+            handle.getinfo(pycurl.APPCONNECT_TIME),
+            handle.getinfo(pycurl.STARTTRANSFER_TIME),
+            handle.getinfo(pycurl.TOTAL_TIME),
+            handle.getinfo(_INFO_SIZE_UPLOAD),
+            handle.getinfo(_INFO_SIZE_DOWNLOAD),
+        )
+
+
+# libcurl deprecated sizes reported as floating point numbers, use the integer
+# variants when pycurl supports them
+_INFO_SIZE_UPLOAD = getattr(pycurl, "SIZE_UPLOAD_T", pycurl.SIZE_UPLOAD)
+_INFO_SIZE_DOWNLOAD = getattr(pycurl, "SIZE_DOWNLOAD_T", pycurl.SIZE_DOWNLOAD)
+
+
 class Response:
     """
     This class represents response for request which is available as instance
@@ -176,6 +285,12 @@ class Response:
         self._error_msg = error_msg
         self._data = None
         self._debug = None
+        # values taken over from the handle when it is detached
+        self._request = None
+        self._output_buffer = None
+        self._debug_buffer = None
+        self._response_code = None
+        self._timing = None
 
     @classmethod
     def connection_successful(cls, handle):
@@ -197,8 +312,52 @@ class Response:
         """
         return cls(handle, False, errno, error_msg)
 
+    @classmethod
+    def relayed(
+        cls,
+        request,
+        was_connected,
+        errno=None,
+        error_msg=None,
+        response_code=None,
+        data="",
+    ):
+        """
+        Returns Response instance of a request sent by another node
+
+        Request request -- the request which has been sent
+        bool was_connected -- has the other node connected to the target
+        int errno -- error number if not connected
+        string error_msg -- text description of the error if not connected
+        int response_code -- HTTP code of the response if connected
+        string data -- body of the response
+        """
+        # pylint: disable=too-many-arguments
+        response = cls(None, was_connected, errno, error_msg)
+        response._request = request
+        response._response_code = response_code
+        response._data = data
+        response._debug = ""
+        return response
+
+    def detach_handle(self):
+        """
+        Take over all response data from the curl handle, so that the handle
+        can be used for another request. The handle property is None then.
+        """
+        if self._handle is None:
+            return
+        self._response_code = self.response_code
+        self._timing = self.timing
+        self._request = self._handle.request_obj
+        self._output_buffer = self._handle.output_buffer
+        self._debug_buffer = self._handle.debug_buffer
+        self._handle = None
+
     @property
     def request(self):
+        if self._handle is None:
+            return self._request
         return self._handle.request_obj
 
     @property
@@ -220,21 +379,43 @@ class Response:
     @property
     def data(self):
         if self._data is None:
-            self._data = self._handle.output_buffer.getvalue().decode("utf-8")
+            output_buffer = (
+                self._output_buffer
+                if self._handle is None
+                else self._handle.output_buffer
+            )
+            self._data = output_buffer.getvalue().decode("utf-8")
         return self._data
 
     @property
     def debug(self):
         if self._debug is None:
-            self._debug = self._handle.debug_buffer.getvalue().decode("utf-8")
+            debug_buffer = (
+                self._debug_buffer
+                if self._handle is None
+                else self._handle.debug_buffer
+            )
+            self._debug = debug_buffer.getvalue().decode("utf-8")
         return self._debug
 
     @property
     def response_code(self):
         if not self.was_connected:
             return None
+        if self._handle is None:
+            return self._response_code
         return self._handle.getinfo(pycurl.RESPONSE_CODE)
 
+    @property
+    def timing(self) -> Optional[ResponseTiming]:
+        """
+        Timing of the request, None if the request has been sent by another
+        node
+        """
+        if self._timing is None and self._handle is not None:
+            self._timing = ResponseTiming.from_handle(self._handle)
+        return self._timing
+
     def __repr__(self):
         return str(
             "Response({0} data='{1}' was_connected={2}) errno='{3}'"
@@ -250,11 +431,24 @@ class Response:
 
 
 class NodeCommunicatorFactory:
-    def __init__(self, communicator_logger, user, groups, request_timeout):
+    def __init__(
+        self,
+        communicator_logger,
+        user,
+        groups,
+        request_timeout,
+        request_concurrency=None,
+        metrics=None,
+        relay_fanout=None,
+    ):
+        # pylint: disable=too-many-arguments
         self._logger = communicator_logger
         self._user = user
         self._groups = groups
         self._request_timeout = request_timeout
+        self._request_concurrency = request_concurrency
+        self._metrics = metrics
+        self._relay_fanout = relay_fanout
 
     def get_communicator(self, request_timeout=None):
         return self.get_simple_communicator(request_timeout=request_timeout)
@@ -262,13 +456,83 @@ class NodeCommunicatorFactory:
     def get_simple_communicator(self, request_timeout=None):
         timeout = request_timeout if request_timeout else self._request_timeout
         return Communicator(
-            self._logger, self._user, self._groups, request_timeout=timeout
+            self._logger,
+            self._user,
+            self._groups,
+            request_timeout=timeout,
+            request_concurrency=self._request_concurrency,
+            debug_capture_level=self._logger.get_debug_capture_level(),
+            metrics=self._metrics,
+            relay_fanout=self._relay_fanout,
+        )
+
+    def get_async_communicator(self, request_timeout=None):
+        timeout = request_timeout if request_timeout else self._request_timeout
+        return AsyncCommunicator(
+            self._logger,
+            self._user,
+            self._groups,
+            request_timeout=timeout,
+            request_concurrency=self._request_concurrency,
+            debug_capture_level=self._logger.get_debug_capture_level(),
+            metrics=self._metrics,
+            relay_fanout=self._relay_fanout,
         )
 
     def get_multiaddress_communicator(self, request_timeout=None):
         timeout = request_timeout if request_timeout else self._request_timeout
         return MultiaddressCommunicator(
-            self._logger, self._user, self._groups, request_timeout=timeout
+            self._logger,
+            self._user,
+            self._groups,
+            request_timeout=timeout,
+            request_concurrency=self._request_concurrency,
+            debug_capture_level=self._logger.get_debug_capture_level(),
+            metrics=self._metrics,
+            relay_fanout=self._relay_fanout,
+        )
+
+
+class _CompressionProbeRequest(Request):
+    """
+    A request finding out whether a host accepts compressed request bodies
+    """
+
+    def __init__(self, request):
+        """
+        Request request -- a request to be sent to the host
+        """
+        super().__init__(
+            RequestTarget(
+                request.target.label,
+                token=request.target.token,
+                dest_list=[request.dest],
+            ),
+            RequestData("remote/capabilities"),
+        )
+        self.host_key = _get_host_key(request.dest)
+
+    def process_response(self, response):
+        """
+        Store whether the host accepts compressed request bodies
+
+        Response response -- response to this request
+        """
+        if not response.was_connected:
+            return
+        if response.response_code == 404:
+            # daemons not providing capabilities do not support compression
+            _gzip_request_host_dict[self.host_key] = False
+            return
+        if response.response_code != 200:
+            return
+        try:
+            capability_list = json.loads(response.data)["pcsd_capabilities"]
+        except (ValueError, TypeError, KeyError):
+            _gzip_request_host_dict[self.host_key] = False
+            return
+        _gzip_request_host_dict[self.host_key] = (
+            _COMPRESSION_CAPABILITY in capability_list
         )
 
 
@@ -277,26 +541,74 @@ class Communicator:
     This class provides simple interface for making parallel requests.
     The instances of this class are not thread-safe! It is intended to use it
     only in a single thread. Use an unique instance for each thread.
+
+    At most request_concurrency requests are being processed at the same
+    time, the others wait in a queue. Waiting requests are sent in turns for
+    each target, so that a target with many requests does not delay requests
+    to the other targets.
+
+    The communicator itself does not relay requests, relay_fanout is used by
+    communication commands which may send their requests through other nodes,
+    see pcs.lib.communication.relay.
+
+    Large request bodies are compressed for hosts with the
+    pcs.daemon-compression capability. Before the first such request is sent
+    to a host, the host's capabilities are checked and the request waits for
+    them.
     """
 
     curl_multi_select_timeout_default = 0.8  # in seconds
 
-    def __init__(self, communicator_logger, user, groups, request_timeout=None):
+    def __init__(
+        self,
+        communicator_logger,
+        user,
+        groups,
+        request_timeout=None,
+        request_concurrency=None,
+        debug_capture_level=DebugCaptureLevel.FULL,
+        metrics=None,
+        relay_fanout=None,
+    ):
+        # pylint: disable=too-many-arguments
         self._logger = communicator_logger
+        self._metrics = metrics
+        self.relay_fanout = relay_fanout
         self._auth_cookies = _get_auth_cookies(user, groups)
+        self._debug_capture_level = debug_capture_level
         self._request_timeout = (
             request_timeout
             if request_timeout is not None
             else settings.default_request_timeout
         )
+        self._request_concurrency = max(
+            1,
+            request_concurrency
+            if request_concurrency is not None
+            else settings.default_request_concurrency,
+        )
         self._multi_handle = pycurl.CurlMulti()
         self._is_running = False
-        # This is used just for storing references of curl easy handles.
-        # We need to have references for all the handles, so they don't be
-        # cleaned up by the garbage collector.
+        # requests waiting to be sent, queued by their target labels
+        self._request_queue: "OrderedDict[str, Deque[Request]]" = OrderedDict()
+        # heap of requests waiting for their time to be queued, items are
+        # (due time, sequence number, request), the sequence number keeps
+        # requests with the same due time in the order they have been added
+        self._delayed_request_heap: List[Tuple[float, int, Request]] = []
+        self._delayed_request_counter = itertools.count()
+        # This is used just for storing references of curl easy handles of
+        # requests being processed. We need to have references for all the
+        # handles, so they don't be cleaned up by the garbage collector.
         self._easy_handle_list = []
-
-    def add_requests(self, request_list):
+        # requests waiting for capabilities of their hosts, by host keys
+        self._compression_probe_wait_dict: Dict[
+            Tuple[str, int], List[Request]
+        ] = {}
+        # hosts which capabilities could not be found out, they are not
+        # checked again by this communicator
+        self._compression_probe_failed_set: Set[Tuple[str, int]] = set()
+
+    def add_requests(self, request_list, delay=None):
         """
         Add requests to queue to be processed. It is possible to call this
         method before getting generator using start_loop method and also during
@@ -306,15 +618,136 @@ class Communicator:
         StopIteration exception).
 
         list request_list -- Request objects to add to the queue
+        float delay -- number of seconds to wait before queuing the requests,
+            other requests are processed meanwhile
         """
+        if delay:
+            due_time = time.monotonic() + delay
+            for request in request_list:
+                heapq.heappush(
+                    self._delayed_request_heap,
+                    (due_time, next(self._delayed_request_counter), request),
+                )
+            return
+        self._queue_requests(request_list)
+
+    def _queue_requests(self, request_list):
         for request in request_list:
-            handle = _create_request_handle(
-                request, self._auth_cookies, self._request_timeout,
+            if request.host_label not in self._request_queue:
+                self._request_queue[request.host_label] = deque()
+            self._request_queue[request.host_label].append(request)
+        if self._is_running:
+            self._send_queued_requests()
+
+    def _send_queued_requests(self):
+        while (
+            self._request_queue
+            and len(self._easy_handle_list) < self._request_concurrency
+        ):
+            # Take a request of the first target in the queue and move the
+            # target to the end of the queue to give other targets a chance.
+            label, target_queue = self._request_queue.popitem(last=False)
+            request = target_queue.popleft()
+            if target_queue:
+                self._request_queue[label] = target_queue
+            if self._wait_for_compression_probe(request):
+                continue
+            self._send_request(request)
+
+    def _wait_for_compression_probe(self, request):
+        """
+        Hold a request until capabilities of its host are known, return True
+        if the request has been held
+        """
+        host_key = _get_host_key(request.dest)
+        if (
+            host_key in _gzip_request_host_dict
+            or host_key in self._compression_probe_failed_set
+            or not _is_request_compressible(request)
+        ):
+            return False
+        if host_key not in self._compression_probe_wait_dict:
+            self._compression_probe_wait_dict[host_key] = []
+            self._send_request(_CompressionProbeRequest(request))
+        self._compression_probe_wait_dict[host_key].append(request)
+        return True
+
+    def _finish_compression_probe(self, response):
+        """
+        Process a response to a capabilities check and send the requests
+        waiting for it, return False if the response is not such a response
+        """
+        probe = response.request
+        if not isinstance(probe, _CompressionProbeRequest):
+            return False
+        probe.process_response(response)
+        if probe.host_key not in _gzip_request_host_dict:
+            self._compression_probe_failed_set.add(probe.host_key)
+        self._queue_requests(
+            self._compression_probe_wait_dict.pop(probe.host_key)
+        )
+        return True
+
+    def _queue_due_requests(self):
+        due_request_list = []
+        now = time.monotonic()
+        while (
+            self._delayed_request_heap
+            and self._delayed_request_heap[0][0] <= now
+        ):
+            due_request_list.append(
+                heapq.heappop(self._delayed_request_heap)[2]
             )
-            self._easy_handle_list.append(handle)
-            self._multi_handle.add_handle(handle)
-            if self._is_running:
-                self._logger.log_request_start(request)
+        if due_request_list:
+            self._queue_requests(due_request_list)
+
+    def _get_delayed_request_timeout(self):
+        if not self._delayed_request_heap:
+            return None
+        return self._delayed_request_heap[0][0] - time.monotonic()
+
+    def _has_free_slot(self):
+        return len(self._easy_handle_list) < self._request_concurrency
+
+    def _send_request(self, request):
+        """
+        Start processing a request to its current destination, return its
+        curl handle
+        """
+        handle = _create_request_handle(
+            request,
+            self._auth_cookies,
+            self._request_timeout,
+            self._debug_capture_level,
+        )
+        self._easy_handle_list.append(handle)
+        self._multi_handle.add_handle(handle)
+        self._logger.log_request_start(request)
+        return handle
+
+    def _cancel_request(self, handle):
+        """
+        Stop processing a request started by _send_request, no response is
+        produced for it
+        """
+        self._multi_handle.remove_handle(handle)
+        self._easy_handle_list.remove(handle)
+        # the transfer has been interrupted, do not reuse the handle
+        handle.close()
+        self._send_queued_requests()
+
+    def _process_events(self):
+        """
+        Called in each iteration of the loop, when curl has done its work
+        """
+
+    def _get_event_timeout(self):
+        """
+        Return number of seconds until _process_events needs to be called, None
+        if it doesn't need to be called until curl has something to do
+        """
+        # pylint: disable=no-self-use
+        return None
 
     def start_loop(self):
         """
@@ -342,28 +775,38 @@ class Communicator:
         if self._is_running:
             raise AssertionError("Method start_loop already running")
         self._is_running = True
-        for handle in self._easy_handle_list:
-            self._logger.log_request_start(handle.request_obj)
+        self._send_queued_requests()
 
-        finished_count = 0
-        while finished_count < len(self._easy_handle_list):
+        while self._easy_handle_list or self._delayed_request_heap:
+            self._queue_due_requests()
             self.__multi_perform()
+            self._process_events()
             self.__wait_for_multi_handle()
-            response_list = self.__get_all_ready_responses()
+            response_list = self._get_all_ready_responses()
             for response in response_list:
                 # free up memory for next usage of this Communicator instance
                 self._multi_handle.remove_handle(response.handle)
-                self._logger.log_response(response)
-                yield response
-                # if something was added to the queue in the meantime, run it
-                # immediately, so we don't need to wait until all responses will
-                # be processed
+                self._easy_handle_list.remove(response.handle)
+                self._log_response(response)
+                if not self._finish_compression_probe(response):
+                    yield response
+                # the response has been processed, its handle can be reused
+                _curl_handle_pool.release(response)
+                # if something was added to the queue in the meantime or there
+                # are requests waiting for a free slot, run them immediately,
+                # so we don't need to wait until all responses will be
+                # processed
+                self._send_queued_requests()
                 self.__multi_perform()
-            finished_count += len(response_list)
-        self._easy_handle_list = []
         self._is_running = False
+        self._logger.log_pool_stats(_curl_handle_pool.get_stats())
 
-    def __get_all_ready_responses(self):
+    def _log_response(self, response):
+        self._logger.log_response(response)
+        if self._metrics is not None:
+            self._metrics.record_response(response)
+
+    def _get_all_ready_responses(self):
         response_list = []
         repeat = True
         while repeat:
@@ -388,6 +831,13 @@ class Communicator:
         return num_to_process
 
     def __wait_for_multi_handle(self):
+        if not self._easy_handle_list:
+            # nothing to wait for but delayed requests, curl cannot wait
+            # without any transfer
+            delayed_timeout = self._get_delayed_request_timeout()
+            if delayed_timeout is not None and delayed_timeout > 0:
+                time.sleep(delayed_timeout)
+            return
         # try to wait until there is something to do for us
         need_to_wait = True
         while need_to_wait:
@@ -401,26 +851,74 @@ class Communicator:
                 # curl don't have timeout set, so we can use our default
                 else self.curl_multi_select_timeout_default
             )
+            event_timeout = _min_timeout(
+                self._get_event_timeout(), self._get_delayed_request_timeout()
+            )
+            if event_timeout is not None:
+                if event_timeout <= 0:
+                    # we have something to do ourselves
+                    return
+                timeout = min(timeout, event_timeout)
             # when value returned from select is -1, it timed out, so we can
             # wait
             need_to_wait = self._multi_handle.select(timeout) == -1
 
 
+def _min_timeout(*timeout_list):
+    # None means there is no timeout
+    timeout_list = [timeout for timeout in timeout_list if timeout is not None]
+    return min(timeout_list) if timeout_list else None
+
+
+class _AddressRace:
+    # pylint: disable=too-few-public-methods
+    __slots__ = ("attempt_dict", "next_attempt_time", "is_decided")
+
+    def __init__(self, handle, dest, next_attempt_time):
+        # curl handles of the racing requests and their destinations
+        self.attempt_dict = {handle: dest}
+        self.next_attempt_time = next_attempt_time
+        self.is_decided = False
+
+
 class MultiaddressCommunicator(Communicator):
     """
     Class with same interface as Communicator. In difference with Communicator,
     it takes advantage of multiple hosts in RequestTarget. So if it is not
     possible to connect to target using first hostname, it will use next one
     until connection will be successful or there is no host left.
+
+    The addresses are raced: if connecting to an address takes longer than
+    address_race_delay, the request is sent to the next address as well,
+    without waiting for the first one to fail. Once one of the racing
+    requests connects, the others are cancelled. The race is decided by a TCP
+    connection, so the cancelled requests have not been sent yet as that
+    takes a TLS handshake.
     """
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._address_race_delay = settings.node_address_race_delay
+        self._race_dict: Dict[Request, _AddressRace] = {}
+
     def start_loop(self):
         for response in super(MultiaddressCommunicator, self).start_loop():
+            request = response.request
+            race = self._race_dict.get(request)
+            if race is not None:
+                dest = race.attempt_dict.pop(response.handle)
+                if response.was_connected:
+                    self.__finish_race(request, dest)
+                elif race.attempt_dict:
+                    # other addresses are still being tried
+                    continue
+                else:
+                    del self._race_dict[request]
             if response.was_connected:
                 yield response
                 continue
             try:
-                previous_dest = response.request.dest
+                previous_dest = response.request.dest if race is None else dest
                 response.request.next_dest()
                 self._logger.log_retry(response, previous_dest)
                 self.add_requests([response.request])
@@ -428,6 +926,208 @@ class MultiaddressCommunicator(Communicator):
                 self._logger.log_no_more_addresses(response)
                 yield response
 
+    def _process_events(self):
+        if self._address_race_delay is None:
+            return
+        now = time.monotonic()
+        for handle in list(self._easy_handle_list):
+            request = handle.request_obj
+            if request in self._race_dict:
+                continue
+            if len(request.target.dest_list) > 1:
+                self._race_dict[request] = _AddressRace(
+                    handle, request.dest, now + self._address_race_delay
+                )
+        for request, race in list(self._race_dict.items()):
+            if race.is_decided:
+                continue
+            for handle, dest in race.attempt_dict.items():
+                # connect time is set as soon as the connection is established
+                if handle.getinfo(pycurl.CONNECT_TIME):
+                    self.__finish_race(request, dest, handle)
+                    break
+            else:
+                if now >= race.next_attempt_time and self._has_free_slot():
+                    self.__start_next_attempt(request, race, now)
+
+    def _get_event_timeout(self):
+        if not self._has_free_slot():
+            # no attempt can be started until a request is finished
+            return None
+        next_attempt_time_list = [
+            race.next_attempt_time
+            for race in self._race_dict.values()
+            if not race.is_decided
+        ]
+        if not next_attempt_time_list:
+            return None
+        return min(next_attempt_time_list) - time.monotonic()
+
+    def __start_next_attempt(self, request, race, now):
+        try:
+            request.next_dest()
+        except StopIteration:
+            # no more addresses, wait for the running attempts
+            race.is_decided = True
+            return
+        race.attempt_dict[self._send_request(request)] = request.dest
+        race.next_attempt_time = now + self._address_race_delay
+
+    def __finish_race(self, request, dest, winner_handle=None):
+        race = self._race_dict[request]
+        cancelled_dest_list = []
+        for handle in list(race.attempt_dict):
+            if handle is not winner_handle:
+                cancelled_dest_list.append(race.attempt_dict.pop(handle))
+                self._cancel_request(handle)
+        # the winner may still fail after connecting, the cancelled addresses
+        # are tried again then
+        request.retry_dests(cancelled_dest_list)
+        request.use_dest(dest)
+        if winner_handle is None:
+            del self._race_dict[request]
+        else:
+            race.is_decided = True
+
+
+class AsyncCommunicator(Communicator):
+    """
+    Class with same interface as Communicator except start_loop, which returns
+    an asynchronous generator. It is driven by an asyncio event loop (which
+    the Tornado IOLoop of pcsd runs on): curl tells which sockets and timeouts
+    to watch and the event loop calls curl back when they are ready. The loop
+    is never blocked waiting for nodes, so it can serve other tasks meanwhile.
+
+    USAGE:
+    com = AsyncCommunicator(...)
+    com.add_requests([
+        Request(...), ...
+    ])
+    async for response in com.start_loop():
+        # do something with response
+        # if needed, add some new requests to the queue
+        com.add_requests([Request(...)])
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._loop = None
+        self._timer = None
+        # sockets watched by the event loop
+        self._watched_fd_set = set()
+        # responses received from curl but not yielded yet
+        self._finished_list: Deque[Response] = deque()
+        self._wakeup = None
+        self._multi_handle.setopt(pycurl.M_SOCKETFUNCTION, self.__on_socket)
+        self._multi_handle.setopt(pycurl.M_TIMERFUNCTION, self.__on_timer)
+
+    async def start_loop(self):
+        """
+        Returns asynchronous generator. All requests in queue (added by method
+        add_requests) will be invoked in parallel and the generator will then
+        return responses for these requests. It is possible to add new
+        requests to the queue while the generator is in progress. Generator
+        will stop after all requests (also those added after creation of
+        generator) are processed.
+        """
+        if self._is_running:
+            raise AssertionError("Method start_loop already running")
+        self._is_running = True
+        self._loop = asyncio.get_event_loop()
+        try:
+            self._send_queued_requests()
+            while (
+                self._easy_handle_list
+                or self._delayed_request_heap
+                or self._finished_list
+            ):
+                self._queue_due_requests()
+                if not self._finished_list:
+                    await self.__wait_for_event()
+                    continue
+                response = self._finished_list.popleft()
+                self._easy_handle_list.remove(response.handle)
+                self._log_response(response)
+                if not self._finish_compression_probe(response):
+                    yield response
+                # the response has been processed, its handle can be reused
+                _curl_handle_pool.release(response)
+                self._send_queued_requests()
+            self._logger.log_pool_stats(_curl_handle_pool.get_stats())
+        finally:
+            self.__stop_watching()
+            self._is_running = False
+            self._loop = None
+
+    async def __wait_for_event(self):
+        self._wakeup = self._loop.create_future()
+        try:
+            await asyncio.wait(
+                [self._wakeup], timeout=self._get_delayed_request_timeout()
+            )
+        finally:
+            self._wakeup = None
+
+    def __wake_up(self):
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    def __stop_watching(self):
+        for fd in self._watched_fd_set:
+            self._loop.remove_reader(fd)
+            self._loop.remove_writer(fd)
+        self._watched_fd_set.clear()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def __on_socket(self, event, fd, multi, data):
+        # pylint: disable=unused-argument
+        # called by curl when it wants to change the events watched on a socket
+        if fd in self._watched_fd_set:
+            self._loop.remove_reader(fd)
+            self._loop.remove_writer(fd)
+            self._watched_fd_set.discard(fd)
+        if event == pycurl.POLL_REMOVE:
+            return
+        if event in (pycurl.POLL_IN, pycurl.POLL_INOUT):
+            self._loop.add_reader(
+                fd, self.__socket_action, fd, pycurl.CSELECT_IN
+            )
+        if event in (pycurl.POLL_OUT, pycurl.POLL_INOUT):
+            self._loop.add_writer(
+                fd, self.__socket_action, fd, pycurl.CSELECT_OUT
+            )
+        self._watched_fd_set.add(fd)
+
+    def __on_timer(self, timeout_ms):
+        # called by curl when it wants to be called after a timeout, curl must
+        # not be called from this callback, so it is always scheduled
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if timeout_ms >= 0:
+            self._timer = self._loop.call_later(
+                timeout_ms / 1000.0,
+                self.__socket_action,
+                pycurl.SOCKET_TIMEOUT,
+                0,
+            )
+
+    def __socket_action(self, fd, event_mask):
+        if fd == pycurl.SOCKET_TIMEOUT:
+            self._timer = None
+        status, _ = self._multi_handle.socket_action(fd, event_mask)
+        while status == pycurl.E_CALL_MULTI_PERFORM:
+            status, _ = self._multi_handle.socket_action(fd, event_mask)
+        response_list = self._get_all_ready_responses()
+        for response in response_list:
+            # free up the handle's sockets as soon as possible
+            self._multi_handle.remove_handle(response.handle)
+        if response_list:
+            self._finished_list.extend(response_list)
+            self.__wake_up()
+
 
 class CommunicatorLoggerInterface:
     def log_request_start(self, request):
@@ -442,6 +1142,214 @@ class CommunicatorLoggerInterface:
     def log_no_more_addresses(self, response):
         raise NotImplementedError()
 
+    def log_pool_stats(self, stats):
+        raise NotImplementedError()
+
+    def get_debug_capture_level(self):
+        """
+        Return DebugCaptureLevel of communication debug info to be logged
+        """
+        raise NotImplementedError()
+
+
+class CommunicatorMetricsInterface:
+    def record_response(self, response):
+        """
+        Take a finished response into account
+
+        Response response -- finished response, its handle is still attached
+        """
+        raise NotImplementedError()
+
+
+@dataclass
+class CommunicationTimingRecord:
+    """
+    Timing of requests summed up for a host or an action
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    request_count: int = 0
+    failed_count: int = 0
+    # sums of times of all the requests, in seconds
+    name_lookup: float = 0.0
+    connect: float = 0.0
+    tls_handshake: float = 0.0
+    first_byte: float = 0.0
+    total: float = 0.0
+    total_max: float = 0.0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+    def add(self, timing: ResponseTiming, failed: bool) -> None:
+        self.request_count += 1
+        if failed:
+            self.failed_count += 1
+        self.name_lookup += timing.name_lookup
+        self.connect += timing.connect
+        self.tls_handshake += timing.tls_handshake
+        self.first_byte += timing.first_byte
+        self.total += timing.total
+        self.total_max = max(self.total_max, timing.total)
+        self.bytes_sent += timing.bytes_sent
+        self.bytes_received += timing.bytes_received
+
+
+class CommunicationTimingStats(CommunicatorMetricsInterface):
+    """
+    Collect timing of requests per host and per action
+
+    One instance is meant to be shared by all communicators of a command, it
+    is thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._host_dict: Dict[str, CommunicationTimingRecord] = {}
+        self._action_dict: Dict[str, CommunicationTimingRecord] = {}
+
+    def record_response(self, response):
+        timing = response.timing
+        # a response with a code means a node is reachable, error codes are
+        # reported as failures, though
+        failed = not response.was_connected or response.response_code >= 400
+        request = response.request
+        with self._lock:
+            for record_dict, key in (
+                (self._host_dict, request.host_label),
+                (self._action_dict, request.action),
+            ):
+                if key not in record_dict:
+                    record_dict[key] = CommunicationTimingRecord()
+                record_dict[key].add(timing, failed)
+
+    def get_host_records(self) -> Dict[str, CommunicationTimingRecord]:
+        with self._lock:
+            return _copy_records(self._host_dict)
+
+    def get_action_records(self) -> Dict[str, CommunicationTimingRecord]:
+        with self._lock:
+            return _copy_records(self._action_dict)
+
+
+def _copy_records(
+    record_dict: Dict[str, CommunicationTimingRecord]
+) -> Dict[str, CommunicationTimingRecord]:
+    return {key: replace(record) for key, record in record_dict.items()}
+
+
+class CurlHandlePoolStats(NamedTuple):
+    # number of curl handles created
+    created: int
+    # number of requests processed by a handle taken from the pool
+    reused: int
+    # number of requests sent over an already open connection
+    connections_reused: int
+    # number of handles waiting in the pool for a request
+    idle: int
+
+
+class CurlHandlePool:
+    """
+    Keep curl easy handles for reuse by later requests to the same host
+
+    All handles share DNS cache, TLS sessions and open connections, so that
+    requests to a host do not need to resolve the host and connect to it
+    again, even if they are sent by different Communicator instances.
+
+    The pool is thread-safe, there is one for each process.
+    """
+
+    max_idle_per_host = 4
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._share = None
+        self._idle: Dict[Tuple[str, int], List[pycurl.Curl]] = {}
+        self._created = 0
+        self._reused = 0
+        self._connections_reused = 0
+
+    def get_handle(self, dest):
+        """
+        Return a curl handle, in its default state, for requests to a host
+
+        Destination dest -- address and port of the host
+        """
+        key = _get_host_key(dest)
+        with self._lock:
+            idle_list = self._idle.get(key)
+            if idle_list:
+                handle = idle_list.pop()
+                self._reused += 1
+                share = None
+            else:
+                handle = pycurl.Curl()
+                handle.pool_key = key
+                self._created += 1
+                share = self._get_share()
+        if share is None:
+            # resetting keeps the handle in the share, it cannot be set again
+            handle.reset()
+        else:
+            handle.setopt(pycurl.SHARE, share)
+        return handle
+
+    def release(self, response):
+        """
+        Return a handle of a processed response to the pool
+
+        Response response -- response which no longer needs its handle
+        """
+        handle = response.handle
+        key = getattr(handle, "pool_key", None)
+        if key is None:
+            # not created by the pool
+            return
+        connection_reused = (
+            response.was_connected and handle.getinfo(pycurl.NUM_CONNECTS) == 0
+        )
+        response.detach_handle()
+        # drop references to request data, they may be big
+        handle.request_obj = None
+        handle.output_buffer = None
+        handle.debug_buffer = None
+        with self._lock:
+            if connection_reused:
+                self._connections_reused += 1
+            idle_list = self._idle.setdefault(key, [])
+            if len(idle_list) < self.max_idle_per_host:
+                idle_list.append(handle)
+                return
+        handle.close()
+
+    def get_stats(self) -> CurlHandlePoolStats:
+        with self._lock:
+            return CurlHandlePoolStats(
+                self._created,
+                self._reused,
+                self._connections_reused,
+                sum(len(idle_list) for idle_list in self._idle.values()),
+            )
+
+    def _get_share(self):
+        if self._share is None:
+            self._share = pycurl.CurlShare()
+            for lock_data in (
+                pycurl.LOCK_DATA_DNS,
+                pycurl.LOCK_DATA_SSL_SESSION,
+                pycurl.LOCK_DATA_CONNECT,
+            ):
+                try:
+                    self._share.setopt(pycurl.SH_SHARE, lock_data)
+                except pycurl.error:
+                    # not supported by the installed libcurl
+                    pass
+        return self._share
+
+
+_curl_handle_pool = CurlHandlePool()
+
 
 def _get_auth_cookies(user, group_list):
     """
@@ -466,49 +1374,117 @@ def _get_auth_cookies(user, group_list):
     return cookies
 
 
-def _create_request_handle(request, cookies, timeout):
+_DEBUG_PREFIXES_HEADERS = {
+    pycurl.DEBUG_TEXT: b"* ",
+    pycurl.DEBUG_HEADER_IN: b"< ",
+    pycurl.DEBUG_HEADER_OUT: b"> ",
+}
+_DEBUG_PREFIXES_FULL = {
+    **_DEBUG_PREFIXES_HEADERS,
+    pycurl.DEBUG_DATA_IN: b"<< ",
+    pycurl.DEBUG_DATA_OUT: b">> ",
+}
+
+
+# Request bodies smaller than this are not worth compressing.
+_REQUEST_COMPRESSION_MIN_SIZE = 1024
+_COMPRESSION_CAPABILITY = "pcs.daemon-compression"
+# Hosts (address and port) with known capabilities: True if they accept gzip
+# compressed request bodies, False for older pcsd daemons which do not.
+_gzip_request_host_dict: Dict[Tuple[str, int], bool] = {}
+
+
+def _get_host_key(dest):
+    return (dest.addr, dest.port or settings.pcsd_default_port)
+
+
+def _is_request_compressible(request):
+    # the request body is ascii, it is urlencoded
+    return len(request.data) >= _REQUEST_COMPRESSION_MIN_SIZE
+
+
+def _create_request_handle(
+    request, cookies, timeout, debug_capture_level=DebugCaptureLevel.FULL
+):
     """
     Returns Curl object (easy handle) which is set up witc specified parameters.
 
     Request request -- request specification
     dict cookies -- cookies to add to request
     int timeot -- request timeout
+    DebugCaptureLevel debug_capture_level -- what to store in debug_buffer
     """
-    # it is not possible to take this callback out of this function, because of
-    # curl API
+    # it is not possible to take these callbacks out of this function, because
+    # of curl API
     def __debug_callback(data_type, debug_data):
-        # pylint: disable=no-member
-        prefixes = {
-            pycurl.DEBUG_TEXT: b"* ",
-            pycurl.DEBUG_HEADER_IN: b"< ",
-            pycurl.DEBUG_HEADER_OUT: b"> ",
-            pycurl.DEBUG_DATA_IN: b"<< ",
-            pycurl.DEBUG_DATA_OUT: b">> ",
-        }
         if data_type in prefixes:
             debug_output.write(prefixes[data_type])
+            if data_type in compressed_data_type_set:
+                debug_data = "<{0} bytes of compressed data>".format(
+                    len(debug_data)
+                ).encode("utf-8")
             debug_output.write(debug_data)
             if not debug_data.endswith(b"\n"):
                 debug_output.write(b"\n")
 
+    def __header_callback(header_line):
+        name, _, value = header_line.partition(b":")
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == b"content-encoding" and value not in (b"", b"identity"):
+            compressed_data_type_set.add(pycurl.DEBUG_DATA_IN)
+
+    def __seek_callback(offset, origin):
+        request_body.seek(offset, origin)
+        return pycurl.SEEKFUNC_OK
+
     output = io.BytesIO()
     debug_output = io.BytesIO()
     cookies.update(request.cookies)
-    handle = pycurl.Curl()
+    handle = _curl_handle_pool.get_handle(request.dest)
     handle.setopt(pycurl.PROTOCOLS, pycurl.PROTO_HTTPS)
     handle.setopt(pycurl.TIMEOUT, timeout)
     handle.setopt(pycurl.URL, request.url.encode("utf-8"))
     handle.setopt(pycurl.WRITEFUNCTION, output.write)
-    handle.setopt(pycurl.VERBOSE, 1)
-    handle.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
+    if debug_capture_level != DebugCaptureLevel.OFF:
+        # Curl calls the debug callback for each piece of transferred data, so
+        # it is only set when the debug info is going to be used.
+        prefixes = (
+            _DEBUG_PREFIXES_FULL
+            if debug_capture_level == DebugCaptureLevel.FULL
+            else _DEBUG_PREFIXES_HEADERS
+        )
+        handle.setopt(pycurl.VERBOSE, 1)
+        handle.setopt(pycurl.DEBUGFUNCTION, __debug_callback)
     handle.setopt(pycurl.SSL_VERIFYHOST, 0)
     handle.setopt(pycurl.SSL_VERIFYPEER, 0)
     handle.setopt(pycurl.NOSIGNAL, 1)  # required for multi-threading
-    handle.setopt(pycurl.HTTPHEADER, ["Expect: "])
+    # ask for gzip compressed responses, the only encoding pcsd compresses
+    # responses by, curl decompresses them
+    handle.setopt(pycurl.ACCEPT_ENCODING, "gzip")
+    compressed_data_type_set = set()
+    handle.setopt(pycurl.HEADERFUNCTION, __header_callback)
+    header_list = ["Expect: "]
     if cookies:
         handle.setopt(pycurl.COOKIE, _dict_to_cookies(cookies).encode("utf-8"))
     if request.data:
-        handle.setopt(pycurl.COPYPOSTFIELDS, request.data.encode("utf-8"))
+        data = request.data.encode("utf-8")
+        if len(data) >= _REQUEST_COMPRESSION_MIN_SIZE and (
+            _gzip_request_host_dict.get(_get_host_key(request.dest), False)
+        ):
+            # pycurl does not accept binary data in COPYPOSTFIELDS, so the
+            # compressed body is read by curl
+            request_body = io.BytesIO(gzip.compress(data, compresslevel=6))
+            header_list.append("Content-Encoding: gzip")
+            compressed_data_type_set.add(pycurl.DEBUG_DATA_OUT)
+            handle.setopt(pycurl.POST, 1)
+            handle.setopt(pycurl.POSTFIELDSIZE, len(request_body.getvalue()))
+            handle.setopt(pycurl.READFUNCTION, request_body.read)
+            # curl rewinds the body when it resends the request over a new
+            # connection
+            handle.setopt(pycurl.SEEKFUNCTION, __seek_callback)
+        else:
+            handle.setopt(pycurl.COPYPOSTFIELDS, data)
+    handle.setopt(pycurl.HTTPHEADER, header_list)
     # add reference for request object and output bufers to handle, so later
     # we don't need to match these objects when they are returned from
     # pycurl after they've been processed
@@ -10,6 +10,9 @@ required_constants = {
     "PROTOCOLS": 181,
     "PROTO_HTTPS": 2,
     "E_OPERATION_TIMEDOUT": 28,
+    # CURLOPT_ACCEPT_ENCODING, formerly CURLOPT_ENCODING
+    "ACCEPT_ENCODING": 10102,
+    "SEEKFUNC_OK": 0,
     # these are types of debug messages
     # see https://curl.haxx.se/libcurl/c/CURLOPT_DEBUGFUNCTION.html
     "DEBUG_TEXT": 0,
@@ -20,6 +23,11 @@ required_constants = {
     "DEBUG_SSL_DATA_IN": 5,
     "DEBUG_SSL_DATA_OUT": 6,
     "DEBUG_END": 7,
+    # data shared by curl handles
+    # see https://curl.haxx.se/libcurl/c/CURLSHOPT_SHARE.html
+    "LOCK_DATA_DNS": 3,
+    "LOCK_DATA_SSL_SESSION": 4,
+    "LOCK_DATA_CONNECT": 5,
 }
 
 __current_module = sys.modules[__name__]
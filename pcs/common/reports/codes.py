@@ -128,7 +128,9 @@ CIB_LOAD_ERROR_SCOPE_MISSING = M("CIB_LOAD_ERROR_SCOPE_MISSING")
 CIB_PUSH_FORCED_FULL_DUE_TO_CRM_FEATURE_SET = M(
     "CIB_PUSH_FORCED_FULL_DUE_TO_CRM_FEATURE_SET"
 )
+CIB_PUSH_CONFLICT = M("CIB_PUSH_CONFLICT")
 CIB_PUSH_ERROR = M("CIB_PUSH_ERROR")
+CIB_PUSH_REBASED = M("CIB_PUSH_REBASED")
 CIB_SAVE_TMP_ERROR = M("CIB_SAVE_TMP_ERROR")
 CIB_SIMULATE_ERROR = M("CIB_SIMULATE_ERROR")
 CIB_UPGRADE_FAILED = M("CIB_UPGRADE_FAILED")
@@ -276,6 +278,9 @@ NODE_ADDRESSES_UNRESOLVABLE = M("NODE_ADDRESSES_UNRESOLVABLE")
 NODE_COMMUNICATION_COMMAND_UNSUCCESSFUL = M(
     "NODE_COMMUNICATION_COMMAND_UNSUCCESSFUL"
 )
+NODE_COMMUNICATION_CONNECTION_POOL_STATS = M(
+    "NODE_COMMUNICATION_CONNECTION_POOL_STATS"
+)
 NODE_COMMUNICATION_DEBUG_INFO = M("NODE_COMMUNICATION_DEBUG_INFO")
 NODE_COMMUNICATION_ERROR = M("NODE_COMMUNICATION_ERROR")
 NODE_COMMUNICATION_ERROR_NOT_AUTHORIZED = M(
@@ -295,6 +300,9 @@ NODE_COMMUNICATION_FINISHED = M("NODE_COMMUNICATION_FINISHED")
 NODE_COMMUNICATION_NOT_CONNECTED = M("NODE_COMMUNICATION_NOT_CONNECTED")
 NODE_COMMUNICATION_NO_MORE_ADDRESSES = M("NODE_COMMUNICATION_NO_MORE_ADDRESSES")
 NODE_COMMUNICATION_PROXY_IS_SET = M("NODE_COMMUNICATION_PROXY_IS_SET")
+NODE_COMMUNICATION_REQUEST_RETRY_SCHEDULED = M(
+    "NODE_COMMUNICATION_REQUEST_RETRY_SCHEDULED"
+)
 NODE_COMMUNICATION_RETRYING = M("NODE_COMMUNICATION_RETRYING")
 NODE_COMMUNICATION_STARTED = M("NODE_COMMUNICATION_STARTED")
 NODE_NAMES_ALREADY_EXIST = M("NODE_NAMES_ALREADY_EXIST")
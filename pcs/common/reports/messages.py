@@ -973,6 +973,32 @@ class NodeCommunicationNoMoreAddresses(ReportItemMessage):
         return f"Unable to connect to '{self.node}' via any of its addresses"
 
 
+@dataclass(frozen=True)
+class NodeCommunicationConnectionPoolStats(ReportItemMessage):
+    """
+    Usage of curl handles and connections kept for reuse by node communication
+
+    created -- number of curl handles created
+    reused -- number of requests processed by a reused curl handle
+    connections_reused -- number of requests sent over an open connection
+    idle -- number of curl handles kept for next requests
+    """
+
+    created: int
+    reused: int
+    connections_reused: int
+    idle: int
+    _code = codes.NODE_COMMUNICATION_CONNECTION_POOL_STATS
+
+    @property
+    def message(self) -> str:
+        return (
+            f"Connection pool: {self.created} handles created, "
+            f"{self.reused} handles reused, {self.connections_reused} "
+            f"connections reused, {self.idle} handles idle"
+        )
+
+
 @dataclass(frozen=True)
 class NodeCommunicationErrorNotAuthorized(ReportItemMessage):
     """
@@ -1157,6 +1183,32 @@ class NodeCommunicationRetrying(ReportItemMessage):
         )
 
 
+@dataclass(frozen=True)
+class NodeCommunicationRequestRetryScheduled(ReportItemMessage):
+    """
+    Request failed with an error which may be temporary, it will be sent
+    again after a delay
+
+    node -- node the request failed on
+    request -- the request action
+    attempt -- number of the attempt to be made
+    delay -- number of seconds the request will be sent in
+    """
+
+    node: str
+    request: str
+    attempt: int
+    delay: float
+    _code = codes.NODE_COMMUNICATION_REQUEST_RETRY_SCHEDULED
+
+    @property
+    def message(self) -> str:
+        return (
+            f"Request '{self.request}' on node '{self.node}' failed, "
+            f"attempt {self.attempt} will be made in {self.delay:.1f} seconds"
+        )
+
+
 @dataclass(frozen=True)
 class DefaultsCanBeOverriden(ReportItemMessage):
     """
@@ -2839,6 +2891,51 @@ class CibPushError(ReportItemMessage):
         return f"Unable to update cib\n{self.reason}\n{self.pushed_cib}"
 
 
+@dataclass(frozen=True)
+class CibPushConflict(ReportItemMessage):
+    """
+    CIB has been changed by someone else while pushing it, retries exhausted
+
+    retry_count -- how many times the changes have been redone and pushed
+    """
+
+    retry_count: int
+    _code = codes.CIB_PUSH_CONFLICT
+
+    @property
+    def message(self) -> str:
+        return (
+            "Unable to update cib, it has been changed by someone else in the "
+            "meantime; gave up after {count} {retry_pl}"
+        ).format(
+            count=self.retry_count,
+            retry_pl=format_plural(self.retry_count, "retry", "retries"),
+        )
+
+
+@dataclass(frozen=True)
+class CibPushRebased(ReportItemMessage):
+    """
+    CIB has been changed by someone else while pushing it, changes have been
+    redone on the new CIB and pushed successfully
+
+    retry_count -- how many times the changes have been redone and pushed
+    """
+
+    retry_count: int
+    _code = codes.CIB_PUSH_REBASED
+
+    @property
+    def message(self) -> str:
+        return (
+            "Cib has been changed by someone else in the meantime, changes "
+            "have been pushed after {count} {retry_pl}"
+        ).format(
+            count=self.retry_count,
+            retry_pl=format_plural(self.retry_count, "retry", "retries"),
+        )
+
+
 @dataclass(frozen=True)
 class CibSaveTmpError(ReportItemMessage):
     """
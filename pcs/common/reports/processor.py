@@ -22,6 +22,14 @@ class ReportProcessor(abc.ABC):
             self.report(report_item)
         return self
 
+    def is_debug_enabled(self) -> bool:
+        """
+        Tell whether debug reports are used, callers may skip gathering data
+        for debug reports if they are not
+        """
+        # pylint: disable=no-self-use
+        return True
+
     @abc.abstractmethod
     def _do_report(self, report_item: ReportItem) -> None:
         raise NotImplementedError()
@@ -1,13 +1,17 @@
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from ctypes import byref, cast, CDLL, CFUNCTYPE, POINTER, sizeof, Structure
 from ctypes import c_char, c_char_p, c_int, c_uint, c_void_p
 from ctypes.util import find_library
 import grp
+import os
 import pwd
+import time
 
 from tornado.gen import coroutine
 
+from pcs import settings
 from pcs.daemon import log
 
 # pylint: disable=invalid-name, too-few-public-methods
@@ -95,15 +99,16 @@ def authenticate_by_pam(username, password):
 
 
 def get_user_groups_sync(username):
-    return tuple(
-        [group.gr_name for group in grp.getgrall() if username in group.gr_mem]
-        + [
-            # `group.gr_mem` does not contain the `username` when `group` is
-            # primary for the `username` (the same is in /etc/group). So it is
-            # necessary to add the primary group.
-            grp.getgrgid(pwd.getpwnam(username).pw_gid).gr_name
-        ]
-    )
+    # Only groups of the user are looked up. Enumerating all groups and their
+    # members takes long when groups are stored in LDAP or a similar directory.
+    group_name_list = []
+    for gid in os.getgrouplist(username, pwd.getpwnam(username).pw_gid):
+        try:
+            group_name_list.append(grp.getgrgid(gid).gr_name)
+        except KeyError:
+            # a group without a name cannot be HA_ADM_GROUP
+            pass
+    return tuple(group_name_list)
 
 
 UserAuthInfo = namedtuple("UserAuthInfo", "name groups is_authorized")
@@ -155,7 +160,10 @@ def check_user_groups_sync(username, logger) -> UserAuthInfo:
     except KeyError as e:
         logger.unable_determine_groups(username, e)
         return UserAuthInfo(username, [], is_authorized=False)
+    return check_groups(username, groups, logger)
+
 
+def check_groups(username, groups, logger) -> UserAuthInfo:
     if HA_ADM_GROUP not in groups:
         logger.not_ha_adm_member(username, HA_ADM_GROUP)
         return UserAuthInfo(username, groups, is_authorized=False)
@@ -164,7 +172,12 @@ def check_user_groups_sync(username, logger) -> UserAuthInfo:
     return UserAuthInfo(username, groups, is_authorized=True)
 
 
-def authorize_user_sync(username, password) -> UserAuthInfo:
+def authorize_user_sync(username, password, groups=None) -> UserAuthInfo:
+    """
+    Authenticate a user by PAM and check their groups
+
+    tuple groups -- known groups of the user, looked up if None
+    """
     log.pcsd.info("Attempting login by '%s'", username)
 
     if not authenticate_by_pam(username, password):
@@ -173,29 +186,272 @@ def authorize_user_sync(username, password) -> UserAuthInfo:
         )
         return UserAuthInfo(username, [], is_authorized=False)
 
-    return check_user_groups_sync(username, LoginLogger())
+    if groups is None:
+        return check_user_groups_sync(username, LoginLogger())
+    return check_groups(username, groups, LoginLogger())
+
+
+UserGroupsCacheStats = namedtuple(
+    "UserGroupsCacheStats", "hit_count miss_count size"
+)
+
+
+class UserGroupsCache:
+    """
+    Groups of authorized users, each kept for a limited time
+
+    Looking up groups may take long, so groups of a user are looked up once
+    and kept until they expire or the user fails to log in. Changes of the
+    groups of a user take effect once the cached groups expire. When the
+    cache is full, groups stored first are dropped.
+
+    The cache must be used from the tornado IOLoop thread only.
+    """
+
+    def __init__(self, ttl, max_size):
+        """
+        int ttl -- number of seconds groups are kept for
+        int max_size -- maximal number of users whose groups are kept
+        """
+        self._ttl = ttl
+        self._max_size = max_size
+        # username: (expiration time, groups), ordered by expiration time
+        self._cache = OrderedDict()
+        self._hit_count = 0
+        self._miss_count = 0
+
+    @property
+    def stats(self) -> UserGroupsCacheStats:
+        return UserGroupsCacheStats(
+            self._hit_count, self._miss_count, len(self._cache)
+        )
+
+    def get(self, username):
+        """
+        Return groups of a user, None if they are not cached or have expired
+        """
+        item = self._cache.get(username)
+        if item is not None and item[0] > time.monotonic():
+            self._hit_count += 1
+            return item[1]
+        self._cache.pop(username, None)
+        self._miss_count += 1
+        log.pcsd.debug(
+            "Groups of user '%s' not cached (%d hits, %d misses)",
+            username,
+            self._hit_count,
+            self._miss_count,
+        )
+        return None
+
+    def set(self, username, groups):
+        self._cache.pop(username, None)
+        self._cache[username] = (time.monotonic() + self._ttl, tuple(groups))
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+
+    def invalidate(self, username):
+        self._cache.pop(username, None)
+
+
+_user_groups_cache = UserGroupsCache(
+    settings.pcsd_user_groups_cache_ttl, settings.pcsd_user_groups_cache_size
+)
+
+
+def get_user_groups_cache() -> UserGroupsCache:
+    return _user_groups_cache
+
+
+WorkerPoolStats = namedtuple(
+    "WorkerPoolStats",
+    "task_count pending_count max_pending_count latency_avg latency_max",
+)
+
+
+class WorkerPool:
+    """
+    Long-lived processes running PAM authentication and group checks
+
+    PAM modules are not run in the pcsd process itself, they may block or
+    crash it. Starting a new process for each task limits pcsd to a few
+    authentications per second, so the processes are kept running. They are
+    replaced by new ones after running max_tasks_per_worker tasks each on
+    average, so resources leaked by PAM modules are freed. Processes which
+    died are replaced as well and the task is run again once.
+
+    The pool must be used from the tornado IOLoop thread only.
+    """
+
+    def __init__(self, worker_count, max_tasks_per_worker):
+        """
+        int worker_count -- number of processes running tasks in parallel
+        int max_tasks_per_worker -- processes are replaced after running this
+            many tasks each on average
+        """
+        self._worker_count = worker_count
+        self._max_tasks = worker_count * max_tasks_per_worker
+        self._executor = None
+        self._executor_task_count = 0
+        self._task_count = 0
+        self._pending_count = 0
+        self._max_pending_count = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    @property
+    def stats(self) -> WorkerPoolStats:
+        """
+        Return numbers of finished and waiting tasks and task latencies, which
+        include time the tasks waited for a free process, in seconds
+        """
+        return WorkerPoolStats(
+            self._task_count,
+            self._pending_count,
+            self._max_pending_count,
+            (
+                self._latency_total / self._task_count
+                if self._task_count
+                else 0.0
+            ),
+            self._latency_max,
+        )
+
+    # TODO async/await version - how to do it?
+    # When async/await is used then the problem is:
+    # "TypeError: object Future can't be used in 'await' expression" is raised
+    # even if the function "convert_yielded" is used according to
+    # http://www.tornadoweb.org/en/stable/guide/coroutines.html#python-3-5-async-and-await
+    @coroutine
+    def run(self, sync_fn, *args):
+        start = time.monotonic()
+        self._pending_count += 1
+        self._max_pending_count = max(
+            self._max_pending_count, self._pending_count
+        )
+        try:
+            executor = self._get_executor()
+            try:
+                result = yield executor.submit(sync_fn, *args)
+            except BrokenProcessPool:
+                log.pcsd.warning(
+                    "Authentication worker process died, starting a new one"
+                )
+                self._shutdown_executor(executor)
+                result = yield self._get_executor().submit(sync_fn, *args)
+        finally:
+            self._pending_count -= 1
+            latency = time.monotonic() - start
+            self._task_count += 1
+            self._latency_total += latency
+            self._latency_max = max(self._latency_max, latency)
+            log.pcsd.debug(
+                "Authentication task '%s' took %.3f s, %d tasks waiting",
+                sync_fn.__name__,
+                latency,
+                self._pending_count,
+            )
+        return result
+
+    def shutdown(self):
+        if self._executor:
+            self._shutdown_executor(self._executor)
+
+    def _get_executor(self):
+        if self._executor and self._executor_task_count >= self._max_tasks:
+            log.pcsd.debug(
+                "Replacing authentication worker processes after %d tasks",
+                self._executor_task_count,
+            )
+            self._shutdown_executor(self._executor)
+        if not self._executor:
+            self._executor = ProcessPoolExecutor(max_workers=self._worker_count)
+        self._executor_task_count += 1
+        return self._executor
+
+    def _shutdown_executor(self, executor):
+        # Tasks already submitted are finished by the old processes.
+        executor.shutdown(wait=False)
+        if executor is self._executor:
+            self._executor = None
+            self._executor_task_count = 0
+
+
+_worker_pool = None
+
+
+def setup_worker_pool(
+    worker_count=settings.pcsd_auth_workers,
+    max_tasks_per_worker=settings.pcsd_auth_worker_max_tasks,
+):
+    """
+    Replace the pool running authentication tasks
+
+    int worker_count -- number of processes running tasks in parallel
+    int max_tasks_per_worker -- processes are replaced after running this many
+        tasks each on average
+    """
+    # pylint: disable=global-statement
+    global _worker_pool
+    if _worker_pool:
+        _worker_pool.shutdown()
+    _worker_pool = WorkerPool(worker_count, max_tasks_per_worker)
+    return _worker_pool
+
+
+def get_worker_pool() -> WorkerPool:
+    return _worker_pool or setup_worker_pool()
 
 
-# TODO async/await version - how to do it?
-# When async/await is used then the problem is:
-# "TypeError: object Future can't be used in 'await' expression" is raised even
-# if the function "convert_yielded" is used according to
-# http://www.tornadoweb.org/en/stable/guide/coroutines.html#python-3-5-async-and-await
-@coroutine
 def run_in_process(sync_fn, *args):
-    pool = ProcessPoolExecutor(max_workers=1)
-    result = yield pool.submit(sync_fn, *args)
-    pool.shutdown()
-    return result
+    return get_worker_pool().run(sync_fn, *args)
+
+
+def log_stats():
+    """
+    Log statistics of the worker pool and the user groups cache
+    """
+    if _worker_pool is not None:
+        pool_stats = _worker_pool.stats
+        log.pcsd.debug(
+            "Auth worker pool: %d tasks done, %d pending (max %d), "
+            "latency avg %.3fs max %.3fs",
+            pool_stats.task_count,
+            pool_stats.pending_count,
+            pool_stats.max_pending_count,
+            pool_stats.latency_avg,
+            pool_stats.latency_max,
+        )
+    cache_stats = _user_groups_cache.stats
+    log.pcsd.debug(
+        "User groups cache: %d hits, %d misses, %d users cached",
+        cache_stats.hit_count,
+        cache_stats.miss_count,
+        cache_stats.size,
+    )
 
 
 @coroutine
 def authorize_user(username, password) -> UserAuthInfo:
-    user = yield run_in_process(authorize_user_sync, username, password)
+    groups = _user_groups_cache.get(username)
+    user = yield run_in_process(authorize_user_sync, username, password, groups)
+    _update_user_groups_cache(user, groups)
     return user
 
 
 @coroutine
 def check_user_groups(username) -> UserAuthInfo:
+    groups = _user_groups_cache.get(username)
+    if groups is not None:
+        return check_groups(username, groups, PlainLogger())
     user = yield run_in_process(check_user_groups_sync, username, PlainLogger())
+    _update_user_groups_cache(user, groups)
     return user
+
+
+def _update_user_groups_cache(user, cached_groups):
+    if not user.is_authorized:
+        _user_groups_cache.invalidate(user.name)
+    elif cached_groups is None:
+        # Cached groups are not stored again, they would never expire.
+        _user_groups_cache.set(user.name, user.groups)
@@ -25,6 +25,7 @@ NOTIFY_SOCKET = "NOTIFY_SOCKET"
 PCSD_DEBUG = "PCSD_DEBUG"
 PCSD_DISABLE_GUI = "PCSD_DISABLE_GUI"
 PCSD_SESSION_LIFETIME = "PCSD_SESSION_LIFETIME"
+PCSD_AUTH_WORKERS = "PCSD_AUTH_WORKERS"
 PCSD_DEV = "PCSD_DEV"
 PCSD_STATIC_FILES_DIR = "PCSD_STATIC_FILES_DIR"
 
@@ -39,6 +40,7 @@ Env = namedtuple(
         PCSD_DEBUG,
         PCSD_DISABLE_GUI,
         PCSD_SESSION_LIFETIME,
+        PCSD_AUTH_WORKERS,
         PCSD_STATIC_FILES_DIR,
         PCSD_DEV,
         "has_errors",
@@ -57,6 +59,7 @@ def prepare_env(environ, logger=None):
         loader.pcsd_debug(),
         loader.pcsd_disable_gui(),
         loader.session_lifetime(),
+        loader.auth_workers(),
         loader.pcsd_static_files_dir(),
         loader.pcsd_dev(),
         loader.has_errors(),
@@ -160,6 +163,21 @@ class EnvLoader:
             )
             return session_lifetime
 
+    def auth_workers(self):
+        auth_workers = self.environ.get(
+            PCSD_AUTH_WORKERS, settings.pcsd_auth_workers
+        )
+        try:
+            if int(auth_workers) > 0:
+                return int(auth_workers)
+        except ValueError:
+            pass
+        self.errors.append(
+            f"Invalid PCSD_AUTH_WORKERS value '{auth_workers}'"
+            " (it must be a positive integer)"
+        )
+        return auth_workers
+
     def pcsd_debug(self):
         return self.__has_true_in_environ(PCSD_DEBUG)
 
@@ -47,7 +47,10 @@ class HttpsServerManage:
         log.pcsd.info("Starting server...")
 
         self.__server = HTTPServer(
-            self.__make_app(self), ssl_options=self.__ssl.create_context()
+            self.__make_app(self),
+            ssl_options=self.__ssl.create_context(),
+            # accept request bodies compressed by pcs
+            decompress_request=True,
         )
 
         # It is necessary to bind sockets for every new HTTPServer since
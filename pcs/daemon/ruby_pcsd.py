@@ -78,6 +78,10 @@ class RubyDaemonRequest(
     ):
         headers = http_request.headers if http_request else HTTPHeaders()
         headers.add("X-Pcsd-Type", request_type)
+        if http_request and "X-Consumed-Content-Encoding" in headers:
+            # The body has been decompressed by the HTTPServer, its length
+            # differs from the length of the received body.
+            headers["Content-Length"] = str(len(http_request.body))
         if payload:
             headers.add(
                 "X-Pcsd-Payload",
@@ -3,13 +3,13 @@ import signal
 import socket
 from pathlib import Path
 
-from tornado.ioloop import IOLoop
+from tornado.ioloop import IOLoop, PeriodicCallback
 from tornado.locks import Lock
 from tornado.web import Application
 
 from pcs import settings
 from pcs.common.system import is_systemd
-from pcs.daemon import log, ruby_pcsd, session, ssl, systemd
+from pcs.daemon import auth, log, ruby_pcsd, session, ssl, systemd
 from pcs.daemon.app import sinatra_ui, sinatra_remote, ui
 from pcs.daemon.app.common import RedirectHandler
 from pcs.daemon.env import prepare_env
@@ -81,7 +81,7 @@ def configure_app(
                 )
             )
 
-        return Application(routes, debug=debug)
+        return Application(routes, debug=debug, compress_response=True)
 
     return make_app
 
@@ -100,12 +100,14 @@ def main():
     if env.PCSD_DEBUG:
         log.enable_debug()
 
+    auth.setup_worker_pool(env.PCSD_AUTH_WORKERS)
     sync_config_lock = Lock()
     ruby_pcsd_wrapper = ruby_pcsd.Wrapper(
         settings.pcsd_ruby_socket, debug=env.PCSD_DEBUG,
     )
+    session_storage = session.Storage(env.PCSD_SESSION_LIFETIME)
     make_app = configure_app(
-        session.Storage(env.PCSD_SESSION_LIFETIME),
+        session_storage,
         ruby_pcsd_wrapper,
         sync_config_lock,
         env.PCSD_STATIC_FILES_DIR,
@@ -145,4 +147,12 @@ def main():
     if is_systemd() and env.NOTIFY_SOCKET:
         ioloop.add_callback(systemd.notify, env.NOTIFY_SOCKET)
     ioloop.add_callback(config_sync(sync_config_lock, ruby_pcsd_wrapper))
+    PeriodicCallback(
+        session_storage.drop_expired,
+        settings.gui_session_drop_expired_interval * 1000,
+    ).start()
+    if env.PCSD_DEBUG:
+        PeriodicCallback(
+            auth.log_stats, settings.pcsd_auth_stats_log_interval * 1000
+        ).start()
     ioloop.start()
@@ -1,7 +1,10 @@
 import random
 import string
+from collections import OrderedDict
 from time import time as now
 
+from pcs import settings
+
 
 class Session:
     def __init__(
@@ -30,32 +33,28 @@ class Session:
         # Groups of the user. Similary to username, it does not mean that the
         # user is authenticated when the groups are loaded.
         self.__groups = groups or []
-        # The moment of the last access. The only muttable attribute.
+        # The moment of the last access. The only muttable attribute. It is
+        # set by Storage when it provides the session.
         self.refresh()
 
     @property
     def is_authenticated(self):
-        self.refresh()
         return self.__is_authenticated
 
     @property
     def username(self):
-        self.refresh()
         return self.__username
 
     @property
     def sid(self):
-        self.refresh()
         return self.__sid
 
     @property
     def ajax_id(self):
-        self.refresh()
         return self.__ajax_id
 
     @property
     def groups(self):
-        self.refresh()
         return self.__groups
 
     def refresh(self):
@@ -70,22 +69,37 @@ class Session:
 
 
 class Storage:
-    def __init__(self, lifetime_seconds):
-        self.__sessions = {}
+    """
+    Sessions kept in the order of their last access
+
+    All sessions have the same lifetime, so expired sessions are always the
+    least recently used ones. They are dropped from the beginning of the
+    order, which costs no more than creating them did. When there are too
+    many sessions, the least recently used ones are dropped as well.
+    """
+
+    def __init__(
+        self, lifetime_seconds, max_count=settings.gui_session_max_count
+    ):
+        """
+        int lifetime_seconds -- sessions unused this long are dropped
+        int max_count -- maximal number of sessions kept
+        """
+        self.__sessions = OrderedDict()
         self.__lifetime_seconds = lifetime_seconds
+        self.__max_count = max_count
 
     def provide(self, sid=None) -> Session:
         if self.__is_valid_sid(sid):
+            self.__sessions.move_to_end(sid)
             return self.__sessions[sid].refresh()
         return self.__register(self.__generate_sid())
 
     def drop_expired(self):
-        obsolete_sid_list = [
-            sid
-            for sid, session in self.__sessions.items()
-            if session.was_unused_last(self.__lifetime_seconds)
-        ]
-        for sid in obsolete_sid_list:
+        while self.__sessions:
+            sid, session = next(iter(self.__sessions.items()))
+            if not session.was_unused_last(self.__lifetime_seconds):
+                break
             del self.__sessions[sid]
 
     def destroy(self, sid):
@@ -119,7 +133,10 @@ class Storage:
 
     def __register(self, *args, **kwargs) -> Session:
         session = Session(*args, **kwargs)
+        self.__sessions.pop(session.sid, None)
         self.__sessions[session.sid] = session
+        while len(self.__sessions) > self.__max_count:
+            self.__sessions.popitem(last=False)
         return session
 
     def __generate_sid(self):
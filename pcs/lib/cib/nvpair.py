@@ -2,7 +2,13 @@ from functools import partial
 from lxml import etree
 
 from pcs.lib.cib.tools import create_subelement_id
-from pcs.lib.xml_tools import get_sub_element, append_when_useful
+from pcs.lib.xml_tools import (
+    append_new_element,
+    append_when_useful,
+    get_sub_element,
+    remove_one_element,
+    update_attribute_remove_empty,
+)
 
 META_ATTRIBUTES_TAG = "meta_attributes"
 INSTANCE_ATTRIBUTES_TAG = "instance_attributes"
@@ -17,12 +23,14 @@ def _append_new_nvpair(nvset_element, name, value, id_provider):
     string value is value attribute of new nvpair
     IdProvider id_provider -- elements' ids generator
     """
-    etree.SubElement(
+    append_new_element(
         nvset_element,
         "nvpair",
-        id=create_subelement_id(nvset_element, name, id_provider),
-        name=name,
-        value=value,
+        dict(
+            id=create_subelement_id(nvset_element, name, id_provider),
+            name=name,
+            value=value,
+        ),
     )
 
 
@@ -42,9 +50,9 @@ def set_nvpair_in_nvset(nvset_element, name, value, id_provider):
             _append_new_nvpair(nvset_element, name, value, id_provider)
     else:
         if value:
-            nvpair.set("value", value)
+            update_attribute_remove_empty(nvpair, "value", value)
         else:
-            nvset_element.remove(nvpair)
+            remove_one_element(nvpair)
 
 
 def arrange_first_nvset(
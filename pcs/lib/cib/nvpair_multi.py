@@ -9,7 +9,6 @@ from typing import (
 )
 from xml.etree.ElementTree import Element
 
-from lxml import etree
 from lxml.etree import _Element
 
 from pcs.common import reports
@@ -34,8 +33,10 @@ from pcs.lib.cib.tools import (
     create_subelement_id,
 )
 from pcs.lib.xml_tools import (
+    append_new_element,
     export_attributes,
     remove_one_element,
+    update_attribute_remove_empty,
 )
 
 
@@ -238,15 +239,16 @@ def nvset_append_new(
             parent_element, nvset_tag, id_provider
         )
 
-    nvset_el = etree.SubElement(cast(_Element, parent_element), nvset_tag)
-    for name, value in nvset_options.items():
-        if value != "":
-            nvset_el.attrib[name] = value
+    nvset_el = append_new_element(
+        parent_element,
+        nvset_tag,
+        {name: value for name, value in nvset_options.items() if value != ""},
+    )
     if nvset_rule:
-        rule_to_cib(cast(Element, nvset_el), id_provider, nvset_rule)
+        rule_to_cib(nvset_el, id_provider, nvset_rule)
     for name, value in nvpair_dict.items():
-        _set_nvpair(cast(Element, nvset_el), id_provider, name, value)
-    return cast(Element, nvset_el)
+        _set_nvpair(nvset_el, id_provider, name, value)
+    return nvset_el
 
 
 def nvset_remove(nvset_el_list: Iterable[Element]) -> None:
@@ -299,8 +301,8 @@ def _set_nvpair(
 
     if not nvpair_el_list:
         if value != "":
-            etree.SubElement(
-                cast(_Element, nvset_element),
+            append_new_element(
+                nvset_element,
                 "nvpair",
                 {
                     "id": create_subelement_id(
@@ -316,8 +318,8 @@ def _set_nvpair(
         return
 
     if value != "":
-        nvpair_el_list[0].set("value", value)
+        update_attribute_remove_empty(nvpair_el_list[0], "value", value)
     else:
-        nvset_element.remove(nvpair_el_list[0])
+        remove_one_element(nvpair_el_list[0])
     for nvpair_el in nvpair_el_list[1:]:
-        nvset_element.remove(nvpair_el)
+        remove_one_element(nvpair_el)
@@ -1,6 +1,13 @@
 import re
+from typing import (
+    cast,
+    Set,
+    Tuple,
+)
 from xml.etree.ElementTree import Element
 
+from lxml.etree import _Element
+
 from pcs.common import reports
 from pcs.common.reports import codes as report_codes
 from pcs.common.reports.item import ReportItem
@@ -11,7 +18,17 @@ from pcs.lib.pacemaker.values import (
     sanitize_id,
     validate_id,
 )
-from pcs.lib.xml_tools import get_root, get_sub_element
+from pcs.lib.xml_tools import (
+    ElementIndex,
+    attach_element_index,
+    get_element_index,
+    get_root,
+    get_sub_element,
+    is_descendant,
+)
+
+# elements with an id attribute which does not actually serve as an id
+_NOT_ID_TAGS = frozenset(("acl_target", "role", "obj_ref", "resource_ref"))
 
 VERSION_FORMAT = r"(?P<major>\d+)\.(?P<minor>\d+)(\.(?P<rev>\d+))?$"
 
@@ -19,6 +36,11 @@ VERSION_FORMAT = r"(?P<major>\d+)\.(?P<minor>\d+)(\.(?P<rev>\d+))?$"
 class IdProvider:
     """
     Book ids for future use in the CIB and generate new ids accordingly
+
+    Ids are looked up in the element index of the CIB, which is kept up to date
+    by pcs.lib.xml_tools helpers putting elements to the CIB. Elements put to
+    the CIB bypassing the helpers are known to the provider only if their ids
+    have been allocated or booked by a provider of the same CIB.
     """
 
     def __init__(self, cib_element):
@@ -26,15 +48,20 @@ class IdProvider:
         etree cib_element -- any element of the xml to being check against
         """
         self._cib = get_root(cib_element)
-        self._booked_ids = set()
+        self._root = cast(_Element, cib_element).getroottree().getroot()
+        self._booked_ids: Set[str] = set()
 
     def allocate_id(self, proposed_id: str) -> str:
         """
         Generate a new unique id based on the proposal and keep track of it
         string proposed_id -- requested id
         """
-        final_id = find_unique_id(self._cib, proposed_id, self._booked_ids)
-        self._booked_ids.add(final_id)
+        counter = 1
+        final_id = proposed_id
+        while self._is_id_used(final_id):
+            final_id = "{0}-{1}".format(proposed_id, counter)
+            counter += 1
+        self._book_id(final_id)
         return final_id
 
     def book_ids(self, *id_list):
@@ -47,15 +74,42 @@ class IdProvider:
         for _id in id_list:
             if _id in reported_ids:
                 continue
-            if _id in self._booked_ids or does_id_exist(self._cib, _id):
+            if self._is_id_used(_id):
                 report_list.append(
                     ReportItem.error(reports.messages.IdAlreadyExists(_id))
                 )
                 reported_ids.add(_id)
                 continue
-            self._booked_ids.add(_id)
+            self._book_id(_id)
         return report_list
 
+    def _get_index(self) -> ElementIndex:
+        # The index may have been replaced by an index of another tree since
+        # the last use. Ids booked in the replaced index are kept by providers.
+        index = get_element_index(self._root)
+        if index is None:
+            index = attach_element_index(self._root)
+        return index
+
+    def _book_id(self, book_id: str) -> None:
+        self._booked_ids.add(book_id)
+        self._get_index().booked_ids.add(book_id)
+
+    def _is_id_used(self, check_id: str) -> bool:
+        if check_id in self._booked_ids:
+            return True
+        index = self._get_index()
+        if check_id in index.booked_ids:
+            return True
+        # Elements may have been removed or changed since they were indexed
+        return any(
+            _holds_configuration_id(self._cib, element, check_id)
+            for element in index.get_elements_by_id(check_id)
+        ) or any(
+            _holds_configuration_id(self._cib, element, check_id)
+            for element in index.get_elements_by_name("remote-node")
+        )
+
 
 class ElementSearcher:
     """
@@ -174,6 +228,20 @@ class ElementSearcher:
 
     def _execute(self):
         self._executed = True
+        index = get_element_index(self._context_element)
+        if index is not None:
+            candidate_list = [
+                element
+                for element in index.get_elements_by_id(self._element_id)
+                if element.get("id") == self._element_id
+                and element.tag in self._tag_list
+                and is_descendant(element, self._context_element)
+            ]
+            # The index is not updated when elements are added bypassing
+            # pcs.lib.xml_tools, search the tree if the index is not conclusive
+            if len(candidate_list) == 1:
+                self._element = candidate_list[0]
+                return
         for tag in self._tag_list:
             element_list = self._context_element.xpath(
                 ".//*[local-name()=$tag_name and @id=$element_id]",
@@ -182,6 +250,8 @@ class ElementSearcher:
             )
             if element_list:
                 self._element = element_list[0]
+                if index is not None:
+                    index.add(self._element)
                 return
 
 
@@ -237,6 +307,49 @@ def get_configuration_elements_by_id(tree: Element, check_id: str):
     )
 
 
+def _holds_configuration_id(tree, element: Element, check_id: str) -> bool:
+    """
+    Check an indexed element still defines the id in the configuration
+
+    etree tree -- the root element or the tree the element has been indexed in
+    element -- indexed element
+    check_id -- id the element has been indexed by
+    """
+    if not (
+        (element.get("id") == check_id and element.tag not in _NOT_ID_TAGS)
+        or (
+            element.get("value") == check_id and _is_remote_node_nvpair(element)
+        )
+    ):
+        return False
+    ancestor_list = []
+    parent = element.getparent()
+    while parent is not None:
+        ancestor_list.append(parent)
+        parent = parent.getparent()
+    root = tree.getroot() if hasattr(tree, "getroot") else tree
+    if not ancestor_list or ancestor_list[-1] is not root:
+        return False
+    if root.tag != "cib":
+        return True
+    # sections directly under cib and the status section are not searched, see
+    # get_configuration_elements_by_id
+    return len(ancestor_list) > 1 and ancestor_list[-2].tag != "status"
+
+
+def _is_remote_node_nvpair(element: Element) -> bool:
+    meta_attributes = element.getparent()
+    return (
+        element.tag == "nvpair"
+        and element.get("name") == "remote-node"
+        and element.get("value") is not None
+        and meta_attributes is not None
+        and meta_attributes.tag == "meta_attributes"
+        and meta_attributes.getparent() is not None
+        and meta_attributes.getparent().tag == "primitive"
+    )
+
+
 # DEPRECATED, use IdProvider instead
 def does_id_exist(tree, check_id):
     """
@@ -468,3 +581,18 @@ def get_cib_crm_feature_set(cib, none_if_missing=False):
         re.compile(VERSION_FORMAT),
         none_if_missing=none_if_missing,
     )
+
+
+def get_cib_epoch(cib) -> Tuple[int, int]:
+    """
+    Return admin_epoch and epoch of a CIB, missing or invalid values are 0
+
+    etree cib -- cib etree
+    """
+    epoch = []
+    for name in ("admin_epoch", "epoch"):
+        try:
+            epoch.append(int(cib.get(name, "0")))
+        except ValueError:
+            epoch.append(0)
+    return epoch[0], epoch[1]
@@ -6,6 +6,7 @@ from typing import (
     Mapping,
     Optional,
 )
+from xml.etree.ElementTree import Element
 
 from pcs.common import reports
 from pcs.common.pacemaker.nvset import CibNvsetDto
@@ -92,11 +93,13 @@ def _defaults_create(
     required_cib_version = None
     if nvset_rule:
         required_cib_version = Version(3, 4, 0)
-    cib = env.get_cib(required_cib_version)
-    id_provider = IdProvider(cib)
 
+    loaded_cib = env.get_cib(
+        required_cib_version, track_changes=True, load_status=False
+    )
+    loaded_id_provider = IdProvider(loaded_cib)
     validator = nvpair_multi.ValidateNvsetAppendNew(
-        id_provider,
+        loaded_id_provider,
         nvpairs,
         nvset_options,
         nvset_rule=nvset_rule,
@@ -106,20 +109,33 @@ def _defaults_create(
         validator.validate(force_options=force)
     ).has_errors:
         raise LibraryError()
+    parsed_rule = validator.get_parsed_rule()
+
+    def create_nvset(cib: Element, id_provider: IdProvider) -> None:
+        nvpair_multi.nvset_append_new(
+            sections.get(cib, cib_section_name),
+            id_provider,
+            nvpair_multi.NVSET_META,
+            nvpairs,
+            nvset_options,
+            nvset_rule=parsed_rule,
+        )
 
-    nvpair_multi.nvset_append_new(
-        sections.get(cib, cib_section_name),
-        id_provider,
-        nvpair_multi.NVSET_META,
-        nvpairs,
-        nvset_options,
-        nvset_rule=validator.get_parsed_rule(),
-    )
-
+    def rebase_create_nvset(cib: Element) -> None:
+        # The options have been validated, only the id may have been taken in
+        # the meantime.
+        id_provider = IdProvider(cib)
+        if nvset_options.get("id"):
+            report_list = id_provider.book_ids(nvset_options["id"])
+            if report_list:
+                raise LibraryError(*report_list)
+        create_nvset(cib, id_provider)
+
+    create_nvset(loaded_cib, loaded_id_provider)
     env.report_processor.report(
         ReportItem.warning(reports.messages.DefaultsCanBeOverriden())
     )
-    env.push_cib()
+    env.push_cib(rebase=rebase_create_nvset)
 
 
 def resource_defaults_config(env: LibraryEnvironment) -> List[CibNvsetDto]:
@@ -142,7 +158,7 @@ def _defaults_config(
     return [
         nvpair_multi.nvset_element_to_dto(nvset_el)
         for nvset_el in nvpair_multi.find_nvsets(
-            sections.get(env.get_cib(), cib_section_name)
+            sections.get(env.get_cib(load_status=False), cib_section_name)
         )
     ]
 
@@ -176,13 +192,27 @@ def _defaults_remove(
 ) -> None:
     if not nvset_id_list:
         return
+
+    def remove_nvsets(cib: Element) -> None:
+        nvset_elements, report_list = nvpair_multi.find_nvsets_by_ids(
+            sections.get(cib, cib_section_name), nvset_id_list,
+        )
+        if report_list:
+            # the reports are errors, a rebase is not possible then
+            raise LibraryError(*report_list)
+        nvpair_multi.nvset_remove(nvset_elements)
+
     nvset_elements, report_list = nvpair_multi.find_nvsets_by_ids(
-        sections.get(env.get_cib(), cib_section_name), nvset_id_list
+        sections.get(
+            env.get_cib(track_changes=True, load_status=False),
+            cib_section_name,
+        ),
+        nvset_id_list,
     )
     if env.report_processor.report_list(report_list).has_errors:
         raise LibraryError()
     nvpair_multi.nvset_remove(nvset_elements)
-    env.push_cib()
+    env.push_cib(rebase=remove_nvsets)
 
 
 def resource_defaults_update(
@@ -236,7 +266,7 @@ def _defaults_update(
     nvpairs: Mapping[str, str],
     pcs_command: reports.types.PcsCommand,
 ) -> None:
-    cib = env.get_cib()
+    cib = env.get_cib(track_changes=True, load_status=False)
     id_provider = IdProvider(cib)
 
     if nvset_id is None:
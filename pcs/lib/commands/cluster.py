@@ -1,7 +1,6 @@
 # pylint: disable=too-many-lines
 import math
 import os.path
-import time
 
 from typing import (
     Any,
@@ -35,7 +34,10 @@ from pcs.lib.cib.tools import (
     get_fencing_topology,
     get_resources,
 )
-from pcs.lib.communication import cluster
+from pcs.lib.communication import (
+    cluster,
+    relay,
+)
 from pcs.lib.communication.corosync import (
     CheckCorosyncOffline,
     DistributeCorosyncConf,
@@ -74,6 +76,7 @@ from pcs.lib.env import LibraryEnvironment
 from pcs.lib.node import get_existing_nodes_names
 from pcs.lib.errors import LibraryError
 from pcs.lib.external import is_service_running
+from pcs.lib.pacemaker import schema
 from pcs.lib.pacemaker.live import (
     get_cib,
     get_cib_xml,
@@ -150,8 +153,8 @@ def verify(env: LibraryEnvironment, verbose=False):
         # fencing topology is invalid). On the other hand cib with id
         # duplication is not loadable.
         # We try extra checks when cib is possible to load.
-        cib_xml, dummy_stderr, returncode = get_cib_xml_cmd_results(runner)
-        if returncode != 0:
+        cib_xml = _get_loadable_cib_xml(env)
+        if cib_xml is None:
             raise LibraryError()
     else:
         cib_xml = get_cib_xml(runner)
@@ -168,6 +171,22 @@ def verify(env: LibraryEnvironment, verbose=False):
         raise LibraryError()
 
 
+def _get_loadable_cib_xml(env: LibraryEnvironment) -> Optional[str]:
+    if not env.is_cib_live:
+        # Loading a CIB file by cibadmin validates it by its schema. Validate it
+        # in-process instead if the schema is available.
+        cib_xml = env.final_mocked_cib_content
+        try:
+            if schema.validate_cib(get_cib(cib_xml)):
+                return cib_xml
+        except LibraryError:
+            return None
+    cib_xml, dummy_stderr, returncode = get_cib_xml_cmd_results(
+        env.cmd_runner()
+    )
+    return cib_xml if returncode == 0 else None
+
+
 def setup(
     env,
     cluster_name,
@@ -1224,7 +1243,7 @@ def _start_cluster(
     if wait_timeout is not False:
         if report_processor.report_list(
             _wait_for_pacemaker_to_start(
-                communicator_factory.get_communicator(),
+                communicator_factory,
                 report_processor,
                 target_list,
                 # wait_timeout is either None or a timeout
@@ -1235,14 +1254,13 @@ def _start_cluster(
 
 
 def _wait_for_pacemaker_to_start(
-    node_communicator,
+    communicator_factory,
     report_processor: ReportProcessor,
     target_list,
     timeout=None,
 ):
     timeout = 60 * 15 if timeout is None else timeout
-    interval = 2
-    stop_at = time.time() + timeout
+    wait_timeout = min(settings.node_start_wait_request_max, math.ceil(timeout))
     report_processor.report(
         ReportItem.info(
             reports.messages.WaitForNodeStartupStarted(
@@ -1250,21 +1268,27 @@ def _wait_for_pacemaker_to_start(
             )
         )
     )
-    error_report_list = []
-    has_errors = False
-    while target_list:
-        if time.time() > stop_at:
-            error_report_list.append(
-                ReportItem.error(reports.messages.WaitForNodeStartupTimedOut())
-            )
-            break
-        time.sleep(interval)
-        com_cmd = CheckPacemakerStarted(report_processor)
-        com_cmd.set_targets(target_list)
-        target_list = run_com(node_communicator, com_cmd)
-        has_errors = has_errors or com_cmd.has_errors
+    # Nodes respond once pacemaker has started on them or once their wait
+    # timed out, then they are polled again until the timeout.
+    com_cmd = CheckPacemakerStarted(
+        report_processor, timeout=timeout, wait_timeout=wait_timeout,
+    )
+    com_cmd.set_targets(target_list)
+    not_started_target_list = run_com(
+        # nodes hold the requests for up to wait_timeout seconds, the requests
+        # must not time out meanwhile
+        communicator_factory.get_communicator(
+            request_timeout=wait_timeout + settings.default_request_timeout
+        ),
+        com_cmd,
+    )
 
-    if error_report_list or has_errors:
+    error_report_list = []
+    if not_started_target_list:
+        error_report_list.append(
+            ReportItem.error(reports.messages.WaitForNodeStartupTimedOut())
+        )
+    if error_report_list or com_cmd.has_errors:
         error_report_list.append(
             ReportItem.error(reports.messages.WaitForNodeStartupError())
         )
@@ -1732,6 +1756,31 @@ def remove_nodes_from_cib(env: LibraryEnvironment, node_list):
             )
 
 
+def relay_requests(
+    env: LibraryEnvironment, action, structured_data, target_dict_list, fanout,
+):
+    """
+    Send a request to nodes on behalf of another node, return the responses
+
+    This node is the first of the targets, the other targets are split to
+    subtrees relayed further by other nodes. This is an internal command used
+    by RelayCommunicator.
+
+    env LibraryEnvironment
+    string action -- action of the request to send
+    list structured_data -- data of the request, see RequestData
+    list target_dict_list -- targets of the request as dicts
+    int fanout -- maximal number of subtrees the targets are split to
+    """
+    return relay.relay_requests(
+        env.get_node_communicator(),
+        action,
+        structured_data,
+        target_dict_list,
+        fanout,
+    )
+
+
 def add_link(
     env: LibraryEnvironment, node_addr_map, link_options=None, force_flags=None,
 ):
@@ -53,6 +53,7 @@ from pcs.lib.pacemaker.state import (
     info_resource_state,
     is_resource_managed,
     ResourceNotFound,
+    ResourcesStateIndex,
 )
 from pcs.lib.pacemaker.values import (
     timeout_to_seconds,
@@ -85,12 +86,13 @@ def _push_cib_wait(
     wait: Optional[Union[bool, int]] = False,
     wait_for_resource_ids: Optional[Iterable[str]] = None,
     resource_state_reporter: Callable[
-        [Element, str], ReportItem
+        [ResourcesStateIndex, str], ReportItem
     ] = info_resource_state,
 ) -> None:
     env.push_cib(wait=wait)
     if wait is not False and wait_for_resource_ids:
-        state = env.get_cluster_state()
+        # the status has just been provided by the local crm_mon
+        state = ResourcesStateIndex(env.get_cluster_state(validate=False))
         if env.report_processor.report_list(
             [
                 resource_state_reporter(state, res_id)
@@ -906,7 +908,7 @@ def _disable_validate_and_edit_cib(
             resource_el_list,
             resource.common.disable,
             IdProvider(cib),
-            env.get_cluster_state(),
+            ResourcesStateIndex(env.get_cluster_state()),
         )
     ).has_errors:
         raise LibraryError()
@@ -1116,7 +1118,7 @@ def enable(
             to_enable_set,
             resource.common.enable,
             IdProvider(cib),
-            env.get_cluster_state(),
+            ResourcesStateIndex(env.get_cluster_state()),
         )
     ).has_errors:
         raise LibraryError()
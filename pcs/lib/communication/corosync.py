@@ -80,6 +80,8 @@ class CheckCorosyncOffline(
 class DistributeCorosyncConf(
     SkipOfflineMixin, AllSameDataMixin, AllAtOnceStrategyMixin, RunRemotelyBase
 ):
+    _relay_allowed = True
+
     def __init__(
         self,
         report_processor,
@@ -1,4 +1,5 @@
 import json
+from dataclasses import dataclass
 
 from pcs.common import reports
 from pcs.common.reports import (
@@ -11,6 +12,7 @@ from pcs.lib import node_communication_format
 from pcs.lib.communication.tools import (
     AllAtOnceStrategyMixin,
     AllSameDataMixin,
+    RetryPolicy,
     RunRemotelyBase,
     SkipOfflineMixin,
     SimpleResponseProcessingMixin,
@@ -115,6 +117,8 @@ class CheckAuth(AllSameDataMixin, AllAtOnceStrategyMixin, RunRemotelyBase):
 class GetHostInfo(AllSameDataMixin, AllAtOnceStrategyMixin, RunRemotelyBase):
     _responses = None
     _report_pcsd_too_old_on_404 = True
+    # the request does not change anything, it is safe to send it again
+    _retry_policy = RetryPolicy()
 
     def _get_request_data(self):
         return RequestData("remote/check_host")
@@ -288,6 +292,8 @@ class FileActionBase(RunActionBase):
 
 class DistributeFiles(FileActionBase):
     # pylint: disable=too-many-ancestors
+    _relay_allowed = True
+
     def _init_properties(self):
         super(DistributeFiles, self)._init_properties()
         self._request_url = "remote/put_file"
@@ -417,32 +423,91 @@ class EnableCluster(
         )
 
 
+def _is_pacemaker_starting(response):
+    # If the node is offline, we only get the "offline" key. Asking for any
+    # other in that case results in KeyError which is not what we want.
+    parsed_response = json.loads(response.data)
+    return parsed_response.get("pending", True) or not parsed_response.get(
+        "online", False
+    )
+
+
+@dataclass(frozen=True)
+class _PacemakerStartedPollPolicy(RetryPolicy):
+    """
+    Poll nodes until pacemaker has started on them or until they can be
+    connected to
+    """
+
+    def is_retryable(self, response):
+        if not response.was_connected:
+            return True
+        if response.response_code != 200:
+            return super().is_retryable(response)
+        try:
+            return _is_pacemaker_starting(response)
+        except (json.JSONDecodeError, AttributeError):
+            return False
+
+    def get_retry_delay(self, response, attempt):
+        # Nodes hold the requests until pacemaker starts, so the time a request
+        # took is a part of the delay. Nodes which held a request are polled
+        # again right away, nodes running an older pcsd after the delay.
+        delay = self.get_delay(attempt)
+        if response.timing is not None:
+            delay -= response.timing.total
+        return max(0.0, delay)
+
+
 class CheckPacemakerStarted(
     AllSameDataMixin, AllAtOnceStrategyMixin, RunRemotelyBase
 ):
     _not_yet_started_target_list = None
 
+    def __init__(self, report_processor, timeout=None, wait_timeout=None):
+        """
+        int timeout -- poll nodes until pacemaker has started on them for this
+            many seconds, check the nodes once if None
+        int wait_timeout -- let nodes respond once pacemaker has started or
+            after this many seconds, so that they do not need to be polled;
+            the request timeout of the communicator must be longer than that
+        """
+        super().__init__(report_processor)
+        if timeout is not None:
+            # Nodes running an older pcsd respond right away and are polled
+            # less often the longer they take to start. The intervals are
+            # randomized, so that pcs instances started at the same time do
+            # not poll the nodes at the same time.
+            self._retry_policy = _PacemakerStartedPollPolicy(
+                attempts=None,
+                backoff_base=2,
+                backoff_cap=10,
+                jitter=0.5,
+                timeout=timeout,
+            )
+        self._wait_timeout = wait_timeout
+
     def _get_request_data(self):
-        return RequestData("remote/pacemaker_node_status")
+        if not self._wait_timeout:
+            return RequestData("remote/pacemaker_node_status")
+        # Nodes running an older pcsd ignore the wait parameter and respond
+        # right away.
+        return RequestData(
+            "remote/pacemaker_node_status", [("wait", str(self._wait_timeout))],
+        )
 
     def _process_response(self, response):
         report = response_to_report_item(response)
         target = response.request.target
         if report is None:
             try:
-                parsed_response = json.loads(response.data)
-                # If the node is offline, we only get the "offline" key. Asking
-                # for any other in that case results in KeyError which is not
-                # what we want.
-                if parsed_response.get(
-                    "pending", True
-                ) or not parsed_response.get("online", False):
+                if _is_pacemaker_starting(response):
                     self._not_yet_started_target_list.append(target)
                     return
                 report = ReportItem.info(
                     reports.messages.ClusterStartSuccess(target.label)
                 )
-            except (json.JSONDecodeError, KeyError):
+            except (json.JSONDecodeError, AttributeError):
                 report = ReportItem.error(
                     reports.messages.InvalidResponseFormat(target.label)
                 )
@@ -455,10 +520,22 @@ class CheckPacemakerStarted(
                 )
         self._report(report)
 
+    def on_retry(self, response, attempt, delay):
+        if not response.was_connected:
+            self._report(
+                response_to_report_item(
+                    response, severity=ReportItemSeverity.WARNING
+                )
+            )
+        super().on_retry(response, attempt, delay)
+
     def before(self):
         self._not_yet_started_target_list = []
 
     def on_complete(self):
+        """
+        Return targets pacemaker has not started on
+        """
         return self._not_yet_started_target_list
 
 
@@ -468,6 +545,8 @@ class UpdateKnownHosts(
     AllAtOnceStrategyMixin,
     RunRemotelyBase,
 ):
+    _relay_allowed = True
+
     def __init__(
         self, report_processor, known_hosts_to_add, known_hosts_to_remove
     ):
@@ -534,6 +613,8 @@ class SendPcsdSslCertAndKey(
     AllAtOnceStrategyMixin,
     RunRemotelyBase,
 ):
+    _relay_allowed = True
+
     def __init__(self, report_processor, ssl_cert, ssl_key):
         super().__init__(report_processor)
         self._ssl_cert = ssl_cert
@@ -0,0 +1,250 @@
+import json
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from pcs.common.host import Destination
+from pcs.common.node_communicator import (
+    Request,
+    RequestData,
+    RequestTarget,
+    Response,
+)
+
+RELAY_ACTION = "remote/relay_requests"
+
+
+class RelayCommunicator:
+    """
+    Class with the same interface as Communicator, which sends requests
+    carrying the same data to many targets through a tree of relaying nodes
+
+    Requests added at once with the same data to more than fanout targets are
+    split to fanout subtrees. Each subtree is sent to its first target, which
+    sends the request to the other targets of the subtree the same way and
+    responds with responses of all the targets of the subtree. So the data are
+    uploaded by each node at most fanout + 1 times, no matter how many targets
+    there are. Responses of relayed requests are returned the same way as
+    responses of requests sent directly.
+
+    Requests of a subtree are sent directly if its relaying node fails, e.g.
+    it is offline or it runs an older pcsd not supporting relaying.
+    """
+
+    def __init__(self, communicator, fanout: int):
+        """
+        Communicator communicator -- sends requests to the relaying nodes and
+            requests not being relayed
+        fanout -- maximal number of subtrees the requests are split to
+        """
+        self._communicator = communicator
+        self._fanout = max(1, fanout)
+        # requests sent by relay requests, by keys of the relay requests
+        self._relayed_request_dict: Dict[Tuple, List[Request]] = {}
+
+    def add_requests(self, request_list, delay=None):
+        """
+        Add requests to be processed, see Communicator.add_requests
+
+        Requests to be delayed are never relayed.
+        """
+        if delay:
+            self._communicator.add_requests(request_list, delay=delay)
+            return
+        direct_request_list = []
+        for same_data_request_list in _group_by_data(request_list):
+            if len(same_data_request_list) <= self._fanout:
+                direct_request_list.extend(same_data_request_list)
+                continue
+            for subtree in _split(same_data_request_list, self._fanout):
+                if len(subtree) == 1:
+                    direct_request_list.extend(subtree)
+                    continue
+                relay_request = _create_relay_request(subtree, self._fanout)
+                self._relayed_request_dict[
+                    _get_request_key(relay_request)
+                ] = subtree
+                direct_request_list.append(relay_request)
+        self._communicator.add_requests(direct_request_list)
+
+    def start_loop(self):
+        for response in self._communicator.start_loop():
+            subtree = self._relayed_request_dict.pop(
+                _get_request_key(response.request), None
+            )
+            if subtree is None:
+                yield response
+                continue
+            relayed_response_dict = _get_relayed_responses(response, subtree)
+            # Send requests which have not been relayed directly.
+            not_relayed_list = [
+                request
+                for request in subtree
+                if request.host_label not in relayed_response_dict
+            ]
+            if not_relayed_list:
+                self._communicator.add_requests(not_relayed_list)
+            yield from relayed_response_dict.values()
+
+
+def relay_requests(
+    communicator,
+    action: str,
+    structured_data: Sequence[Sequence[Any]],
+    target_dict_list: Sequence[Dict[str, Any]],
+    fanout: int,
+) -> List[Dict[str, Any]]:
+    """
+    Send a request relayed by another node and return its responses
+
+    The first target is the relaying node itself, the request is sent to it
+    directly. The other targets are split to subtrees relayed further.
+
+    Communicator communicator -- sends the requests
+    action -- action of the relayed request
+    structured_data -- data of the relayed request, see RequestData
+    target_dict_list -- targets of the request exported by _target_to_dict
+    fanout -- maximal number of subtrees the targets are split to
+    """
+    request_data = RequestData(
+        action, [tuple(item) for item in structured_data]
+    )
+    request_list = [
+        Request(_target_from_dict(target_dict), request_data)
+        for target_dict in target_dict_list
+    ]
+    relay_communicator = RelayCommunicator(communicator, fanout)
+    relay_communicator.add_requests(request_list[:1])
+    relay_communicator.add_requests(request_list[1:])
+    return [
+        _response_to_dict(response)
+        for response in relay_communicator.start_loop()
+    ]
+
+
+def _get_request_key(request: Request) -> Tuple[str, str, str]:
+    return (request.host_label, request.action, request.data)
+
+
+def _group_by_data(request_list: Sequence[Request]) -> List[List[Request]]:
+    group_dict: Dict[Tuple[str, str], List[Request]] = {}
+    for request in request_list:
+        group_dict.setdefault((request.action, request.data), []).append(
+            request
+        )
+    return list(group_dict.values())
+
+
+def _split(
+    request_list: Sequence[Request], part_count: int
+) -> List[List[Request]]:
+    # parts differ in size by one request at most
+    part_size, bigger_part_count = divmod(len(request_list), part_count)
+    part_list = []
+    start = 0
+    for index in range(min(part_count, len(request_list))):
+        end = start + part_size + (1 if index < bigger_part_count else 0)
+        part_list.append(list(request_list[start:end]))
+        start = end
+    return part_list
+
+
+def _create_relay_request(subtree: Sequence[Request], fanout: int) -> Request:
+    request_data = subtree[0].request_data
+    return Request(
+        subtree[0].target,
+        RequestData(
+            RELAY_ACTION,
+            [
+                (
+                    "data_json",
+                    json.dumps(
+                        dict(
+                            action=request_data.action,
+                            structured_data=list(request_data.structured_data),
+                            target_dict_list=[
+                                _target_to_dict(request.target)
+                                for request in subtree
+                            ],
+                            fanout=fanout,
+                        )
+                    ),
+                )
+            ],
+        ),
+    )
+
+
+def _get_relayed_responses(
+    relay_response: Response, subtree: Sequence[Request]
+) -> Dict[str, Response]:
+    if not relay_response.was_connected or (
+        relay_response.response_code != 200
+    ):
+        return {}
+    try:
+        output = json.loads(relay_response.data)
+        if output["status"] != "success":
+            return {}
+        request_dict = {request.host_label: request for request in subtree}
+        response_dict = {}
+        for response_dict_item in output["data"]:
+            response = _response_from_dict(response_dict_item, request_dict)
+            if response is not None:
+                response_dict[response.request.host_label] = response
+        return response_dict
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return {}
+
+
+def _target_to_dict(target: RequestTarget) -> Dict[str, Any]:
+    return dict(
+        label=target.label,
+        token=target.token,
+        dest_list=[
+            dict(addr=dest.addr, port=dest.port) for dest in target.dest_list
+        ],
+    )
+
+
+def _target_from_dict(target_dict: Dict[str, Any]) -> RequestTarget:
+    return RequestTarget(
+        target_dict["label"],
+        token=target_dict["token"],
+        dest_list=[
+            Destination(dest["addr"], dest["port"])
+            for dest in target_dict["dest_list"]
+        ],
+    )
+
+
+def _response_to_dict(response: Response) -> Dict[str, Any]:
+    return dict(
+        label=response.request.host_label,
+        was_connected=response.was_connected,
+        errno=response.errno,
+        error_msg=response.error_msg,
+        response_code=response.response_code,
+        data=response.data,
+    )
+
+
+def _response_from_dict(
+    response_dict: Dict[str, Any], request_dict: Dict[str, Request]
+) -> Optional[Response]:
+    request = request_dict.get(response_dict["label"])
+    if request is None:
+        return None
+    return Response.relayed(
+        request,
+        bool(response_dict["was_connected"]),
+        errno=response_dict["errno"],
+        error_msg=response_dict["error_msg"],
+        response_code=response_dict["response_code"],
+        data=response_dict["data"],
+    )
@@ -1,11 +1,98 @@
-from pcs.common import reports
+import random
+import time
+from dataclasses import dataclass
+from typing import (
+    FrozenSet,
+    Optional,
+)
+
+from pcs.common import (
+    pcs_pycurl as pycurl,
+    reports,
+)
 from pcs.common.reports.item import ReportItem
-from pcs.common.node_communicator import Request
+from pcs.common.node_communicator import (
+    Request,
+    Response,
+)
 from pcs.common.reports import ReportItemSeverity
+from pcs.lib.communication.relay import RelayCommunicator
 from pcs.lib.node_communication import response_to_report_item
 from pcs.lib.errors import LibraryError
 
 
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Describes which failed requests of a communication command are sent again
+    and when
+
+    Requests are retried with an exponential backoff. The delays are
+    randomized, so that requests which failed at the same time, e.g. when the
+    whole cluster is being restarted, are not retried at the same time again.
+
+    attempts -- maximal number of attempts to send a request, including the
+        first one, None for no limit
+    backoff_base -- delay before the first retry in seconds, each next retry
+        doubles the delay
+    backoff_cap -- maximal delay between retries in seconds
+    jitter -- part of the delay to randomize, 0 for no randomization, 1 for
+        a delay chosen randomly from the whole 0 to delay interval
+    retryable_errnos -- curl errors of requests which failed to connect to
+        be retried
+    retryable_http_codes -- HTTP codes of responses to be retried
+    timeout -- requests are not retried later than this many seconds after
+        the command started, None for no limit
+    """
+
+    attempts: Optional[int] = 3
+    backoff_base: float = 1.0
+    backoff_cap: float = 30.0
+    jitter: float = 1.0
+    retryable_errnos: FrozenSet[int] = frozenset(
+        (
+            pycurl.E_COULDNT_CONNECT,
+            pycurl.E_OPERATION_TIMEDOUT,
+            pycurl.E_GOT_NOTHING,
+            pycurl.E_SEND_ERROR,
+            pycurl.E_RECV_ERROR,
+        )
+    )
+    retryable_http_codes: FrozenSet[int] = frozenset((502, 503, 504))
+    timeout: Optional[float] = None
+
+    def is_retryable(self, response: Response) -> bool:
+        """
+        Check whether a request should be sent again based on its response
+
+        response -- the response of the request
+        """
+        if response.was_connected:
+            return response.response_code in self.retryable_http_codes
+        return response.errno in self.retryable_errnos
+
+    def get_delay(self, attempt: int) -> float:
+        """
+        Return number of seconds to wait before an attempt to send a request
+
+        attempt -- number of the attempt, 2 for the first retry
+        """
+        delay = min(
+            self.backoff_cap, self.backoff_base * 2 ** max(0, attempt - 2)
+        )
+        return delay * (1 - self.jitter * random.random())
+
+    def get_retry_delay(self, response: Response, attempt: int) -> float:
+        """
+        Return number of seconds to wait before sending a failed request again
+
+        response -- the response of the failed request
+        attempt -- number of the attempt, 2 for the first retry
+        """
+        del response
+        return self.get_delay(attempt)
+
+
 class CommunicationCommandInterface:
     """
     Interface for all communication commands.
@@ -38,6 +125,31 @@ class CommunicationCommandInterface:
         """
         raise NotImplementedError()
 
+    def on_retry(self, response, attempt, delay):
+        """
+        Runs when a failed request is going to be sent again instead of
+        processing its response.
+
+        Response response -- the response of the failed request
+        int attempt -- number of the next attempt to send the request
+        float delay -- number of seconds the request will be sent in
+        """
+        raise NotImplementedError()
+
+    @property
+    def retry_policy(self):
+        """
+        RetryPolicy of the requests, None if failed requests are not retried
+        """
+        raise NotImplementedError()
+
+    @property
+    def relay_allowed(self):
+        """
+        Can the requests be relayed by other nodes, see RelayCommunicator
+        """
+        raise NotImplementedError()
+
     @property
     def has_errors(self):
         """
@@ -51,18 +163,90 @@ def run(communicator, cmd):
     Run communication command. Returns return value of method on_complete() of
     communcation command after run.
 
+    Failed requests are sent again according to the retry policy of the
+    command. Each request is delayed on its own, other requests are processed
+    meanwhile.
+
+    If the command allows it and the communicator has a relay fanout set,
+    requests are relayed by other nodes.
+
     NodeCommunicator communicator -- object used for communication
     CommunicationCommandInterface cmd
     """
+    relay_fanout = getattr(communicator, "relay_fanout", None)
+    if relay_fanout and cmd.relay_allowed:
+        communicator = RelayCommunicator(communicator, relay_fanout)
+    response_handler = _ResponseHandler(communicator, cmd)
     cmd.before()
     communicator.add_requests(cmd.get_initial_request_list())
     for response in communicator.start_loop():
-        extra_requests = cmd.on_response(response)
-        if extra_requests:
-            communicator.add_requests(extra_requests)
+        response_handler.handle(response)
+    return cmd.on_complete()
+
+
+async def run_async(communicator, cmd):
+    """
+    Run communication command by an asynchronous communicator. Returns return
+    value of method on_complete() of communcation command after run.
+
+    AsyncCommunicator communicator -- object used for communication
+    CommunicationCommandInterface cmd
+    """
+    response_handler = _ResponseHandler(communicator, cmd)
+    cmd.before()
+    communicator.add_requests(cmd.get_initial_request_list())
+    async for response in communicator.start_loop():
+        response_handler.handle(response)
     return cmd.on_complete()
 
 
+class _ResponseHandler:
+    """
+    Pass responses to a communication command, retry failed requests according
+    to the retry policy of the command
+    """
+
+    def __init__(self, communicator, cmd):
+        self._communicator = communicator
+        self._cmd = cmd
+        self._retry_policy = cmd.retry_policy
+        # number of attempts made so far, for retried requests only
+        self._attempt_dict = {}
+        self._started_at = time.time()
+
+    def handle(self, response):
+        if self._retry_policy is not None and self._retry(response):
+            return
+        extra_requests = self._cmd.on_response(response)
+        if extra_requests:
+            self._communicator.add_requests(extra_requests)
+
+    def _retry(self, response):
+        request_key = _get_request_key(response.request)
+        attempt = self._attempt_dict.pop(request_key, 1)
+        policy = self._retry_policy
+        if (policy.attempts is not None and attempt >= policy.attempts) or (
+            not policy.is_retryable(response)
+        ):
+            return False
+        delay = policy.get_retry_delay(response, attempt + 1)
+        if (
+            policy.timeout is not None
+            and time.time() + delay > self._started_at + policy.timeout
+        ):
+            return False
+        self._attempt_dict[request_key] = attempt + 1
+        self._cmd.on_retry(response, attempt + 1, delay)
+        self._communicator.add_requests([response.request.copy()], delay=delay)
+        return True
+
+
+def _get_request_key(request):
+    # Requests are identified by their content rather than by their instances,
+    # so that the same request sent several times is counted as one.
+    return (request.host_label, request.action, request.data)
+
+
 def run_and_raise(communicator, cmd):
     """
     Run communication command. Returns return value of method on_complete() of
@@ -87,6 +271,10 @@ class RunRemotelyBase(CommunicationCommandInterface):
 
     # pylint: disable=abstract-method
     _report_pcsd_too_old_on_404 = False
+    # failed requests are not retried by default
+    _retry_policy: Optional[RetryPolicy] = None
+    # requests carrying large data to many nodes may be relayed
+    _relay_allowed = False
 
     def __init__(self, report_processor):
         self.__report_processor = report_processor
@@ -147,6 +335,26 @@ class RunRemotelyBase(CommunicationCommandInterface):
     def before(self):
         pass
 
+    def on_retry(self, response, attempt, delay):
+        self._report(
+            ReportItem.debug(
+                reports.messages.NodeCommunicationRequestRetryScheduled(
+                    response.request.target.label,
+                    response.request.action,
+                    attempt,
+                    delay,
+                )
+            )
+        )
+
+    @property
+    def retry_policy(self):
+        return self._retry_policy
+
+    @property
+    def relay_allowed(self):
+        return self._relay_allowed
+
     @property
     def has_errors(self):
         return self.__has_errors
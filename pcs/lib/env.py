@@ -1,6 +1,12 @@
-from typing import Optional
+import random
+import time
+from typing import (
+    Callable,
+    Optional,
+)
 from xml.etree.ElementTree import Element
 
+from pcs import settings
 from pcs.common import file_type_codes
 from pcs.common import reports
 from pcs.common.node_communicator import Communicator, NodeCommunicatorFactory
@@ -8,7 +14,11 @@ from pcs.common.reports import ReportProcessor
 from pcs.common.reports.item import ReportItem
 from pcs.common.tools import Version
 from pcs.lib.booth.env import BoothEnv
-from pcs.lib.cib.tools import get_cib_crm_feature_set
+from pcs.lib.cib.tools import (
+    get_cib_crm_feature_set,
+    get_cib_epoch,
+    get_pacemaker_version_by_which_cib_was_validated,
+)
 from pcs.lib.dr.env import DrEnv
 from pcs.lib.node import get_existing_nodes_names
 from pcs.lib.communication import qdevice
@@ -32,11 +42,13 @@ from pcs.lib.node_communication import (
     LibCommunicatorLogger,
     NodeTargetLibFactory,
 )
+from pcs.lib.pacemaker import diff
 from pcs.lib.pacemaker.live import (
     diff_cibs_xml,
     ensure_cib_version,
     ensure_wait_for_idle_support,
     get_cib,
+    get_cib_without_status,
     get_cib_xml,
     get_cluster_status_xml,
     push_cib_diff_xml,
@@ -46,7 +58,13 @@ from pcs.lib.pacemaker.live import (
 from pcs.lib.pacemaker.state import get_cluster_state_dom
 from pcs.lib.pacemaker.values import get_valid_timeout_seconds
 from pcs.lib.tools import write_tmpfile
-from pcs.lib.xml_tools import etree_to_str
+from pcs.lib.xml_tools import (
+    attach_element_index,
+    detach_element_index,
+    etree_to_str,
+    start_change_journal,
+    stop_change_journal,
+)
 
 MIN_FEATURE_SET_VERSION_FOR_DIFF = Version(3, 0, 9)
 
@@ -65,6 +83,9 @@ class LibraryEnvironment:
         booth_files_data=None,
         known_hosts_getter=None,
         request_timeout=None,
+        request_concurrency=None,
+        communication_metrics=None,
+        request_relay_fanout=None,
     ):
         # pylint: disable=too-many-arguments
         self._logger = logger
@@ -75,6 +96,7 @@ class LibraryEnvironment:
         self._corosync_conf_data = corosync_conf_data
         self._booth_files_data = booth_files_data or {}
         self._request_timeout = request_timeout
+        self._request_concurrency = request_concurrency
         # TODO tokens probably should not be inserted from outside, but we're
         # postponing dealing with them, because it's not that easy to move
         # related code currently - it's in pcsd
@@ -85,11 +107,20 @@ class LibraryEnvironment:
         self.__loaded_cib_diff_source = None
         self.__loaded_cib_diff_source_feature_set = None
         self.__loaded_cib_to_modify = None
+        self.__loaded_cib_epoch = None
+        self.__loaded_cib_load_options = None
+        self.__loaded_cib_change_journal = None
+        self.__loaded_cib_element_index = None
+        self.__cib_transaction = False
+        self.__cib_transaction_push_pending = False
         self._communicator_factory = NodeCommunicatorFactory(
             LibCommunicatorLogger(self.logger, self.report_processor),
             self.user_login,
             self.user_groups,
             self._request_timeout,
+            request_concurrency=self._request_concurrency,
+            metrics=communication_metrics,
+            relay_fanout=request_relay_fanout,
         )
         self.__loaded_booth_env = None
         self.__loaded_dr_env = None
@@ -121,11 +152,54 @@ class LibraryEnvironment:
             codes.add(file_type_codes.COROSYNC_CONF)
         return sorted(codes)
 
-    def get_cib(self, minimal_version: Optional[Version] = None) -> Element:
+    def get_cib(
+        self,
+        minimal_version: Optional[Version] = None,
+        track_changes: bool = False,
+        load_status: bool = True,
+    ) -> Element:
+        """
+        Load the CIB to be modified and pushed later
+
+        minimal_version -- upgrade the CIB if it is older
+        track_changes -- record changes done by pcs.lib.xml_tools helpers to
+            push them without diffing the whole CIB; set it only in commands
+            changing the CIB by the helpers, the CIB is diffed anyway if
+            elements or attributes have been added or removed bypassing them
+        load_status -- if False, the status section is not loaded unless the
+            CIB gets upgraded; set it to False in commands which do not need
+            the status
+        """
+        if self.__cib_transaction and self.__loaded_cib_diff_source is not None:
+            if minimal_version is None or (
+                get_pacemaker_version_by_which_cib_was_validated(
+                    self.__loaded_cib_to_modify
+                )
+                >= minimal_version
+            ):
+                if not track_changes and self.__loaded_cib_change_journal:
+                    # the command may change the CIB bypassing the journal
+                    stop_change_journal(self.__loaded_cib_change_journal)
+                    self.__loaded_cib_change_journal = None
+                return self.__loaded_cib_to_modify
+            # The CIB is upgraded in the cluster and loaded again, changes done
+            # in the transaction so far must not get lost
+            self.__end_cib_transaction_changes()
         if self.__loaded_cib_diff_source is not None:
             raise AssertionError("CIB has already been loaded")
-        self.__loaded_cib_diff_source = get_cib_xml(self.cmd_runner())
-        self.__loaded_cib_to_modify = get_cib(self.__loaded_cib_diff_source)
+        if self.__cib_transaction:
+            # commands run later in the transaction may need the status
+            load_status = True
+        if load_status:
+            self.__loaded_cib_diff_source = get_cib_xml(self.cmd_runner())
+            self.__loaded_cib_to_modify = get_cib(self.__loaded_cib_diff_source)
+        else:
+            self.__loaded_cib_to_modify = get_cib_without_status(
+                self.cmd_runner()
+            )
+            self.__loaded_cib_diff_source = etree_to_str(
+                self.__loaded_cib_to_modify
+            )
         if minimal_version is not None:
             upgraded_cib = ensure_cib_version(
                 self.cmd_runner(), self.__loaded_cib_to_modify, minimal_version
@@ -138,9 +212,22 @@ class LibraryEnvironment:
                         ReportItem.info(reports.messages.CibUpgradeSuccessful())
                     )
                 self._cib_upgrade_reported = True
+        self.__loaded_cib_epoch = get_cib_epoch(self.__loaded_cib_to_modify)
+        self.__loaded_cib_load_options = dict(
+            minimal_version=minimal_version,
+            track_changes=track_changes,
+            load_status=load_status,
+        )
         self.__loaded_cib_diff_source_feature_set = get_cib_crm_feature_set(
             self.__loaded_cib_to_modify, none_if_missing=True
         ) or Version(0, 0, 0)
+        if track_changes:
+            self.__loaded_cib_change_journal = start_change_journal(
+                self.__loaded_cib_to_modify
+            )
+        self.__loaded_cib_element_index = attach_element_index(
+            self.__loaded_cib_to_modify
+        )
         return self.__loaded_cib_to_modify
 
     @property
@@ -149,8 +236,16 @@ class LibraryEnvironment:
             raise AssertionError("CIB has not been loaded")
         return self.__loaded_cib_to_modify
 
-    def get_cluster_state(self):
-        return get_cluster_state_dom(get_cluster_status_xml(self.cmd_runner()))
+    def get_cluster_state(self, validate=True):
+        """
+        Return the cluster status as provided by the local crm_mon
+
+        bool validate -- if False, skip validating the status by the crm_mon
+            schema
+        """
+        return get_cluster_state_dom(
+            get_cluster_status_xml(self.cmd_runner()), validate=validate
+        )
 
     def get_wait_timeout(self, wait):
         if wait is False:
@@ -175,7 +270,12 @@ class LibraryEnvironment:
         """
         self.get_wait_timeout(wait)
 
-    def push_cib(self, custom_cib=None, wait=False):
+    def push_cib(
+        self,
+        custom_cib=None,
+        wait=False,
+        rebase: Optional[Callable[[Element], None]] = None,
+    ):
         """
         Push previously loaded instance of CIB or a custom CIB
 
@@ -184,8 +284,16 @@ class LibraryEnvironment:
             the cluster completely)
         mixed wait -- how many seconds to wait for pacemaker to process new CIB
             or False for not waiting at all
+        rebase -- if the CIB has been changed in the cluster since it was
+            loaded, load it again, call rebase with it to redo the changes and
+            retry the push; it must raise LibraryError if the changes cannot be
+            done anymore
         """
         if custom_cib is not None:
+            if self.__cib_transaction:
+                raise AssertionError(
+                    "Cannot push custom CIB in a CIB transaction"
+                )
             if self.__loaded_cib_diff_source is not None:
                 raise AssertionError(
                     "CIB has been loaded, cannot push custom CIB"
@@ -193,6 +301,112 @@ class LibraryEnvironment:
             return self.__push_cib_full(custom_cib, wait)
         if self.__loaded_cib_diff_source is None:
             raise AssertionError("CIB has not been loaded")
+        if self.__cib_transaction:
+            if wait is not False:
+                raise AssertionError(
+                    "Cannot wait in a CIB transaction, wait when committing it"
+                )
+            self.__cib_transaction_push_pending = True
+            return None
+        if rebase is not None and self.is_cib_live:
+            return self.__push_loaded_cib_rebasing(wait, rebase)
+        return self.__push_loaded_cib(wait)
+
+    def begin_cib_transaction(self) -> None:
+        """
+        Make commands share one CIB which is pushed once at the end
+
+        Until the transaction is committed, get_cib returns the CIB loaded by
+        the first command and push_cib does not push it. The CIB is pushed
+        earlier only if a command needs it upgraded.
+        """
+        if self.__cib_transaction:
+            raise AssertionError("CIB transaction has already begun")
+        if self.__loaded_cib_diff_source is not None:
+            raise AssertionError("CIB has already been loaded")
+        self.__cib_transaction = True
+
+    def commit_cib_transaction(self, wait=False) -> None:
+        """
+        Push the CIB modified in a transaction and end the transaction
+
+        mixed wait -- how many seconds to wait for pacemaker to process new CIB
+            or False for not waiting at all
+        """
+        if not self.__cib_transaction:
+            raise AssertionError("CIB transaction has not begun")
+        self.__cib_transaction = False
+        if self.__cib_transaction_push_pending:
+            self.__cib_transaction_push_pending = False
+            self.__push_loaded_cib(wait)
+        else:
+            self.__drop_loaded_cib()
+
+    def cancel_cib_transaction(self) -> None:
+        """
+        End a transaction without pushing the CIB modified in it
+        """
+        if not self.__cib_transaction:
+            raise AssertionError("CIB transaction has not begun")
+        self.__cib_transaction = False
+        self.__cib_transaction_push_pending = False
+        self.__drop_loaded_cib()
+
+    def __end_cib_transaction_changes(self):
+        if self.__cib_transaction_push_pending:
+            self.__cib_transaction_push_pending = False
+            self.__push_loaded_cib(wait=False)
+        else:
+            self.__drop_loaded_cib()
+
+    def __push_loaded_cib_rebasing(self, wait, rebase):
+        # fail early on invalid wait rather than after retrying the push
+        self.get_wait_timeout(wait)
+        retry_count = 0
+        while True:
+            try:
+                if not self.__is_loaded_cib_outdated():
+                    self.__push_loaded_cib(wait)
+                    break
+            except LibraryError:
+                # The push may have failed due to the changed CIB, e.g. an
+                # element to be modified has been removed. If the CIB is not
+                # loaded anymore, it has been pushed and waiting failed.
+                if (
+                    self.__loaded_cib_diff_source is None
+                    or not self.__is_loaded_cib_outdated()
+                ):
+                    raise
+            if retry_count >= settings.cib_push_conflict_retry_max:
+                raise LibraryError(
+                    ReportItem.error(
+                        reports.messages.CibPushConflict(retry_count)
+                    )
+                )
+            retry_count += 1
+            # Randomize the delay so that concurrently running commands do not
+            # keep colliding with each other.
+            time.sleep(
+                random.uniform(0, 1)
+                * settings.cib_push_conflict_retry_delay
+                * 2 ** (retry_count - 1)
+            )
+            load_options = self.__loaded_cib_load_options
+            self.__drop_loaded_cib()
+            rebase(self.get_cib(**load_options))
+        if retry_count:
+            self.report_processor.report(
+                ReportItem.debug(reports.messages.CibPushRebased(retry_count))
+            )
+
+    def __is_loaded_cib_outdated(self):
+        # num_updates is not checked, it is increased by every status change
+        # and a diff is applicable regardless of it
+        return self.__loaded_cib_epoch != get_cib_epoch(
+            get_cib(get_cib_xml(self.cmd_runner(), no_children=True))
+        )
+
+    def __push_loaded_cib(self, wait):
         # Push by diff works with crm_feature_set > 3.0.8, see
         # https://bugzilla.redhat.com/show_bug.cgi?id=1488044 for details. We
         # only check the version if a CIB has been loaded, otherwise the push
@@ -231,24 +445,53 @@ class LibraryEnvironment:
         )
 
     def __main_push_cib_diff(self, cmd_runner):
-        cib_diff_xml = diff_cibs_xml(
-            cmd_runner,
-            self.report_processor,
-            self.__loaded_cib_diff_source,
-            etree_to_str(self.__loaded_cib_to_modify),
-        )
+        cib_diff_xml = None
+        if self.__loaded_cib_change_journal is not None:
+            try:
+                cib_diff_xml = diff.journal_to_diff_xml(
+                    self.__loaded_cib_change_journal
+                )
+            except diff.NativeDiffNotSupported:
+                # the CIB has been changed bypassing the journal
+                pass
+        if cib_diff_xml is None and not settings.cib_diff_use_crm_diff:
+            try:
+                cib_diff_xml = diff.diff_cibs_xml(
+                    get_cib(self.__loaded_cib_diff_source),
+                    self.__loaded_cib_to_modify,
+                )
+            except diff.NativeDiffNotSupported:
+                # the CIB contains something we cannot diff, let crm_diff
+                # deal with it
+                pass
+        if cib_diff_xml is None:
+            cib_diff_xml = diff_cibs_xml(
+                cmd_runner,
+                self.report_processor,
+                self.__loaded_cib_diff_source,
+                etree_to_str(self.__loaded_cib_to_modify),
+            )
         if cib_diff_xml:
             push_cib_diff_xml(cmd_runner, cib_diff_xml)
 
     def __do_push_cib(self, cmd_runner, push_strategy, wait):
         timeout = self.get_wait_timeout(wait)
         push_strategy()
+        self.__drop_loaded_cib()
+        if self.is_cib_live and timeout is not False:
+            wait_for_idle(cmd_runner, timeout)
+
+    def __drop_loaded_cib(self):
+        if self.__loaded_cib_change_journal is not None:
+            stop_change_journal(self.__loaded_cib_change_journal)
+            self.__loaded_cib_change_journal = None
+        if self.__loaded_cib_element_index is not None:
+            detach_element_index(self.__loaded_cib_element_index)
+            self.__loaded_cib_element_index = None
         self._cib_upgrade_reported = False
         self.__loaded_cib_diff_source = None
         self.__loaded_cib_diff_source_feature_set = None
         self.__loaded_cib_to_modify = None
-        if self.is_cib_live and timeout is not False:
-            wait_for_idle(cmd_runner, timeout)
 
     @property
     def is_cib_live(self):
@@ -1,3 +1,4 @@
+import logging
 import os
 
 from pcs import settings
@@ -6,6 +7,7 @@ from pcs.common import reports
 from pcs.common.reports.item import ReportItem
 from pcs.common.node_communicator import (
     CommunicatorLoggerInterface,
+    DebugCaptureLevel,
     HostNotFound,
     NodeTargetFactory,
 )
@@ -147,6 +149,21 @@ class LibCommunicatorLogger(CommunicatorLoggerInterface):
             )
         )
 
+    def get_debug_capture_level(self):
+        if self._reporter.is_debug_enabled():
+            return DebugCaptureLevel.FULL
+        # Logs of transferred data would get big, log headers only.
+        if self._logger.isEnabledFor(logging.DEBUG):
+            return DebugCaptureLevel.HEADERS
+        return DebugCaptureLevel.OFF
+
+    def log_pool_stats(self, stats):
+        report_msg = reports.messages.NodeCommunicationConnectionPoolStats(
+            stats.created, stats.reused, stats.connections_reused, stats.idle,
+        )
+        self._logger.debug(report_msg.message)
+        self._reporter.report(ReportItem.debug(report_msg))
+
 
 class NodeTargetLibFactory(NodeTargetFactory):
     def __init__(self, known_hosts, report_processor: ReportProcessor):
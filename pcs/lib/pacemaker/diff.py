@@ -0,0 +1,344 @@
+from copy import deepcopy
+from typing import (
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from lxml import etree
+from lxml.etree import _Element
+
+from pcs.lib.xml_tools import (
+    ChangeJournal,
+    etree_to_str,
+)
+
+
+class NativeDiffNotSupported(Exception):
+    """
+    CIBs contain constructs which cannot be safely diffed in-process
+    """
+
+
+def diff_cibs_xml(cib_old: _Element, cib_new: _Element) -> str:
+    """
+    Return xml diff of two CIBs, empty string if they do not differ
+
+    The diff is a pacemaker patchset in format 2 equivalent to the output of
+    'crm_diff --no-version' and can be pushed by 'cibadmin --patch'. Raise
+    NativeDiffNotSupported if the CIBs cannot be diffed without crm_diff.
+
+    cib_old -- original CIB
+    cib_new -- modified CIB
+    """
+    diff = diff_cibs(cib_old, cib_new)
+    return "" if diff is None else etree_to_str(diff)
+
+
+def diff_cibs(cib_old: _Element, cib_new: _Element) -> Optional[_Element]:
+    """
+    Return a patchset transforming cib_old to cib_new or None if they are same
+
+    cib_old -- original CIB
+    cib_new -- modified CIB
+    """
+    if cib_old.tag != cib_new.tag:
+        raise NativeDiffNotSupported()
+    if _to_bytes(cib_old) == _to_bytes(cib_new):
+        return None
+    deleted_list: List[_Element] = []
+    changed_list: List[_Element] = []
+    _diff_element(
+        cib_old,
+        cib_new,
+        _xpath_step("", cib_new.tag, cib_new.get("id")),
+        deleted_list,
+        changed_list,
+    )
+    if not deleted_list and not changed_list:
+        return None
+    diff = etree.Element("diff", format="2")
+    # Pacemaker lists deletions first, the rest goes in document order
+    for change in deleted_list + changed_list:
+        diff.append(change)
+    return diff
+
+
+def journal_to_diff_xml(journal: ChangeJournal) -> str:
+    """
+    Return xml diff of changes recorded in a journal, empty string if none
+
+    Raise NativeDiffNotSupported if the journal does not describe all the
+    changes done to the tracked CIB.
+
+    journal -- changes done to a CIB
+    """
+    diff = journal_to_diff(journal)
+    return "" if diff is None else etree_to_str(diff)
+
+
+def journal_to_diff(journal: ChangeJournal) -> Optional[_Element]:
+    """
+    Return a patchset of changes recorded in a journal or None if no changes
+
+    journal -- changes done to a CIB
+    """
+    if not journal.is_active:
+        # changes done since the journal was stopped are unknown
+        raise NativeDiffNotSupported()
+    deleted_list: List[_Element] = []
+    changed_list: List[_Element] = []
+
+    for element, parent, position, removed_count in journal.deleted:
+        if (
+            # the element has been created and removed in the meantime
+            removed_count == 0
+            # an ancestor has been removed as well or re-created as a whole
+            or not journal.is_tracked(parent)
+            or journal.is_created(parent)
+        ):
+            continue
+        element_id = journal.modified.get(element, element.attrib).get("id")
+        if element_id is None:
+            _check_unambiguous(element, _ambiguous_tags([*parent, element]))
+        deleted_list.append(
+            _change(
+                "delete",
+                _xpath_step(
+                    _journal_xpath(journal, parent), element.tag, element_id
+                ),
+                position=str(position),
+            )
+        )
+
+    for element, old_attrib in journal.modified.items():
+        if not journal.is_tracked(element) or journal.is_created(element):
+            continue
+        if old_attrib == dict(element.attrib):
+            continue
+        if old_attrib.get("id") != element.get("id"):
+            # xpaths of elements are built with ids
+            raise NativeDiffNotSupported()
+        changed_list.append(
+            _change_modify(
+                old_attrib, element, _journal_xpath(journal, element)
+            )
+        )
+
+    created_list = [
+        element
+        for element in journal.created
+        if journal.is_tracked(element)
+        and not journal.is_created(element.getparent())
+    ]
+    # Elements must be put into their parents in the order of their positions
+    for element in sorted(created_list, key=_document_position):
+        parent = element.getparent()
+        change = _change(
+            "create",
+            _journal_xpath(journal, parent),
+            position=str(parent.index(element)),
+        )
+        created = deepcopy(element)
+        created.tail = None
+        change.append(created)
+        changed_list.append(change)
+
+    if not journal.is_consistent():
+        # the tree has been changed bypassing the journal
+        raise NativeDiffNotSupported()
+    if not deleted_list and not changed_list:
+        return None
+    diff = etree.Element("diff", format="2")
+    for change in deleted_list + changed_list:
+        diff.append(change)
+    return diff
+
+
+def _journal_xpath(journal: ChangeJournal, element: _Element) -> str:
+    ancestor_list = []
+    while element is not None:
+        ancestor_list.append(element)
+        element = element.getparent()
+    path = ""
+    for ancestor in reversed(ancestor_list):
+        parent = ancestor.getparent()
+        if parent is not None and ancestor.get("id") is None:
+            _check_unambiguous(ancestor, _ambiguous_tags(list(parent)))
+        path = _xpath_step(
+            path,
+            ancestor.tag,
+            journal.modified.get(ancestor, ancestor.attrib).get("id"),
+        )
+    return path
+
+
+def _document_position(element: _Element) -> List[int]:
+    position = []
+    parent = element.getparent()
+    while parent is not None:
+        position.append(parent.index(element))
+        element, parent = parent, parent.getparent()
+    return list(reversed(position))
+
+
+def _diff_element(
+    old: _Element,
+    new: _Element,
+    path: str,
+    deleted_list: List[_Element],
+    changed_list: List[_Element],
+) -> None:
+    # pylint: disable=too-many-locals
+    if _has_text(old.text) or _has_text(new.text):
+        raise NativeDiffNotSupported()
+    if dict(old.attrib) != dict(new.attrib):
+        changed_list.append(_change_modify(old.attrib, new, path))
+
+    old_children = _element_children(old)
+    new_children = _element_children(new)
+    # Elements without an id are addressed by their tag only. If there are
+    # more of them with the same tag, the xpath is ambiguous.
+    ambiguous_tags = _ambiguous_tags(old_children) | _ambiguous_tags(
+        new_children
+    )
+
+    # Match children the same way pacemaker does: by a tag and an id. Children
+    # without an id are matched to the first unmatched child with the same tag.
+    old_by_key: Dict[Tuple[str, Optional[str]], List[int]] = {}
+    for index, child in enumerate(old_children):
+        old_by_key.setdefault(_match_key(child), []).append(index)
+    new_to_old: Dict[int, int] = {}
+    for index, child in enumerate(new_children):
+        candidates = old_by_key.get(_match_key(child))
+        if candidates:
+            new_to_old[index] = candidates.pop(0)
+    matched_old = set(new_to_old.values())
+
+    # positions of kept elements, deleted and created elements are skipped
+    old_kept_position = {}
+    for index, child in enumerate(old_children):
+        if index in matched_old:
+            old_kept_position[index] = len(old_kept_position)
+        else:
+            _check_unambiguous(child, ambiguous_tags)
+            deleted_list.append(
+                _change(
+                    "delete",
+                    _xpath_step(path, child.tag, child.get("id")),
+                    position=str(index),
+                )
+            )
+
+    new_kept_position = 0
+    for index, child in enumerate(new_children):
+        if index not in new_to_old:
+            change = _change("create", path, position=str(index))
+            created = deepcopy(child)
+            created.tail = None
+            change.append(created)
+            changed_list.append(change)
+            continue
+        old_index = new_to_old[index]
+        child_path = _xpath_step(path, child.tag, child.get("id"))
+        child_deleted_list: List[_Element] = []
+        child_changed_list: List[_Element] = []
+        # Most of a CIB stays untouched. Comparing serialized subtrees is done
+        # in C and is much cheaper than walking them in python.
+        if _to_bytes(old_children[old_index]) != _to_bytes(child):
+            _diff_element(
+                old_children[old_index],
+                child,
+                child_path,
+                child_deleted_list,
+                child_changed_list,
+            )
+        if old_kept_position[old_index] != new_kept_position:
+            child_changed_list.append(
+                _change("move", child_path, position=str(index))
+            )
+        if child_deleted_list or child_changed_list:
+            _check_unambiguous(child, ambiguous_tags)
+            deleted_list.extend(child_deleted_list)
+            changed_list.extend(child_changed_list)
+        new_kept_position += 1
+
+
+def _element_children(element: _Element) -> List[_Element]:
+    children = []
+    for child in element:
+        if not isinstance(child.tag, str):
+            # comments, processing instructions, entities
+            raise NativeDiffNotSupported()
+        if _has_text(child.tail):
+            raise NativeDiffNotSupported()
+        children.append(child)
+    return children
+
+
+def _ambiguous_tags(element_list: List[_Element]) -> Set[str]:
+    seen_tags: Set[str] = set()
+    ambiguous_tags: Set[str] = set()
+    for element in element_list:
+        if element.get("id") is None:
+            if element.tag in seen_tags:
+                ambiguous_tags.add(element.tag)
+            seen_tags.add(element.tag)
+    return ambiguous_tags
+
+
+def _check_unambiguous(element: _Element, ambiguous_tags: Set[str]) -> None:
+    if element.get("id") is None and element.tag in ambiguous_tags:
+        raise NativeDiffNotSupported()
+
+
+def _match_key(element: _Element) -> Tuple[str, Optional[str]]:
+    return element.tag, element.get("id")
+
+
+def _xpath_step(parent_path: str, tag: str, element_id: Optional[str]) -> str:
+    if element_id is None:
+        return f"{parent_path}/{tag}"
+    if "'" in element_id:
+        # pacemaker does not escape ids in patchset xpaths
+        raise NativeDiffNotSupported()
+    return f"{parent_path}/{tag}[@id='{element_id}']"
+
+
+def _to_bytes(element: _Element) -> bytes:
+    return etree.tostring(element, with_tail=False)
+
+
+def _has_text(text: Optional[str]) -> bool:
+    return bool(text and text.strip())
+
+
+def _change(operation: str, path: str, **attrs: str) -> _Element:
+    return etree.Element("change", operation=operation, path=path, **attrs)
+
+
+def _change_modify(
+    old_attrib: Mapping[str, str], new: _Element, path: str
+) -> _Element:
+    change = _change("modify", path)
+    change_list = etree.SubElement(change, "change-list")
+    for name, value in new.attrib.items():
+        if old_attrib.get(name) != value:
+            etree.SubElement(
+                change_list,
+                "change-attr",
+                name=name,
+                operation="set",
+                value=value,
+            )
+    for name in old_attrib:
+        if name not in new.attrib:
+            etree.SubElement(
+                change_list, "change-attr", name=name, operation="unset"
+            )
+    change_result = etree.SubElement(change, "change-result")
+    etree.SubElement(change_result, new.tag, attrib=dict(new.attrib))
+    return change
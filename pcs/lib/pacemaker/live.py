@@ -1,5 +1,6 @@
 import os.path
 import re
+import time
 from typing import (
     Iterable,
     List,
@@ -19,6 +20,7 @@ from pcs.lib.cib.tools import get_pacemaker_version_by_which_cib_was_validated
 from pcs.lib.errors import LibraryError
 from pcs.lib.external import CommandRunner
 from pcs.lib.pacemaker.state import ClusterState
+from pcs.lib.pacemaker.tool_help_cache import ToolHelpCache
 from pcs.lib.tools import write_tmpfile
 from pcs.lib.xml_tools import etree_to_str
 
@@ -91,16 +93,18 @@ def get_ticket_status_text(runner: CommandRunner) -> Tuple[str, str, int]:
 ### cib
 
 
-def get_cib_xml_cmd_results(runner, scope=None):
+def get_cib_xml_cmd_results(runner, scope=None, no_children=False):
     command = [__exec("cibadmin"), "--local", "--query"]
     if scope:
         command.append("--scope={0}".format(scope))
+    if no_children:
+        command.append("--no-children")
     stdout, stderr, returncode = runner.run(command)
     return stdout, stderr, returncode
 
 
-def get_cib_xml(runner, scope=None):
-    stdout, stderr, retval = get_cib_xml_cmd_results(runner, scope)
+def get_cib_xml(runner, scope=None, no_children=False):
+    stdout, stderr, retval = get_cib_xml_cmd_results(runner, scope, no_children)
     if retval != 0:
         if retval == __EXITCODE_CIB_SCOPE_VALID_BUT_NOT_PRESENT and scope:
             raise LibraryError(
@@ -131,6 +135,21 @@ def get_cib(xml):
         )
 
 
+def get_cib_without_status(runner):
+    """
+    Load a CIB without its status section
+
+    The cib element and the configuration section are loaded separately so
+    that the status section is neither transferred nor parsed. The cib element
+    is loaded first, so its epoch is never newer than the configuration.
+
+    CommandRunner runner
+    """
+    cib = get_cib(get_cib_xml(runner, no_children=True))
+    cib.append(get_cib(get_cib_xml(runner, scope="configuration")))
+    return cib
+
+
 def verify(runner, verbose=False):
     crm_verify_cmd = [__exec("crm_verify")]
     # Currently, crm_verify can suggest up to two -V options but it accepts
@@ -485,6 +504,36 @@ def get_local_node_status(runner):
     )
 
 
+def is_local_node_started(node_status):
+    """
+    Check whether pacemaker is fully started on the local node
+
+    dict node_status -- status of the local node, see get_local_node_status
+    """
+    # If the node is offline, we only get the "offline" key.
+    return node_status.get("online", False) and not node_status.get(
+        "pending", True
+    )
+
+
+def wait_for_local_node_started(runner, timeout):
+    """
+    Return status of the local node once it is started or the timeout expires
+
+    Pacemaker does not notify about nodes starting up, so the status is checked
+    in short intervals. That is much cheaper than being polled by other nodes.
+
+    int timeout -- maximal time to wait in seconds
+    """
+    stop_at = time.time() + timeout
+    while True:
+        node_status = get_local_node_status(runner)
+        remaining = stop_at - time.time()
+        if is_local_node_started(node_status) or remaining <= 0:
+            return node_status
+        time.sleep(min(settings.node_start_check_interval, remaining))
+
+
 def remove_node(runner, node_name):
     stdout, stderr, retval = runner.run(
         [__exec("crm_node"), "--force", "--remove", node_name,]
@@ -693,9 +742,38 @@ def __exec(name):
     return os.path.join(settings.pacemaker_binaries, name)
 
 
+_tool_help_cache: Optional[ToolHelpCache] = None
+
+
+def set_tool_help_cache(path: Optional[str]) -> None:
+    """
+    Keep help of pacemaker tools in a file instead of running them repeatedly
+
+    path -- cache file, None disables the cache
+    """
+    # pylint: disable=global-statement
+    global _tool_help_cache
+    _tool_help_cache = ToolHelpCache(path) if path else None
+
+
+def _get_pcmk_tool_help(
+    runner: CommandRunner, tool: str, option: str
+) -> Tuple[str, str]:
+    tool_path = __exec(tool)
+    if _tool_help_cache is not None:
+        cached_help = _tool_help_cache.get(tool_path, option)
+        if cached_help is not None:
+            return cached_help
+    # retval is not consistent across tools and versions so we don't care
+    stdout, stderr, dummy_retval = runner.run([tool_path, option])
+    if _tool_help_cache is not None:
+        # the cache does not store empty output of tools which failed to run
+        _tool_help_cache.store(tool_path, option, stdout, stderr)
+    return stdout, stderr
+
+
 def __is_in_crm_resource_help(runner, text):
-    # returns 1 on success so we don't care about retval
-    stdout, stderr, dummy_retval = runner.run([__exec("crm_resource"), "-?"])
+    stdout, stderr = _get_pcmk_tool_help(runner, "crm_resource", "-?")
     # help goes to stderr but we check stdout as well if that gets changed
     return text in stderr or text in stdout
 
@@ -703,7 +781,7 @@ def __is_in_crm_resource_help(runner, text):
 def _is_in_pcmk_tool_help(
     runner: CommandRunner, tool: str, text_list: Iterable[str]
 ) -> bool:
-    stdout, stderr, dummy_retval = runner.run([__exec(tool), "--help-all"])
+    stdout, stderr = _get_pcmk_tool_help(runner, tool, "--help-all")
     # Help goes to stderr but we check stdout as well if that gets changed. Use
     # generators in all to return early.
     return all(text in stderr for text in text_list) or all(
@@ -0,0 +1,83 @@
+"""
+Compiled RelaxNG schemas of pacemaker documents
+
+Compiling a schema takes much longer than validating a document by it. The
+schemas are compiled once per process and recompiled only when their files
+change.
+"""
+import os.path
+from typing import (
+    Dict,
+    Optional,
+    Tuple,
+)
+
+from lxml import etree
+
+from pcs import settings
+from pcs.common import reports
+from pcs.common.reports.item import ReportItem
+from pcs.lib.errors import LibraryError
+
+# path -> (mtime, compiled schema)
+_schema_cache: Dict[str, Tuple[float, etree.RelaxNG]] = {}
+
+
+def get_relaxng(path: str) -> Optional[etree.RelaxNG]:
+    """
+    Return a compiled RelaxNG schema or None if the schema file does not exist
+
+    path -- path to the schema file
+    """
+    if not os.path.isfile(path):
+        _schema_cache.pop(path, None)
+        return None
+    mtime = os.stat(path).st_mtime
+    cached = _schema_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    schema = etree.RelaxNG(file=path)
+    _schema_cache[path] = (mtime, schema)
+    return schema
+
+
+def clear_cache() -> None:
+    """
+    Forget all compiled schemas
+    """
+    _schema_cache.clear()
+
+
+def get_cib_schema_path(cib) -> Optional[str]:
+    """
+    Return path to the schema a CIB declares to be valid against
+
+    etree cib -- cib etree
+    """
+    validate_with = cib.get("validate-with", "")
+    # the value is a file name, refuse anything else
+    if not validate_with.startswith("pacemaker-") or os.path.sep in (
+        validate_with
+    ):
+        return None
+    return os.path.join(settings.pacemaker_schema_dir, f"{validate_with}.rng")
+
+
+def validate_cib(cib) -> bool:
+    """
+    Validate a CIB by its schema without running pacemaker tools, return False
+    if the schema is not available and the CIB has not been validated
+
+    etree cib -- cib etree
+    """
+    schema_path = get_cib_schema_path(cib)
+    schema = get_relaxng(schema_path) if schema_path else None
+    if schema is None:
+        return False
+    try:
+        schema.assertValid(cib)
+    except etree.DocumentInvalid as e:
+        raise LibraryError(
+            ReportItem.error(reports.messages.CibLoadErrorBadFormat(str(e)))
+        )
+    return True
@@ -2,7 +2,6 @@
 The intention is put there knowledge about cluster state structure.
 Hide information about underlaying xml is desired too.
 """
-import os.path
 from collections import defaultdict
 from typing import Dict, Any
 
@@ -13,6 +12,7 @@ from pcs.common import reports
 from pcs.common.tools import xml_fromstring
 from pcs.common.reports.item import ReportItem
 from pcs.lib.errors import LibraryError
+from pcs.lib.pacemaker.schema import get_relaxng
 from pcs.lib.pacemaker.values import (
     is_false,
     is_true,
@@ -62,18 +62,27 @@ class _Children:
         self.dom_part = dom_part
         self.children = children
         self.sections = sections
+        # the document is searched once for each child or section
+        self._cache = {}
 
     def __getattr__(self, name):
+        if name in self._cache:
+            return self._cache[name]
+
         if name in self.children.keys():
             element_name, wrapper = self.children[name]
-            return [
+            self._cache[name] = [
                 wrapper(element)
-                for element in self.dom_part.findall(".//" + element_name)
+                for element in self.dom_part.iterfind(".//" + element_name)
             ]
+            return self._cache[name]
 
         if name in self.sections.keys():
             element_name, wrapper = self.sections[name]
-            return wrapper(self.dom_part.findall(".//" + element_name)[0])
+            self._cache[name] = wrapper(
+                self.dom_part.findall(".//" + element_name)[0]
+            )
+            return self._cache[name]
 
         raise AttributeError(
             "'{0}' does not declare child or section '{1}'".format(
@@ -150,14 +159,23 @@ class _NodeSection(_Element):
 
 
 def _validate_cluster_state_dom(dom):
-    if os.path.isfile(settings.crm_mon_schema):
-        etree.RelaxNG(file=settings.crm_mon_schema).assertValid(dom)
+    schema = get_relaxng(settings.crm_mon_schema)
+    if schema is not None:
+        schema.assertValid(dom)
+
 
+def get_cluster_state_dom(xml, validate=True):
+    """
+    Parse crm_mon xml
 
-def get_cluster_state_dom(xml):
+    string xml -- crm_mon xml
+    bool validate -- if False, skip validating the xml by the crm_mon schema,
+        use it only for xml coming directly from the local crm_mon
+    """
     try:
         dom = xml_fromstring(xml)
-        _validate_cluster_state_dom(dom)
+        if validate:
+            _validate_cluster_state_dom(dom)
         return dom
     except (etree.XMLSyntaxError, etree.DocumentInvalid):
         raise LibraryError(
@@ -176,13 +194,220 @@ class ClusterState(_Element):
         super(ClusterState, self).__init__(self.dom)
 
 
+class _ResourceRecord:
+    """
+    A resource, group, clone, bundle or replica element of a cluster state
+    """
+
+    __slots__ = ("element", "position", "children", "descendants", "nodes")
+
+    def __init__(self, element, position):
+        self.element = element
+        self.position = position
+        # direct child records
+        self.children = []
+        # all primitive records in the subtree
+        self.descendants = []
+        # names of nodes the resource runs on
+        self.nodes = []
+
+    @property
+    def tag(self):
+        return self.element.tag
+
+    def child_primitives(self):
+        return [child for child in self.children if child.tag == "resource"]
+
+    def is_unmanaged(self):
+        return is_false(self.element.attrib.get("managed", ""))
+
+
+class _NodeRecord:
+    """
+    A node of a cluster state
+    """
+
+    __slots__ = ("element", "resources")
+
+    def __init__(self, element):
+        self.element = element
+        # primitive records running on the node
+        self.resources = []
+
+    @property
+    def id(self):
+        return self.element.attrib.get("id")
+
+    @property
+    def name(self):
+        return self.element.attrib.get("name")
+
+
+class ResourcesStateIndex:
+    """
+    Nodes and resources of a cluster state indexed by their ids
+
+    The cluster state is traversed once, queries for any number of resources
+    or nodes do not search the document again. Create a new index for each
+    cluster state snapshot. Queries for a single resource are faster when run
+    on the document itself.
+    """
+
+    __slots__ = ("_by_id", "_parent", "_nodes", "_node_by_id", "_node_by_name")
+
+    _TAGS = ("resource", "group", "clone", "bundle", "replica")
+
+    def __init__(self, cluster_state):
+        """
+        etree cluster_state -- status of the cluster
+        """
+        # (tag, id) -> list of records; resources and groups are also
+        # reachable by ids without the clone instance suffix
+        self._by_id = defaultdict(list)
+        # record -> the closest clone or bundle record containing it
+        self._parent = {}
+        self._nodes = []
+        self._node_by_id = {}
+        self._node_by_name = {}
+        for node_el in cluster_state.iterfind("./nodes/node"):
+            self._add_node(_NodeRecord(node_el))
+        records = {}
+        for position, element in enumerate(
+            cluster_state.iter("node", *self._TAGS)
+        ):
+            if element.tag == "node":
+                self._add_running_node(records, element)
+                continue
+            record = _ResourceRecord(element, position)
+            records[element] = record
+            ancestor_records = [
+                records[ancestor]
+                for ancestor in element.iterancestors(*self._TAGS)
+                if ancestor in records
+            ]
+            if ancestor_records:
+                ancestor_records[0].children.append(record)
+            for ancestor_record in ancestor_records:
+                if ancestor_record.tag in ("clone", "bundle"):
+                    self._parent[record] = ancestor_record
+                    break
+            if record.tag == "resource":
+                for ancestor_record in ancestor_records:
+                    ancestor_record.descendants.append(record)
+            self._add_id(record)
+
+    def _add_node(self, node):
+        self._nodes.append(node)
+        if node.id is not None:
+            self._node_by_id[node.id] = node
+        if node.name is not None:
+            self._node_by_name[node.name] = node
+
+    def _add_running_node(self, records, node_el):
+        record = records.get(node_el.getparent())
+        if record is None or record.tag != "resource":
+            return
+        node_name = node_el.attrib.get("name")
+        record.nodes.append(node_name)
+        node = self._node_by_name.get(node_name)
+        if node is not None:
+            node.resources.append(record)
+
+    def _add_id(self, record):
+        element_id = record.element.attrib.get("id")
+        if element_id is None:
+            return
+        if record.tag in ("resource", "group"):
+            # same as matching (@id="{id}" or starts-with(@id, "{id}:"))
+            parts = element_id.split(":")
+            for i in range(1, len(parts) + 1):
+                self._by_id[(record.tag, ":".join(parts[:i]))].append(record)
+        else:
+            self._by_id[(record.tag, element_id)].append(record)
+
+    def find(self, tag, resource_id):
+        """
+        Return records of elements with the specified tag matching an id
+
+        string tag -- resource, group, clone, bundle or replica
+        string resource_id -- id of the resource
+        """
+        return self._by_id.get((tag, resource_id), [])
+
+    def get_clone_or_bundle(self, record):
+        """
+        Return the closest clone or bundle record containing a record or None
+        """
+        return self._parent.get(record)
+
+    def get_nodes(self):
+        """
+        Return records of all nodes in the order of the cluster state
+        """
+        return list(self._nodes)
+
+    def find_node_by_id(self, node_id):
+        """
+        Return a record of the node with the specified id or None
+        """
+        return self._node_by_id.get(node_id)
+
+    def find_node_by_name(self, node_name):
+        """
+        Return a record of the node with the specified name or None
+        """
+        return self._node_by_name.get(node_name)
+
+
 def _id_xpath_predicate(resource_id):
     return """(@id="{0}" or starts-with(@id, "{0}:"))""".format(resource_id)
 
 
+def _sorted_unique_records(record_list):
+    return sorted(
+        {record.position: record for record in record_list}.values(),
+        key=lambda record: record.position,
+    )
+
+
+def _get_primitive_records_for_state_check(
+    index, resource_id, expected_running
+):
+    # the last primitive of a group is the last one to be started and the first
+    # one to be stopped
+    position = -1 if expected_running else 0
+    primitives = list(index.find("resource", resource_id))
+    group_list = list(index.find("group", resource_id))
+    for clone in index.find("clone", resource_id):
+        primitives.extend(clone.child_primitives())
+        group_list.extend(
+            child for child in clone.children if child.tag == "group"
+        )
+    for group in group_list:
+        group_primitives = group.child_primitives()
+        if group_primitives:
+            primitives.append(group_primitives[position])
+    for bundle in index.find("bundle", resource_id):
+        for replica in bundle.children:
+            if replica.tag == "replica":
+                primitives.extend(replica.child_primitives())
+    return [
+        record
+        for record in _sorted_unique_records(primitives)
+        if not is_true(record.element.attrib.get("failed", ""))
+    ]
+
+
 def _get_primitives_for_state_check(
     cluster_state, resource_id, expected_running
 ):
+    if isinstance(cluster_state, ResourcesStateIndex):
+        return [
+            record.element
+            for record in _get_primitive_records_for_state_check(
+                cluster_state, resource_id, expected_running
+            )
+        ]
     primitives = cluster_state.xpath(
         """
         .//resource[{predicate_id}]
@@ -207,21 +432,43 @@ def _get_primitives_for_state_check(
     ]
 
 
-def _get_primitive_roles_with_nodes(primitive_el_list):
+def _get_roles_with_nodes(role_nodes_list):
     # Clone resources are represented by multiple primitive elements.
     roles_with_nodes = defaultdict(set)
-    for resource_element in primitive_el_list:
-        if resource_element.attrib["role"] in ["Started", "Master", "Slave"]:
-            roles_with_nodes[resource_element.attrib["role"]].update(
-                [
-                    node.attrib["name"]
-                    for node in resource_element.findall(".//node")
-                ]
-            )
+    for role, node_names in role_nodes_list:
+        if role in ["Started", "Master", "Slave"]:
+            roles_with_nodes[role].update(node_names)
     return {role: sorted(nodes) for role, nodes in roles_with_nodes.items()}
 
 
+def _get_primitive_roles_with_nodes(primitive_el_list):
+    return _get_roles_with_nodes(
+        (
+            resource_element.attrib["role"],
+            [
+                node.attrib["name"]
+                for node in resource_element.findall(".//node")
+            ],
+        )
+        for resource_element in primitive_el_list
+    )
+
+
+def _get_indexed_roles_with_nodes(index, resource_id, expected_running):
+    # node names have been collected when building the index
+    return _get_roles_with_nodes(
+        (record.element.attrib["role"], record.nodes)
+        for record in _get_primitive_records_for_state_check(
+            index, resource_id, expected_running
+        )
+    )
+
+
 def get_resource_state(cluster_state, resource_id):
+    if isinstance(cluster_state, ResourcesStateIndex):
+        return _get_indexed_roles_with_nodes(
+            cluster_state, resource_id, expected_running=True
+        )
     return _get_primitive_roles_with_nodes(
         _get_primitives_for_state_check(
             cluster_state, resource_id, expected_running=True
@@ -239,11 +486,16 @@ def info_resource_state(cluster_state, resource_id):
 
 
 def ensure_resource_state(expected_running, cluster_state, resource_id):
-    roles_with_nodes = _get_primitive_roles_with_nodes(
-        _get_primitives_for_state_check(
+    if isinstance(cluster_state, ResourcesStateIndex):
+        roles_with_nodes = _get_indexed_roles_with_nodes(
             cluster_state, resource_id, expected_running
         )
-    )
+    else:
+        roles_with_nodes = _get_primitive_roles_with_nodes(
+            _get_primitives_for_state_check(
+                cluster_state, resource_id, expected_running
+            )
+        )
     if not roles_with_nodes:
         return ReportItem(
             reports.item.ReportItemSeverity(
@@ -271,13 +523,42 @@ def ensure_resource_running(cluster_state, resource_id):
     )
 
 
+def _is_indexed_resource_managed(index, resource_id):
+    primitive_list = list(index.find("resource", resource_id))
+    for group in index.find("group", resource_id):
+        primitive_list.extend(group.child_primitives())
+    if primitive_list:
+        for primitive in primitive_list:
+            if primitive.is_unmanaged():
+                return False
+            parent = index.get_clone_or_bundle(primitive)
+            if parent is not None and parent.is_unmanaged():
+                return False
+        return True
+
+    parent_list = _sorted_unique_records(
+        index.find("clone", resource_id) + index.find("bundle", resource_id)
+    )
+    for parent in parent_list:
+        if parent.is_unmanaged():
+            return False
+        for primitive in parent.descendants:
+            if primitive.is_unmanaged():
+                return False
+        return True
+
+    raise ResourceNotFound(resource_id)
+
+
 def is_resource_managed(cluster_state, resource_id):
     """
     Check if the resource is managed
 
-    etree cluster_state -- status of the cluster
+    etree|ResourcesStateIndex cluster_state -- status of the cluster
     string resource_id -- id of the resource
     """
+    if isinstance(cluster_state, ResourcesStateIndex):
+        return _is_indexed_resource_managed(cluster_state, resource_id)
     primitive_list = cluster_state.xpath(
         """
         .//resource[{predicate_id}]
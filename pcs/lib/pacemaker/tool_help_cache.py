@@ -0,0 +1,124 @@
+import json
+import os
+import os.path
+import tempfile
+from typing import (
+    Dict,
+    Optional,
+    Tuple,
+)
+
+
+class ToolHelpCache:
+    """
+    Help texts of pacemaker tools stored in a file
+
+    Pacemaker tools are probed for supported features by parsing their help.
+    The help only changes when the tools get upgraded, so it is stored in a
+    file shared by all pcs processes. A record is valid as long as the tool
+    binary is the same file (inode, size and modification time) as when the
+    record was stored.
+
+    The cache is best effort: an unreadable, unwritable or corrupted cache
+    file only means the tools are run again.
+    """
+
+    def __init__(self, path: str):
+        """
+        path -- cache file
+        """
+        self._path = path
+        self._records: Optional[Dict[str, Dict]] = None
+
+    def get(self, tool_path: str, option: str) -> Optional[Tuple[str, str]]:
+        """
+        Return stored stdout and stderr of a tool help, None if not stored
+
+        tool_path -- full path to the tool binary
+        option -- command line option printing the help
+        """
+        identity = _get_binary_identity(tool_path)
+        if identity is None:
+            return None
+        record = self._get_records().get(_get_key(tool_path, option))
+        if not isinstance(record, dict) or record.get("binary") != identity:
+            return None
+        stdout, stderr = record.get("stdout"), record.get("stderr")
+        if not isinstance(stdout, str) or not isinstance(stderr, str):
+            return None
+        if _is_empty(stdout, stderr):
+            return None
+        return stdout, stderr
+
+    def store(
+        self, tool_path: str, option: str, stdout: str, stderr: str
+    ) -> None:
+        """
+        Store stdout and stderr of a tool help, empty help is not stored
+
+        tool_path -- full path to the tool binary
+        option -- command line option printing the help
+        stdout -- standard output of the tool
+        stderr -- error output of the tool
+        """
+        if _is_empty(stdout, stderr):
+            # the tool has most likely failed to run
+            return
+        identity = _get_binary_identity(tool_path)
+        if identity is None:
+            return
+        records = self._get_records()
+        records[_get_key(tool_path, option)] = dict(
+            binary=identity, stdout=stdout, stderr=stderr,
+        )
+        self._save(records)
+
+    def _get_records(self) -> Dict[str, Dict]:
+        if self._records is None:
+            self._records = self._load()
+        return self._records
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self._path, "r") as cache_file:
+                records = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        return records if isinstance(records, dict) else {}
+
+    def _save(self, records: Dict[str, Dict]) -> None:
+        # Write to a temporary file and rename it so that concurrently running
+        # pcs processes never read a partially written cache.
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(self._path),
+                prefix=".{0}.".format(os.path.basename(self._path)),
+            )
+            with os.fdopen(fd, "w") as tmp_file:
+                json.dump(records, tmp_file)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self._path)
+        except OSError:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+
+def _is_empty(stdout: str, stderr: str) -> bool:
+    return not stdout.strip() and not stderr.strip()
+
+
+def _get_key(tool_path: str, option: str) -> str:
+    return "{0} {1}".format(tool_path, option)
+
+
+def _get_binary_identity(tool_path: str) -> Optional[list]:
+    try:
+        stat = os.stat(tool_path)
+    except OSError:
+        return None
+    # a list to be comparable with a value loaded from json
+    return [stat.st_ino, stat.st_size, stat.st_mtime_ns]
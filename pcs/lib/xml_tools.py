@@ -1,10 +1,307 @@
-from typing import cast, Dict, Iterable
+from typing import (
+    cast,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
 from xml.etree.ElementTree import Element
 
 from lxml import etree
 from lxml.etree import _Element
 
 
+class ChangeJournal:
+    """
+    Record changes done to an xml tree by the helpers in this module
+
+    Only changes done by the helpers are recorded. Users of a journal are
+    supposed to check its consistency with the tree before relying on it.
+    """
+
+    def __init__(self, root: Element):
+        """
+        root -- root element of the tree to be tracked
+        """
+        self.root = root
+        # False once the journal has stopped recording changes
+        self.is_active = True
+        self.initial_element_count = count_elements(root)
+        self.initial_attribute_count = count_attributes(root)
+        # elements added to the tree, their subtrees are new as a whole
+        self.created: List[Element] = []
+        self._created_set: Set[Element] = set()
+        # (removed element, its former parent, its former position,
+        #   the number of removed original elements)
+        self.deleted: List[Tuple[Element, Element, int, int]] = []
+        self._removed_attribute_count = 0
+        # element -> its attributes before the first change
+        self.modified: Dict[Element, Dict[str, str]] = {}
+
+    def is_tracked(self, element: Element) -> bool:
+        """
+        Is the element a part of the tracked tree?
+        """
+        # Elements removed from a tree still belong to the same document, so
+        # getroottree cannot be used.
+        parent = cast(_Element, element).getparent()
+        while parent is not None:
+            element, parent = parent, parent.getparent()
+        return element is self.root
+
+    def is_created(self, element: Optional[Element]) -> bool:
+        """
+        Is the element or any of its ancestors new in the tree?
+        """
+        while element is not None:
+            if element in self._created_set:
+                return True
+            element = cast(_Element, element).getparent()
+        return False
+
+    def is_consistent(self) -> bool:
+        """
+        Do the numbers of elements and attributes in the tree match the changes
+        recorded in the journal?
+
+        The tree is counted by libxml2, its size is not walked in python.
+        Elements or attributes added or removed bypassing the journal are
+        detected unless their numbers cancel out. Changes of attribute values
+        bypassing the journal are not detected, only trees changed solely by
+        the helpers in this module are supposed to be tracked.
+        """
+        expected_element_count = self.initial_element_count
+        expected_attribute_count = (
+            self.initial_attribute_count - self._removed_attribute_count
+        )
+        for (
+            dummy_element,
+            dummy_parent,
+            dummy_position,
+            removed_count,
+        ) in self.deleted:
+            expected_element_count -= removed_count
+        for element in self.created:
+            if self.is_tracked(element) and not self.is_created(
+                cast(_Element, element).getparent()
+            ):
+                expected_element_count += count_elements(element)
+                expected_attribute_count += count_attributes(element)
+        for element, old_attrib in self.modified.items():
+            if self.is_tracked(element) and not self.is_created(element):
+                expected_attribute_count += len(element.attrib) - len(
+                    old_attrib
+                )
+        return (
+            count_elements(self.root) == expected_element_count
+            and count_attributes(self.root) == expected_attribute_count
+        )
+
+    def record_created(self, element: Element) -> None:
+        # elements put into new elements are covered by their ancestors
+        if not self.is_created(element):
+            self.created.append(element)
+            self._created_set.add(element)
+
+    def record_deleted(self, element: Element) -> None:
+        parent = cast(_Element, element).getparent()
+        removed_count, removed_attribute_count = (
+            (0, 0) if self.is_created(parent) else self._count_original(element)
+        )
+        self._removed_attribute_count += removed_attribute_count
+        self.deleted.append(
+            (element, parent, parent.index(element), removed_count)
+        )
+
+    def record_modified(self, element: Element) -> None:
+        if element not in self.modified:
+            self.modified[element] = dict(element.attrib)
+
+    def _count_original(self, element: Element) -> Tuple[int, int]:
+        # numbers of elements and attributes the journal started with
+        if element in self._created_set:
+            return 0, 0
+        element_count = 1
+        attribute_count = len(self.modified.get(element, element.attrib))
+        for child in cast(_Element, element).iterchildren(tag=etree.Element):
+            child_element_count, child_attribute_count = self._count_original(
+                cast(Element, child)
+            )
+            element_count += child_element_count
+            attribute_count += child_attribute_count
+        return element_count, attribute_count
+
+
+# Only one tree is tracked at a time so that journals of trees which are not
+# used anymore do not pile up.
+_active_journal: Optional[ChangeJournal] = None
+
+
+def start_change_journal(root: Element) -> ChangeJournal:
+    """
+    Start recording changes done to a tree by the helpers in this module
+
+    A journal being recorded is stopped when a new one is started.
+
+    root -- root element of the tree to be tracked
+    """
+    # pylint: disable=global-statement
+    global _active_journal
+    if _active_journal is not None:
+        _active_journal.is_active = False
+    _active_journal = ChangeJournal(root)
+    return _active_journal
+
+
+def stop_change_journal(journal: ChangeJournal) -> None:
+    """
+    Stop recording changes into the specified journal
+    """
+    # pylint: disable=global-statement
+    global _active_journal
+    journal.is_active = False
+    if _active_journal is journal:
+        _active_journal = None
+
+
+def _get_journal(element: Element) -> Optional[ChangeJournal]:
+    if _active_journal is not None and _active_journal.is_tracked(element):
+        return _active_journal
+    return None
+
+
+class ElementIndex:
+    """
+    Index elements of an xml tree by their ids and names
+
+    The index is built when it is used for the first time. Elements put into
+    the tree by the helpers in this module are added to the index. Elements
+    found in the index may have been removed from the tree or changed since,
+    so users of the index must check the elements they get.
+    """
+
+    def __init__(self, root: Element):
+        """
+        root -- root element of the tree to be indexed
+        """
+        self.root = root
+        # ids reserved for elements to be put into the tree
+        self.booked_ids: Set[str] = set()
+        self._by_id: Optional[Dict[str, List[Element]]] = None
+        self._by_name: Dict[str, List[Element]] = {}
+
+    def get_elements_by_id(self, element_id: str) -> List[Element]:
+        """
+        Return indexed elements having the specified id when they were indexed
+        """
+        self._ensure_built()
+        return cast(Dict[str, List[Element]], self._by_id).get(element_id, [])
+
+    def get_elements_by_name(self, name: str) -> List[Element]:
+        """
+        Return indexed elements having the specified name attribute when they
+        were indexed
+        """
+        self._ensure_built()
+        return self._by_name.get(name, [])
+
+    def add(self, element: Element) -> None:
+        """
+        Add an element and its descendants to the index
+
+        element -- element which has been put into the tree or changed its id
+            or name
+        """
+        if self._by_id is None:
+            # everything gets indexed on the first use of the index
+            return
+        for indexed in cast(_Element, element).iter():
+            for attr_name, index in (
+                ("id", self._by_id),
+                ("name", self._by_name),
+            ):
+                value = indexed.get(attr_name)
+                if value is None:
+                    continue
+                element_list = index.setdefault(value, [])
+                if indexed not in element_list:
+                    element_list.append(cast(Element, indexed))
+
+    def _ensure_built(self) -> None:
+        if self._by_id is None:
+            self._by_id = {}
+            self.add(self.root)
+
+
+# Only the last loaded tree is indexed so that indexes of trees which are not
+# used anymore do not pile up.
+_attached_index: Optional[ElementIndex] = None
+
+
+def attach_element_index(root: Element) -> ElementIndex:
+    """
+    Index elements of a tree, an index of a previously indexed tree is dropped
+
+    root -- root element of the tree to be indexed
+    """
+    # pylint: disable=global-statement
+    global _attached_index
+    _attached_index = ElementIndex(root)
+    return _attached_index
+
+
+def detach_element_index(index: ElementIndex) -> None:
+    """
+    Stop using the specified index
+    """
+    # pylint: disable=global-statement
+    global _attached_index
+    if _attached_index is index:
+        _attached_index = None
+
+
+def get_element_index(element: Element) -> Optional[ElementIndex]:
+    """
+    Return an index of the tree the element belongs to, None if not indexed
+    """
+    if (
+        _attached_index is not None
+        and cast(_Element, element).getroottree().getroot()
+        is _attached_index.root
+    ):
+        return _attached_index
+    return None
+
+
+def is_descendant(element: Element, ancestor: Element) -> bool:
+    """
+    Check the element is placed under the ancestor element in a tree
+    """
+    parent = cast(_Element, element).getparent()
+    while parent is not None:
+        if parent is ancestor:
+            return True
+        parent = parent.getparent()
+    return False
+
+
+def count_elements(element: Element) -> int:
+    """
+    Return the number of elements in a subtree including its root
+    """
+    return int(cast(_Element, element).xpath("count(descendant-or-self::*)"))
+
+
+def count_attributes(element: Element) -> int:
+    """
+    Return the number of attributes of elements in a subtree including its root
+    """
+    return int(cast(_Element, element).xpath("count(descendant-or-self::*/@*)"))
+
+
 def get_root(tree):
     # ElementTree has getroot, Elemet has getroottree
     return tree.getroot() if hasattr(tree, "getroot") else tree.getroottree()
@@ -53,9 +350,33 @@ def get_sub_element(
                 element.append(sub_element)
             else:
                 element.insert(new_index, sub_element)
+            _record_created(sub_element)
     return sub_element
 
 
+def append_new_element(
+    parent: Element,
+    tag: str,
+    attrib: Optional[Mapping[str, str]] = None,
+    index: Optional[int] = None,
+) -> Element:
+    """
+    Create a new element and put it into a parent
+
+    parent -- where to put the new element
+    tag -- tag of the new element
+    attrib -- attributes of the new element
+    index -- position of the new element, None means at the end
+    """
+    element = etree.Element(tag, attrib or {})
+    if index is None:
+        cast(_Element, parent).append(element)
+    else:
+        cast(_Element, parent).insert(index, element)
+    _record_created(cast(Element, element))
+    return cast(Element, element)
+
+
 def export_attributes(element: Element, with_id: bool = True) -> Dict[str, str]:
     result = dict((key, value) for key, value in element.attrib.items())
     if not with_id:
@@ -73,9 +394,16 @@ def update_attribute_remove_empty(element, name, value):
     """
     if not value:
         if name in element.attrib:
+            _record_modified(element)
             del element.attrib[name]
         return
+    if element.get(name) != value:
+        _record_modified(element)
     element.set(name, value)
+    if name in ("id", "name"):
+        index = get_element_index(element)
+        if index:
+            index.add(element)
 
 
 def update_attributes_remove_empty(element, attributtes):
@@ -157,6 +485,7 @@ def append_when_useful(parent, element, attribs_important=True, index=None):
             parent.append(element)
         else:
             parent.insert(index, element)
+        _record_created(element)
     return element
 
 
@@ -185,9 +514,10 @@ def reset_element(element, keep_attrs=None):
     """
     keep_attrs = keep_attrs or []
     for child in list(element):
-        element.remove(child)
+        remove_one_element(child)
     for key in element.attrib.keys():
         if key not in keep_attrs:
+            _record_modified(element)
             del element.attrib[key]
 
 
@@ -206,11 +536,16 @@ def move_elements(
         adjacent element
     """
     for el in to_move_list:
+        # a moved element is recorded as removed and created again
+        journal = _get_journal(el)
+        if journal and cast(_Element, el).getparent() is not None:
+            journal.record_deleted(el)
         if put_after_adjacent:
             cast(_Element, adjacent_el).addnext(cast(_Element, el))
             adjacent_el = el
         else:
             cast(_Element, adjacent_el).addprevious(cast(_Element, el))
+        _record_created(el)
 
 
 def remove_one_element(element: Element) -> None:
@@ -221,4 +556,22 @@ def remove_one_element(element: Element) -> None:
     """
     parent = cast(_Element, element).getparent()
     if parent is not None:
+        journal = _get_journal(element)
+        if journal:
+            journal.record_deleted(element)
         parent.remove(cast(_Element, element))
+
+
+def _record_created(element: Element) -> None:
+    journal = _get_journal(element)
+    if journal:
+        journal.record_created(element)
+    index = get_element_index(element)
+    if index:
+        index.add(element)
+
+
+def _record_modified(element: Element) -> None:
+    journal = _get_journal(element)
+    if journal:
+        journal.record_modified(element)
@@ -176,11 +176,25 @@ def print_node_utilization(filter_node=None, filter_name=None):
 def node_pacemaker_status(lib, argv, modifiers):
     """
     Internal pcs-pcsd command
+
+    Options:
+      * --wait - wait up to the specified number of seconds for pacemaker to
+        fully start on the local node before printing its status
     """
     del lib
     del argv
-    del modifiers
-    print(json.dumps(lib_pacemaker.get_local_node_status(utils.cmd_runner())))
+    modifiers.ensure_only_supported("--wait")
+    runner = utils.cmd_runner()
+    wait_timeout = None
+    if "--wait" in utils.pcs_options:
+        wait_timeout = utils.validate_wait_get_timeout(False)
+    if wait_timeout:
+        node_status = lib_pacemaker.wait_for_local_node_started(
+            runner, wait_timeout
+        )
+    else:
+        node_status = lib_pacemaker.get_local_node_status(runner)
+    print(json.dumps(node_status))
 
 
 def attribute_show_cmd(filter_node=None, filter_attr=None):
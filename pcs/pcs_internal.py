@@ -12,11 +12,13 @@ from pcs.common.reports import (
     ReportProcessor,
 )
 from pcs.lib.errors import LibraryError
+from pcs.lib.pacemaker.live import set_tool_help_cache
 
 
 SUPPORTED_COMMANDS = {
     "cluster.setup",
     "cluster.add_nodes",
+    "cluster.relay_requests",
     "cluster.remove_nodes",
     "status.full_cluster_status_plaintext",
 }
@@ -47,6 +49,7 @@ def get_cli_env(options):
     env.request_timeout = (
         options.get("request_timeout") or settings.default_request_timeout
     )
+    env.request_concurrency = options.get("request_concurrency")
     return env
 
 
@@ -80,6 +83,7 @@ def main():
 
     utils.subprocess_setup()
     logging.basicConfig()
+    set_tool_help_cache(settings.pacemaker_tool_help_cache)
 
     try:
         input_data = json.load(sys.stdin)
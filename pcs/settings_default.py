@@ -38,7 +38,15 @@ crm_report = os.path.join(pacemaker_binaries, "crm_report")
 crm_rule = os.path.join(pacemaker_binaries, "crm_rule")
 crm_verify = os.path.join(pacemaker_binaries, "crm_verify")
 cibadmin = os.path.join(pacemaker_binaries, "cibadmin")
-crm_mon_schema = "/usr/share/pacemaker/crm_mon.rng"
+# CIB diffs are computed in-process, set to True to compute them by crm_diff
+cib_diff_use_crm_diff = False
+# how many times to retry pushing CIB changes of commands able to redo them if
+# the CIB has been changed meanwhile, and the initial delay between retries in
+# seconds, the delay doubles with each retry
+cib_push_conflict_retry_max = 5
+cib_push_conflict_retry_delay = 0.2
+pacemaker_schema_dir = "/usr/share/pacemaker/"
+crm_mon_schema = os.path.join(pacemaker_schema_dir, "crm_mon.rng")
 agent_metadata_schema = "/usr/share/resource-agents/ra-api-1.dtd"
 pcsd_var_location = "/var/lib/pcsd/"
 pcsd_ruby_socket = "/run/pcsd-ruby.socket"
@@ -50,6 +58,9 @@ pcsd_settings_conf_location = os.path.join(
     pcsd_var_location, "pcs_settings.conf"
 )
 pcsd_dr_config_location = os.path.join(pcsd_var_location, "disaster-recovery")
+pacemaker_tool_help_cache = os.path.join(
+    pcsd_var_location, "pacemaker-tool-help.json"
+)
 pcsd_exec_location = "/usr/lib/pcsd/"
 pcsd_log_location = "/var/log/pcsd/pcsd.log"
 pcsd_default_port = 2224
@@ -68,6 +79,15 @@ pacemaker_wait_timeout_status = 124
 booth_config_dir = "/etc/booth"
 booth_binary = "/usr/sbin/booth"
 default_request_timeout = 60
+# in seconds, pcsd holds a request waiting for a node to start for at most this
+# long, pcs then sends the request again; pcsd limits the wait to
+# NODE_START_WAIT_REQUEST_MAX in its settings.rb
+node_start_wait_request_max = 30
+# in seconds, how often a node being waited for checks whether it has started
+node_start_check_interval = 0.25
+default_request_concurrency = 32
+# in seconds, None disables racing of node addresses
+node_address_race_delay = 0.3
 pcs_bundled_dir = "/usr/lib/pcs/bundled/"
 pcs_bundled_pacakges_dir = os.path.join(pcs_bundled_dir, "packages")
 
@@ -95,3 +115,19 @@ pcsd_gem_path = "vendor/bundle/ruby"
 ruby_executable = "/usr/bin/ruby"
 
 gui_session_lifetime_seconds = 60 * 60
+# least recently used web UI sessions are dropped when there are more of them
+gui_session_max_count = 10000
+# how often pcsd drops expired web UI sessions, in seconds
+gui_session_drop_expired_interval = 60
+
+# number of processes running PAM authentication and checking groups of users
+# in pcsd, the processes are replaced after running this many tasks each
+pcsd_auth_workers = 2
+pcsd_auth_worker_max_tasks = 100
+# pcsd keeps groups of authorized users for this many seconds, changes of groups
+# of a user take effect after that
+pcsd_user_groups_cache_ttl = 60
+pcsd_user_groups_cache_size = 1000
+# how often pcsd logs statistics of the auth processes and the user groups
+# cache in debug mode, in seconds
+pcsd_auth_stats_log_interval = 5 * 60
@@ -283,9 +283,12 @@ def check_nodes(node_list, prefix=""):
         )
         status_list.append(returncode)
 
-    utils.read_known_hosts_file()  # cache known hosts
-    utils.run_parallel(
-        utils.create_task_list(report, utils.checkAuthorization, node_list)
+    utils.run_node_requests(
+        [
+            utils.get_node_request(node, "remote/check_auth")
+            for node in node_list
+        ],
+        report,
     )
 
     return any([status != online_code for status in status_list])
@@ -26,6 +26,7 @@ def full_usage():
     out += strip_extras(client([], False))
     out += strip_extras(dr([], False))
     out += strip_extras(tag([], False))
+    out += strip_extras(batch([], False))
     print(out.strip())
     print("Examples:\n" + examples.replace(r" \ ", ""))
 
@@ -180,10 +181,19 @@ Options:
                        A few commands only use the specified file in read-only
                        mode since their effect is not a CIB modification.
     --debug            Print all network traffic and external commands run.
+    --debug-timing     Print how long requests to other nodes took, for each
+                       node and each request type, when the command finishes.
     --version          Print pcs version information. List pcs capabilities if
                        --full is specified.
     --request-timeout  Timeout for each outgoing request to another node in
                        seconds. Default is 60s.
+    --request-concurrency
+                       Maximal number of outgoing requests to other nodes
+                       processed at the same time. Default is 32.
+    --request-relay-fanout
+                       Send configuration files distributed to more than this
+                       number of nodes to this number of nodes only, which
+                       forward them to the other nodes. Disabled by default.
     --force            Override checks and errors, the exact behavior depends on
                        the command. WARNING: Using the --force option is
                        strongly discouraged unless you know what you are doing.
@@ -207,6 +217,7 @@ Commands:
     client      Manage pcsd client configuration.
     dr          Manage disaster recovery configuration.
     tag         Manage pacemaker tags.
+    batch       Run several CIB commands at once.
 """
     # Advanced usage to possibly add later
     #  --corosync_conf=<corosync file> Specify alternative corosync.conf file
@@ -2267,6 +2278,32 @@ Commands:
     return output
 
 
+def batch(args=(), pout=True):
+    output = """
+Usage: pcs batch <command>
+Run several CIB commands at once.
+
+Commands:
+    run <batch file> [--wait[=n]]
+        Run pcs commands listed in the batch file, one command per line. Empty
+        lines and lines starting with '#' are ignored. All the commands work
+        with one CIB which is pushed to the cluster once all of them have
+        succeeded. If any of the commands fails, no changes are pushed.
+        Supported commands are: resource create, resource [op] defaults set
+        create|delete|remove|update, constraint order|colocation set,
+        constraint ticket set|add, tag create|delete|remove|update. Options
+        -f, --wait, --corosync_conf, --debug, --debug-timing,
+        --request-timeout, --request-concurrency and --request-relay-fanout
+        can be specified only for the whole batch. If --wait is specified, pcs
+        will wait up to 'n' seconds for the changes to be applied in the
+        cluster.
+"""
+    if pout:
+        print(sub_usage(args, output))
+        return None
+    return output
+
+
 def dr(args=(), pout=True):
     output = """
 Usage: pcs dr <command>
@@ -2313,6 +2350,7 @@ def show(main_usage_name, rest_usage_names):
         "status": status,
         "stonith": stonith,
         "tag": tag,
+        "batch": batch,
     }
     if main_usage_name not in usage_map:
         raise Exception(
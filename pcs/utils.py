@@ -14,7 +14,6 @@ from io import BytesIO
 import tarfile
 import getpass
 import base64
-import threading
 import logging
 from functools import lru_cache
 from urllib.parse import urlencode
@@ -22,7 +21,9 @@ from urllib.parse import urlencode
 from typing import (
     Any,
     Dict,
+    Optional,
     Sequence,
+    Set,
     Tuple,
 )
 
@@ -34,7 +35,13 @@ from pcs.common import (
     pcs_pycurl as pycurl,
     reports,
 )
-from pcs.common.host import PcsKnownHost
+from pcs.common.known_hosts import get_known_hosts_store
+from pcs.common.node_communicator import (
+    CommunicationTimingStats,
+    Request,
+    RequestData,
+    RequestTarget,
+)
 from pcs.common.reports import ReportProcessor
 from pcs.common.reports.item import ReportItemList
 from pcs.common.reports.messages import CibUpgradeFailedToMinimalRequiredVersion
@@ -66,8 +73,7 @@ from pcs.lib.external import (
     is_proxy_set,
     is_systemctl,
 )
-from pcs.lib.file.instance import FileInstance as LibFileInstance
-from pcs.lib.interface.config import ParserErrorException
+from pcs.lib.file import metadata as lib_file_metadata
 from pcs.lib.pacemaker.live import has_wait_for_idle_support
 from pcs.lib.pacemaker.state import ClusterState
 from pcs.lib.pacemaker.values import (
@@ -89,6 +95,8 @@ usefile = False
 filename = ""
 # Note: not properly typed
 pcs_options: Dict[Any, Any] = {}
+# set in pcs module if timing of requests to other nodes is to be collected
+communication_timing_stats: Optional[CommunicationTimingStats] = None
 
 
 class UnknownPropertyException(Exception):
@@ -171,15 +179,6 @@ def checkStatus(node):
     return sendHTTPRequest(node, "remote/status", None, False, False)
 
 
-# Check and see if we're authorized (faster than a status check)
-def checkAuthorization(node):
-    """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
-    """
-    return sendHTTPRequest(node, "remote/check_auth", None, False, False)
-
-
 def get_uid_gid_file_name(uid, gid):
     """
     Commandline options: no options
@@ -285,78 +284,48 @@ def remove_uid_gid_file(uid, gid):
     return file_removed
 
 
-@lru_cache()
 def read_known_hosts_file():
     """
     Commandline options: no options
     """
-    data = {}
-    try:
-        if os.getuid() != 0:
-            known_hosts_raw_file = pcs_file.RawFile(
-                cli_file_metadata.for_file_type(file_type_codes.PCS_KNOWN_HOSTS)
-            )
-            # json.loads handles bytes, it expects utf-8, 16 or 32 encoding
-            known_hosts_struct = json.loads(known_hosts_raw_file.read())
-        else:
-            # TODO remove
-            # This is here to provide known-hosts to functions not yet
-            # overhauled to pcs.lib. Cli should never read known hosts from
-            # /var/lib/pcsd/.
-            known_hosts_instance = LibFileInstance.for_known_hosts()
-            known_hosts_struct = known_hosts_instance.read_to_structure()
-
-        # TODO use known hosts facade for getting info from json struct once the
-        # facade exists
-        data = {
-            name: PcsKnownHost.from_known_host_file_dict(name, host)
-            for name, host in known_hosts_struct["known_hosts"].items()
-        }
-    except LibraryError as e:
-        # TODO remove
-        # This is here to provide known-hosts to functions not yet
-        # overhauled to pcs.lib. Cli should never read known hosts from
-        # /var/lib/pcsd/.
-        process_library_reports(e.args)
-    except ParserErrorException as e:
+    if os.getuid() != 0:
+        metadata = cli_file_metadata.for_file_type(
+            file_type_codes.PCS_KNOWN_HOSTS
+        )
+    else:
         # TODO remove
         # This is here to provide known-hosts to functions not yet
         # overhauled to pcs.lib. Cli should never read known hosts from
         # /var/lib/pcsd/.
-        process_library_reports(
-            known_hosts_instance.parser_exception_to_report_list(e)
+        metadata = lib_file_metadata.for_file_type(
+            file_type_codes.PCS_KNOWN_HOSTS
         )
+    try:
+        return get_known_hosts_store(metadata).get_all()
     except pcs_file.RawFileError as e:
-        reports_output.warn("Unable to read the known-hosts file: " + e.reason)
+        __warn_known_hosts_once(
+            "Unable to read the known-hosts file: " + e.reason
+        )
     except json.JSONDecodeError as e:
-        reports_output.warn(f"Unable to parse the known-hosts file: {e}")
+        __warn_known_hosts_once(f"Unable to parse the known-hosts file: {e}")
     except (TypeError, KeyError):
-        reports_output.warn("Warning: Unable to parse the known-hosts file.")
-    return data
+        __warn_known_hosts_once(
+            "Warning: Unable to parse the known-hosts file."
+        )
+    return {}
+
+
+# the file is read each time known hosts are needed, warn only once
+__known_hosts_warning_set: Set[str] = set()
 
 
-def repeat_if_timeout(send_http_request_function, repeat_count=15):
+def __warn_known_hosts_once(message):
     """
     Commandline options: no options
-    NOTE: callback send_http_request_function may use --request-timeout
     """
-
-    def repeater(node, *args, **kwargs):
-        repeats_left = repeat_count
-        while True:
-            retval, output = send_http_request_function(node, *args, **kwargs)
-            if (
-                retval != 2
-                or "Operation timed out" not in output
-                or repeats_left < 1
-            ):
-                # did not timed out OR repeat limit exceeded
-                return retval, output
-            repeats_left = repeats_left - 1
-            if "--debug" in pcs_options:
-                print("{0}: {1}, trying again...".format(node, output))
-
-    return repeater
+    if message not in __known_hosts_warning_set:
+        __known_hosts_warning_set.add(message)
+        reports_output.warn(message)
 
 
 # Set the corosync.conf file on the specified node
@@ -379,98 +348,29 @@ def setCorosyncConfig(node, config):
         err("Unable to set corosync config: {0}".format(data))
 
 
-def getPacemakerNodeStatus(node):
-    """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
-    """
-    return sendHTTPRequest(
-        node, "remote/pacemaker_node_status", None, False, False
-    )
-
-
-def startCluster(node, quiet=False, timeout=None):
-    """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
-    """
-    return sendHTTPRequest(
-        node,
-        "remote/cluster_start",
-        printResult=False,
-        printSuccess=not quiet,
-        timeout=timeout,
-    )
-
-
-def stopPacemaker(node, quiet=False, force=True):
-    """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
-    """
-    return stopCluster(
-        node, pacemaker=True, corosync=False, quiet=quiet, force=force
-    )
-
-
-def stopCorosync(node, quiet=False, force=True):
-    """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
+def stop_cluster_on_nodes(
+    node_list, pacemaker=True, corosync=True, repeat_on_timeout=False
+):
     """
-    return stopCluster(
-        node, pacemaker=False, corosync=True, quiet=quiet, force=force
-    )
-
+    Stop cluster services on nodes, return error messages of failed nodes
 
-def stopCluster(node, quiet=False, pacemaker=True, corosync=True, force=True):
-    """
     Commandline options:
       * --request-timeout - timeout for HTTP requests
     """
-    data = dict()
+    data = []
     timeout = None
     if pacemaker and not corosync:
-        data["component"] = "pacemaker"
+        data.append(("component", "pacemaker"))
         timeout = 2 * 60
     elif corosync and not pacemaker:
-        data["component"] = "corosync"
-    if force:
-        data["force"] = 1
-    data = urlencode(data)
-    return sendHTTPRequest(
-        node,
+        data.append(("component", "corosync"))
+    data.append(("force", 1))
+    return send_http_request_to_nodes(
+        node_list,
         "remote/cluster_stop",
         data,
-        printResult=False,
-        printSuccess=not quiet,
         timeout=timeout,
-    )
-
-
-def enableCluster(node):
-    """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
-    """
-    return sendHTTPRequest(node, "remote/cluster_enable", None, False, True)
-
-
-def disableCluster(node):
-    """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
-    """
-    return sendHTTPRequest(node, "remote/cluster_disable", None, False, True)
-
-
-def destroyCluster(node, quiet=False):
-    """
-    Commandline options:
-      * --request-timeout - timeout for HTTP requests
-    """
-    return sendHTTPRequest(
-        node, "remote/cluster_destroy", None, not quiet, not quiet
+        repeat_on_timeout=repeat_on_timeout,
     )
 
 
@@ -591,31 +491,7 @@ def sendHTTPRequest(
             print("--Debug Communication Output End--")
             print()
 
-        if response_code == 401:
-            output = (
-                3,
-                (
-                    "Unable to authenticate to {node} - (HTTP error: {code}), "
-                    "try running 'pcs host auth {node}'"
-                ).format(node=host, code=response_code),
-            )
-        elif response_code == 403:
-            output = (
-                4,
-                "{node}: Permission denied - (HTTP error: {code})".format(
-                    node=host, code=response_code
-                ),
-            )
-        elif response_code >= 400:
-            output = (
-                1,
-                "Error connecting to {node} - (HTTP error: {code})".format(
-                    node=host, code=response_code
-                ),
-            )
-        else:
-            output = (0, response_data)
-
+        output = __get_http_request_result(host, response_code, response_data)
         if printResult and output[0] != 0:
             print(output[1])
 
@@ -630,13 +506,156 @@ def sendHTTPRequest(
         dummy_errno, reason = e.args
         if "--debug" in pcs_options:
             print("Response Reason: {0}".format(reason))
-        msg = (
+        output = __get_http_connection_failure_result(host, reason)
+        if printResult:
+            print(output[1])
+        return output
+
+
+def __get_http_request_result(host, response_code, response_data):
+    """
+    Commandline options: no options
+    """
+    if response_code == 401:
+        return (
+            3,
+            (
+                "Unable to authenticate to {node} - (HTTP error: {code}), "
+                "try running 'pcs host auth {node}'"
+            ).format(node=host, code=response_code),
+        )
+    if response_code == 403:
+        return (
+            4,
+            "{node}: Permission denied - (HTTP error: {code})".format(
+                node=host, code=response_code
+            ),
+        )
+    if response_code >= 400:
+        return (
+            1,
+            "Error connecting to {node} - (HTTP error: {code})".format(
+                node=host, code=response_code
+            ),
+        )
+    return (0, response_data)
+
+
+def __get_http_connection_failure_result(host, reason):
+    """
+    Commandline options: no options
+    """
+    return (
+        2,
+        (
             "Unable to connect to {host}, try setting higher timeout in "
             "--request-timeout option ({reason})"
-        ).format(host=host, reason=reason)
-        if printResult:
-            print(msg)
-        return (2, msg)
+        ).format(host=host, reason=reason),
+    )
+
+
+def get_node_request(node, request, data=()):
+    """
+    Create a request to be sent to a node by a Communicator
+
+    Commandline options: no options
+
+    string node -- name of the node
+    string request -- url path of the request
+    list data -- list of tuples, data to send with the request
+    """
+    known_host = read_known_hosts_file().get(node, None)
+    # TODO: do not allow communication with unknown host
+    target = (
+        RequestTarget.from_known_host(known_host)
+        if known_host
+        else RequestTarget(node)
+    )
+    return Request(target, RequestData(request, data))
+
+
+def run_node_requests(request_list, process_result, timeout=None, delay=None):
+    """
+    Send requests to nodes at once and process their results
+
+    All the requests are processed by one Communicator in the current thread,
+    results are processed as soon as they arrive.
+
+    Commandline options:
+      * --request-timeout - timeout for HTTP requests
+      * --debug
+
+    list request_list -- Request instances, see get_node_request
+    callable process_result -- called with a node name, a result code and an
+        output of a request, the same as returned by sendHTTPRequest. Returns
+        a delay in seconds after which the request is to be sent again or None
+        if the result is final.
+    int timeout -- default timeout of the requests in seconds
+    float delay -- send the requests after this many seconds
+    """
+    communicator = get_lib_env().get_node_communicator(
+        request_timeout=pcs_options.get("--request-timeout", timeout)
+    )
+    communicator.add_requests(request_list, delay=delay)
+    for response in communicator.start_loop():
+        node = response.request.host_label
+        if response.was_connected:
+            returncode, output = __get_http_request_result(
+                node, response.response_code, response.data
+            )
+        else:
+            returncode, output = __get_http_connection_failure_result(
+                node, response.error_msg
+            )
+        repeat_delay = process_result(node, returncode, output)
+        if repeat_delay is not None:
+            communicator.add_requests(
+                [response.request.copy()], delay=repeat_delay
+            )
+
+
+def send_http_request_to_nodes(
+    node_list, request, data=(), timeout=None, repeat_on_timeout=False
+):
+    """
+    Send a request to nodes at once, return error messages of failed nodes
+
+    Commandline options:
+      * --request-timeout - timeout for HTTP requests
+      * --debug
+
+    list node_list -- names of nodes to send the request to
+    string request -- url path of the request
+    list data -- list of tuples, data to send with the request
+    int timeout -- default timeout of the requests in seconds
+    bool repeat_on_timeout -- send a timed out request again, up to 15 times
+    """
+    node_errors = dict()
+    repeats_left = {node: 15 for node in node_list}
+
+    def process_result(node, returncode, output):
+        if (
+            repeat_on_timeout
+            and returncode == 2
+            and "Operation timed out" in output
+            and repeats_left[node] > 0
+        ):
+            repeats_left[node] -= 1
+            if "--debug" in pcs_options:
+                print("{0}: {1}, trying again...".format(node, output))
+            return 0
+        message = "{0}: {1}".format(node, output.strip())
+        print(message)
+        if returncode != 0:
+            node_errors[node] = message
+        return None
+
+    run_node_requests(
+        [get_node_request(node, request, data) for node in node_list],
+        process_result,
+        timeout=timeout,
+    )
+    return node_errors
 
 
 def __get_cookie_list(token):
@@ -1037,75 +1056,6 @@ def call_local_pcsd(argv, std_in=None):
         return [["Unable to communicate with pcsd"], 1, "", ""]
 
 
-def map_for_error_list(callab, iterab):
-    """
-    Commandline options: no options
-    NOTE: callback 'callab' may use some options
-    """
-    error_list = []
-    for item in iterab:
-        retval, error = callab(item)
-        if retval != 0:
-            error_list.append(error)
-    return error_list
-
-
-def run_parallel(worker_list, wait_seconds=1):
-    """
-    Commandline options: no options
-    """
-    thread_list = []
-    for worker in worker_list:
-        thread = threading.Thread(target=worker)
-        thread.daemon = True
-        thread.start()
-        thread_list.append(thread)
-
-    while thread_list:
-        for thread in thread_list:
-            thread.join(wait_seconds)
-            if not thread.is_alive():
-                thread_list.remove(thread)
-
-
-def create_task(report, action, node, *args, **kwargs):
-    """
-    Commandline options: no options
-    """
-
-    def worker():
-        returncode, output = action(node, *args, **kwargs)
-        report(node, returncode, output)
-
-    return worker
-
-
-def create_task_list(report, action, node_list, *args, **kwargs):
-    """
-    Commandline options: no options
-    """
-    return [
-        create_task(report, action, node, *args, **kwargs) for node in node_list
-    ]
-
-
-def parallel_for_nodes(action, node_list, *args, **kwargs):
-    """
-    Commandline options: no options
-    NOTE: callback 'action' may use some cmd options
-    """
-    node_errors = dict()
-
-    def report(node, returncode, output):
-        message = "{0}: {1}".format(node, output.strip())
-        print(message)
-        if returncode != 0:
-            node_errors[node] = message
-
-    run_parallel(create_task_list(report, action, node_list, *args, **kwargs))
-    return node_errors
-
-
 # Check if something exists in the CIB
 def does_exist(xpath_query):
     """
@@ -2721,6 +2671,9 @@ def get_lib_env() -> LibraryEnvironment:
       * -f - CIB file
       * --corosync_conf - corosync.conf file
       * --request-timeout - timeout of HTTP requests
+      * --request-concurrency - number of concurrent HTTP requests
+      * --request-relay-fanout - number of nodes relaying HTTP requests
+      * --debug-timing - collect timing of HTTP requests
     """
     user = None
     groups = None
@@ -2754,6 +2707,9 @@ def get_lib_env() -> LibraryEnvironment:
         corosync_conf_data,
         known_hosts_getter=read_known_hosts_file,
         request_timeout=pcs_options.get("--request-timeout"),
+        request_concurrency=pcs_options.get("--request-concurrency"),
+        communication_metrics=communication_timing_stats,
+        request_relay_fanout=pcs_options.get("--request-relay-fanout"),
     )
 
 
@@ -2779,12 +2735,18 @@ def get_cli_env():
     Commandline options:
       * --debug
       * --request-timeout
+      * --request-concurrency
+      * --request-relay-fanout
+      * --debug-timing
     """
     env = Env()
     env.user, env.groups = get_cib_user_groups()
     env.known_hosts_getter = read_known_hosts_file
     env.report_processor = get_report_processor()
     env.request_timeout = pcs_options.get("--request-timeout")
+    env.request_concurrency = pcs_options.get("--request-concurrency")
+    env.communication_metrics = communication_timing_stats
+    env.request_relay_fanout = pcs_options.get("--request-relay-fanout")
     return env
 
 
@@ -0,0 +1,62 @@
+# This module is intended to compare the in-process CIB diff with crm_diff.
+# Run it manually: python3 pcs_test/benchmark/cib_diff.py [cib file]
+
+# pylint: disable=wrong-import-position
+
+import logging
+import os.path
+import sys
+import timeit
+
+PACKAGE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, PACKAGE_DIR)
+
+from pcs import settings
+from pcs.cli.reports.processor import ReportProcessorToConsole
+from pcs.lib.external import CommandRunner
+from pcs.lib.pacemaker import diff
+from pcs.lib.pacemaker.live import diff_cibs_xml, get_cib
+from pcs.lib.xml_tools import etree_to_str
+from pcs_test.tools.misc import get_test_resource as rc
+
+REPEAT = 10
+
+cib_file = sys.argv[1] if len(sys.argv) > 1 else rc("cib-large.xml")
+with open(cib_file) as a_file:
+    cib_old_xml = a_file.read()
+
+
+def modify_cib(cib):
+    # the equivalent of 'pcs resource meta <first resource> foo=bar'
+    primitive = cib.find(".//resources/primitive")
+    meta = primitive.find("./meta_attributes")
+    meta.append(meta.makeelement("nvpair", id="bench-foo", name="foo"))
+    meta[-1].set("value", "bar")
+    return cib
+
+
+cib_new = modify_cib(get_cib(cib_old_xml))
+
+
+def native():
+    # the original CIB is kept as a string in LibraryEnvironment
+    return diff.diff_cibs_xml(get_cib(cib_old_xml), cib_new)
+
+
+def crm_diff():
+    reporter = ReportProcessorToConsole()
+    runner = CommandRunner(logging.getLogger("pcs"), reporter, {"LC_ALL": "C"})
+    return diff_cibs_xml(runner, reporter, cib_old_xml, etree_to_str(cib_new))
+
+
+print(f"CIB: {cib_file}, {len(cib_old_xml)} bytes, {REPEAT} runs")
+print(native())
+native_time = timeit.timeit(native, number=REPEAT) / REPEAT
+print(f"native:   {native_time * 1000:8.2f} ms")
+if os.path.exists(os.path.join(settings.pacemaker_binaries, "crm_diff")):
+    crm_diff_time = timeit.timeit(crm_diff, number=REPEAT) / REPEAT
+    print(f"crm_diff: {crm_diff_time * 1000:8.2f} ms")
+else:
+    print("crm_diff: not installed")
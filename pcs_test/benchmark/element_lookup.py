@@ -0,0 +1,69 @@
+# This module is intended to measure looking up CIB elements by their ids with
+# and without the element index attached to the CIB.
+# Run it manually: python3 pcs_test/benchmark/element_lookup.py
+
+# pylint: disable=wrong-import-position
+
+import os.path
+import sys
+import timeit
+
+PACKAGE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, PACKAGE_DIR)
+
+from lxml import etree
+
+from pcs.lib.cib.tools import find_element_by_tag_and_id, get_resources
+from pcs.lib.xml_tools import (
+    attach_element_index,
+    count_elements,
+    detach_element_index,
+)
+from pcs_test.tools.misc import get_test_resource as rc
+
+RESOURCE_COUNT_LIST = (500, 1000, 2000, 4000)
+# lookups without the index are slow, only some of them are measured
+SAMPLE_SIZE = 100
+
+
+def fixture_cib(resource_count):
+    cib = etree.parse(rc("cib-empty.xml")).getroot()
+    resources = get_resources(cib)
+    for i in range(resource_count):
+        primitive = etree.SubElement(
+            resources, "primitive", id=f"R{i}", type="Dummy"
+        )
+        meta = etree.SubElement(primitive, "meta_attributes", id=f"R{i}-meta")
+        etree.SubElement(meta, "nvpair", id=f"R{i}-meta-a", name="a", value="b")
+        operations = etree.SubElement(primitive, "operations")
+        etree.SubElement(
+            operations, "op", id=f"R{i}-monitor", name="monitor", interval="10"
+        )
+    return cib
+
+
+def lookup_all(cib, id_list):
+    resources = get_resources(cib)
+    for resource_id in id_list:
+        find_element_by_tag_and_id("primitive", resources, resource_id)
+
+
+print(f"{'resources':>9} {'elements':>8} {'xpath':>12} {'indexed':>12}")
+for resource_count in RESOURCE_COUNT_LIST:
+    cib = fixture_cib(resource_count)
+    id_list = [f"R{i}" for i in range(resource_count)]
+    sample_list = id_list[:: max(1, resource_count // SAMPLE_SIZE)]
+    xpath_time = (
+        timeit.timeit(lambda: lookup_all(cib, sample_list), number=1)
+        / len(sample_list)
+        * resource_count
+    )
+    index = attach_element_index(cib)
+    indexed_time = timeit.timeit(lambda: lookup_all(cib, id_list), number=1)
+    detach_element_index(index)
+    print(
+        f"{resource_count:>9} {count_elements(cib):>8} "
+        f"{xpath_time * 1000:>10.1f}ms {indexed_time * 1000:>10.1f}ms"
+    )
@@ -0,0 +1,94 @@
+# This module is intended to measure the overhead of capturing debug info of
+# node communication. It downloads a large response from a local https server
+# with each debug capture level.
+# Run it manually: python3 pcs_test/benchmark/node_communication_debug.py
+
+# pylint: disable=wrong-import-position
+
+import os.path
+import ssl
+import sys
+import tempfile
+import threading
+import timeit
+from http.server import (
+    BaseHTTPRequestHandler,
+    HTTPServer,
+)
+
+PACKAGE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, PACKAGE_DIR)
+
+from pcs.common.host import Destination
+from pcs.common.node_communicator import (
+    DebugCaptureLevel,
+    Request,
+    RequestData,
+    RequestTarget,
+    _create_request_handle,
+)
+from pcs.daemon.ssl import regenerate_cert_key
+
+RESPONSE_SIZE_LIST = [1024 ** 2, 16 * 1024 ** 2]
+REPEAT = 5
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):  # pylint: disable=invalid-name
+        size = int(self.path.rsplit("/", 1)[-1])
+        self.send_response(200)
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        self.wfile.write(b"x" * size)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+def start_server(tmp_dir):
+    cert_path = os.path.join(tmp_dir, "cert")
+    key_path = os.path.join(tmp_dir, "key")
+    regenerate_cert_key("localhost", cert_path, key_path)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    server = HTTPServer(("localhost", 0), Handler)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def download(port, size, debug_capture_level):
+    request = Request(
+        RequestTarget("localhost", dest_list=[Destination("localhost", port)]),
+        RequestData(str(size)),
+    )
+    handle = _create_request_handle(request, {}, 10, debug_capture_level)
+    handle.perform()
+    handle.close()
+
+
+with tempfile.TemporaryDirectory() as tmp_directory:
+    http_server = start_server(tmp_directory)
+    server_port = http_server.server_address[1]
+    level_list = list(DebugCaptureLevel)
+    print(
+        f"{'response':>9} "
+        + " ".join(f"{level.value:>12}" for level in level_list)
+    )
+    for response_size in RESPONSE_SIZE_LIST:
+        time_list = [
+            timeit.timeit(
+                # pylint: disable=cell-var-from-loop
+                lambda: download(server_port, response_size, level),
+                number=REPEAT,
+            )
+            / REPEAT
+            for level in level_list
+        ]
+        print(
+            f"{response_size // 1024 ** 2:>7}MB "
+            + " ".join(f"{t * 1000:>10.1f}ms" for t in time_list)
+        )
+    http_server.shutdown()
@@ -0,0 +1,77 @@
+# This module is intended to measure querying states of all resources of
+# a cluster status with and without sharing a resources state index and
+# querying a single resource with and without building an index.
+# Run it manually: python3 pcs_test/benchmark/resource_state.py
+
+# pylint: disable=wrong-import-position
+
+import os.path
+import sys
+import timeit
+
+PACKAGE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+sys.path.insert(0, PACKAGE_DIR)
+
+from lxml import etree
+
+from pcs.lib.pacemaker.state import (
+    ResourcesStateIndex,
+    get_resource_state,
+    is_resource_managed,
+)
+from pcs_test.tools.misc import get_test_resource as rc
+
+RESOURCE_COUNT_LIST = (100, 500, 1000)
+
+
+def fixture_status(resource_count):
+    status = etree.parse(rc("crm_mon.minimal.xml")).getroot()
+    resources = etree.SubElement(status, "resources")
+    for i in range(resource_count):
+        if i % 2:
+            parent = etree.SubElement(resources, "clone", id=f"R{i}-clone")
+            instance_list = [f"R{i}:0", f"R{i}:1"]
+        else:
+            parent = resources
+            instance_list = [f"R{i}"]
+        for instance in instance_list:
+            primitive = etree.SubElement(
+                parent,
+                "resource",
+                id=instance,
+                role="Started",
+                managed="true",
+                failed="false",
+            )
+            etree.SubElement(primitive, "node", name="node1", id="1")
+    return status
+
+
+def query_all(cluster_state, id_list):
+    for resource_id in id_list:
+        get_resource_state(cluster_state, resource_id)
+        is_resource_managed(cluster_state, resource_id)
+
+
+print(
+    f"{'resources':>9} {'per query':>12} {'shared':>12} "
+    f"{'one query':>12} {'one indexed':>12}"
+)
+for resource_count in RESOURCE_COUNT_LIST:
+    status = fixture_status(resource_count)
+    id_list = [f"R{i}" for i in range(resource_count)]
+    per_query_time = timeit.timeit(lambda: query_all(status, id_list), number=1)
+    shared_time = timeit.timeit(
+        lambda: query_all(ResourcesStateIndex(status), id_list), number=1
+    )
+    one_time = timeit.timeit(lambda: query_all(status, id_list[-1:]), number=1)
+    one_indexed_time = timeit.timeit(
+        lambda: query_all(ResourcesStateIndex(status), id_list[-1:]), number=1
+    )
+    print(
+        f"{resource_count:>9} {per_query_time * 1000:>10.1f}ms "
+        f"{shared_time * 1000:>10.1f}ms {one_time * 1000:>10.1f}ms "
+        f"{one_indexed_time * 1000:>10.1f}ms"
+    )
@@ -0,0 +1,135 @@
+from textwrap import dedent
+from unittest import mock, TestCase
+
+from pcs import resource
+from pcs.cli.batch import command
+from pcs.cli.common.errors import CmdLineInputError
+from pcs.cli.tag import command as tag_command
+from pcs.lib.errors import LibraryError
+from pcs_test.tools.misc import dict_to_modifiers
+
+
+class ParseBatchCommand(TestCase):
+    def test_find_longest_prefix(self):
+        batch_command = command.parse_batch_command(
+            ["resource", "defaults", "set", "create", "meta", "a=b"]
+        )
+        self.assertEqual(
+            batch_command.handler, resource.resource_defaults_set_create_cmd
+        )
+        self.assertEqual(batch_command.argv, ["meta", "a=b"])
+
+    def test_strip_pcs_and_options(self):
+        batch_command = command.parse_batch_command(
+            ["pcs", "resource", "create", "R", "ocf:pacemaker:Dummy"]
+            + ["--group", "G", "--disabled", "op", "monitor", "interval=-1"]
+        )
+        self.assertEqual(batch_command.handler, resource.resource_create)
+        self.assertEqual(
+            batch_command.argv,
+            ["R", "ocf:pacemaker:Dummy", "op", "monitor", "interval=-1"],
+        )
+        self.assertEqual(batch_command.modifiers.get("--group"), "G")
+        self.assertTrue(batch_command.modifiers.get("--disabled"))
+
+    def test_unsupported_command(self):
+        with self.assertRaises(CmdLineInputError) as cm:
+            command.parse_batch_command(["resource", "delete", "R"])
+        self.assertEqual(
+            cm.exception.message, "Unsupported command 'resource delete R'"
+        )
+
+    def test_batch_only_option(self):
+        for option in ("--wait", "-f=cib.xml", "--debug"):
+            with self.subTest(option=option), self.assertRaises(
+                CmdLineInputError
+            ) as cm:
+                command.parse_batch_command(["tag", "create", "T", option])
+            self.assertIn(
+                "can be specified only for the whole batch",
+                cm.exception.message,
+            )
+
+    def test_option_used_twice(self):
+        with self.assertRaises(CmdLineInputError) as cm:
+            command.parse_batch_command(
+                ["constraint", "order", "set", "A", "--force", "--force"]
+            )
+        self.assertEqual(cm.exception.message, "--force can only be used once")
+
+    def test_unknown_option(self):
+        with self.assertRaises(CmdLineInputError):
+            command.parse_batch_command(["tag", "create", "--nonsense"])
+
+
+class ParseBatch(TestCase):
+    def test_skip_comments_and_empty_lines(self):
+        command_list = command.parse_batch(
+            dedent(
+                """\
+                # create a tag
+
+                tag create T "a b" c # trailing comment
+                  tag update T remove c
+                """
+            )
+        )
+        self.assertEqual(
+            [(cmd.line_number, cmd.handler, cmd.argv) for cmd in command_list],
+            [
+                (3, tag_command.tag_create, ["T", "a b", "c"]),
+                (4, tag_command.tag_update, ["T", "remove", "c"]),
+            ],
+        )
+
+    @mock.patch("pcs.cli.reports.output.sys.stderr")
+    def test_report_line_number(self, mock_stderr):
+        with self.assertRaises(SystemExit):
+            command.parse_batch("tag create T A\ntag create 'T B\n")
+        mock_stderr.write.assert_called_once_with(
+            "Error: line 2: No closing quotation\n"
+        )
+
+
+class BatchRun(TestCase):
+    def setUp(self):
+        self.lib = mock.Mock(spec_set=["env", "middleware_factory"])
+        self.tag_lib = mock.Mock(spec_set=["tag"])
+        patcher = mock.patch("pcs.cli.batch.command.run_cib_transaction")
+        self.addCleanup(patcher.stop)
+        self.run_cib_transaction = patcher.start()
+        self.run_cib_transaction.side_effect = lambda env, factory, run_commands, wait=False: run_commands(
+            self.tag_lib
+        )
+        open_patcher = mock.patch(
+            "pcs.cli.batch.command.open",
+            mock.mock_open(read_data="tag create T A\ntag remove U\n"),
+            create=True,
+        )
+        self.addCleanup(open_patcher.stop)
+        open_patcher.start()
+
+    def test_no_args(self):
+        with self.assertRaises(CmdLineInputError):
+            command.batch_run(self.lib, [], dict_to_modifiers({}))
+        self.run_cib_transaction.assert_not_called()
+
+    def test_run_in_transaction(self):
+        command.batch_run(
+            self.lib, ["batch.txt"], dict_to_modifiers({"wait": "10"})
+        )
+        self.run_cib_transaction.assert_called_once_with(
+            self.lib.env, self.lib.middleware_factory, mock.ANY, wait="10",
+        )
+        self.tag_lib.tag.create.assert_called_once_with("T", ["A"])
+        self.tag_lib.tag.remove.assert_called_once_with(["U"])
+
+    @mock.patch("pcs.cli.batch.command.warn")
+    def test_stop_on_failure(self, mock_warn):
+        self.tag_lib.tag.create.side_effect = LibraryError()
+        with self.assertRaises(LibraryError):
+            command.batch_run(self.lib, ["batch.txt"], dict_to_modifiers({}))
+        self.tag_lib.tag.remove.assert_not_called()
+        mock_warn.assert_called_once_with(
+            "Command on line 1 failed, the batch has been aborted"
+        )
@@ -0,0 +1,54 @@
+from unittest import (
+    TestCase,
+    mock,
+)
+
+from pcs.cli.common.communication_timing import timing_stats_to_lines
+from pcs.common.node_communicator import (
+    CommunicationTimingRecord,
+    CommunicationTimingStats,
+)
+
+
+def fixture_stats(host_records, action_records):
+    stats = mock.Mock(spec_set=CommunicationTimingStats)
+    stats.get_host_records.return_value = host_records
+    stats.get_action_records.return_value = action_records
+    return stats
+
+
+class TimingStatsToLines(TestCase):
+    def test_no_requests(self):
+        self.assertEqual([], timing_stats_to_lines(fixture_stats({}, {})))
+
+    def test_slowest_first(self):
+        fast = CommunicationTimingRecord(
+            2, 0, 0.002, 0.004, 0.02, 0.1, 0.2, 0.15, 300, 4000
+        )
+        slow = CommunicationTimingRecord(
+            1, 1, 0.001, 0.002, 0.01, 2.5, 3.0, 3.0, 100, 20
+        )
+        self.assertEqual(
+            [
+                "Node communication timing (ms):",
+                "Node       Requests  Failed  DNS  Connect   TLS  1st byte"
+                "     Avg     Max  Sent  Received",
+                "slow-node         1       1  1.0      2.0  10.0    2500.0"
+                "  3000.0  3000.0   100        20",
+                "node1             2       0  1.0      2.0  10.0      50.0"
+                "   100.0   150.0   300      4000",
+                "",
+                "Action              Requests  Failed  DNS  Connect   TLS"
+                "  1st byte     Avg     Max  Sent  Received",
+                "remote/status              1       1  1.0      2.0  10.0"
+                "    2500.0  3000.0  3000.0   100        20",
+                "remote/get_configs         2       0  1.0      2.0  10.0"
+                "      50.0   100.0   150.0   300      4000",
+            ],
+            timing_stats_to_lines(
+                fixture_stats(
+                    {"node1": fast, "slow-node": slow},
+                    {"remote/get_configs": fast, "remote/status": slow},
+                )
+            ),
+        )
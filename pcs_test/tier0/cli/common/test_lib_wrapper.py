@@ -1,6 +1,8 @@
 from unittest import mock, TestCase
 
-from pcs.cli.common.lib_wrapper import Library
+from pcs.cli.common.env_cli import Env
+from pcs.cli.common.lib_wrapper import Library, run_cib_transaction
+from pcs.cli.common.middleware import create_middleware_factory
 
 
 class LibraryWrapperTest(TestCase):
@@ -25,8 +27,74 @@ class LibraryWrapperTest(TestCase):
         mock_middleware_factory.cib = dummy_middleware
         mock_middleware_factory.corosync_conf_existing = dummy_middleware
         mock_env = mock.MagicMock()
+        mock_env.batch_lib_env = None
         Library(mock_env, mock_middleware_factory).constraint_order.set(
             "first", second="third"
         )
 
         mock_order_set.assert_called_once_with(lib_env, "first", second="third")
+
+
+def dummy_middleware(next_in_line, env, *args, **kwargs):
+    return next_in_line(env, *args, **kwargs)
+
+
+@mock.patch("pcs.cli.common.lib_wrapper.lib_env_to_cli_env")
+@mock.patch("pcs.cli.common.lib_wrapper.cli_env_to_lib_env")
+class RunCibTransaction(TestCase):
+    def setUp(self):
+        self.cli_env = Env()
+        self.outer_middleware = mock.Mock(side_effect=dummy_middleware)
+        self.middleware_factory = create_middleware_factory(
+            cib=self.outer_middleware,
+            corosync_conf_existing=dummy_middleware,
+            booth_conf=self.outer_middleware,
+        )
+
+    @mock.patch("pcs.cli.common.lib_wrapper.tag.create")
+    @mock.patch("pcs.cli.common.lib_wrapper.tag.remove")
+    def test_share_lib_env(
+        self, mock_remove, mock_create, mock_cli_to_lib, mock_lib_to_cli
+    ):
+        lib_env = mock.Mock()
+        mock_cli_to_lib.return_value = lib_env
+
+        def run_commands(lib):
+            lib.tag.create("T", ["A"])
+            lib.tag.remove(["T"])
+            return "result"
+
+        self.assertEqual(
+            "result",
+            run_cib_transaction(
+                self.cli_env, self.middleware_factory, run_commands, wait="10"
+            ),
+        )
+        mock_create.assert_called_once_with(lib_env, "T", ["A"])
+        mock_remove.assert_called_once_with(lib_env, ["T"])
+        mock_cli_to_lib.assert_called_once_with(self.cli_env)
+        mock_lib_to_cli.assert_called_once_with(lib_env, self.cli_env)
+        self.outer_middleware.assert_called_once()
+        self.assertIsNone(self.cli_env.batch_lib_env)
+        lib_env.assert_has_calls(
+            [
+                mock.call.ensure_wait_satisfiable("10"),
+                mock.call.begin_cib_transaction(),
+                mock.call.commit_cib_transaction(wait="10"),
+            ]
+        )
+
+    def test_cancel_on_error(self, mock_cli_to_lib, mock_lib_to_cli):
+        lib_env = mock.Mock()
+        mock_cli_to_lib.return_value = lib_env
+
+        def run_commands(lib):
+            raise SystemExit(1)
+
+        with self.assertRaises(SystemExit):
+            run_cib_transaction(
+                self.cli_env, self.middleware_factory, run_commands
+            )
+        lib_env.cancel_cib_transaction.assert_called_once_with()
+        lib_env.commit_cib_transaction.assert_not_called()
+        mock_lib_to_cli.assert_not_called()
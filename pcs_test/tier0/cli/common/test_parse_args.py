@@ -547,6 +547,7 @@ class InputModifiersTest(TestCase):
             "--config",
             "--corosync",
             "--debug",
+            "--debug-timing",
             "--defaults",
             "--disabled",
             "--enable",
@@ -581,6 +582,8 @@ class InputModifiersTest(TestCase):
             "--group",
             "--name",
             "--node",
+            "--request-concurrency",
+            "--request-relay-fanout",
             "--request-timeout",
             "--to",
             # "--wait", # --wait is a special case, it has its own tests
@@ -639,6 +642,15 @@ class InputModifiersTest(TestCase):
     def test_debug_implicit(self):
         InputModifiers({"--debug": ""}).ensure_only_supported()
 
+    def test_debug_timing_implicit(self):
+        InputModifiers({"--debug-timing": ""}).ensure_only_supported()
+
+    def test_request_concurrency_implicit(self):
+        InputModifiers({"--request-concurrency": "4"}).ensure_only_supported()
+
+    def test_request_relay_fanout_implicit(self):
+        InputModifiers({"--request-relay-fanout": "4"}).ensure_only_supported()
+
     def test_bool_options(self):
         for opt in self.bool_opts:
             with self.subTest(opt=opt):
@@ -0,0 +1,35 @@
+from unittest import mock, TestCase
+
+from pcs_test.tools.misc import dict_to_modifiers
+
+from pcs import node
+
+NODE_STATUS = {"name": "node1", "online": True, "pending": False}
+
+
+@mock.patch("pcs.node.print")
+@mock.patch("pcs.node.utils.cmd_runner", lambda: "runner")
+@mock.patch("pcs.node.lib_pacemaker.wait_for_local_node_started")
+@mock.patch("pcs.node.lib_pacemaker.get_local_node_status")
+class NodePacemakerStatus(TestCase):
+    def test_no_wait(self, mock_status, mock_wait, mock_print):
+        mock_status.return_value = NODE_STATUS
+        with mock.patch("pcs.node.utils.pcs_options", {}):
+            node.node_pacemaker_status(None, [], dict_to_modifiers({}))
+        mock_status.assert_called_once_with("runner")
+        mock_wait.assert_not_called()
+        mock_print.assert_called_once_with(
+            '{"name": "node1", "online": true, "pending": false}'
+        )
+
+    def test_wait(self, mock_status, mock_wait, mock_print):
+        mock_wait.return_value = NODE_STATUS
+        with mock.patch("pcs.node.utils.pcs_options", {"--wait": "10"}):
+            node.node_pacemaker_status(
+                None, [], dict_to_modifiers({"wait": "10"})
+            )
+        mock_status.assert_not_called()
+        mock_wait.assert_called_once_with("runner", 10)
+        mock_print.assert_called_once_with(
+            '{"name": "node1", "online": true, "pending": false}'
+        )
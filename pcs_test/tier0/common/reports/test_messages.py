@@ -580,6 +580,17 @@ class NodeCommunicationNotConnected(NameBuildTest):
         )
 
 
+class NodeCommunicationConnectionPoolStats(NameBuildTest):
+    def test_success(self):
+        self.assert_message_from_report(
+            (
+                "Connection pool: 5 handles created, 3 handles reused, 2 "
+                "connections reused, 4 handles idle"
+            ),
+            reports.NodeCommunicationConnectionPoolStats(5, 3, 2, 4),
+        )
+
+
 class NodeCommunicationNoMoreAddresses(NameBuildTest):
     def test_success(self):
         self.assert_message_from_report(
@@ -708,6 +719,19 @@ class NodeCommunicationRetrying(NameBuildTest):
         )
 
 
+class NodeCommunicationRequestRetryScheduled(NameBuildTest):
+    def test_success(self):
+        self.assert_message_from_report(
+            (
+                "Request 'my/request' on node 'node_name' failed, attempt 2 "
+                "will be made in 1.3 seconds"
+            ),
+            reports.NodeCommunicationRequestRetryScheduled(
+                "node_name", "my/request", 2, 1.26
+            ),
+        )
+
+
 class DefaultsCanBeOverriden(NameBuildTest):
     def test_message(self):
         self.assert_message_from_report(
@@ -1853,6 +1877,37 @@ class CibPushError(NameBuildTest):
         )
 
 
+class CibPushConflict(NameBuildTest):
+    def test_one_retry(self):
+        self.assert_message_from_report(
+            (
+                "Unable to update cib, it has been changed by someone else in "
+                "the meantime; gave up after 1 retry"
+            ),
+            reports.CibPushConflict(1),
+        )
+
+    def test_more_retries(self):
+        self.assert_message_from_report(
+            (
+                "Unable to update cib, it has been changed by someone else in "
+                "the meantime; gave up after 5 retries"
+            ),
+            reports.CibPushConflict(5),
+        )
+
+
+class CibPushRebased(NameBuildTest):
+    def test_all(self):
+        self.assert_message_from_report(
+            (
+                "Cib has been changed by someone else in the meantime, changes "
+                "have been pushed after 2 retries"
+            ),
+            reports.CibPushRebased(2),
+        )
+
+
 class CibSaveTmpError(NameBuildTest):
     def test_all(self):
         self.assert_message_from_report(
@@ -0,0 +1,125 @@
+import json
+import os
+import os.path
+from tempfile import TemporaryDirectory
+from unittest import (
+    TestCase,
+    mock,
+)
+
+from pcs.common import file_type_codes
+from pcs.common.file import (
+    FileMetadata,
+    RawFileError,
+)
+from pcs.common.host import (
+    Destination,
+    PcsKnownHost,
+)
+from pcs.common.known_hosts import (
+    KnownHostsStore,
+    get_known_hosts_store,
+)
+
+
+def fixture_metadata(path):
+    return FileMetadata(
+        file_type_codes.PCS_KNOWN_HOSTS, path, None, None, 0o600, False
+    )
+
+
+def fixture_file_content(*host_names):
+    return json.dumps(
+        {
+            "format_version": 1,
+            "data_version": 1,
+            "known_hosts": {
+                name: {
+                    "dest_list": [{"addr": f"{name}.addr", "port": 2224}],
+                    "token": f"{name}-token",
+                }
+                for name in host_names
+            },
+        }
+    )
+
+
+def fixture_host(name):
+    return PcsKnownHost(
+        name, f"{name}-token", [Destination(f"{name}.addr", 2224)]
+    )
+
+
+class KnownHostsStoreTest(TestCase):
+    def setUp(self):
+        tmp_dir = TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, "known-hosts")
+        self.store = KnownHostsStore(fixture_metadata(self.path))
+
+    def write(self, content):
+        # pcsd replaces the file
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as known_hosts_file:
+            known_hosts_file.write(content)
+        os.replace(tmp_path, self.path)
+
+    def test_get(self):
+        self.write(fixture_file_content("node1", "node2"))
+        self.assertEqual(
+            {"node1": fixture_host("node1"), "node2": fixture_host("node2")},
+            dict(self.store.get_all()),
+        )
+        self.assertEqual(fixture_host("node2"), self.store.get("node2"))
+        self.assertIsNone(self.store.get("node3"))
+
+    def test_read_only(self):
+        self.write(fixture_file_content("node1"))
+        with self.assertRaises(TypeError):
+            self.store.get_all()["node2"] = fixture_host("node2")
+
+    def test_parsed_once(self):
+        self.write(fixture_file_content("node1"))
+        with mock.patch(
+            "pcs.common.known_hosts._parse", wraps=lambda data: {}
+        ) as mock_parse:
+            self.store.get_all()
+            self.store.get_all()
+            self.store.get("node1")
+        self.assertEqual(1, mock_parse.call_count)
+
+    def test_file_replaced(self):
+        self.write(fixture_file_content("node1"))
+        hosts = self.store.get_all()
+        self.write(fixture_file_content("node2"))
+        self.assertEqual(["node1"], list(hosts))
+        self.assertEqual(["node2"], list(self.store.get_all()))
+
+    def test_file_missing(self):
+        with self.assertRaises(RawFileError) as cm:
+            self.store.get_all()
+        self.assertEqual(RawFileError.ACTION_READ, cm.exception.action)
+        self.assertEqual(
+            f"No such file or directory: '{self.path}'", cm.exception.reason
+        )
+
+    def test_invalid_file(self):
+        self.write("{")
+        with self.assertRaises(json.JSONDecodeError):
+            self.store.get_all()
+        self.write(json.dumps({"hosts": {}}))
+        with self.assertRaises(KeyError):
+            self.store.get_all()
+        self.write(fixture_file_content("node1"))
+        self.assertEqual(["node1"], list(self.store.get_all()))
+
+
+class GetKnownHostsStoreTest(TestCase):
+    def test_shared_per_path(self):
+        store = get_known_hosts_store(fixture_metadata("/tmp/a/known-hosts"))
+        self.assertIs(
+            store, get_known_hosts_store(fixture_metadata("/tmp/a/known-hosts"))
+        )
+        self.assertIsNot(
+            store, get_known_hosts_store(fixture_metadata("/tmp/b/known-hosts"))
+        )
@@ -1,9 +1,12 @@
+import asyncio
+import gzip
 import io
 from unittest import mock, TestCase
 
 from pcs_test.tools.custom_mock import (
     MockCurl,
     MockCurlMulti,
+    MockCurlMultiSocket,
 )
 
 from pcs import settings
@@ -189,6 +192,19 @@ class RequestHostTest(TestCase):
         self.assertEqual(Destination(hostname, PORT), request.dest)
         self.assertRaises(StopIteration, request.next_dest)
 
+    def test_retry_dests(self):
+        hosts = ["host1", "host2", "host3"]
+        request = self._get_request(
+            lib.RequestTarget("label", dest_list=_addr_list_to_dest(hosts))
+        )
+        request.next_dest()
+        request.retry_dests([Destination("host1", None)])
+        request.next_dest()
+        self.assertEqual(Destination("host1", None), request.dest)
+        request.next_dest()
+        self.assertEqual(Destination("host3", None), request.dest)
+        self.assertRaises(StopIteration, request.next_dest)
+
     def test_multiple_hosts(self):
         hosts = ["host1", "host2", "host3"]
         request = self._get_request(
@@ -277,6 +293,13 @@ class CreateRequestHandleTest(TestCase):
         pycurl.NOSIGNAL: 1,
     }
 
+    def setUp(self):
+        patcher = mock.patch.object(
+            lib, "_curl_handle_pool", lib.CurlHandlePool()
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_all_info(self, mock_curl):
         mock_curl.return_value = MockCurl(
             None,
@@ -346,6 +369,400 @@ class CreateRequestHandleTest(TestCase):
         self.assertEqual("", handle.debug_buffer.getvalue().decode("utf-8"))
 
 
+class ResponseDetachHandleTest(TestCase):
+    def test_detach(self):
+        request = lib.Request(
+            lib.RequestTarget("host"), lib.RequestData("request")
+        )
+        handle = ResponseTest.fixture_handle(
+            {**fixture_timing_info(), pycurl.RESPONSE_CODE: 200},
+            request,
+            "output",
+            "debug",
+        )
+        response = lib.Response.connection_successful(handle)
+        response.detach_handle()
+        handle.request_obj = None
+        handle.output_buffer = None
+        handle.debug_buffer = None
+        handle._info = {}  # pylint: disable=protected-access
+        self.assertIsNone(response.handle)
+        self.assertIs(request, response.request)
+        self.assertEqual("output", response.data)
+        self.assertEqual("debug", response.debug)
+        self.assertEqual(200, response.response_code)
+        self.assertEqual(fixture_timing(), response.timing)
+
+
+def fixture_timing_info(total=0.5):
+    # pylint: disable=protected-access
+    return {
+        pycurl.NAMELOOKUP_TIME: 0.01,
+        pycurl.CONNECT_TIME: 0.02,
+        pycurl.APPCONNECT_TIME: 0.1,
+        pycurl.STARTTRANSFER_TIME: 0.4,
+        pycurl.TOTAL_TIME: total,
+        lib._INFO_SIZE_UPLOAD: 100,
+        lib._INFO_SIZE_DOWNLOAD: 2000,
+    }
+
+
+def fixture_timing(total=0.5):
+    return lib.ResponseTiming(0.01, 0.02, 0.1, 0.4, total, 100, 2000)
+
+
+class ResponseTimingTest(TestCase):
+    def test_from_handle(self):
+        response = lib.Response.connection_successful(
+            MockCurl(fixture_timing_info())
+        )
+        self.assertEqual(fixture_timing(), response.timing)
+
+
+def fixture_timing_response(host_label, action, code=200, total=0.5):
+    info = fixture_timing_info(total)
+    info[pycurl.RESPONSE_CODE] = code
+    return lib.Response.connection_successful(
+        MockCurl(
+            info,
+            request=lib.Request(
+                lib.RequestTarget(host_label), lib.RequestData(action)
+            ),
+        )
+    )
+
+
+class CommunicationTimingStatsTest(TestCase):
+    def test_aggregate(self):
+        stats = lib.CommunicationTimingStats()
+        stats.record_response(fixture_timing_response("node1", "a1"))
+        stats.record_response(
+            fixture_timing_response("node1", "a2", code=500, total=1.5)
+        )
+        stats.record_response(fixture_timing_response("node2", "a1"))
+        stats.record_response(
+            lib.Response.connection_failure(
+                MockCurl(
+                    fixture_timing_info(total=0.05),
+                    request=fixture_request(2, "a2"),
+                ),
+                pycurl.E_COULDNT_CONNECT,
+                "error",
+            )
+        )
+        host_records = stats.get_host_records()
+        self.assertEqual(
+            ["host2", "node1", "node2"], sorted(host_records.keys())
+        )
+        self.assertEqual(
+            lib.CommunicationTimingRecord(
+                2, 1, 0.02, 0.04, 0.2, 0.8, 2.0, 1.5, 200, 4000
+            ),
+            host_records["node1"],
+        )
+        self.assertEqual(
+            lib.CommunicationTimingRecord(
+                1, 1, 0.01, 0.02, 0.1, 0.4, 0.05, 0.05, 100, 2000
+            ),
+            host_records["host2"],
+        )
+        action_records = stats.get_action_records()
+        self.assertEqual(["a1", "a2"], sorted(action_records.keys()))
+        self.assertEqual(
+            lib.CommunicationTimingRecord(
+                2, 0, 0.02, 0.04, 0.2, 0.8, 1.0, 0.5, 200, 4000
+            ),
+            action_records["a1"],
+        )
+        self.assertEqual(2, action_records["a2"].failed_count)
+
+    def test_records_are_copies(self):
+        stats = lib.CommunicationTimingStats()
+        stats.record_response(fixture_timing_response("node1", "a1"))
+        stats.get_host_records()["node1"].request_count = 10
+        self.assertEqual(1, stats.get_host_records()["node1"].request_count)
+
+
+class CurlHandlePoolRealHandleTest(TestCase):
+    def test_reuse_handle(self):
+        pool = lib.CurlHandlePool()
+        handle = pool.get_handle(Destination("host1", None))
+        handle.request_obj = None
+        handle.output_buffer = io.BytesIO()
+        handle.debug_buffer = io.BytesIO()
+        pool.release(lib.Response(handle, True))
+        self.assertIs(handle, pool.get_handle(Destination("host1", None)))
+        stats = pool.get_stats()
+        self.assertEqual((1, 1), (stats.created, stats.reused))
+
+
+@mock.patch("pcs.common.node_communicator.pycurl.Curl")
+class CurlHandlePoolTest(TestCase):
+    # pylint: disable=no-self-use
+    def setUp(self):
+        self.pool = lib.CurlHandlePool()
+
+    @staticmethod
+    def fixture_response(handle, request=None, connected=True):
+        handle.request_obj = request
+        handle.output_buffer = io.BytesIO()
+        handle.debug_buffer = io.BytesIO()
+        return lib.Response(handle, connected)
+
+    def test_new_handles(self, mock_curl):
+        mock_curl.side_effect = MockCurl
+        handle1 = self.pool.get_handle(Destination("host1", None))
+        handle2 = self.pool.get_handle(Destination("host1", None))
+        self.assertIsNot(handle1, handle2)
+        self.assertEqual(("host1", PORT), handle1.pool_key)
+        self.assertIn(pycurl.SHARE, handle1.opts)
+        self.assertEqual(
+            lib.CurlHandlePoolStats(2, 0, 0, 0), self.pool.get_stats()
+        )
+
+    def test_reuse_handle(self, mock_curl):
+        mock_curl.side_effect = MockCurl
+        handle = self.pool.get_handle(Destination("host1", 1234))
+        handle.setopt(pycurl.TIMEOUT, 10)
+        response = self.fixture_response(handle, request="request")
+        self.pool.release(response)
+        self.assertIsNone(response.handle)
+        self.assertEqual("request", response.request)
+        self.assertEqual(
+            lib.CurlHandlePoolStats(1, 0, 0, 1), self.pool.get_stats()
+        )
+
+        self.assertIsNot(
+            handle, self.pool.get_handle(Destination("host1", None))
+        )
+        self.assertIsNot(
+            handle, self.pool.get_handle(Destination("host2", 1234))
+        )
+        reused_handle = self.pool.get_handle(Destination("host1", 1234))
+        self.assertIs(handle, reused_handle)
+        self.assertNotIn(pycurl.TIMEOUT, reused_handle.opts)
+        # a reset handle stays in the share, it must not be put there again
+        self.assertNotIn(pycurl.SHARE, reused_handle.opts)
+        self.assertEqual(
+            lib.CurlHandlePoolStats(3, 1, 0, 0), self.pool.get_stats()
+        )
+
+    def test_connections_reused(self, mock_curl):
+        mock_curl.side_effect = lambda: MockCurl({pycurl.NUM_CONNECTS: 0})
+        dest = Destination("host1", None)
+        self.pool.release(self.fixture_response(self.pool.get_handle(dest)))
+        self.pool.release(
+            self.fixture_response(self.pool.get_handle(dest), connected=False)
+        )
+        self.assertEqual(
+            lib.CurlHandlePoolStats(1, 1, 1, 1), self.pool.get_stats()
+        )
+
+    def test_max_idle(self, mock_curl):
+        mock_curl.side_effect = MockCurl
+        dest = Destination("host1", None)
+        handle_list = [
+            self.pool.get_handle(dest)
+            for _ in range(self.pool.max_idle_per_host + 1)
+        ]
+        for handle in handle_list:
+            self.pool.release(self.fixture_response(handle))
+        self.assertFalse(hasattr(handle_list[0], "closed"))
+        self.assertTrue(handle_list[-1].closed)
+        self.assertEqual(
+            lib.CurlHandlePoolStats(5, 0, 0, 4), self.pool.get_stats()
+        )
+
+    def test_ignore_foreign_handle(self, mock_curl):
+        handle = MockCurl()
+        response = self.fixture_response(handle)
+        self.pool.release(response)
+        self.assertIs(handle, response.handle)
+        self.assertEqual(
+            lib.CurlHandlePoolStats(0, 0, 0, 0), self.pool.get_stats()
+        )
+        mock_curl.assert_not_called()
+
+
+@mock.patch("pcs.common.node_communicator.pycurl.Curl")
+class CreateRequestHandleCompressionTest(TestCase):
+    # pylint: disable=protected-access
+    def setUp(self):
+        for name, value in (
+            ("_curl_handle_pool", lib.CurlHandlePool()),
+            ("_gzip_request_host_dict", {}),
+        ):
+            patcher = mock.patch.object(lib, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.large_data = "x" * lib._REQUEST_COMPRESSION_MIN_SIZE
+
+    @staticmethod
+    def create_handle(data, port=None):
+        return lib._create_request_handle(
+            lib.Request(
+                lib.RequestTarget(
+                    "label", dest_list=[Destination("host", port)]
+                ),
+                lib.RequestData("action", [("data", data)]),
+            ),
+            {},
+            10,
+        )
+
+    @staticmethod
+    def set_host_capability(accepts_compression, port=None):
+        # pylint: disable=protected-access
+        lib._gzip_request_host_dict[
+            ("host", port or PORT)
+        ] = accepts_compression
+
+    def test_accept_compressed_responses(self, mock_curl):
+        mock_curl.side_effect = MockCurl
+        handle = self.create_handle("")
+        self.assertEqual("gzip", handle.opts[pycurl.ACCEPT_ENCODING])
+
+    def test_not_compressed_for_unknown_host(self, mock_curl):
+        mock_curl.side_effect = MockCurl
+        handle = self.create_handle(self.large_data)
+        self.assertEqual(
+            f"data={self.large_data}".encode(),
+            handle.opts[pycurl.COPYPOSTFIELDS],
+        )
+        self.assertEqual(("Expect: ",), handle.opts[pycurl.HTTPHEADER])
+
+    def test_not_compressed_for_host_without_capability(self, mock_curl):
+        mock_curl.side_effect = MockCurl
+        self.set_host_capability(False)
+        handle = self.create_handle(self.large_data)
+        self.assertEqual(
+            f"data={self.large_data}".encode(),
+            handle.opts[pycurl.COPYPOSTFIELDS],
+        )
+        self.assertEqual(("Expect: ",), handle.opts[pycurl.HTTPHEADER])
+
+    def test_compressed_for_accepting_host(self, mock_curl):
+        mock_curl.side_effect = MockCurl
+        self.set_host_capability(True)
+        handle = self.create_handle(self.large_data)
+        self.assertNotIn(pycurl.COPYPOSTFIELDS, handle.opts)
+        body = handle.opts[pycurl.READFUNCTION](100000)
+        self.assertEqual(len(body), handle.opts[pycurl.POSTFIELDSIZE])
+        self.assertEqual(
+            f"data={self.large_data}".encode(), gzip.decompress(body)
+        )
+        self.assertEqual(
+            ("Expect: ", "Content-Encoding: gzip"),
+            handle.opts[pycurl.HTTPHEADER],
+        )
+        # curl is able to read the body again
+        handle.opts[pycurl.SEEKFUNCTION](0, 0)
+        self.assertEqual(body, handle.opts[pycurl.READFUNCTION](100000))
+
+    def test_compressed_data_not_in_debug(self, mock_curl):
+        mock_curl.side_effect = lambda: MockCurl(
+            debug_output_list=[
+                (pycurl.DEBUG_DATA_OUT, b"\x1f\x8b\x08"),
+                (pycurl.DEBUG_HEADER_IN, b"Content-Encoding: gzip\r\n"),
+                (pycurl.DEBUG_DATA_IN, b"\x1f\x8b"),
+            ]
+        )
+        self.set_host_capability(True)
+        handle = self.create_handle(self.large_data)
+        handle.opts[pycurl.HEADERFUNCTION](b"Content-Encoding: gzip\r\n")
+        handle.perform()
+        self.assertEqual(
+            (
+                ">> <3 bytes of compressed data>\n"
+                "< Content-Encoding: gzip\r\n"
+                "<< <2 bytes of compressed data>\n"
+            ),
+            handle.debug_buffer.getvalue().decode("utf-8"),
+        )
+
+    def test_not_compressed_for_other_port(self, mock_curl):
+        mock_curl.side_effect = MockCurl
+        self.set_host_capability(True, port=1234)
+        handle = self.create_handle(self.large_data)
+        self.assertEqual(("Expect: ",), handle.opts[pycurl.HTTPHEADER])
+
+    def test_small_data_not_compressed(self, mock_curl):
+        mock_curl.side_effect = MockCurl
+        self.set_host_capability(True)
+        handle = self.create_handle("x")
+        self.assertEqual(b"data=x", handle.opts[pycurl.COPYPOSTFIELDS])
+        self.assertEqual(("Expect: ",), handle.opts[pycurl.HTTPHEADER])
+
+
+@mock.patch("pcs.common.node_communicator.pycurl.Curl")
+class CreateRequestHandleDebugTest(TestCase):
+    # pylint: disable=protected-access
+    def setUp(self):
+        patcher = mock.patch.object(
+            lib, "_curl_handle_pool", lib.CurlHandlePool()
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.request = lib.Request(
+            lib.RequestTarget("label"), lib.RequestData("action")
+        )
+
+    @staticmethod
+    def fixture_curl():
+        return MockCurl(
+            None,
+            b"output",
+            [
+                (pycurl.DEBUG_TEXT, b"text"),
+                (pycurl.DEBUG_HEADER_OUT, b"header out"),
+                (pycurl.DEBUG_DATA_OUT, b"data out"),
+                (pycurl.DEBUG_HEADER_IN, b"header in"),
+                (pycurl.DEBUG_DATA_IN, b"data in"),
+                (pycurl.DEBUG_SSL_DATA_IN, b"ssl data in"),
+            ],
+        )
+
+    def test_full(self, mock_curl):
+        mock_curl.return_value = self.fixture_curl()
+        handle = lib._create_request_handle(
+            self.request, {}, 10, lib.DebugCaptureLevel.FULL
+        )
+        handle.perform()
+        self.assertEqual(1, handle.opts[pycurl.VERBOSE])
+        self.assertEqual(
+            "* text\n> header out\n>> data out\n< header in\n<< data in\n",
+            handle.debug_buffer.getvalue().decode("utf-8"),
+        )
+
+    def test_headers(self, mock_curl):
+        mock_curl.return_value = self.fixture_curl()
+        handle = lib._create_request_handle(
+            self.request, {}, 10, lib.DebugCaptureLevel.HEADERS
+        )
+        handle.perform()
+        self.assertEqual(1, handle.opts[pycurl.VERBOSE])
+        self.assertEqual(
+            "* text\n> header out\n< header in\n",
+            handle.debug_buffer.getvalue().decode("utf-8"),
+        )
+        self.assertEqual(
+            "output", handle.output_buffer.getvalue().decode("utf-8")
+        )
+
+    def test_off(self, mock_curl):
+        mock_curl.return_value = self.fixture_curl()
+        handle = lib._create_request_handle(
+            self.request, {}, 10, lib.DebugCaptureLevel.OFF
+        )
+        handle.perform()
+        self.assertNotIn(pycurl.VERBOSE, handle.opts)
+        self.assertNotIn(pycurl.DEBUGFUNCTION, handle.opts)
+        self.assertEqual("", handle.debug_buffer.getvalue().decode("utf-8"))
+        self.assertEqual(
+            "output", handle.output_buffer.getvalue().decode("utf-8")
+        )
+
+
 def fixture_request(host_id=1, action="action"):
     return lib.Request(
         lib.RequestTarget("host{0}".format(host_id)), lib.RequestData(action),
@@ -357,6 +774,11 @@ class CommunicatorBaseTest(TestCase):
         self.mock_com_log = mock.MagicMock(
             spec_set=lib.CommunicatorLoggerInterface
         )
+        patcher = mock.patch.object(
+            lib, "_curl_handle_pool", lib.CurlHandlePool()
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def get_communicator(self):
         return lib.Communicator(self.mock_com_log, None, None)
@@ -383,7 +805,10 @@ class CommunicatorSimpleTest(CommunicatorBaseTest):
         self.assertIs(handle, response.handle)
         self.assertIs(request, response.request)
         mock_create_handle.assert_called_once_with(
-            request, {}, settings.default_request_timeout
+            request,
+            {},
+            settings.default_request_timeout,
+            lib.DebugCaptureLevel.FULL,
         )
         return response
 
@@ -403,6 +828,12 @@ class CommunicatorSimpleTest(CommunicatorBaseTest):
         response = self.get_response(com, mock_create_handle, MockCurl())
         self.assert_common_checks(com, response)
 
+    def test_metrics(self, mock_create_handle, _):
+        metrics = mock.Mock(spec_set=lib.CommunicatorMetricsInterface)
+        com = lib.Communicator(self.mock_com_log, None, None, metrics=metrics)
+        response = self.get_response(com, mock_create_handle, MockCurl())
+        metrics.record_response.assert_called_once_with(response)
+
     def test_failure(self, mock_create_handle, _):
         com = self.get_communicator()
         expected_reason = "expected reason"
@@ -423,7 +854,7 @@ class CommunicatorMultiTest(CommunicatorBaseTest):
     )
     def test_call_start_loop_multiple_times(self, _, mock_create_handle):
         com = self.get_communicator()
-        mock_create_handle.side_effect = lambda request, _, __: MockCurl(
+        mock_create_handle.side_effect = lambda request, *_: MockCurl(
             request=request
         )
         com.add_requests([fixture_request(i) for i in range(2)])
@@ -478,6 +909,7 @@ class CommunicatorMultiTest(CommunicatorBaseTest):
             + [
                 mock.call.log_request_start(request_list[4]),
                 mock.call.log_response(response_list[4]),
+                mock.call.log_pool_stats(lib.CurlHandlePoolStats(5, 0, 0, 5)),
             ]
         )
         self.assertEqual(logger_calls, self.mock_com_log.mock_calls)
@@ -485,6 +917,351 @@ class CommunicatorMultiTest(CommunicatorBaseTest):
         com._multi_handle.assert_no_handle_left()
 
 
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+@mock.patch(
+    "pcs.common.node_communicator.pycurl.CurlMulti",
+    side_effect=lambda: MockCurlMulti([1, 1, 1, 1]),
+)
+class CommunicatorConcurrencyTest(CommunicatorBaseTest):
+    def test_limit_and_fairness(self, _, mock_create_handle):
+        com = lib.Communicator(
+            self.mock_com_log, None, None, request_concurrency=2
+        )
+        mock_create_handle.side_effect = lambda request, *_: MockCurl(
+            request=request
+        )
+        request_a1, request_a2, request_a3 = [
+            fixture_request(1, "action{0}".format(i)) for i in range(3)
+        ]
+        request_b1 = fixture_request(2)
+        com.add_requests([request_a1, request_a2, request_a3, request_b1])
+        response_list = list(com.start_loop())
+        self.assertEqual(
+            [request_a1, request_b1, request_a2, request_a3],
+            [response.request for response in response_list],
+        )
+        self.assertEqual(
+            [
+                mock.call.log_request_start(request_a1),
+                mock.call.log_request_start(request_b1),
+                mock.call.log_response(response_list[0]),
+                mock.call.log_request_start(request_a2),
+                mock.call.log_response(response_list[1]),
+                mock.call.log_request_start(request_a3),
+                mock.call.log_response(response_list[2]),
+                mock.call.log_response(response_list[3]),
+                mock.call.log_pool_stats(lib.CurlHandlePoolStats(0, 0, 0, 0)),
+            ],
+            self.mock_com_log.mock_calls,
+        )
+        # pylint: disable=no-member, protected-access
+        com._multi_handle.assert_no_handle_left()
+
+    @mock.patch.object(settings, "default_request_concurrency", 1)
+    def test_default_limit(self, _, mock_create_handle):
+        com = self.get_communicator()
+        mock_create_handle.side_effect = lambda request, *_: MockCurl(
+            request=request
+        )
+        request_list = [fixture_request(i) for i in range(2)]
+        com.add_requests(request_list)
+        response_list = list(com.start_loop())
+        self.assertEqual(
+            [
+                mock.call.log_request_start(request_list[0]),
+                mock.call.log_response(response_list[0]),
+                mock.call.log_request_start(request_list[1]),
+                mock.call.log_response(response_list[1]),
+                mock.call.log_pool_stats(lib.CurlHandlePoolStats(0, 0, 0, 0)),
+            ],
+            self.mock_com_log.mock_calls,
+        )
+
+
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+@mock.patch(
+    "pcs.common.node_communicator.pycurl.CurlMulti",
+    side_effect=lambda: MockCurlMulti([1, 0, 1]),
+)
+class CommunicatorDelayedRequestTest(CommunicatorBaseTest):
+    def test_delayed_request(self, _, mock_create_handle):
+        clock = {"now": 100.0}
+
+        def sleep(seconds):
+            clock["now"] += seconds
+
+        com = self.get_communicator()
+        mock_create_handle.side_effect = lambda request, *_: MockCurl(
+            request=request
+        )
+        request_now = fixture_request(1)
+        request_delayed = fixture_request(2)
+        with mock.patch(
+            "pcs.common.node_communicator.time.monotonic", lambda: clock["now"],
+        ), mock.patch(
+            "pcs.common.node_communicator.time.sleep", side_effect=sleep
+        ) as mock_sleep:
+            com.add_requests([request_delayed], delay=5)
+            com.add_requests([request_now])
+            response_list = list(com.start_loop())
+        mock_sleep.assert_called_once_with(5)
+        self.assertEqual(
+            [
+                mock.call.log_request_start(request_now),
+                mock.call.log_response(response_list[0]),
+                mock.call.log_request_start(request_delayed),
+                mock.call.log_response(response_list[1]),
+                mock.call.log_pool_stats(lib.CurlHandlePoolStats(0, 0, 0, 0)),
+            ],
+            self.mock_com_log.mock_calls,
+        )
+        # pylint: disable=no-member, protected-access
+        com._multi_handle.assert_no_handle_left()
+
+
+def fixture_large_request(host_id=1):
+    # pylint: disable=protected-access
+    return lib.Request(
+        lib.RequestTarget("host{0}".format(host_id)),
+        lib.RequestData(
+            "action", [("data", "x" * lib._REQUEST_COMPRESSION_MIN_SIZE)]
+        ),
+    )
+
+
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+class CommunicatorCompressionProbeTest(CommunicatorBaseTest):
+    # pylint: disable=protected-access
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(lib, "_gzip_request_host_dict", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def fixture_create_handle(probe_handle_kwargs):
+        def create_handle(request, *_):
+            if request.action != "remote/capabilities":
+                return MockCurl(request=request)
+            handle = MockCurl(request=request, **probe_handle_kwargs)
+            handle.output_buffer = io.BytesIO(
+                probe_handle_kwargs.get("output", b"")
+            )
+            return handle
+
+        return create_handle
+
+    def run_requests(self, mock_create_handle, request_list, performed_list):
+        with mock.patch(
+            "pcs.common.node_communicator.pycurl.CurlMulti",
+            side_effect=lambda: MockCurlMulti(performed_list),
+        ):
+            com = self.get_communicator()
+            com.add_requests(request_list)
+            response_list = list(com.start_loop())
+        com._multi_handle.assert_no_handle_left()
+        self.assertEqual(
+            request_list, [response.request for response in response_list]
+        )
+        return [
+            call_args[0][0].action
+            for call_args in mock_create_handle.call_args_list
+        ]
+
+    def test_capability_present(self, mock_create_handle):
+        mock_create_handle.side_effect = self.fixture_create_handle(
+            dict(
+                info={pycurl.RESPONSE_CODE: 200},
+                output=b'{"pcsd_capabilities": ["pcs.daemon-compression"]}',
+            )
+        )
+        action_list = self.run_requests(
+            mock_create_handle,
+            [fixture_large_request(), fixture_large_request()],
+            [1, 2],
+        )
+        self.assertEqual(
+            ["remote/capabilities", "action", "action"], action_list
+        )
+        self.assertEqual({("host1", PORT): True}, lib._gzip_request_host_dict)
+
+    def test_capability_missing(self, mock_create_handle):
+        mock_create_handle.side_effect = self.fixture_create_handle(
+            dict(
+                info={pycurl.RESPONSE_CODE: 200},
+                output=b'{"pcsd_capabilities": ["pcs.cluster-config"]}',
+            )
+        )
+        action_list = self.run_requests(
+            mock_create_handle, [fixture_large_request()], [1, 1]
+        )
+        self.assertEqual(["remote/capabilities", "action"], action_list)
+        self.assertEqual({("host1", PORT): False}, lib._gzip_request_host_dict)
+
+    def test_capabilities_not_provided(self, mock_create_handle):
+        mock_create_handle.side_effect = self.fixture_create_handle(
+            dict(info={pycurl.RESPONSE_CODE: 404})
+        )
+        action_list = self.run_requests(
+            mock_create_handle, [fixture_large_request()], [1, 1]
+        )
+        self.assertEqual(["remote/capabilities", "action"], action_list)
+        self.assertEqual({("host1", PORT): False}, lib._gzip_request_host_dict)
+
+    def test_not_connected(self, mock_create_handle):
+        mock_create_handle.side_effect = self.fixture_create_handle(
+            dict(error=(pycurl.E_SEND_ERROR, "reason"))
+        )
+        request_list = [fixture_large_request(), fixture_large_request()]
+        action_list = self.run_requests(
+            mock_create_handle, request_list, [1, 2]
+        )
+        # the host is not checked again by the communicator
+        self.assertEqual(
+            ["remote/capabilities", "action", "action"], action_list
+        )
+        self.assertEqual({}, lib._gzip_request_host_dict)
+
+    def test_no_probe(self, mock_create_handle):
+        mock_create_handle.side_effect = self.fixture_create_handle({})
+        lib._gzip_request_host_dict[("host2", PORT)] = True
+        action_list = self.run_requests(
+            mock_create_handle,
+            [fixture_request(1), fixture_large_request(2)],
+            [2],
+        )
+        self.assertEqual(["action", "action"], action_list)
+
+
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+@mock.patch(
+    "pcs.common.node_communicator.pycurl.CurlMulti", MockCurlMultiSocket
+)
+class AsyncCommunicatorTest(CommunicatorBaseTest):
+    def setUp(self):
+        super().setUp()
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    @staticmethod
+    async def finish_requests(com, count):
+        # pylint: disable=protected-access
+        multi_handle = com._multi_handle
+        while len(multi_handle.waiting_handle_list) < count:
+            await asyncio.sleep(0)
+        # finish the requests in the reversed order
+        for handle in reversed(multi_handle.waiting_handle_list):
+            multi_handle.finish(handle)
+
+    def test_responses(self, mock_create_handle):
+        com = lib.AsyncCommunicator(self.mock_com_log, None, None)
+        mock_create_handle.side_effect = lambda request, *_: MockCurl(
+            request=request
+        )
+        request_list = [fixture_request(i, f"action{i}") for i in range(2)]
+        request_added = fixture_request(2, "added")
+
+        async def get_response_list():
+            com.add_requests(request_list)
+            finisher = asyncio.ensure_future(self.finish_requests(com, 2))
+            response_list = []
+            async for response in com.start_loop():
+                response_list.append(response)
+                if response.request is request_list[1]:
+                    com.add_requests([request_added])
+                    finisher = asyncio.ensure_future(
+                        self.finish_requests(com, 1)
+                    )
+            await finisher
+            return response_list
+
+        response_list = self.loop.run_until_complete(get_response_list())
+        self.assertEqual(
+            ["action1", "action0", "added"],
+            [response.request.action for response in response_list],
+        )
+        self.assertEqual(
+            [
+                mock.call.log_request_start(request_list[0]),
+                mock.call.log_request_start(request_list[1]),
+                mock.call.log_response(response_list[0]),
+                mock.call.log_request_start(request_added),
+                mock.call.log_response(response_list[1]),
+                mock.call.log_response(response_list[2]),
+                mock.call.log_pool_stats(lib.CurlHandlePoolStats(0, 0, 0, 0)),
+            ],
+            self.mock_com_log.mock_calls,
+        )
+        # pylint: disable=protected-access
+        com._multi_handle.assert_no_handle_left()
+
+    def test_call_start_loop_multiple_times(self, mock_create_handle):
+        com = lib.AsyncCommunicator(self.mock_com_log, None, None)
+        mock_create_handle.side_effect = lambda request, *_: MockCurl(
+            request=request
+        )
+
+        async def start_twice():
+            com.add_requests([fixture_request(1)])
+            finisher = asyncio.ensure_future(self.finish_requests(com, 1))
+            loop = com.start_loop()
+            await loop.__anext__()
+            await finisher
+            with self.assertRaises(AssertionError):
+                await com.start_loop().__anext__()
+            await loop.aclose()
+
+        self.loop.run_until_complete(start_twice())
+
+
+class NodeCommunicatorFactoryTest(TestCase):
+    def test_debug_capture_level(self):
+        logger = mock.Mock()
+        logger.get_debug_capture_level.return_value = lib.DebugCaptureLevel.OFF
+        factory = lib.NodeCommunicatorFactory(logger, None, None, 10)
+        # pylint: disable=protected-access
+        self.assertEqual(
+            lib.DebugCaptureLevel.OFF,
+            factory.get_simple_communicator()._debug_capture_level,
+        )
+        self.assertEqual(
+            lib.DebugCaptureLevel.OFF,
+            factory.get_multiaddress_communicator()._debug_capture_level,
+        )
+
+    def test_request_concurrency(self):
+        factory = lib.NodeCommunicatorFactory(
+            mock.Mock(), None, None, 10, request_concurrency=3
+        )
+        # pylint: disable=protected-access
+        self.assertEqual(
+            3, factory.get_simple_communicator()._request_concurrency
+        )
+        self.assertEqual(
+            3, factory.get_multiaddress_communicator()._request_concurrency
+        )
+
+    def test_metrics(self):
+        metrics = mock.Mock()
+        factory = lib.NodeCommunicatorFactory(
+            mock.Mock(), None, None, 10, metrics=metrics
+        )
+        # pylint: disable=protected-access
+        self.assertIs(metrics, factory.get_simple_communicator()._metrics)
+        self.assertIs(metrics, factory.get_multiaddress_communicator()._metrics)
+        self.assertIs(metrics, factory.get_async_communicator()._metrics)
+
+    def test_async_communicator(self):
+        factory = lib.NodeCommunicatorFactory(
+            mock.Mock(), None, None, 10, request_concurrency=3
+        )
+        com = factory.get_async_communicator(request_timeout=20)
+        self.assertIsInstance(com, lib.AsyncCommunicator)
+        # pylint: disable=protected-access
+        self.assertEqual(20, com._request_timeout)
+        self.assertEqual(3, com._request_concurrency)
+
+
 def fixture_logger_request_retry_calls(response, hostname):
     return [
         mock.call.log_request_start(response.request),
@@ -518,7 +1295,7 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
             expected_response_list.append(response)
             return response
 
-        def _mock_create_request_handle(request, _, __):
+        def _mock_create_request_handle(request, *_):
             counter["counter"] += 1
             return (
                 MockCurl(request=request)
@@ -552,7 +1329,12 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
         self.assertEqual(3, len(expected_response_list))
         mock_create_handle.assert_has_calls(
             [
-                mock.call(request, {}, settings.default_request_timeout)
+                mock.call(
+                    request,
+                    {},
+                    settings.default_request_timeout,
+                    lib.DebugCaptureLevel.FULL,
+                )
                 for _ in range(3)
             ]
         )
@@ -566,6 +1348,7 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
             + [
                 mock.call.log_request_start(request),
                 mock.call.log_response(response),
+                mock.call.log_pool_stats(lib.CurlHandlePoolStats(0, 0, 0, 0)),
             ]
         )
         self.assertEqual(logger_calls, self.mock_com_log.mock_calls)
@@ -584,7 +1367,7 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
 
         mock_con_failure.side_effect = _con_failure
         com = self.get_multiaddress_communicator()
-        mock_create_handle.side_effect = lambda request, _, __: MockCurl(
+        mock_create_handle.side_effect = lambda request, *_: MockCurl(
             error=(pycurl.E_SEND_ERROR, "reason"), request=request,
         )
         request = lib.Request(
@@ -608,7 +1391,12 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
         self.assertEqual(4, len(expected_response_list))
         mock_create_handle.assert_has_calls(
             [
-                mock.call(request, {}, settings.default_request_timeout)
+                mock.call(
+                    request,
+                    {},
+                    settings.default_request_timeout,
+                    lib.DebugCaptureLevel.FULL,
+                )
                 for _ in range(3)
             ]
         )
@@ -626,8 +1414,188 @@ class MultiaddressCommunicatorTest(CommunicatorBaseTest):
                 mock.call.log_request_start(request),
                 mock.call.log_response(response),
                 mock.call.log_no_more_addresses(response),
+                mock.call.log_pool_stats(lib.CurlHandlePoolStats(0, 0, 0, 0)),
             ]
         )
         self.assertEqual(logger_calls, self.mock_com_log.mock_calls)
         # pylint: disable=no-member, protected-access
         com._multi_handle.assert_no_handle_left()
+
+
+@mock.patch("pcs.common.node_communicator._create_request_handle")
+class MultiaddressCommunicatorRaceTest(CommunicatorBaseTest):
+    def setUp(self):
+        super().setUp()
+        self.request = lib.Request(
+            lib.RequestTarget(
+                "label", dest_list=_addr_list_to_dest(["host0", "host1"]),
+            ),
+            lib.RequestData("action"),
+        )
+        self.handle_list = []
+
+    def fixture_create_handle(self, handle_info_dict):
+        def create_handle(request, *_):
+            handle = MockCurl(**handle_info_dict[request.dest.addr])
+            handle.request_obj = request
+            self.handle_list.append(handle)
+            return handle
+
+        return create_handle
+
+    def run_loop(
+        self,
+        mock_create_handle,
+        handle_info_dict,
+        info_read_list,
+        race_delay=0,
+    ):
+        mock_create_handle.side_effect = self.fixture_create_handle(
+            handle_info_dict
+        )
+        with mock.patch(
+            "pcs.common.node_communicator.pycurl.CurlMulti",
+            side_effect=lambda: MockCurlMulti(info_read_list),
+        ), mock.patch.object(settings, "node_address_race_delay", race_delay):
+            com = self.get_multiaddress_communicator()
+        com.add_requests([self.request])
+        response_list = list(com.start_loop())
+        # pylint: disable=no-member, protected-access
+        com._multi_handle.assert_no_handle_left()
+        return response_list
+
+    def test_next_address_wins(self, mock_create_handle):
+        response_list = self.run_loop(
+            mock_create_handle,
+            {
+                # connecting to host0 hangs
+                "host0": dict(),
+                "host1": dict(info={pycurl.CONNECT_TIME: 0.1}),
+            },
+            [0, 1],
+        )
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        self.assertTrue(response.was_connected)
+        self.assertIs(self.request, response.request)
+        self.assertEqual(Destination("host1", None), self.request.dest)
+        self.assertEqual(2, len(self.handle_list))
+        self.assertTrue(self.handle_list[0].closed)
+        self.assertEqual(
+            [
+                mock.call.log_request_start(self.request),
+                mock.call.log_request_start(self.request),
+                mock.call.log_response(response),
+                mock.call.log_pool_stats(lib.CurlHandlePoolStats(0, 0, 0, 0)),
+            ],
+            self.mock_com_log.mock_calls,
+        )
+
+    def test_cancelled_address_retried(self, mock_create_handle):
+        response_list = self.run_loop(
+            mock_create_handle,
+            {
+                # connecting to host0 hangs at first
+                "host0": dict(),
+                # host1 connects first and fails during the TLS handshake
+                "host1": dict(
+                    info={pycurl.CONNECT_TIME: 0.1},
+                    error=(pycurl.E_SSL_CONNECT_ERROR, "reason"),
+                ),
+            },
+            [0, 1, 1],
+        )
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        self.assertTrue(response.was_connected)
+        self.assertEqual(Destination("host0", None), self.request.dest)
+        self.assertEqual(3, len(self.handle_list))
+        self.assertTrue(self.handle_list[0].closed)
+        self.assertIs(self.handle_list[2], response.handle)
+        self.assertEqual(
+            [
+                mock.call.log_request_start(self.request),
+                mock.call.log_request_start(self.request),
+                mock.call.log_response(mock.ANY),
+                mock.call.log_retry(mock.ANY, Destination("host1", None)),
+                mock.call.log_request_start(self.request),
+                mock.call.log_response(response),
+                mock.call.log_pool_stats(lib.CurlHandlePoolStats(0, 0, 0, 0)),
+            ],
+            self.mock_com_log.mock_calls,
+        )
+
+    def test_first_address_connected(self, mock_create_handle):
+        response_list = self.run_loop(
+            mock_create_handle,
+            {"host0": dict(info={pycurl.CONNECT_TIME: 0.1})},
+            [0, 1],
+        )
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        self.assertTrue(response.was_connected)
+        self.assertEqual(Destination("host0", None), self.request.dest)
+        self.assertEqual(1, len(self.handle_list))
+        self.assertEqual(
+            [
+                mock.call.log_request_start(self.request),
+                mock.call.log_response(response),
+                mock.call.log_pool_stats(lib.CurlHandlePoolStats(0, 0, 0, 0)),
+            ],
+            self.mock_com_log.mock_calls,
+        )
+
+    def test_delay_not_elapsed(self, mock_create_handle):
+        response_list = self.run_loop(
+            mock_create_handle, {"host0": dict()}, [0, 1], race_delay=60,
+        )
+        self.assertEqual(1, len(response_list))
+        self.assertTrue(response_list[0].was_connected)
+        self.assertEqual(Destination("host0", None), self.request.dest)
+        self.assertEqual(1, len(self.handle_list))
+
+    def test_all_addresses_failed(self, mock_create_handle):
+        error = dict(error=(pycurl.E_SEND_ERROR, "reason"))
+        response_list = self.run_loop(
+            mock_create_handle, {"host0": error, "host1": error}, [1, 1],
+        )
+        self.assertEqual(1, len(response_list))
+        response = response_list[0]
+        self.assertFalse(response.was_connected)
+        self.assertEqual(Destination("host1", None), self.request.dest)
+        self.assertEqual(2, len(self.handle_list))
+        self.assertIs(self.handle_list[1], response.handle)
+        self.assertEqual(
+            [
+                mock.call.log_request_start(self.request),
+                mock.call.log_request_start(self.request),
+                mock.call.log_response(mock.ANY),
+                mock.call.log_response(response),
+                mock.call.log_no_more_addresses(response),
+                mock.call.log_pool_stats(lib.CurlHandlePoolStats(0, 0, 0, 0)),
+            ],
+            self.mock_com_log.mock_calls,
+        )
+
+    def test_race_disabled(self, mock_create_handle):
+        error = dict(error=(pycurl.E_SEND_ERROR, "reason"))
+        response_list = self.run_loop(
+            mock_create_handle,
+            {"host0": error, "host1": dict()},
+            [1, 1],
+            race_delay=None,
+        )
+        self.assertEqual(1, len(response_list))
+        self.assertTrue(response_list[0].was_connected)
+        self.assertEqual(Destination("host1", None), self.request.dest)
+        self.assertEqual(
+            [
+                mock.call.log_request_start(self.request),
+                mock.call.log_response(mock.ANY),
+                mock.call.log_retry(mock.ANY, Destination("host0", None)),
+                mock.call.log_request_start(self.request),
+                mock.call.log_response(response_list[0]),
+                mock.call.log_pool_stats(lib.CurlHandlePoolStats(0, 0, 0, 0)),
+            ],
+            self.mock_com_log.mock_calls,
+        )
@@ -1,5 +1,11 @@
-from unittest import TestCase
+from concurrent.futures.process import BrokenProcessPool
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
 import logging
+import os
+
+from tornado.gen import multi
+from tornado.ioloop import IOLoop
 
 from pcs_test.tools.misc import create_setup_patch_mixin
 
@@ -39,3 +45,230 @@ class AuthorizeUserSync(TestCase, create_setup_patch_mixin(auth)):
         user_auth_info = auth.authorize_user_sync(USER, PASSWORD)
         self.assertEqual(user_auth_info.name, USER)
         self.assertFalse(user_auth_info.is_authorized)
+
+
+def get_pid():
+    return os.getpid()
+
+
+def exit_first_time(marker_path):
+    if not os.path.exists(marker_path):
+        with open(marker_path, "w"):
+            pass
+        os._exit(1)  # pylint: disable=protected-access
+    return "done"
+
+
+def exit_always():
+    os._exit(1)  # pylint: disable=protected-access
+
+
+class WorkerPool(TestCase):
+    def setUp(self):
+        self.pool = auth.WorkerPool(worker_count=1, max_tasks_per_worker=2)
+        self.addCleanup(self.pool.shutdown)
+
+    def run_task(self, sync_fn, *args):
+        return IOLoop.current().run_sync(lambda: self.pool.run(sync_fn, *args))
+
+    def test_processes_reused_and_replaced(self):
+        pid_list = [self.run_task(get_pid) for _ in range(5)]
+        self.assertNotIn(os.getpid(), pid_list)
+        self.assertEqual(pid_list[0], pid_list[1])
+        self.assertNotEqual(pid_list[1], pid_list[2])
+        self.assertEqual(pid_list[2], pid_list[3])
+        self.assertNotEqual(pid_list[3], pid_list[4])
+
+    def test_died_process_replaced(self):
+        with TemporaryDirectory() as tmp_dir:
+            self.assertEqual(
+                "done",
+                self.run_task(exit_first_time, os.path.join(tmp_dir, "marker")),
+            )
+        self.assertEqual(1, self.pool.stats.task_count)
+
+    def test_died_process_replaced_once(self):
+        with self.assertRaises(BrokenProcessPool):
+            self.run_task(exit_always)
+        self.assertNotEqual(os.getpid(), self.run_task(get_pid))
+
+    def test_stats(self):
+        self.assertEqual(
+            auth.WorkerPoolStats(0, 0, 0, 0.0, 0.0), self.pool.stats
+        )
+        self.run_task(get_pid)
+        self.run_task(get_pid)
+        stats = self.pool.stats
+        self.assertEqual(2, stats.task_count)
+        self.assertEqual(0, stats.pending_count)
+        self.assertEqual(1, stats.max_pending_count)
+        self.assertGreater(stats.latency_max, 0)
+        self.assertLessEqual(stats.latency_avg, stats.latency_max)
+
+    def test_stats_pending(self):
+        async def run_tasks():
+            return await multi([self.pool.run(get_pid), self.pool.run(get_pid)])
+
+        IOLoop.current().run_sync(run_tasks)
+        self.assertEqual(2, self.pool.stats.max_pending_count)
+        self.assertEqual(0, self.pool.stats.pending_count)
+
+
+class GetUserGroupsSync(TestCase, create_setup_patch_mixin(auth)):
+    def setUp(self):
+        self.getgrouplist = self.setup_patch(
+            "os.getgrouplist", return_value=[10, 20, 30]
+        )
+        self.setup_patch("pwd.getpwnam", return_value=mock.Mock(pw_gid=10))
+        self.setup_patch("grp.getgrgid", side_effect=self.getgrgid)
+
+    @staticmethod
+    def getgrgid(gid):
+        if gid == 30:
+            raise KeyError(gid)
+        return mock.Mock(gr_name=f"group{gid}")
+
+    def test_groups_of_user_only(self):
+        self.assertEqual(
+            ("group10", "group20"), auth.get_user_groups_sync(USER)
+        )
+        self.getgrouplist.assert_called_once_with(USER, 10)
+
+
+class UserGroupsCache(TestCase, create_setup_patch_mixin(auth)):
+    def setUp(self):
+        self.monotonic = self.setup_patch("time.monotonic", return_value=100)
+        self.cache = auth.UserGroupsCache(ttl=10, max_size=2)
+
+    def test_get(self):
+        self.assertIsNone(self.cache.get("user1"))
+        self.cache.set("user1", ["group1"])
+        self.assertEqual(("group1",), self.cache.get("user1"))
+        self.assertEqual(
+            auth.UserGroupsCacheStats(hit_count=1, miss_count=1, size=1),
+            self.cache.stats,
+        )
+
+    def test_expired(self):
+        self.cache.set("user1", ["group1"])
+        self.monotonic.return_value = 109.9
+        self.assertEqual(("group1",), self.cache.get("user1"))
+        self.monotonic.return_value = 110
+        self.assertIsNone(self.cache.get("user1"))
+        self.assertEqual(
+            auth.UserGroupsCacheStats(hit_count=1, miss_count=1, size=0),
+            self.cache.stats,
+        )
+
+    def test_max_size(self):
+        self.cache.set("user1", ["group1"])
+        self.cache.set("user2", ["group2"])
+        self.cache.set("user1", ["group1"])
+        self.cache.set("user3", ["group3"])
+        self.assertIsNone(self.cache.get("user2"))
+        self.assertEqual(("group1",), self.cache.get("user1"))
+        self.assertEqual(("group3",), self.cache.get("user3"))
+
+    def test_invalidate(self):
+        self.cache.set("user1", ["group1"])
+        self.cache.invalidate("user1")
+        self.cache.invalidate("user2")
+        self.assertIsNone(self.cache.get("user1"))
+
+
+class CachedUserGroups(TestCase, create_setup_patch_mixin(auth)):
+    def setUp(self):
+        self.cache = auth.UserGroupsCache(ttl=10, max_size=10)
+        self.setup_patch("_user_groups_cache", self.cache)
+        self.setup_patch("run_in_process", self.run_in_process)
+        self.authenticate_by_pam = self.setup_patch(
+            "authenticate_by_pam", return_value=True
+        )
+        self.get_user_groups_sync = self.setup_patch(
+            "get_user_groups_sync", return_value=(auth.HA_ADM_GROUP,)
+        )
+
+    @staticmethod
+    async def run_in_process(sync_fn, *args):
+        return sync_fn(*args)
+
+    @staticmethod
+    def run_coroutine(coroutine, *args):
+        return IOLoop.current().run_sync(lambda: coroutine(*args))
+
+    def test_shared(self):
+        self.assertTrue(
+            self.run_coroutine(
+                auth.authorize_user, USER, PASSWORD
+            ).is_authorized
+        )
+        self.assertTrue(
+            self.run_coroutine(auth.check_user_groups, USER).is_authorized
+        )
+        self.assertTrue(
+            self.run_coroutine(
+                auth.authorize_user, USER, PASSWORD
+            ).is_authorized
+        )
+        self.assertEqual(1, self.get_user_groups_sync.call_count)
+        self.assertEqual(2, self.authenticate_by_pam.call_count)
+        self.assertEqual(
+            auth.UserGroupsCacheStats(hit_count=2, miss_count=1, size=1),
+            self.cache.stats,
+        )
+
+    def test_not_authorized_not_cached(self):
+        self.get_user_groups_sync.return_value = ()
+        self.assertFalse(
+            self.run_coroutine(auth.check_user_groups, USER).is_authorized
+        )
+        self.assertFalse(
+            self.run_coroutine(auth.check_user_groups, USER).is_authorized
+        )
+        self.assertEqual(2, self.get_user_groups_sync.call_count)
+
+    def test_invalidated_on_login_failure(self):
+        self.run_coroutine(auth.check_user_groups, USER)
+        self.authenticate_by_pam.return_value = False
+        self.assertFalse(
+            self.run_coroutine(
+                auth.authorize_user, USER, PASSWORD
+            ).is_authorized
+        )
+        self.assertIsNone(self.cache.get(USER))
+
+
+class LogStats(TestCase, create_setup_patch_mixin(auth)):
+    def setUp(self):
+        self.cache = auth.UserGroupsCache(ttl=10, max_size=10)
+        self.setup_patch("_user_groups_cache", self.cache)
+        self.log = self.setup_patch("log")
+
+    def test_stats_logged(self):
+        self.cache.set(USER, (auth.HA_ADM_GROUP,))
+        self.cache.get(USER)
+        self.cache.get("other")
+        pool = mock.Mock(
+            stats=auth.WorkerPoolStats(
+                task_count=5,
+                pending_count=1,
+                max_pending_count=3,
+                latency_avg=0.25,
+                latency_max=1.5,
+            )
+        )
+        self.setup_patch("_worker_pool", pool)
+        self.log.reset_mock()
+        auth.log_stats()
+        self.assertEqual(
+            [
+                mock.call(mock.ANY, 5, 1, 3, 0.25, 1.5),
+                mock.call(mock.ANY, 1, 1, 1),
+            ],
+            self.log.pcsd.debug.call_args_list,
+        )
+
+    def test_no_worker_pool(self):
+        self.setup_patch("_worker_pool", None)
+        auth.log_stats()
+        self.log.pcsd.debug.assert_called_once_with(mock.ANY, 0, 0, 0)
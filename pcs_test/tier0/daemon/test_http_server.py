@@ -39,10 +39,11 @@ class ManageTest(TestCase, create_setup_patch_mixin(http_server)):
         self.assertEqual(0, len(self.server_list))
         self.assertFalse(self.https_server_manage.server_is_running)
 
-    def HTTPServer(self, app, ssl_options):
+    def HTTPServer(self, app, ssl_options, decompress_request):
         # pylint: disable=invalid-name
         self.assertEqual(self.app, app)
         self.assertEqual(self.pcsd_ssl.create_context.return_value, ssl_options)
+        self.assertTrue(decompress_request)
         self.server_list.append(MagicMock(spec_set=HTTPServer))
         return self.server_list[-1]
 
@@ -138,6 +138,27 @@ class RunRuby(AsyncTestCase):
         self.assert_sinatra_result(result, headers, status, body)
 
 
+class RubyDaemonRequestTest(TestCase):
+    def test_decompressed_body_length(self):
+        http_request = create_http_request()
+        http_request.headers["Content-Length"] = "10"
+        http_request.headers["X-Consumed-Content-Encoding"] = "gzip"
+        request = ruby_pcsd.RubyDaemonRequest(
+            ruby_pcsd.SINATRA_REMOTE, http_request
+        )
+        self.assertEqual(
+            str(len(http_request.body)), request.headers["Content-Length"]
+        )
+
+    def test_body_length_kept(self):
+        http_request = create_http_request()
+        http_request.headers["Content-Length"] = "10"
+        request = ruby_pcsd.RubyDaemonRequest(
+            ruby_pcsd.SINATRA_REMOTE, http_request
+        )
+        self.assertEqual("10", request.headers["Content-Length"])
+
+
 class ProcessResponseLog(TestCase):
     @patch_ruby_pcsd("log.from_external_source")
     @patch_ruby_pcsd("next", mock.Mock(return_value=1))
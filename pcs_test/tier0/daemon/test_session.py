@@ -51,19 +51,18 @@ class SessionTest(TestCase, AssertMixin, PatchSessionMixin):
         self.assertFalse(self.session.was_unused_last(2))
 
     def test_session_is_refreshable(self):
-        # pylint: disable=pointless-statement
         with self.refresh_test() as session1:
             session1.refresh()
-        with self.refresh_test() as session1:
-            session1.is_authenticated
-        with self.refresh_test() as session1:
-            session1.username
-        with self.refresh_test() as session1:
-            session1.groups
-        with self.refresh_test() as session1:
-            session1.sid
-        with self.refresh_test() as session1:
-            session1.ajax_id
+
+    def test_session_is_not_refreshed_by_reading(self):
+        # pylint: disable=pointless-statement
+        self.now.return_value = 10.1
+        self.session.is_authenticated
+        self.session.username
+        self.session.groups
+        self.session.sid
+        self.session.ajax_id
+        self.assertTrue(self.session.was_unused_last(10))
 
 
 class StorageTest(TestCase, AssertMixin, PatchSessionMixin):
@@ -131,3 +130,32 @@ class StorageTest(TestCase, AssertMixin, PatchSessionMixin):
         session2 = self.storage.rejected_user(session1.sid, USER)
         self.assert_login_failed_session(session2, USER)
         self.assertEqual(session1.sid, session2.sid)
+
+    def test_drop_expired_sessions_in_order_of_access(self):
+        session1 = self.storage.provide()
+        self.now.return_value = 5
+        session2 = self.storage.provide()
+        self.now.return_value = 8
+        self.assertIs(session1, self.storage.provide(session1.sid))
+        self.now.return_value = 16
+        self.storage.drop_expired()
+        self.assertIsNot(session2, self.storage.provide(session2.sid))
+        self.assertIs(session1, self.storage.provide(session1.sid))
+
+    def test_drop_least_recently_used_sessions(self):
+        storage = session.Storage(lifetime_seconds=10, max_count=2)
+        session1 = storage.provide()
+        session2 = storage.provide()
+        self.assertIs(session1, storage.provide(session1.sid))
+        session3 = storage.provide()
+        self.assertIs(session1, storage.provide(session1.sid))
+        self.assertIs(session3, storage.provide(session3.sid))
+        self.assertIsNot(session2, storage.provide(session2.sid))
+
+    def test_login_existing_session_keeps_count(self):
+        storage = session.Storage(lifetime_seconds=10, max_count=2)
+        session1 = storage.provide()
+        session2 = storage.provide()
+        session3 = storage.login(session1.sid, USER, GROUPS)
+        self.assertIs(session2, storage.provide(session2.sid))
+        self.assertIs(session3, storage.provide(session1.sid))
@@ -15,6 +15,12 @@ from pcs.common.reports import codes as report_codes
 from pcs.common.tools import Version
 
 from pcs.lib.cib import tools as lib
+from pcs.lib.xml_tools import (
+    append_new_element,
+    attach_element_index,
+    detach_element_index,
+    update_attribute_remove_empty,
+)
 
 # pylint: disable=no-self-use, line-too-long
 
@@ -110,6 +116,96 @@ class IdProviderAllocate(IdProviderTest):
         self.assertEqual("myId-2", self.provider.allocate_id("myId"))
 
 
+class IdProviderIndex(IdProviderTest):
+    def test_removed_element(self):
+        self.fixture_add_primitive_with_id("myId")
+        self.assertEqual("myId-1", self.provider.allocate_id("myId"))
+        primitive = self.cib.tree.find(".//primitive")
+        primitive.getparent().remove(primitive)
+        assert_report_item_list_equal(self.provider.book_ids("myId"), [])
+
+    def test_changed_id(self):
+        self.fixture_add_primitive_with_id("myId")
+        assert_report_item_list_equal(
+            self.provider.book_ids("myId"), [self.fixture_report("myId")]
+        )
+        self.cib.tree.find(".//primitive").set("id", "otherId")
+        assert_report_item_list_equal(self.provider.book_ids("myId"), [])
+
+    def test_added_element(self):
+        self.assertEqual("myId", self.provider.allocate_id("myId"))
+        resources = self.cib.tree.find(".//resources")
+        append_new_element(resources, "primitive", {"id": "otherId"})
+        self.assertEqual("otherId-1", self.provider.allocate_id("otherId"))
+        assert_report_item_list_equal(
+            self.provider.book_ids("otherId"), [self.fixture_report("otherId")]
+        )
+
+    def test_added_element_id_changed(self):
+        self.assertEqual("myId", self.provider.allocate_id("myId"))
+        resources = self.cib.tree.find(".//resources")
+        primitive = append_new_element(resources, "primitive", {"id": "A"})
+        update_attribute_remove_empty(primitive, "id", "otherId")
+        self.assertEqual("otherId-1", self.provider.allocate_id("otherId"))
+        self.assertEqual("A", self.provider.allocate_id("A"))
+
+    def test_added_remote_node(self):
+        self.assertEqual("node", self.provider.allocate_id("node"))
+        primitive = append_new_element(
+            self.cib.tree.find(".//resources"), "primitive", {"id": "R"}
+        )
+        nvset = append_new_element(
+            primitive, "meta_attributes", {"id": "R-meta"}
+        )
+        nvpair = append_new_element(
+            nvset, "nvpair", {"id": "R-meta-remote", "value": "remote"}
+        )
+        update_attribute_remove_empty(nvpair, "name", "remote-node")
+        self.assertEqual("remote-1", self.provider.allocate_id("remote"))
+
+    def test_booked_by_another_provider(self):
+        self.assertEqual("myId", self.provider.allocate_id("myId"))
+        self.assertEqual(
+            "otherId", lib.IdProvider(self.cib.tree).allocate_id("otherId")
+        )
+        self.fixture_add_primitive_with_id("otherId")
+        self.assertEqual("otherId-1", self.provider.allocate_id("otherId"))
+
+    def test_ignore_status_section(self):
+        self.cib.append_to_first_tag_name("status", '<elem1 id="status-1"/>')
+        self.assertEqual("status-1", self.provider.allocate_id("status-1"))
+
+    def test_ignore_acl_target(self):
+        self.cib.append_to_first_tag_name(
+            "configuration", '<acls><acl_target id="target1"/></acls>'
+        )
+        assert_report_item_list_equal(self.provider.book_ids("target1"), [])
+
+    def test_remote_node(self):
+        self.cib.append_to_first_tag_name(
+            "resources",
+            """
+            <primitive id="R">
+              <meta_attributes id="R-meta">
+                <nvpair id="R-meta-remote" name="remote-node" value="node"/>
+                <nvpair id="R-meta-other" name="other" value="other"/>
+              </meta_attributes>
+            </primitive>
+            """,
+        )
+        self.assertEqual("node-1", self.provider.allocate_id("node"))
+        self.assertEqual("other", self.provider.allocate_id("other"))
+        self.cib.tree.find(".//nvpair").set("name", "not-remote-node")
+        assert_report_item_list_equal(self.provider.book_ids("node"), [])
+
+    def test_cib_is_not_root_element(self):
+        tree = etree.fromstring('<nvset id="nvset"><nvpair id="nv"/></nvset>')
+        provider = lib.IdProvider(tree[0])
+        # the root element is not searched
+        self.assertEqual("nvset", provider.allocate_id("nvset"))
+        self.assertEqual("nv-1", provider.allocate_id("nv"))
+
+
 class DoesIdExistTest(CibToolsTest):
     def test_existing_id(self):
         self.fixture_add_primitive_with_id("myId")
@@ -471,6 +567,21 @@ class GetPacemakerVersionByWhichCibWasValidatedTest(TestCase):
         )
 
 
+class GetCibEpoch(TestCase):
+    def test_success(self):
+        self.assertEqual(
+            (2, 557),
+            lib.get_cib_epoch(
+                etree.XML('<cib admin_epoch="2" epoch="557" num_updates="3"/>')
+            ),
+        )
+
+    def test_missing_and_invalid(self):
+        self.assertEqual(
+            (0, 0), lib.get_cib_epoch(etree.XML('<cib epoch="x" />')),
+        )
+
+
 class GetCibCrmFeatureSet(TestCase):
     def test_success(self):
         self.assertEqual(
@@ -825,3 +936,61 @@ class ElementSearcher(TestCase):
                 ),
             ],
         )
+
+
+class ElementSearcherIndexed(TestCase):
+    def setUp(self):
+        self.tree = etree.fromstring(
+            """
+            <cib>
+                <configuration><resources>
+                    <group id="a"><primitive id="b"/></group>
+                </resources></configuration>
+                <status><lrm_resource id="b"/></status>
+            </cib>
+            """
+        )
+        self.resources = self.tree.find(".//resources")
+        self.index = attach_element_index(self.tree)
+        self.addCleanup(detach_element_index, self.index)
+
+    def test_element_exists(self):
+        searcher = lib.ElementSearcher(
+            ["group", "primitive"], "b", self.resources
+        )
+        self.assertIs(self.tree.find(".//primitive"), searcher.get_element())
+
+    def test_element_in_other_context(self):
+        searcher = lib.ElementSearcher(
+            "lrm_resource", "b", self.tree.find(".//status")
+        )
+        self.assertIs(self.tree.find(".//lrm_resource"), searcher.get_element())
+        searcher = lib.ElementSearcher("lrm_resource", "b", self.resources)
+        self.assertFalse(searcher.element_found())
+
+    def test_removed_element(self):
+        self.index.get_elements_by_id("a")
+        self.resources.remove(self.resources[0])
+        searcher = lib.ElementSearcher("group", "a", self.resources)
+        self.assertFalse(searcher.element_found())
+
+    def test_changed_id(self):
+        self.index.get_elements_by_id("a")
+        self.tree.find(".//primitive").set("id", "c")
+        self.assertFalse(
+            lib.ElementSearcher(
+                "primitive", "b", self.resources
+            ).element_found()
+        )
+        self.assertTrue(
+            lib.ElementSearcher(
+                "primitive", "c", self.resources
+            ).element_found()
+        )
+
+    def test_element_added_bypassing_index(self):
+        self.index.get_elements_by_id("a")
+        new = etree.SubElement(self.resources, "primitive", id="c")
+        searcher = lib.ElementSearcher("primitive", "c", self.resources)
+        self.assertIs(new, searcher.get_element())
+        self.assertEqual([new], self.index.get_elements_by_id("c"))
@@ -900,7 +900,7 @@ class AddNodesSuccessMinimal(TestCase):
         (
             self.config.http.host.start_cluster(
                 node_labels=self.new_nodes
-            ).http.host.check_pacemaker_started(self.new_nodes)
+            ).http.host.check_pacemaker_started(self.new_nodes, wait_timeout=1)
         )
 
         with mock.patch("time.sleep", lambda secs: None):
@@ -1024,7 +1024,7 @@ class AddNodesSuccessMinimal(TestCase):
         (
             self.config.http.host.enable_cluster(node_labels=self.new_nodes)
             .http.host.start_cluster(node_labels=self.new_nodes)
-            .http.host.check_pacemaker_started(self.new_nodes)
+            .http.host.check_pacemaker_started(self.new_nodes, wait_timeout=1)
         )
         with mock.patch("time.sleep", lambda secs: None):
             cluster.add_nodes(
@@ -2,7 +2,7 @@
 from functools import partial
 import json
 import re
-from unittest import TestCase
+from unittest import mock, TestCase
 
 from pcs_test.tier0.lib.commands.cluster.test_add_nodes import (
     corosync_conf_fixture,
@@ -1317,12 +1317,44 @@ class ClusterStatus(TestCase):
             dict(label="new6", response_code=400, output="an error"),
         ]
 
+    @staticmethod
+    def fixture_get_host_info_retries():
+        # new5 is not connected, the request is retried twice
+        return [
+            [
+                dict(
+                    label="new5",
+                    was_connected=False,
+                    errno=7,
+                    error_msg="an error",
+                )
+            ]
+            for _ in range(2)
+        ]
+
+    @staticmethod
+    def fixture_get_host_info_retry_reports():
+        return [
+            fixture.debug(
+                reports.codes.NODE_COMMUNICATION_REQUEST_RETRY_SCHEDULED,
+                node="new5",
+                request="remote/check_host",
+                attempt=attempt,
+                delay=delay,
+            )
+            for attempt, delay in [(2, 0.5), (3, 1.0)]
+        ]
+
+    @mock.patch("pcs.lib.communication.tools.random.random", lambda: 0.5)
     def test_new_nodes_not_ready(self):
         existing_nodes = ["node1", "node2", "node3"]
         new_nodes = ["new1", "new2", "new3", "new4", "new5", "new6"]
         self.setup_config(existing_nodes, new_nodes, with_get_host_info=False)
         self.config.http.host.get_host_info(
-            communication_list=self.fixture_get_host_info_communication()
+            communication_list=(
+                [self.fixture_get_host_info_communication()]
+                + self.fixture_get_host_info_retries()
+            )
         )
         self.config.local.pcsd_ssl_cert_sync_disabled()
 
@@ -1345,6 +1377,7 @@ class ClusterStatus(TestCase):
                 )
                 for node in new_nodes
             ]
+            + self.fixture_get_host_info_retry_reports()
             + [
                 fixture.error(
                     reports.codes.NODE_COMMUNICATION_ERROR_UNABLE_TO_CONNECT,
@@ -1384,12 +1417,16 @@ class ClusterStatus(TestCase):
             ]
         )
 
+    @mock.patch("pcs.lib.communication.tools.random.random", lambda: 0.5)
     def test_new_nodes_not_ready_forced(self):
         existing_nodes = ["node1", "node2", "node3"]
         new_nodes = ["new1", "new2", "new3", "new4", "new5", "new6"]
         self.setup_config(existing_nodes, new_nodes, with_get_host_info=False)
         self.config.http.host.get_host_info(
-            communication_list=self.fixture_get_host_info_communication()
+            communication_list=(
+                [self.fixture_get_host_info_communication()]
+                + self.fixture_get_host_info_retries()
+            )
         )
         self.config.local.pcsd_ssl_cert_sync_disabled()
 
@@ -1413,6 +1450,7 @@ class ClusterStatus(TestCase):
                 )
                 for node in new_nodes
             ]
+            + self.fixture_get_host_info_retry_reports()
             + [
                 fixture.error(
                     reports.codes.NODE_COMMUNICATION_ERROR_UNABLE_TO_CONNECT,
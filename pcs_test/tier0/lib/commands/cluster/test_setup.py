@@ -454,7 +454,7 @@ class SetupSuccessMinimal(TestCase):
         (
             self.config.http.host.start_cluster(
                 NODE_LIST
-            ).http.host.check_pacemaker_started(NODE_LIST)
+            ).http.host.check_pacemaker_started(NODE_LIST, wait_timeout=1)
         )
         cluster.setup(
             self.env_assist.get_env(),
@@ -519,7 +519,7 @@ class SetupSuccessMinimal(TestCase):
         (
             self.config.http.host.enable_cluster(NODE_LIST)
             .http.host.start_cluster(NODE_LIST)
-            .http.host.check_pacemaker_started(NODE_LIST)
+            .http.host.check_pacemaker_started(NODE_LIST, wait_timeout=1)
         )
         cluster.setup(
             self.env_assist.get_env(),
@@ -2103,17 +2103,6 @@ class TransportUdpSuccess(TestCase):
         )
 
 
-def get_time_mock(step=1):
-    _counter = 0
-
-    def time():
-        nonlocal _counter
-        _counter += step
-        return _counter
-
-    return time
-
-
 @mock.patch(
     "pcs.lib.commands.cluster.generate_binary_key",
     lambda random_bytes_count: RANDOM_KEY,
@@ -2123,6 +2112,8 @@ def get_time_mock(step=1):
     "pcs.lib.commands.cluster.ssl.generate_cert",
     lambda ssl_key, server_name: PCSD_SSL_CERT,
 )
+@mock.patch("time.time", lambda: 0)
+@mock.patch("pcs.lib.communication.tools.random.random", lambda: 0.5)
 class SetupWithWait(TestCase):
     def setUp(self):
         self.env_assist, self.config = get_env_tools(self)
@@ -2166,34 +2157,60 @@ class SetupWithWait(TestCase):
             .http.host.start_cluster(NODE_LIST)
         )
 
-    @mock.patch("time.sleep", lambda secs: None)
-    @mock.patch("time.time", get_time_mock())
+    @staticmethod
+    def fixture_started(node):
+        return dict(
+            label=node, output=json.dumps(dict(pending=False, online=True))
+        )
+
+    @staticmethod
+    def fixture_not_started(node):
+        return dict(
+            label=node, output=json.dumps(dict(pending=True, online=False))
+        )
+
+    @staticmethod
+    def fixture_retry(node, attempt, delay):
+        return fixture.debug(
+            reports.codes.NODE_COMMUNICATION_REQUEST_RETRY_SCHEDULED,
+            node=node,
+            request="remote/pacemaker_node_status",
+            attempt=attempt,
+            delay=delay,
+        )
+
+    @staticmethod
+    def fixture_wait_started_reports():
+        return reports_success_minimal_fixture() + [
+            fixture.info(
+                reports.codes.CLUSTER_START_STARTED,
+                host_name_list=sorted(NODE_LIST),
+            ),
+            fixture.info(
+                reports.codes.WAIT_FOR_NODE_STARTUP_STARTED,
+                node_name_list=NODE_LIST,
+            ),
+        ]
+
+    def run_setup(self, wait):
+        return cluster.setup(
+            self.env_assist.get_env(),
+            CLUSTER_NAME,
+            [dict(name=node, addrs=None) for node in NODE_LIST],
+            start=True,
+            wait=wait,
+        )
+
     def test_some_success(self):
+        # the first retry would be sent after the timeout
         self.config.http.host.check_pacemaker_started(
+            wait_timeout=1,
             pacemaker_started_node_list=NODE_LIST[:1],
             pacemaker_not_started_node_list=NODE_LIST[1:],
         )
-        self.env_assist.assert_raise_library_error(
-            lambda: cluster.setup(
-                self.env_assist.get_env(),
-                CLUSTER_NAME,
-                [dict(name=node, addrs=None) for node in NODE_LIST],
-                start=True,
-                wait=1,
-            )
-        )
+        self.env_assist.assert_raise_library_error(lambda: self.run_setup(1))
         self.env_assist.assert_reports(
-            reports_success_minimal_fixture()
-            + [
-                fixture.info(
-                    reports.codes.CLUSTER_START_STARTED,
-                    host_name_list=sorted(NODE_LIST),
-                ),
-                fixture.info(
-                    reports.codes.WAIT_FOR_NODE_STARTUP_STARTED,
-                    node_name_list=NODE_LIST,
-                ),
-            ]
+            self.fixture_wait_started_reports()
             + [
                 fixture.info(reports.codes.CLUSTER_START_SUCCESS, node=node,)
                 for node in NODE_LIST[:1]
@@ -2204,215 +2221,157 @@ class SetupWithWait(TestCase):
             ]
         )
 
-    @mock.patch("time.sleep", lambda secs: None)
-    @mock.patch("time.time", get_time_mock(step=2))
-    def test_timed_out_right_away(self):
-        self.env_assist.assert_raise_library_error(
-            lambda: cluster.setup(
-                self.env_assist.get_env(),
-                CLUSTER_NAME,
-                [dict(name=node, addrs=None) for node in NODE_LIST],
-                start=True,
-                wait=1,
-            )
+    def test_wait_timeout_limited(self):
+        self.config.http.host.check_pacemaker_started(
+            pacemaker_started_node_list=NODE_LIST,
         )
+        self.run_setup(settings.node_start_wait_request_max * 10)
         self.env_assist.assert_reports(
-            reports_success_minimal_fixture()
+            self.fixture_wait_started_reports()
             + [
-                fixture.info(
-                    reports.codes.CLUSTER_START_STARTED,
-                    host_name_list=sorted(NODE_LIST),
-                ),
-                fixture.info(
-                    reports.codes.WAIT_FOR_NODE_STARTUP_STARTED,
-                    node_name_list=NODE_LIST,
-                ),
-                fixture.error(reports.codes.WAIT_FOR_NODE_STARTUP_TIMED_OUT),
-                fixture.error(reports.codes.WAIT_FOR_NODE_STARTUP_ERROR),
+                fixture.info(reports.codes.CLUSTER_START_SUCCESS, node=node,)
+                for node in NODE_LIST
             ]
         )
 
-    @mock.patch("time.sleep", lambda secs: None)
-    @mock.patch("time.time", get_time_mock())
     def test_multiple_tries(self):
-        (
-            self.config.http.host.check_pacemaker_started(
-                pacemaker_started_node_list=NODE_LIST[:1],
-                pacemaker_not_started_node_list=NODE_LIST[1:],
-            )
-            .http.host.check_pacemaker_started(
-                pacemaker_not_started_node_list=NODE_LIST[1:],
-                name="pcmk_status_check_1",
-            )
-            .http.host.check_pacemaker_started(
-                pacemaker_started_node_list=NODE_LIST[1:2],
-                pacemaker_not_started_node_list=NODE_LIST[2:],
-                name="pcmk_status_check_2",
-            )
-            .http.host.check_pacemaker_started(
-                pacemaker_started_node_list=NODE_LIST[2:3],
-                name="pcmk_status_check_3",
-            )
-        )
-        cluster.setup(
-            self.env_assist.get_env(),
-            CLUSTER_NAME,
-            [dict(name=node, addrs=None) for node in NODE_LIST],
-            start=True,
-            wait=5,
+        self.config.http.host.check_pacemaker_started(
+            wait_timeout=20,
+            communication_list=[
+                [
+                    self.fixture_started(NODE_LIST[0]),
+                    self.fixture_not_started(NODE_LIST[1]),
+                    self.fixture_not_started(NODE_LIST[2]),
+                ],
+                [self.fixture_not_started(NODE_LIST[1])],
+                [self.fixture_started(NODE_LIST[2])],
+                [self.fixture_started(NODE_LIST[1])],
+            ],
         )
+        self.run_setup(20)
         self.env_assist.assert_reports(
-            reports_success_minimal_fixture()
+            self.fixture_wait_started_reports()
             + [
-                fixture.info(
-                    reports.codes.CLUSTER_START_STARTED,
-                    host_name_list=sorted(NODE_LIST),
-                ),
-                fixture.info(
-                    reports.codes.WAIT_FOR_NODE_STARTUP_STARTED,
-                    node_name_list=NODE_LIST,
-                ),
+                fixture.info(reports.codes.CLUSTER_START_SUCCESS, node=node,)
+                for node in NODE_LIST
+            ]
+            + [
+                self.fixture_retry(NODE_LIST[1], 2, 1.5),
+                self.fixture_retry(NODE_LIST[2], 2, 1.5),
+                self.fixture_retry(NODE_LIST[1], 3, 3.0),
             ]
+        )
+
+    def test_held_requests_polled_again_right_away(self):
+        self.config.http.host.check_pacemaker_started(
+            wait_timeout=20,
+            communication_list=[
+                [
+                    self.fixture_started(NODE_LIST[0]),
+                    # held by the node for a part of the delay
+                    dict(self.fixture_not_started(NODE_LIST[1]), total_time=1),
+                    # held by the node for the whole delay
+                    dict(self.fixture_not_started(NODE_LIST[2]), total_time=10),
+                ],
+                [self.fixture_started(NODE_LIST[1])],
+                [self.fixture_started(NODE_LIST[2])],
+            ],
+        )
+        self.run_setup(20)
+        self.env_assist.assert_reports(
+            self.fixture_wait_started_reports()
             + [
                 fixture.info(reports.codes.CLUSTER_START_SUCCESS, node=node,)
                 for node in NODE_LIST
             ]
+            + [
+                self.fixture_retry(NODE_LIST[1], 2, 0.5),
+                self.fixture_retry(NODE_LIST[2], 2, 0.0),
+            ]
         )
 
-    @mock.patch("time.sleep", lambda secs: None)
-    @mock.patch("time.time", get_time_mock())
     def test_fails(self):
-        node_not_started = dict(
-            label=NODE_LIST[2],
-            output=json.dumps(dict(pending=True, online=False,)),
-        )
-        (
-            self.config.http.host.check_pacemaker_started(
-                communication_list=[
+        self.config.http.host.check_pacemaker_started(
+            wait_timeout=20,
+            communication_list=[
+                [
                     dict(
                         label=NODE_LIST[0],
                         was_connected=False,
                         error_msg="error",
                     ),
                     dict(label=NODE_LIST[1], output="not json"),
-                    node_not_started,
-                ],
-            )
-            .http.host.check_pacemaker_started(
-                communication_list=[
-                    dict(label=NODE_LIST[0], response_code=400,),
-                    node_not_started,
+                    self.fixture_not_started(NODE_LIST[2]),
                 ],
-                name="pcmk_status_check_2",
-            )
-            .http.host.check_pacemaker_started(
-                pacemaker_started_node_list=NODE_LIST[2:3],
-                name="pcmk_status_check_3",
-            )
-        )
-        self.env_assist.assert_raise_library_error(
-            lambda: cluster.setup(
-                self.env_assist.get_env(),
-                CLUSTER_NAME,
-                [dict(name=node, addrs=None) for node in NODE_LIST],
-                start=True,
-                wait=5,
-            )
+                [dict(label=NODE_LIST[0], response_code=400)],
+                [self.fixture_not_started(NODE_LIST[2])],
+                [self.fixture_started(NODE_LIST[2])],
+            ],
         )
+        self.env_assist.assert_raise_library_error(lambda: self.run_setup(20))
         self.env_assist.assert_reports(
-            reports_success_minimal_fixture()
+            self.fixture_wait_started_reports()
             + [
-                fixture.info(
-                    reports.codes.CLUSTER_START_STARTED,
-                    host_name_list=sorted(NODE_LIST),
-                ),
-                fixture.info(
-                    reports.codes.WAIT_FOR_NODE_STARTUP_STARTED,
-                    node_name_list=NODE_LIST,
-                ),
                 fixture.warn(
                     reports.codes.NODE_COMMUNICATION_ERROR_UNABLE_TO_CONNECT,
                     node=NODE_LIST[0],
                     command="remote/pacemaker_node_status",
                     reason="error",
                 ),
-            ]
-            + [
-                fixture.info(reports.codes.CLUSTER_START_SUCCESS, node=node,)
-                for node in NODE_LIST[2:3]
-            ]
-            + [
+                self.fixture_retry(NODE_LIST[0], 2, 1.5),
                 fixture.error(
                     reports.codes.INVALID_RESPONSE_FORMAT, node=NODE_LIST[1]
                 ),
+                self.fixture_retry(NODE_LIST[2], 2, 1.5),
                 fixture.error(
                     reports.codes.NODE_COMMUNICATION_COMMAND_UNSUCCESSFUL,
                     node=NODE_LIST[0],
                     command="remote/pacemaker_node_status",
                     reason="",
                 ),
+                self.fixture_retry(NODE_LIST[2], 3, 3.0),
+                fixture.info(
+                    reports.codes.CLUSTER_START_SUCCESS, node=NODE_LIST[2]
+                ),
                 fixture.error(reports.codes.WAIT_FOR_NODE_STARTUP_ERROR),
             ]
         )
 
-    @mock.patch("time.sleep", lambda secs: None)
-    @mock.patch("time.time", get_time_mock())
     def test_fails_and_timed_out(self):
-        (
-            self.config.http.host.check_pacemaker_started(
-                communication_list=[
+        self.config.http.host.check_pacemaker_started(
+            wait_timeout=2,
+            communication_list=[
+                [
                     dict(
                         label=NODE_LIST[0],
                         was_connected=False,
                         error_msg="error",
                     ),
                     dict(label=NODE_LIST[1], output="not json"),
-                    dict(
-                        label=NODE_LIST[2],
-                        output=json.dumps(dict(pending=True, online=False,)),
-                    ),
+                    self.fixture_not_started(NODE_LIST[2]),
                 ],
-            ).http.host.check_pacemaker_started(
-                pacemaker_started_node_list=[NODE_LIST[0]],
-                pacemaker_not_started_node_list=[NODE_LIST[2]],
-                name="pcmk_status_check_1",
-            )
-        )
-        self.env_assist.assert_raise_library_error(
-            lambda: cluster.setup(
-                self.env_assist.get_env(),
-                CLUSTER_NAME,
-                [dict(name=node, addrs=None) for node in NODE_LIST],
-                start=True,
-                wait=2,
-            )
+                [self.fixture_started(NODE_LIST[0])],
+                [self.fixture_not_started(NODE_LIST[2])],
+            ],
         )
+        self.env_assist.assert_raise_library_error(lambda: self.run_setup(2))
         self.env_assist.assert_reports(
-            reports_success_minimal_fixture()
+            self.fixture_wait_started_reports()
             + [
-                fixture.info(
-                    reports.codes.CLUSTER_START_STARTED,
-                    host_name_list=sorted(NODE_LIST),
-                ),
-                fixture.info(
-                    reports.codes.WAIT_FOR_NODE_STARTUP_STARTED,
-                    node_name_list=NODE_LIST,
-                ),
                 fixture.warn(
                     reports.codes.NODE_COMMUNICATION_ERROR_UNABLE_TO_CONNECT,
                     node=NODE_LIST[0],
                     command="remote/pacemaker_node_status",
                     reason="error",
                 ),
+                self.fixture_retry(NODE_LIST[0], 2, 1.5),
                 fixture.error(
                     reports.codes.INVALID_RESPONSE_FORMAT, node=NODE_LIST[1],
                 ),
-            ]
-            + [
-                fixture.info(reports.codes.CLUSTER_START_SUCCESS, node=node,)
-                for node in NODE_LIST[:1]
-            ]
-            + [
+                self.fixture_retry(NODE_LIST[2], 2, 1.5),
+                fixture.info(
+                    reports.codes.CLUSTER_START_SUCCESS, node=NODE_LIST[0]
+                ),
                 fixture.error(reports.codes.WAIT_FOR_NODE_STARTUP_TIMED_OUT),
                 fixture.error(reports.codes.WAIT_FOR_NODE_STARTUP_ERROR),
             ]
@@ -2422,6 +2381,34 @@ class SetupWithWait(TestCase):
 REASON = "error msg"
 
 
+@mock.patch("pcs.lib.commands.cluster.run_com", return_value=[])
+class WaitForPacemakerToStartRequestTimeout(TestCase):
+    def assert_request_timeout(self, mock_run_com, timeout, request_timeout):
+        communicator_factory = mock.Mock(spec_set=["get_communicator"])
+        cluster._wait_for_pacemaker_to_start(
+            communicator_factory, mock.Mock(), [], timeout=timeout
+        )
+        communicator_factory.get_communicator.assert_called_once_with(
+            request_timeout=request_timeout
+        )
+        mock_run_com.assert_called_once_with(
+            communicator_factory.get_communicator.return_value, mock.ANY
+        )
+
+    def test_short_wait(self, mock_run_com):
+        self.assert_request_timeout(
+            mock_run_com, 10, 10 + settings.default_request_timeout
+        )
+
+    def test_long_wait(self, mock_run_com):
+        self.assert_request_timeout(
+            mock_run_com,
+            600,
+            settings.node_start_wait_request_max
+            + settings.default_request_timeout,
+        )
+
+
 @mock.patch(
     "pcs.lib.commands.cluster.generate_binary_key",
     lambda random_bytes_count: RANDOM_KEY,
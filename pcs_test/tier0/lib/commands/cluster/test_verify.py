@@ -1,10 +1,13 @@
-from unittest import TestCase
+from unittest import mock, TestCase
 
 from pcs_test.tools import fixture
 from pcs_test.tools.command_env import get_env_tools
 
+from pcs.common import reports
 from pcs.common.reports import codes as report_codes
+from pcs.common.reports.item import ReportItem
 from pcs.lib.commands.cluster import verify
+from pcs.lib.errors import LibraryError
 
 
 CRM_VERIFY_ERROR_REPORT_LINES = [
@@ -127,6 +130,34 @@ class CibIsMocked(TestCase, AssertInvalidCibMixin):
         )
         self.assert_raises_invalid_cib_content(CRM_VERIFY_ERROR_REPORT_LINES[0])
 
+    @mock.patch("pcs.lib.commands.cluster.schema.validate_cib")
+    def test_invalid_cib_validated_in_process(self, mock_validate):
+        mock_validate.return_value = True
+        (
+            self.config.env.set_cib_data(
+                "<cib><configuration><resources/></configuration></cib>",
+                cib_tempfile=self.cib_tempfile,
+            )
+            .runner.pcmk.verify(
+                stderr="".join(CRM_VERIFY_ERROR_REPORT_LINES),
+                cib_tempfile=self.cib_tempfile,
+            )
+            .runner.pcmk.load_state()
+        )
+        self.assert_raises_invalid_cib_content(CRM_VERIFY_ERROR_REPORT_LINES[0])
+        mock_validate.assert_called_once()
+
+    @mock.patch("pcs.lib.commands.cluster.schema.validate_cib")
+    def test_unloadable_cib_validated_in_process(self, mock_validate):
+        mock_validate.side_effect = LibraryError(
+            ReportItem.error(reports.messages.CibLoadErrorBadFormat("reason"))
+        )
+        self.config.runner.pcmk.verify(
+            stderr="".join(CRM_VERIFY_ERROR_REPORT_LINES),
+            cib_tempfile=self.cib_tempfile,
+        )
+        self.assert_raises_invalid_cib_content(CRM_VERIFY_ERROR_REPORT_LINES[0])
+
 
 class VerboseMode(TestCase, AssertInvalidCibMixin):
     def setUp(self):
@@ -1,7 +1,15 @@
-from unittest import TestCase
+from unittest import mock, TestCase
+
+from lxml import etree
 
 from pcs_test.tools import fixture
+from pcs_test.tools.assertions import (
+    assert_raise_library_error,
+    assert_xml_equal,
+)
 from pcs_test.tools.command_env import get_env_tools
+from pcs_test.tools.custom_mock import MockLibraryReportProcessor
+from pcs_test.tools.misc import read_test_resource
 
 from pcs.common import reports
 from pcs.common.pacemaker.nvset import (
@@ -23,7 +31,9 @@ class DefaultsCreateMixin:
     def setUp(self):
         # pylint: disable=invalid-name
         self.env_assist, self.config = get_env_tools(self)
-        self.config.runner.cib.load(filename="cib-empty-1.2.xml")
+        self.config.runner.cib.load(
+            filename="cib-empty-1.2.xml", load_status=False
+        )
 
     def test_success_minimal(self):
         defaults_xml = f"""
@@ -52,7 +62,9 @@ class DefaultsCreateMixin:
             </{self.tag}>
         """
         self.config.runner.cib.load(
-            instead="runner.cib.load", optional_in_conf=defaults_xml_1
+            load_status=False,
+            instead="runner.cib.load",
+            optional_in_conf=defaults_xml_1,
         )
         self.config.env.push_cib(optional_in_conf=defaults_xml_2)
 
@@ -78,11 +90,12 @@ class DefaultsCreateMixin:
             </{self.tag}>
         """
         self.config.runner.cib.load(
+            load_status=False,
             name="load_cib_old_version",
             filename="cib-empty-3.3.xml",
-            before="runner.cib.load",
+            before="runner.cib.load.root",
         )
-        self.config.runner.cib.upgrade(before="runner.cib.load")
+        self.config.runner.cib.upgrade(before="runner.cib.load.root")
         self.config.runner.cib.load(
             filename="cib-empty-3.4.xml", instead="runner.cib.load"
         )
@@ -117,7 +130,9 @@ class DefaultsCreateMixin:
             </{self.tag}>
         """
         self.config.runner.cib.load(
-            filename="cib-empty-3.4.xml", instead="runner.cib.load"
+            load_status=False,
+            filename="cib-empty-3.4.xml",
+            instead="runner.cib.load",
         )
         self.config.env.push_cib(optional_in_conf=defaults_xml)
 
@@ -134,7 +149,9 @@ class DefaultsCreateMixin:
 
     def test_validation(self):
         self.config.runner.cib.load(
-            filename="cib-empty-3.4.xml", instead="runner.cib.load"
+            load_status=False,
+            filename="cib-empty-3.4.xml",
+            instead="runner.cib.load",
         )
         self.env_assist.assert_raise_library_error(
             lambda: self.command(
@@ -197,13 +214,98 @@ class DefaultsCreateMixin:
         )
 
 
+class DefaultsRebase(TestCase):
+    def setUp(self):
+        self.env = mock.Mock(
+            spec_set=["get_cib", "push_cib", "report_processor"]
+        )
+        self.env.report_processor = MockLibraryReportProcessor()
+        self.env.get_cib.return_value = self.fixture_cib(
+            """
+            <rsc_defaults>
+                <meta_attributes id="set1" />
+            </rsc_defaults>
+            """
+        )
+
+    @staticmethod
+    def fixture_cib(defaults_xml):
+        cib = etree.fromstring(read_test_resource("cib-empty-1.2.xml"))
+        cib.find("configuration").append(etree.fromstring(defaults_xml))
+        return cib
+
+    def get_rebase(self):
+        return self.env.push_cib.call_args[1]["rebase"]
+
+    def test_create_not_validated_again(self):
+        cib_options.resource_defaults_create(
+            self.env,
+            {},
+            {"unknown-option": "value"},
+            force_flags={reports.codes.FORCE_OPTIONS},
+        )
+        cib = self.fixture_cib("<rsc_defaults />")
+        self.get_rebase()(cib)
+        assert_xml_equal(
+            """
+            <rsc_defaults>
+                <meta_attributes id="rsc_defaults-meta_attributes"
+                    unknown-option="value"
+                />
+            </rsc_defaults>
+            """,
+            etree.tostring(cib.find("configuration/rsc_defaults")).decode(),
+        )
+        self.env.report_processor.assert_reports(
+            [
+                fixture.warn(
+                    reports.codes.INVALID_OPTIONS,
+                    option_names=["unknown-option"],
+                    allowed=["id", "score"],
+                    option_type=None,
+                    allowed_patterns=[],
+                ),
+                fixture.warn(reports.codes.DEFAULTS_CAN_BE_OVERRIDEN),
+            ]
+        )
+
+    def test_create_id_taken(self):
+        cib_options.resource_defaults_create(self.env, {}, {"id": "set2"})
+        assert_raise_library_error(
+            lambda: self.get_rebase()(
+                self.fixture_cib(
+                    """
+                    <rsc_defaults>
+                        <meta_attributes id="set2" />
+                    </rsc_defaults>
+                    """
+                )
+            ),
+            fixture.error(reports.codes.ID_ALREADY_EXISTS, id="set2"),
+        )
+
+    def test_remove_nvset_removed(self):
+        cib_options.resource_defaults_remove(self.env, ["set1"])
+        assert_raise_library_error(
+            lambda: self.get_rebase()(self.fixture_cib("<rsc_defaults />")),
+            fixture.report_not_found(
+                "set1",
+                context_type="rsc_defaults",
+                expected_types=["options set"],
+            ),
+        )
+        self.env.report_processor.assert_reports([])
+
+
 class ResourceDefaultsCreate(DefaultsCreateMixin, TestCase):
     command = staticmethod(cib_options.resource_defaults_create)
     tag = "rsc_defaults"
 
     def test_rule_op_expression_not_allowed(self):
         self.config.runner.cib.load(
-            filename="cib-empty-3.4.xml", instead="runner.cib.load"
+            load_status=False,
+            filename="cib-empty-3.4.xml",
+            instead="runner.cib.load",
         )
         self.env_assist.assert_raise_library_error(
             lambda: self.command(
@@ -236,7 +338,9 @@ class DefaultsConfigMixin:
     def test_empty(self):
         defaults_xml = f"""<{self.tag} />"""
         self.config.runner.cib.load(
-            filename="cib-empty-3.4.xml", optional_in_conf=defaults_xml
+            load_status=False,
+            filename="cib-empty-3.4.xml",
+            optional_in_conf=defaults_xml,
         )
         self.assertEqual([], self.command(self.env_assist.get_env()))
 
@@ -264,7 +368,9 @@ class DefaultsConfigMixin:
             </{self.tag}>
         """
         self.config.runner.cib.load(
-            filename="cib-empty-3.4.xml", optional_in_conf=defaults_xml
+            load_status=False,
+            filename="cib-empty-3.4.xml",
+            optional_in_conf=defaults_xml,
         )
         self.assertEqual(
             [
@@ -343,7 +449,9 @@ class DefaultsRemoveMixin:
         self.command(self.env_assist.get_env(), [])
 
     def test_defaults_section_missing(self):
-        self.config.runner.cib.load(filename="cib-empty-1.2.xml")
+        self.config.runner.cib.load(
+            filename="cib-empty-1.2.xml", load_status=False
+        )
         self.env_assist.assert_raise_library_error(
             lambda: self.command(self.env_assist.get_env(), ["set1"])
         )
@@ -359,6 +467,7 @@ class DefaultsRemoveMixin:
 
     def test_success(self):
         self.config.runner.cib.load(
+            load_status=False,
             filename="cib-empty-1.2.xml",
             optional_in_conf=f"""
                 <{self.tag}>
@@ -383,6 +492,7 @@ class DefaultsRemoveMixin:
 
     def test_delete_all_keep_the_section(self):
         self.config.runner.cib.load(
+            load_status=False,
             filename="cib-empty-1.2.xml",
             optional_in_conf=f"""
                 <{self.tag}>
@@ -395,6 +505,7 @@ class DefaultsRemoveMixin:
 
     def test_nvset_not_found(self):
         self.config.runner.cib.load(
+            load_status=False,
             filename="cib-empty-1.2.xml",
             optional_in_conf=f"""
                 <{self.tag}>
@@ -462,7 +573,7 @@ class DefaultsUpdateLegacyMixin:
 
     def test_change(self):
         self.config.runner.cib.load(
-            optional_in_conf=self.fixture_initial_defaults()
+            load_status=False, optional_in_conf=self.fixture_initial_defaults()
         )
         self.config.env.push_cib(
             optional_in_conf=f"""
@@ -478,7 +589,7 @@ class DefaultsUpdateLegacyMixin:
 
     def test_add(self):
         self.config.runner.cib.load(
-            optional_in_conf=self.fixture_initial_defaults()
+            load_status=False, optional_in_conf=self.fixture_initial_defaults()
         )
         self.config.env.push_cib(
             optional_in_conf=f"""
@@ -495,7 +606,7 @@ class DefaultsUpdateLegacyMixin:
 
     def test_remove(self):
         self.config.runner.cib.load(
-            optional_in_conf=self.fixture_initial_defaults()
+            load_status=False, optional_in_conf=self.fixture_initial_defaults()
         )
         self.config.env.push_cib(
             remove=(
@@ -505,7 +616,7 @@ class DefaultsUpdateLegacyMixin:
         self.command(self.env_assist.get_env(), None, {"a": ""})
 
     def test_add_section_if_missing(self):
-        self.config.runner.cib.load()
+        self.config.runner.cib.load(load_status=False)
         self.config.env.push_cib(
             optional_in_conf=f"""
             <{self.tag}>
@@ -518,7 +629,9 @@ class DefaultsUpdateLegacyMixin:
         self.command(self.env_assist.get_env(), None, {"a": "A"})
 
     def test_add_meta_if_missing(self):
-        self.config.runner.cib.load(optional_in_conf=f"<{self.tag} />")
+        self.config.runner.cib.load(
+            optional_in_conf=f"<{self.tag} />", load_status=False
+        )
         self.config.env.push_cib(
             optional_in_conf=f"""
             <{self.tag}>
@@ -531,22 +644,25 @@ class DefaultsUpdateLegacyMixin:
         self.command(self.env_assist.get_env(), None, {"a": "A"})
 
     def test_dont_add_section_if_only_removing(self):
-        self.config.runner.cib.load()
+        self.config.runner.cib.load(load_status=False)
         self.command(self.env_assist.get_env(), None, {"a": "", "b": ""})
 
     def test_dont_add_meta_if_only_removing(self):
-        self.config.runner.cib.load(optional_in_conf=f"<{self.tag} />")
+        self.config.runner.cib.load(
+            optional_in_conf=f"<{self.tag} />", load_status=False
+        )
         self.command(self.env_assist.get_env(), None, {"a": "", "b": ""})
 
     def test_keep_section_when_empty(self):
         self.config.runner.cib.load(
-            optional_in_conf=self.fixture_initial_defaults()
+            load_status=False, optional_in_conf=self.fixture_initial_defaults()
         )
         self.config.env.push_cib(remove=f"./configuration/{self.tag}//nvpair")
         self.command(self.env_assist.get_env(), None, {"a": "", "b": ""})
 
     def test_ambiguous(self):
         self.config.runner.cib.load(
+            load_status=False,
             optional_in_conf=f"""
                 <{self.tag}>
                     <meta_attributes id="{self.tag}-options">
@@ -557,7 +673,7 @@ class DefaultsUpdateLegacyMixin:
                         <nvpair id="{self.tag}-options-c" name="c" value="d"/>
                     </meta_attributes>
                 </{self.tag}>
-            """
+            """,
         )
         self.env_assist.assert_raise_library_error(
             lambda: self.command(self.env_assist.get_env(), None, {"x": "y"})
@@ -591,7 +707,7 @@ class DefaultsUpdateMixin:
 
     def test_success(self):
         self.config.runner.cib.load(
-            optional_in_conf=self.fixture_initial_defaults()
+            load_status=False, optional_in_conf=self.fixture_initial_defaults()
         )
         self.config.env.push_cib(
             optional_in_conf=f"""
@@ -615,7 +731,7 @@ class DefaultsUpdateMixin:
 
     def test_nvset_doesnt_exist(self):
         self.config.runner.cib.load(
-            optional_in_conf=self.fixture_initial_defaults()
+            load_status=False, optional_in_conf=self.fixture_initial_defaults()
         )
         self.env_assist.assert_raise_library_error(
             lambda: self.command(
@@ -634,7 +750,7 @@ class DefaultsUpdateMixin:
 
     def test_keep_elements_when_empty(self):
         self.config.runner.cib.load(
-            optional_in_conf=self.fixture_initial_defaults()
+            load_status=False, optional_in_conf=self.fixture_initial_defaults()
         )
         self.config.env.push_cib(remove=f"./configuration/{self.tag}//nvpair")
         self.command(
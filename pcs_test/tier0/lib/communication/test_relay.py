@@ -0,0 +1,343 @@
+import json
+from unittest import TestCase
+from urllib.parse import parse_qs
+
+from pcs_test.tools.custom_mock import MockCurlSimple
+
+from pcs.common import pcs_pycurl as pycurl
+from pcs.common.host import Destination
+from pcs.common.node_communicator import (
+    Request,
+    RequestData,
+    RequestTarget,
+    Response,
+)
+from pcs.lib.communication import relay
+
+
+def fixture_request(label, action="remote/put_file", data=(("file", "x"),)):
+    return Request(
+        RequestTarget(
+            label,
+            token=f"{label}-token",
+            dest_list=[Destination(f"{label}.addr", 2224)],
+        ),
+        RequestData(action, data),
+    )
+
+
+def fixture_response(request, output="", code=200, was_connected=True):
+    return Response(
+        MockCurlSimple(
+            info={pycurl.RESPONSE_CODE: code}, output=output, request=request
+        ),
+        was_connected=was_connected,
+        errno=None if was_connected else pycurl.E_COULDNT_CONNECT,
+        error_msg=None if was_connected else "unable to connect",
+    )
+
+
+class FakeCommunicator:
+    """
+    Respond to requests one by one with responses created by a callback
+    """
+
+    def __init__(self, get_response):
+        self._get_response = get_response
+        self._request_list = []
+        self.sent_request_list = []
+
+    def add_requests(self, request_list, delay=None):
+        del delay
+        self._request_list.extend(request_list)
+
+    def start_loop(self):
+        while self._request_list:
+            request = self._request_list.pop(0)
+            self.sent_request_list.append(request)
+            yield self._get_response(request)
+
+
+class FakeCluster:
+    """
+    Respond to requests as nodes of a cluster do, relay requests are relayed
+    """
+
+    def __init__(self, offline_node_list=(), old_pcsd_node_list=()):
+        self._offline_node_list = offline_node_list
+        self._old_pcsd_node_list = old_pcsd_node_list
+        # (sending node, target node, action) of all sent requests
+        self.sent_list = []
+
+    def get_communicator(self, node):
+        return FakeCommunicator(
+            lambda request: self._get_response(node, request)
+        )
+
+    def _get_response(self, node, request):
+        self.sent_list.append((node, request.host_label, request.action))
+        if request.host_label in self._offline_node_list:
+            return fixture_response(request, was_connected=False)
+        if request.action != relay.RELAY_ACTION:
+            return fixture_response(request, output=f"{request.host_label}")
+        if request.host_label in self._old_pcsd_node_list:
+            return fixture_response(request, output="Unknown Request", code=404)
+        input_data = json.loads(parse_qs(request.data)["data_json"][0])
+        output_data = relay.relay_requests(
+            self.get_communicator(request.host_label),
+            input_data["action"],
+            input_data["structured_data"],
+            input_data["target_dict_list"],
+            input_data["fanout"],
+        )
+        return fixture_response(
+            request,
+            output=json.dumps(
+                dict(
+                    status="success",
+                    status_msg=None,
+                    report_list=[],
+                    data=output_data,
+                )
+            ),
+        )
+
+
+def node_list(count):
+    return [f"node{i}" for i in range(1, count + 1)]
+
+
+class RelayCommunicator(TestCase):
+    def assert_responses(self, expected_label_list, response_list):
+        self.assertEqual(
+            sorted(expected_label_list),
+            sorted(response.request.host_label for response in response_list),
+        )
+        for response in response_list:
+            self.assertTrue(response.was_connected)
+            self.assertEqual(200, response.response_code)
+            self.assertEqual(response.request.host_label, response.data)
+            self.assertEqual("remote/put_file", response.request.action)
+
+    def run_requests(self, cluster, request_list, fanout):
+        communicator = relay.RelayCommunicator(
+            cluster.get_communicator("local"), fanout
+        )
+        communicator.add_requests(request_list)
+        return list(communicator.start_loop())
+
+    def test_not_more_targets_than_fanout(self):
+        cluster = FakeCluster()
+        response_list = self.run_requests(
+            cluster, [fixture_request(node) for node in node_list(3)], 3
+        )
+        self.assert_responses(node_list(3), response_list)
+        self.assertEqual(
+            [("local", node, "remote/put_file") for node in node_list(3)],
+            cluster.sent_list,
+        )
+
+    def test_relayed(self):
+        cluster = FakeCluster()
+        response_list = self.run_requests(
+            cluster, [fixture_request(node) for node in node_list(7)], 2
+        )
+        self.assert_responses(node_list(7), response_list)
+        # node1 relays node1-node4, node5 relays node5-node7, node1 sends
+        # a request to itself and splits the rest of its subtree again
+        self.assertEqual(
+            [
+                ("local", "node1", relay.RELAY_ACTION),
+                ("node1", "node1", "remote/put_file"),
+                ("node1", "node2", relay.RELAY_ACTION),
+                ("node2", "node2", "remote/put_file"),
+                ("node2", "node3", "remote/put_file"),
+                ("node1", "node4", "remote/put_file"),
+                ("local", "node5", relay.RELAY_ACTION),
+                ("node5", "node5", "remote/put_file"),
+                ("node5", "node6", "remote/put_file"),
+                ("node5", "node7", "remote/put_file"),
+            ],
+            cluster.sent_list,
+        )
+
+    def test_relayed_token_and_addresses(self):
+        cluster = FakeCluster()
+        response_list = self.run_requests(
+            cluster, [fixture_request(node) for node in node_list(4)], 2
+        )
+        request_list = [response.request for response in response_list]
+        self.assertEqual(
+            [
+                RequestTarget(
+                    node,
+                    token=f"{node}-token",
+                    dest_list=[Destination(f"{node}.addr", 2224)],
+                )
+                for node in node_list(4)
+            ],
+            sorted(
+                [request.target for request in request_list],
+                key=lambda target: target.label,
+            ),
+        )
+
+    def test_different_data_not_grouped(self):
+        cluster = FakeCluster()
+        response_list = self.run_requests(
+            cluster,
+            [
+                fixture_request(node, data=[("file", node)])
+                for node in node_list(3)
+            ],
+            1,
+        )
+        self.assert_responses(node_list(3), response_list)
+        self.assertEqual(
+            [("local", node, "remote/put_file") for node in node_list(3)],
+            cluster.sent_list,
+        )
+
+    def test_delayed_not_relayed(self):
+        cluster = FakeCluster()
+        communicator = relay.RelayCommunicator(
+            cluster.get_communicator("local"), 1
+        )
+        communicator.add_requests(
+            [fixture_request(node) for node in node_list(3)], delay=1
+        )
+        self.assert_responses(node_list(3), list(communicator.start_loop()))
+        self.assertEqual(
+            [("local", node, "remote/put_file") for node in node_list(3)],
+            cluster.sent_list,
+        )
+
+    def test_relay_offline(self):
+        cluster = FakeCluster(offline_node_list=["node1"])
+        response_list = self.run_requests(
+            cluster, [fixture_request(node) for node in node_list(4)], 2
+        )
+        self.assertEqual(
+            [
+                ("local", "node1", relay.RELAY_ACTION),
+                ("local", "node3", relay.RELAY_ACTION),
+                ("node3", "node3", "remote/put_file"),
+                ("node3", "node4", "remote/put_file"),
+                ("local", "node1", "remote/put_file"),
+                ("local", "node2", "remote/put_file"),
+            ],
+            cluster.sent_list,
+        )
+        self.assertEqual(
+            ["node3", "node4", "node1", "node2"],
+            [response.request.host_label for response in response_list],
+        )
+        self.assertFalse(response_list[2].was_connected)
+        self.assertEqual("unable to connect", response_list[2].error_msg)
+        self.assert_responses(
+            ["node2", "node3", "node4"],
+            [response_list[index] for index in (0, 1, 3)],
+        )
+
+    def test_relay_old_pcsd(self):
+        cluster = FakeCluster(old_pcsd_node_list=["node1"])
+        response_list = self.run_requests(
+            cluster, [fixture_request(node) for node in node_list(4)], 2
+        )
+        self.assert_responses(node_list(4), response_list)
+        self.assertEqual(
+            [
+                ("local", "node1", relay.RELAY_ACTION),
+                ("local", "node3", relay.RELAY_ACTION),
+                ("node3", "node3", "remote/put_file"),
+                ("node3", "node4", "remote/put_file"),
+                ("local", "node1", "remote/put_file"),
+                ("local", "node2", "remote/put_file"),
+            ],
+            cluster.sent_list,
+        )
+
+    def test_relayed_node_offline(self):
+        cluster = FakeCluster(offline_node_list=["node2"])
+        response_list = self.run_requests(
+            cluster, [fixture_request(node) for node in node_list(4)], 2
+        )
+        response_dict = {
+            response.request.host_label: response for response in response_list
+        }
+        self.assertEqual(node_list(4), sorted(response_dict))
+        self.assertFalse(response_dict["node2"].was_connected)
+        self.assertEqual(pycurl.E_COULDNT_CONNECT, response_dict["node2"].errno)
+        self.assertEqual("unable to connect", response_dict["node2"].error_msg)
+        self.assertIsNone(response_dict["node2"].response_code)
+        self.assert_responses(
+            ["node1", "node3", "node4"],
+            [response_dict[node] for node in ("node1", "node3", "node4")],
+        )
+
+    def test_relay_response_incomplete(self):
+        def get_response(request):
+            if request.action != relay.RELAY_ACTION:
+                return fixture_response(request, output=request.host_label)
+            return fixture_response(
+                request,
+                output=json.dumps(
+                    dict(
+                        status="success",
+                        data=[
+                            dict(
+                                label="node1",
+                                was_connected=True,
+                                errno=None,
+                                error_msg=None,
+                                response_code=200,
+                                data="node1",
+                            ),
+                            dict(
+                                label="unknown",
+                                was_connected=True,
+                                errno=None,
+                                error_msg=None,
+                                response_code=200,
+                                data="unknown",
+                            ),
+                        ],
+                    )
+                ),
+            )
+
+        communicator = relay.RelayCommunicator(
+            FakeCommunicator(get_response), 1
+        )
+        communicator.add_requests(
+            [fixture_request(node) for node in node_list(2)]
+        )
+        response_list = list(communicator.start_loop())
+        self.assert_responses(node_list(2), response_list)
+
+    def test_relay_response_invalid(self):
+        for output in (
+            "not json",
+            json.dumps(dict(status="error", report_list=[])),
+            json.dumps(dict(status="success", data=[dict(label="node1")])),
+        ):
+            with self.subTest(output=output):
+                communicator = relay.RelayCommunicator(
+                    FakeCommunicator(
+                        lambda request, output=output: fixture_response(
+                            request,
+                            output=(
+                                output
+                                if request.action == relay.RELAY_ACTION
+                                else request.host_label
+                            ),
+                        )
+                    ),
+                    1,
+                )
+                communicator.add_requests(
+                    [fixture_request(node) for node in node_list(2)]
+                )
+                self.assert_responses(
+                    node_list(2), list(communicator.start_loop())
+                )
@@ -0,0 +1,292 @@
+import asyncio
+from unittest import mock, TestCase
+
+from pcs_test.tools import fixture
+from pcs_test.tools.custom_mock import (
+    MockCurlSimple,
+    MockLibraryReportProcessor,
+)
+
+from pcs.common import pcs_pycurl as pycurl
+from pcs.common.node_communicator import (
+    RequestData,
+    RequestTarget,
+    Response,
+)
+from pcs.common.reports import codes as report_codes
+from pcs.lib.communication import tools
+
+
+def fixture_response(request, was_connected=True, errno=None, code=200):
+    return Response(
+        MockCurlSimple(info={pycurl.RESPONSE_CODE: code}, request=request),
+        was_connected=was_connected,
+        errno=errno,
+        error_msg=None if was_connected else "an error",
+    )
+
+
+class FakeCommunicator:
+    """
+    Respond to requests one by one with responses created by a callback
+    """
+
+    def __init__(self, get_response):
+        self._get_response = get_response
+        self._request_list = []
+        self.delay_list = []
+
+    def add_requests(self, request_list, delay=None):
+        self._request_list.extend(request_list)
+        self.delay_list.extend([delay] * len(request_list))
+
+    def start_loop(self):
+        while self._request_list:
+            yield self._get_response(self._request_list.pop(0))
+
+
+class FakeAsyncCommunicator(FakeCommunicator):
+    async def start_loop(self):
+        # pylint: disable=invalid-overridden-method
+        while self._request_list:
+            await asyncio.sleep(0)
+            yield self._get_response(self._request_list.pop(0))
+
+
+class RetriedCommand(
+    tools.AllSameDataMixin, tools.AllAtOnceStrategyMixin, tools.RunRemotelyBase
+):
+    _retry_policy = tools.RetryPolicy(attempts=3, backoff_base=2, jitter=0)
+
+    def __init__(self, report_processor):
+        super().__init__(report_processor)
+        self.response_list = []
+
+    def _get_request_data(self):
+        return RequestData("remote/action")
+
+    def _process_response(self, response):
+        self.response_list.append(response)
+
+    def on_complete(self):
+        return self.response_list
+
+
+class TimedOutCommand(RetriedCommand):
+    _retry_policy = tools.RetryPolicy(
+        attempts=None, backoff_base=2, jitter=0, timeout=10
+    )
+
+
+class RetryPolicyIsRetryable(TestCase):
+    def setUp(self):
+        self.policy = tools.RetryPolicy()
+
+    def assert_retryable(self, expected, **kwargs):
+        self.assertEqual(
+            expected, self.policy.is_retryable(fixture_response(None, **kwargs))
+        )
+
+    def test_success(self):
+        self.assert_retryable(False)
+
+    def test_retryable_http_code(self):
+        self.assert_retryable(True, code=503)
+
+    def test_not_retryable_http_code(self):
+        self.assert_retryable(False, code=500)
+
+    def test_retryable_errno(self):
+        self.assert_retryable(
+            True, was_connected=False, errno=pycurl.E_COULDNT_CONNECT
+        )
+
+    def test_not_retryable_errno(self):
+        self.assert_retryable(
+            False, was_connected=False, errno=pycurl.E_SSL_CONNECT_ERROR
+        )
+
+
+class RetryPolicyGetDelay(TestCase):
+    def test_exponential_and_capped(self):
+        policy = tools.RetryPolicy(backoff_base=1, backoff_cap=5, jitter=0)
+        self.assertEqual(
+            [1, 2, 4, 5, 5],
+            [policy.get_delay(attempt) for attempt in range(2, 7)],
+        )
+
+    @mock.patch("pcs.lib.communication.tools.random.random", lambda: 0.5)
+    def test_jitter(self):
+        policy = tools.RetryPolicy(backoff_base=4, backoff_cap=8, jitter=0.5)
+        self.assertEqual(
+            [3, 6, 6], [policy.get_delay(attempt) for attempt in range(2, 5)],
+        )
+
+
+class RunRetry(TestCase):
+    def setUp(self):
+        self.report_processor = MockLibraryReportProcessor()
+        self.cmd = RetriedCommand(self.report_processor)
+        self.cmd.set_targets([RequestTarget("node1"), RequestTarget("node2")])
+
+    def fixture_retry_reports(self, attempt_list):
+        return [
+            fixture.debug(
+                report_codes.NODE_COMMUNICATION_REQUEST_RETRY_SCHEDULED,
+                node="node1",
+                request="remote/action",
+                attempt=attempt,
+                delay=delay,
+            )
+            for attempt, delay in attempt_list
+        ]
+
+    def test_retry_until_success(self):
+        attempts = {"count": 0}
+
+        def get_response(request):
+            if request.target.label == "node2":
+                return fixture_response(request)
+            attempts["count"] += 1
+            if attempts["count"] < 3:
+                return fixture_response(request, code=503)
+            return fixture_response(request)
+
+        communicator = FakeCommunicator(get_response)
+        response_list = tools.run(communicator, self.cmd)
+        self.assertEqual(
+            [("node2", 200), ("node1", 200)],
+            [
+                (response.request.target.label, response.response_code)
+                for response in response_list
+            ],
+        )
+        self.assertEqual([None, None, 2, 4], communicator.delay_list)
+        self.report_processor.assert_reports(
+            self.fixture_retry_reports([(2, 2), (3, 4)])
+        )
+
+    def test_give_up_after_attempts(self):
+        communicator = FakeCommunicator(
+            lambda request: fixture_response(
+                request,
+                was_connected=request.target.label != "node1",
+                errno=pycurl.E_COULDNT_CONNECT,
+            )
+        )
+        response_list = tools.run(communicator, self.cmd)
+        self.assertEqual(
+            [("node2", True), ("node1", False)],
+            [
+                (response.request.target.label, response.was_connected)
+                for response in response_list
+            ],
+        )
+        self.assertEqual([None, None, 2, 4], communicator.delay_list)
+        self.report_processor.assert_reports(
+            self.fixture_retry_reports([(2, 2), (3, 4)])
+        )
+
+    def test_not_retryable(self):
+        communicator = FakeCommunicator(
+            lambda request: fixture_response(request, code=400)
+        )
+        response_list = tools.run(communicator, self.cmd)
+        self.assertEqual(2, len(response_list))
+        self.assertEqual([None, None], communicator.delay_list)
+        self.report_processor.assert_reports([])
+
+    @mock.patch("pcs.lib.communication.tools.time.time")
+    def test_unlimited_attempts_until_timeout(self, mock_time):
+        mock_time.side_effect = [100, 101, 106, 109]
+        cmd = TimedOutCommand(self.report_processor)
+        cmd.set_targets([RequestTarget("node1")])
+        communicator = FakeCommunicator(
+            lambda request: fixture_response(request, code=503)
+        )
+        response_list = tools.run(communicator, cmd)
+        self.assertEqual(1, len(response_list))
+        # the third retry would be sent 13 seconds after the start
+        self.assertEqual([None, 2, 4], communicator.delay_list)
+
+    def test_no_retry_policy(self):
+        cmd = tools.RunRemotelyBase(self.report_processor)
+        self.assertIsNone(cmd.retry_policy)
+
+
+class RelayedCommand(RetriedCommand):
+    _retry_policy = None
+    _relay_allowed = True
+
+
+class RunRelay(TestCase):
+    def setUp(self):
+        self.report_processor = MockLibraryReportProcessor()
+        self.sent_action_list = []
+
+    def get_response(self, request):
+        self.sent_action_list.append(request.action)
+        return fixture_response(request, code=404)
+
+    def run_cmd(self, cmd, relay_fanout):
+        communicator = FakeCommunicator(self.get_response)
+        communicator.relay_fanout = relay_fanout
+        cmd.set_targets([RequestTarget(f"node{i}") for i in range(1, 4)])
+        return tools.run(communicator, cmd)
+
+    def test_relayed(self):
+        response_list = self.run_cmd(RelayedCommand(self.report_processor), 1)
+        self.assertEqual(
+            ["remote/relay_requests"] + ["remote/action"] * 3,
+            self.sent_action_list,
+        )
+        self.assertEqual(
+            ["remote/action"] * 3,
+            [response.request.action for response in response_list],
+        )
+
+    def test_relay_not_allowed(self):
+        self.run_cmd(RetriedCommand(self.report_processor), 1)
+        self.assertEqual(["remote/action"] * 3, self.sent_action_list)
+
+    def test_relay_disabled(self):
+        self.run_cmd(RelayedCommand(self.report_processor), None)
+        self.assertEqual(["remote/action"] * 3, self.sent_action_list)
+
+
+class RunAsync(TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def test_retry(self):
+        report_processor = MockLibraryReportProcessor()
+        cmd = RetriedCommand(report_processor)
+        cmd.set_targets([RequestTarget("node1")])
+        attempts = {"count": 0}
+
+        def get_response(request):
+            attempts["count"] += 1
+            return fixture_response(
+                request, code=503 if attempts["count"] < 2 else 200
+            )
+
+        communicator = FakeAsyncCommunicator(get_response)
+        response_list = self.loop.run_until_complete(
+            tools.run_async(communicator, cmd)
+        )
+        self.assertEqual(
+            [200], [response.response_code for response in response_list]
+        )
+        self.assertEqual([None, 2], communicator.delay_list)
+        report_processor.assert_reports(
+            [
+                fixture.debug(
+                    report_codes.NODE_COMMUNICATION_REQUEST_RETRY_SCHEDULED,
+                    node="node1",
+                    request="remote/action",
+                    attempt=2,
+                    delay=2,
+                )
+            ]
+        )
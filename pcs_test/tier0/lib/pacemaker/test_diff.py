@@ -0,0 +1,366 @@
+from unittest import TestCase
+from lxml import etree
+
+from pcs_test.tools.assertions import assert_xml_equal
+from pcs_test.tools.misc import get_test_resource as rc
+
+from pcs.lib.pacemaker import diff as lib
+from pcs.lib.xml_tools import (
+    append_new_element,
+    remove_one_element,
+    start_change_journal,
+    stop_change_journal,
+    update_attribute_remove_empty,
+)
+
+
+def _cib(resources):
+    return etree.fromstring(
+        f"""
+        <cib epoch="1">
+          <configuration>
+            <resources>{resources}</resources>
+          </configuration>
+        </cib>
+        """
+    )
+
+
+class DiffCibsXml(TestCase):
+    def assert_diff(self, resources_old, resources_new, expected_changes):
+        assert_xml_equal(
+            f'<diff format="2">{expected_changes}</diff>',
+            lib.diff_cibs_xml(_cib(resources_old), _cib(resources_new)),
+        )
+
+    def assert_not_supported(self, resources_old, resources_new):
+        with self.assertRaises(lib.NativeDiffNotSupported):
+            lib.diff_cibs_xml(_cib(resources_old), _cib(resources_new))
+
+    def test_no_difference(self):
+        self.assertEqual(
+            "",
+            lib.diff_cibs_xml(
+                _cib('<primitive id="A" class="ocf"/>'),
+                _cib('\n  <primitive class="ocf" id="A"/>\n'),
+            ),
+        )
+
+    def test_large_cib_no_difference(self):
+        with open(rc("cib-large.xml")) as cib_file:
+            cib_xml = cib_file.read()
+        self.assertEqual(
+            "",
+            lib.diff_cibs_xml(
+                etree.fromstring(cib_xml), etree.fromstring(cib_xml)
+            ),
+        )
+
+    def test_modify_attributes(self):
+        self.assert_diff(
+            '<primitive id="A" class="ocf" type="Dummy"/>',
+            '<primitive id="A" class="ocf" provider="pacemaker" type="Stateful"/>',
+            """
+            <change operation="modify"
+                path="/cib/configuration/resources/primitive[@id='A']"
+            >
+              <change-list>
+                <change-attr name="provider" operation="set" value="pacemaker"/>
+                <change-attr name="type" operation="set" value="Stateful"/>
+              </change-list>
+              <change-result>
+                <primitive id="A" class="ocf" provider="pacemaker"
+                    type="Stateful"
+                />
+              </change-result>
+            </change>
+            """,
+        )
+
+    def test_unset_attribute(self):
+        self.assert_diff(
+            '<primitive id="A" class="ocf" description="desc"/>',
+            '<primitive id="A" class="ocf"/>',
+            """
+            <change operation="modify"
+                path="/cib/configuration/resources/primitive[@id='A']"
+            >
+              <change-list>
+                <change-attr name="description" operation="unset"/>
+              </change-list>
+              <change-result>
+                <primitive id="A" class="ocf"/>
+              </change-result>
+            </change>
+            """,
+        )
+
+    def test_create(self):
+        self.assert_diff(
+            '<primitive id="A"/>',
+            """
+            <primitive id="A">
+              <meta_attributes id="A-meta">
+                <nvpair id="A-meta-a" name="a" value="1"/>
+              </meta_attributes>
+            </primitive>
+            <primitive id="B"/>
+            """,
+            """
+            <change operation="create"
+                path="/cib/configuration/resources/primitive[@id='A']"
+                position="0"
+            >
+              <meta_attributes id="A-meta">
+                <nvpair id="A-meta-a" name="a" value="1"/>
+              </meta_attributes>
+            </change>
+            <change operation="create" path="/cib/configuration/resources"
+                position="1"
+            >
+              <primitive id="B"/>
+            </change>
+            """,
+        )
+
+    def test_delete_goes_first(self):
+        self.assert_diff(
+            '<primitive id="A"/><primitive id="B"><utilization id="U"/></primitive>',
+            '<primitive id="A" class="ocf"/><primitive id="B"/>',
+            """
+            <change operation="delete"
+                path="/cib/configuration/resources/primitive[@id='B']/utilization[@id='U']"
+                position="0"
+            />
+            <change operation="modify"
+                path="/cib/configuration/resources/primitive[@id='A']"
+            >
+              <change-list>
+                <change-attr name="class" operation="set" value="ocf"/>
+              </change-list>
+              <change-result>
+                <primitive id="A" class="ocf"/>
+              </change-result>
+            </change>
+            """,
+        )
+
+    def test_move(self):
+        self.assert_diff(
+            '<primitive id="A"/><primitive id="B"/><primitive id="C"/>',
+            '<primitive id="B"/><primitive id="A"/><primitive id="C"/>',
+            """
+            <change operation="move"
+                path="/cib/configuration/resources/primitive[@id='B']"
+                position="0"
+            />
+            <change operation="move"
+                path="/cib/configuration/resources/primitive[@id='A']"
+                position="1"
+            />
+            """,
+        )
+
+    def test_create_and_delete_are_not_moves(self):
+        self.assert_diff(
+            '<primitive id="A"/><primitive id="B"/><primitive id="C"/>',
+            '<primitive id="X"/><primitive id="B"/><primitive id="C"/>',
+            """
+            <change operation="delete"
+                path="/cib/configuration/resources/primitive[@id='A']"
+                position="0"
+            />
+            <change operation="create" path="/cib/configuration/resources"
+                position="0"
+            >
+              <primitive id="X"/>
+            </change>
+            """,
+        )
+
+    def test_elements_without_id(self):
+        self.assert_diff(
+            '<template id="T"><operations/></template>',
+            '<template id="T"><operations><op id="o"/></operations></template>',
+            """
+            <change operation="create"
+                path="/cib/configuration/resources/template[@id='T']/operations"
+                position="0"
+            >
+              <op id="o"/>
+            </change>
+            """,
+        )
+
+    def test_ambiguous_elements_without_id(self):
+        self.assert_not_supported(
+            '<template id="T"><operations/><operations/></template>',
+            '<template id="T"><operations/><operations a="b"/></template>',
+        )
+
+    def test_ambiguous_elements_without_id_not_changed(self):
+        self.assert_diff(
+            '<template id="T"><operations/><operations/></template>',
+            '<template id="T" a="b"><operations/><operations/></template>',
+            """
+            <change operation="modify"
+                path="/cib/configuration/resources/template[@id='T']"
+            >
+              <change-list>
+                <change-attr name="a" operation="set" value="b"/>
+              </change-list>
+              <change-result>
+                <template id="T" a="b"/>
+              </change-result>
+            </change>
+            """,
+        )
+
+    def test_comment(self):
+        self.assert_not_supported(
+            '<primitive id="A"/>', '<primitive id="A"/><!-- comment -->'
+        )
+
+    def test_text(self):
+        self.assert_not_supported(
+            '<primitive id="A"/>', '<primitive id="A">text</primitive>'
+        )
+
+    def test_quote_in_id(self):
+        self.assert_not_supported(
+            """<primitive id="A'B"/>""", """<primitive id="A'B" a="b"/>"""
+        )
+
+    def test_different_root(self):
+        with self.assertRaises(lib.NativeDiffNotSupported):
+            lib.diff_cibs(etree.Element("cib"), etree.Element("diff"))
+
+
+class JournalToDiffXml(TestCase):
+    def setUp(self):
+        self.cib = _cib(
+            """
+            <primitive id="A" class="ocf">
+              <meta_attributes id="A-meta">
+                <nvpair id="A-meta-a" name="a" value="1"/>
+              </meta_attributes>
+            </primitive>
+            <primitive id="B"/>
+            """
+        )
+        self.journal = start_change_journal(self.cib)
+        self.addCleanup(stop_change_journal, self.journal)
+        self.resources = self.cib.find("configuration/resources")
+
+    def assert_diff(self, expected_changes):
+        assert_xml_equal(
+            f'<diff format="2">{expected_changes}</diff>',
+            lib.journal_to_diff_xml(self.journal),
+        )
+
+    def test_no_changes(self):
+        self.assertEqual("", lib.journal_to_diff_xml(self.journal))
+
+    def test_changes(self):
+        nvset = self.resources.find("primitive/meta_attributes")
+        update_attribute_remove_empty(nvset[0], "value", "2")
+        append_new_element(nvset, "nvpair", {"id": "A-meta-b", "name": "b"})
+        update_attribute_remove_empty(nvset[-1], "value", "3")
+        remove_one_element(self.resources.find("primitive[@id='B']"))
+        append_new_element(self.resources, "primitive", {"id": "C"}, index=0)
+        self.assert_diff(
+            """
+            <change operation="delete"
+                path="/cib/configuration/resources/primitive[@id='B']"
+                position="1"
+            />
+            <change operation="modify"
+                path="/cib/configuration/resources/primitive[@id='A']/meta_attributes[@id='A-meta']/nvpair[@id='A-meta-a']"
+            >
+              <change-list>
+                <change-attr name="value" operation="set" value="2"/>
+              </change-list>
+              <change-result>
+                <nvpair id="A-meta-a" name="a" value="2"/>
+              </change-result>
+            </change>
+            <change operation="create" path="/cib/configuration/resources"
+                position="0"
+            >
+              <primitive id="C"/>
+            </change>
+            <change operation="create"
+                path="/cib/configuration/resources/primitive[@id='A']/meta_attributes[@id='A-meta']"
+                position="1"
+            >
+              <nvpair id="A-meta-b" name="b" value="3"/>
+            </change>
+            """
+        )
+
+    def test_created_and_removed(self):
+        remove_one_element(append_new_element(self.resources, "primitive"))
+        self.assertEqual("", lib.journal_to_diff_xml(self.journal))
+
+    def test_modified_and_removed(self):
+        primitive = self.resources.find("primitive")
+        update_attribute_remove_empty(primitive, "class", "")
+        remove_one_element(primitive[0][0])
+        remove_one_element(primitive)
+        self.assert_diff(
+            """
+            <change operation="delete"
+                path="/cib/configuration/resources/primitive[@id='A']"
+                position="0"
+            />
+            """
+        )
+
+    def test_bypassed_structure(self):
+        append_new_element(self.resources, "primitive", {"id": "C"})
+        etree.SubElement(self.resources, "primitive", id="D")
+        with self.assertRaises(lib.NativeDiffNotSupported):
+            lib.journal_to_diff_xml(self.journal)
+
+    def test_bypassed_attribute(self):
+        append_new_element(self.resources, "primitive", {"id": "C"})
+        self.resources[0].set("provider", "heartbeat")
+        with self.assertRaises(lib.NativeDiffNotSupported):
+            lib.journal_to_diff_xml(self.journal)
+
+    def test_bypassed_attribute_of_modified_element(self):
+        update_attribute_remove_empty(self.resources[0], "class", "lsb")
+        self.resources[0].set("provider", "heartbeat")
+        self.assert_diff(
+            """
+            <change operation="modify"
+                path="/cib/configuration/resources/primitive[@id='A']"
+            >
+              <change-list>
+                <change-attr name="class" operation="set" value="lsb"/>
+                <change-attr name="provider" operation="set"
+                    value="heartbeat"
+                />
+              </change-list>
+              <change-result>
+                <primitive id="A" class="lsb" provider="heartbeat"/>
+              </change-result>
+            </change>
+            """
+        )
+
+    def test_bypassed_remove_and_add(self):
+        self.resources.remove(self.resources.find("primitive[@id='B']"))
+        etree.SubElement(self.resources, "primitive", id="D", type="Dummy")
+        with self.assertRaises(lib.NativeDiffNotSupported):
+            lib.journal_to_diff_xml(self.journal)
+
+    def test_id_changed(self):
+        update_attribute_remove_empty(self.resources[0], "id", "X")
+        with self.assertRaises(lib.NativeDiffNotSupported):
+            lib.journal_to_diff_xml(self.journal)
+
+    def test_stopped(self):
+        stop_change_journal(self.journal)
+        with self.assertRaises(lib.NativeDiffNotSupported):
+            lib.journal_to_diff_xml(self.journal)
@@ -1,4 +1,5 @@
 import os.path
+from tempfile import TemporaryDirectory
 from unittest import mock, TestCase
 from lxml import etree
 
@@ -348,6 +349,51 @@ class GetCibTest(LibraryPacemakerTest):
         xml_fromstring_mock.assert_called_once_with(xml)
 
 
+class GetCibWithoutStatus(LibraryPacemakerTest):
+    def test_success(self):
+        runner = mock.MagicMock(spec_set=CommandRunner)
+        runner.run.side_effect = [
+            ('<cib epoch="3"/>', "", 0),
+            ("<configuration><resources/></configuration>", "", 0),
+        ]
+        assert_xml_equal(
+            '<cib epoch="3"><configuration><resources/></configuration></cib>',
+            etree_to_str(lib.get_cib_without_status(runner)),
+        )
+        runner.run.assert_has_calls(
+            [
+                mock.call(
+                    [
+                        self.path("cibadmin"),
+                        "--local",
+                        "--query",
+                        "--no-children",
+                    ]
+                ),
+                mock.call(
+                    [
+                        self.path("cibadmin"),
+                        "--local",
+                        "--query",
+                        "--scope=configuration",
+                    ]
+                ),
+            ]
+        )
+
+    def test_error(self):
+        runner = get_runner("some info", "some error", 1)
+        assert_raise_library_error(
+            lambda: lib.get_cib_without_status(runner),
+            fixture.error(
+                report_codes.CIB_LOAD_ERROR, reason="some error\nsome info",
+            ),
+        )
+        runner.run.assert_called_once_with(
+            [self.path("cibadmin"), "--local", "--query", "--no-children"]
+        )
+
+
 class Verify(LibraryPacemakerTest):
     def test_run_on_live_cib(self):
         runner = get_runner()
@@ -909,6 +955,63 @@ class GetLocalNodeStatusTest(TestCase):
         )
 
 
+class WaitForLocalNodeStartedTest(TestCase):
+    def setUp(self):
+        self.env_assist, self.config = get_env_tools(test_case=self)
+
+    def config_node_status(self, name, **kwargs):
+        self.config.runner.pcmk.load_state(
+            nodes=[fixture.state_node("1", "name_1", **kwargs)],
+            name=f"{name}.load_state",
+        ).runner.pcmk.local_node_name(
+            node_name="name_1", name=f"{name}.local_node_name"
+        )
+
+    @mock.patch("pcs.lib.pacemaker.live.time.sleep")
+    def test_started(self, mock_sleep):
+        self.config_node_status("status")
+        env = self.env_assist.get_env()
+        self.assertEqual(
+            dict(offline=False, **fixture.state_node("1", "name_1")),
+            lib.wait_for_local_node_started(env.cmd_runner(), 10),
+        )
+        mock_sleep.assert_not_called()
+
+    @mock.patch("pcs.lib.pacemaker.live.time.sleep")
+    def test_wait_until_started(self, mock_sleep):
+        self.config.runner.pcmk.load_state(
+            stderr="error: Could not connect to cluster (is it running?)",
+            returncode=102,
+        )
+        self.config_node_status("pending", online=False, pending=True)
+        self.config_node_status("started")
+        env = self.env_assist.get_env()
+        self.assertEqual(
+            dict(offline=False, **fixture.state_node("1", "name_1")),
+            lib.wait_for_local_node_started(env.cmd_runner(), 10),
+        )
+        self.assertEqual(
+            [mock.call(settings.node_start_check_interval)] * 2,
+            mock_sleep.call_args_list,
+        )
+
+    @mock.patch("pcs.lib.pacemaker.live.time.sleep")
+    @mock.patch("pcs.lib.pacemaker.live.time.time")
+    def test_timeout(self, mock_time, mock_sleep):
+        mock_time.side_effect = [100, 109.875, 110.5]
+        self.config_node_status("pending_1", pending=True)
+        self.config_node_status("pending_2", pending=True)
+        env = self.env_assist.get_env()
+        self.assertEqual(
+            dict(
+                offline=False,
+                **fixture.state_node("1", "name_1", pending=True),
+            ),
+            lib.wait_for_local_node_started(env.cmd_runner(), 10),
+        )
+        self.assertEqual([mock.call(0.125)], mock_sleep.call_args_list)
+
+
 class RemoveNode(LibraryPacemakerTest):
     def test_success(self):
         mock_runner = get_runner("", "", 0)
@@ -1360,3 +1463,47 @@ class IsInPcmkToolHelp(TestCase):
         self.assertFalse(
             lib._is_in_pcmk_tool_help(mock_runner, "", ["A", "C", "E"])
         )
+
+
+class GetPcmkToolHelpCached(TestCase):
+    # pylint: disable=protected-access
+    def setUp(self):
+        tmp_dir = TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        with open(os.path.join(tmp_dir.name, "crm_resource"), "w"):
+            pass
+        patcher = mock.patch.object(
+            settings, "pacemaker_binaries", tmp_dir.name
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        lib.set_tool_help_cache(os.path.join(tmp_dir.name, "cache.json"))
+        self.addCleanup(lib.set_tool_help_cache, None)
+
+    def test_run_once(self):
+        mock_runner = get_runner("", "--wait --expired", 1)
+        self.assertTrue(lib.has_wait_for_idle_support(mock_runner))
+        self.assertTrue(
+            lib.has_resource_unmove_unban_expired_support(mock_runner)
+        )
+        mock_runner.run.assert_called_once_with(
+            [os.path.join(settings.pacemaker_binaries, "crm_resource"), "-?"]
+        )
+
+    def test_shared_by_processes(self):
+        self.assertTrue(
+            lib.has_wait_for_idle_support(get_runner("", "--wait", 1))
+        )
+        # a new process starts with an empty memory
+        lib.set_tool_help_cache(
+            os.path.join(settings.pacemaker_binaries, "cache.json")
+        )
+        mock_runner = get_runner()
+        self.assertTrue(lib.has_wait_for_idle_support(mock_runner))
+        mock_runner.run.assert_not_called()
+
+    def test_empty_output_not_stored(self):
+        self.assertFalse(lib.has_wait_for_idle_support(get_runner("", "", 1)))
+        mock_runner = get_runner("", "--wait", 1)
+        self.assertTrue(lib.has_wait_for_idle_support(mock_runner))
+        mock_runner.run.assert_called_once()
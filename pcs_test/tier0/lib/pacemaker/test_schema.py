@@ -0,0 +1,108 @@
+import os
+import os.path
+from tempfile import TemporaryDirectory
+from unittest import mock, TestCase
+
+from lxml import etree
+
+from pcs_test.tools import fixture
+from pcs_test.tools.assertions import assert_raise_library_error
+
+from pcs.common.reports import codes as report_codes
+from pcs.lib.pacemaker import schema
+
+SCHEMA = """
+    <grammar xmlns="http://relaxng.org/ns/structure/1.0">
+      <start>
+        <element name="cib">
+          <attribute name="validate-with"><text/></attribute>
+          <optional><element name="configuration"><empty/></element></optional>
+        </element>
+      </start>
+    </grammar>
+"""
+
+
+class SchemaTestBase(TestCase):
+    def setUp(self):
+        schema.clear_cache()
+        self.addCleanup(schema.clear_cache)
+        tmp_dir = TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+        self.schema_path = os.path.join(self.tmp_dir, "pacemaker-3.2.rng")
+        with open(self.schema_path, "w") as schema_file:
+            schema_file.write(SCHEMA)
+
+
+class GetRelaxng(SchemaTestBase):
+    def test_missing_file(self):
+        self.assertIsNone(
+            schema.get_relaxng(os.path.join(self.tmp_dir, "missing.rng"))
+        )
+
+    def test_compiled_once(self):
+        self.assertIs(
+            schema.get_relaxng(self.schema_path),
+            schema.get_relaxng(self.schema_path),
+        )
+
+    def test_recompiled_when_changed(self):
+        compiled = schema.get_relaxng(self.schema_path)
+        stat = os.stat(self.schema_path)
+        os.utime(self.schema_path, (stat.st_atime, stat.st_mtime + 10))
+        self.assertIsNot(compiled, schema.get_relaxng(self.schema_path))
+
+    def test_forget_removed(self):
+        schema.get_relaxng(self.schema_path)
+        os.remove(self.schema_path)
+        self.assertIsNone(schema.get_relaxng(self.schema_path))
+
+
+class ValidateCib(SchemaTestBase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch(
+            "pcs.settings.pacemaker_schema_dir", self.tmp_dir + "/"
+        )
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+    def test_valid(self):
+        self.assertTrue(
+            schema.validate_cib(
+                etree.fromstring(
+                    '<cib validate-with="pacemaker-3.2"><configuration/></cib>'
+                )
+            )
+        )
+
+    def test_invalid(self):
+        assert_raise_library_error(
+            lambda: schema.validate_cib(
+                etree.fromstring(
+                    '<cib validate-with="pacemaker-3.2"><status/></cib>'
+                )
+            ),
+            fixture.error(
+                report_codes.CIB_LOAD_ERROR_BAD_FORMAT, reason=mock.ANY,
+            ),
+        )
+
+    def test_schema_not_available(self):
+        self.assertFalse(
+            schema.validate_cib(
+                etree.fromstring(
+                    '<cib validate-with="pacemaker-3.9"><bad/></cib>'
+                )
+            )
+        )
+
+    def test_not_a_schema_name(self):
+        for validate_with in ("none", "pacemaker-../../etc/schema", ""):
+            with self.subTest(validate_with=validate_with):
+                self.assertIsNone(
+                    schema.get_cib_schema_path(
+                        etree.Element("cib", {"validate-with": validate_with})
+                    )
+                )
@@ -62,6 +62,10 @@ class ChildrenTest(TestCase):
         children = _Children("test", self.dom, {"anys": ("any", self.wrap)}, {})
         self.assertEqual(["any.1", "any.2"], children.anys)
 
+    def test_children_searched_once(self):
+        children = _Children("test", self.dom, {"anys": ("any", self.wrap)}, {})
+        self.assertIs(children.anys, children.anys)
+
     def test_raises_on_undeclared_children(self):
         children = _Children("test", self.dom, {}, {})
         self.assertRaises(AttributeError, lambda: children.some_section)
@@ -97,6 +101,11 @@ class ClusterStatusTest(TestBase):
             (severities.ERROR, report_codes.BAD_CLUSTER_STATE_FORMAT, {}),
         )
 
+    @mock.patch("pcs.lib.pacemaker.state._validate_cluster_state_dom")
+    def test_skip_validation(self, mock_validate):
+        state.get_cluster_state_dom(str(self.covered_status), validate=False)
+        mock_validate.assert_not_called()
+
 
 class WorkWithClusterStatusNodesTest(TestBase):
     def fixture_node_string(self, **kwargs):
@@ -492,6 +501,21 @@ class GetPrimitivesForStateCheck(TestCase):
         self.assert_primitives("B2-R2", ["B2-R2", "B2-R2"], False)
 
 
+class GetPrimitivesForStateCheckIndexed(GetPrimitivesForStateCheck):
+    def assert_primitives(self, resource_id, primitive_ids, expected_running):
+        self.assertEqual(
+            [
+                elem.attrib["id"]
+                for elem in state._get_primitives_for_state_check(
+                    state.ResourcesStateIndex(self.status),
+                    resource_id,
+                    expected_running,
+                )
+            ],
+            primitive_ids,
+        )
+
+
 class CommonResourceState(TestCase):
     resource_id = "R"
 
@@ -966,3 +990,111 @@ class IsResourceManaged(TestCase):
         self.assert_managed("R46", False)
         self.assert_managed("R47", False)
         self.assert_managed("R48", False)
+
+
+class IsResourceManagedIndexed(IsResourceManaged):
+    def setUp(self):
+        super().setUp()
+        self.index = state.ResourcesStateIndex(self.status)
+
+    def assert_managed(self, resource, managed):
+        self.assertEqual(
+            managed, state.is_resource_managed(self.index, resource)
+        )
+
+
+class ResourcesStateIndex(TestCase):
+    def setUp(self):
+        self.index = state.ResourcesStateIndex(
+            etree.fromstring(
+                """
+                <crm_mon>
+                    <nodes>
+                        <node name="node1" id="1" />
+                        <node name="node2" id="2" />
+                    </nodes>
+                    <resources>
+                        <clone id="C">
+                            <group id="G:0">
+                                <resource id="R:0" role="Started">
+                                    <node name="node1" id="1" />
+                                </resource>
+                            </group>
+                        </clone>
+                        <resource id="R" role="Master">
+                            <node name="node1" id="1" />
+                        </resource>
+                        <bundle id="B">
+                            <replica id="0">
+                                <resource id="B-R" role="Stopped" />
+                            </replica>
+                        </bundle>
+                    </resources>
+                </crm_mon>
+                """
+            )
+        )
+
+    def assert_found(self, tag, resource_id, expected_ids):
+        self.assertEqual(
+            [
+                record.element.get("id")
+                for record in self.index.find(tag, resource_id)
+            ],
+            expected_ids,
+        )
+
+    def test_find(self):
+        self.assert_found("resource", "R", ["R:0", "R"])
+        self.assert_found("resource", "R:0", ["R:0"])
+        self.assert_found("group", "G", ["G:0"])
+        self.assert_found("clone", "C", ["C"])
+        self.assert_found("bundle", "B", ["B"])
+        self.assert_found("resource", "C", [])
+        self.assert_found("clone", "G", [])
+
+    def test_clone_or_bundle(self):
+        record_r0, record_r = self.index.find("resource", "R")
+        self.assertEqual(
+            "C", self.index.get_clone_or_bundle(record_r0).element.get("id")
+        )
+        self.assertIsNone(self.index.get_clone_or_bundle(record_r))
+        (record_b,) = self.index.find("resource", "B-R")
+        self.assertEqual(
+            "B", self.index.get_clone_or_bundle(record_b).element.get("id")
+        )
+
+    def test_descendants(self):
+        (clone,) = self.index.find("clone", "C")
+        self.assertEqual(
+            ["R:0"], [record.element.get("id") for record in clone.descendants]
+        )
+
+    def test_nodes(self):
+        self.assertEqual(
+            ["node1", "node2"], [node.name for node in self.index.get_nodes()]
+        )
+        self.assertEqual("node2", self.index.find_node_by_id("2").name)
+        self.assertEqual("1", self.index.find_node_by_name("node1").id)
+        self.assertIsNone(self.index.find_node_by_id("node1"))
+        self.assertIsNone(self.index.find_node_by_name("node3"))
+
+    def test_running_nodes(self):
+        record_r0, record_r = self.index.find("resource", "R")
+        self.assertEqual(["node1"], record_r0.nodes)
+        self.assertEqual(["node1"], record_r.nodes)
+        self.assertEqual(
+            ["R:0", "R"],
+            [
+                record.element.get("id")
+                for record in self.index.find_node_by_name("node1").resources
+            ],
+        )
+        self.assertEqual([], self.index.find_node_by_name("node2").resources)
+
+    def test_resource_state(self):
+        self.assertEqual(
+            {"Master": ["node1"], "Started": ["node1"]},
+            state.get_resource_state(self.index, "R"),
+        )
+        self.assertEqual({}, state.get_resource_state(self.index, "B"))
@@ -0,0 +1,99 @@
+import json
+import os
+import os.path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from pcs.lib.pacemaker.tool_help_cache import ToolHelpCache
+
+
+class ToolHelpCacheTest(TestCase):
+    def setUp(self):
+        tmp_dir = TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.cache_path = os.path.join(tmp_dir.name, "cache.json")
+        self.tool_path = os.path.join(tmp_dir.name, "crm_resource")
+        self.write_tool("binary v1")
+
+    def write_tool(self, content):
+        with open(self.tool_path, "w") as tool_file:
+            tool_file.write(content)
+
+    def test_nothing_stored(self):
+        self.assertIsNone(
+            ToolHelpCache(self.cache_path).get(self.tool_path, "-?")
+        )
+
+    def test_stored(self):
+        ToolHelpCache(self.cache_path).store(
+            self.tool_path, "-?", "stdout", "stderr"
+        )
+        cache = ToolHelpCache(self.cache_path)
+        self.assertEqual(
+            ("stdout", "stderr"), cache.get(self.tool_path, "-?"),
+        )
+        self.assertIsNone(cache.get(self.tool_path, "--help-all"))
+        self.assertEqual(0o644, os.stat(self.cache_path).st_mode & 0o777)
+
+    def test_empty_not_stored(self):
+        cache = ToolHelpCache(self.cache_path)
+        cache.store(self.tool_path, "-?", "", " \n")
+        self.assertIsNone(cache.get(self.tool_path, "-?"))
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def test_empty_stored_ignored(self):
+        ToolHelpCache(self.cache_path).store(
+            self.tool_path, "-?", "stdout", "stderr"
+        )
+        with open(self.cache_path) as cache_file:
+            records = json.load(cache_file)
+        for record in records.values():
+            record.update(stdout="", stderr="")
+        with open(self.cache_path, "w") as cache_file:
+            json.dump(records, cache_file)
+        self.assertIsNone(
+            ToolHelpCache(self.cache_path).get(self.tool_path, "-?")
+        )
+
+    def test_stored_more_records(self):
+        cache = ToolHelpCache(self.cache_path)
+        cache.store(self.tool_path, "-?", "out1", "err1")
+        cache.store(self.tool_path, "--help-all", "out2", "err2")
+        cache = ToolHelpCache(self.cache_path)
+        self.assertEqual(("out1", "err1"), cache.get(self.tool_path, "-?"))
+        self.assertEqual(
+            ("out2", "err2"), cache.get(self.tool_path, "--help-all")
+        )
+
+    def test_tool_changed(self):
+        ToolHelpCache(self.cache_path).store(
+            self.tool_path, "-?", "stdout", "stderr"
+        )
+        self.write_tool("binary v2 upgraded")
+        self.assertIsNone(
+            ToolHelpCache(self.cache_path).get(self.tool_path, "-?")
+        )
+
+    def test_tool_missing(self):
+        cache = ToolHelpCache(self.cache_path)
+        missing_path = self.tool_path + "_missing"
+        cache.store(missing_path, "-?", "stdout", "stderr")
+        self.assertIsNone(cache.get(missing_path, "-?"))
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def test_corrupted_cache(self):
+        with open(self.cache_path, "w") as cache_file:
+            cache_file.write("not a json")
+        cache = ToolHelpCache(self.cache_path)
+        self.assertIsNone(cache.get(self.tool_path, "-?"))
+        cache.store(self.tool_path, "-?", "stdout", "stderr")
+        self.assertEqual(
+            ("stdout", "stderr"),
+            ToolHelpCache(self.cache_path).get(self.tool_path, "-?"),
+        )
+
+    def test_unwritable_cache(self):
+        tmp_dir = os.path.dirname(self.cache_path)
+        cache = ToolHelpCache(os.path.join(tmp_dir, "missing", "cache.json"))
+        cache.store(self.tool_path, "-?", "stdout", "stderr")
+        self.assertEqual(["crm_resource"], os.listdir(tmp_dir))
@@ -14,6 +14,8 @@ from pcs_test.tools.xml import etree_to_str
 from pcs.common.reports import codes as report_codes
 from pcs.common.tools import Version
 from pcs.lib.env import LibraryEnvironment
+from pcs.lib.errors import LibraryError
+from pcs.lib.xml_tools import append_new_element, get_element_index
 
 
 def mock_tmpfile(filename):
@@ -135,12 +137,31 @@ class GetCib(TestCase, ManageCibAssertionMixin):
         env.get_cib()
         self.assert_raises_cib_already_loaded(env.get_cib)
 
+    def test_without_status(self):
+        self.config.runner.cib.load(load_status=False)
+        cib = self.env_assist.get_env().get_cib(load_status=False)
+        self.assertIsNone(cib.find("status"))
+        self.assertIsNotNone(cib.find("configuration/resources"))
+        self.assertEqual("cib", cib.tag)
+        self.assertIsNotNone(cib.get("validate-with"))
+
+    def test_element_index_attached(self):
+        self.config.runner.cib.load()
+        env = self.env_assist.get_env()
+        cib = env.get_cib()
+        self.assertIs(cib, get_element_index(cib).root)
+
 
 class PushLoadedCib(TestCase, ManageCibAssertionMixin):
     # pylint: disable=too-many-public-methods
     wait_timeout = 10
 
     def setUp(self):
+        crm_diff_patcher = mock.patch(
+            "pcs.settings.cib_diff_use_crm_diff", True
+        )
+        self.addCleanup(crm_diff_patcher.stop)
+        crm_diff_patcher.start()
         tmpfile_patcher = mock.patch("pcs.lib.pacemaker.live.write_tmpfile")
         self.addCleanup(tmpfile_patcher.stop)
         self.mock_write_tmpfile = tmpfile_patcher.start()
@@ -434,6 +455,462 @@ class PushLoadedCib(TestCase, ManageCibAssertionMixin):
         )
 
 
+class PushLoadedCibNativeDiff(TestCase):
+    def setUp(self):
+        tmpfile_patcher = mock.patch("pcs.lib.pacemaker.live.write_tmpfile")
+        self.addCleanup(tmpfile_patcher.stop)
+        self.mock_write_tmpfile = tmpfile_patcher.start()
+        self.tmpfile_old = mock_tmpfile("old.cib")
+        self.tmpfile_new = mock_tmpfile("new.cib")
+        self.mock_write_tmpfile.side_effect = [
+            self.tmpfile_old,
+            self.tmpfile_new,
+        ]
+        self.env_assist, self.config = get_env_tools(test_case=self)
+        self.config.runner.cib.load(filename="cib-empty-2.0.xml")
+
+    def test_diff_is_empty(self):
+        env = self.env_assist.get_env()
+        env.get_cib()
+        env.push_cib()
+        self.mock_write_tmpfile.assert_not_called()
+
+    def test_element_index_detached(self):
+        env = self.env_assist.get_env()
+        cib = env.get_cib()
+        env.push_cib()
+        self.assertIsNone(get_element_index(cib))
+
+    def test_push_diff_without_status(self):
+        self.config.runner.cib.load(
+            filename="cib-empty-2.0.xml",
+            load_status=False,
+            instead="runner.cib.load",
+        )
+        self.config.runner.cib.push_diff(
+            cib_diff="""
+                <diff format="2">
+                  <change operation="create" path="/cib/configuration/resources"
+                    position="0"
+                  >
+                    <primitive id="R"/>
+                  </change>
+                </diff>
+            """
+        )
+        env = self.env_assist.get_env()
+        cib = env.get_cib(load_status=False)
+        etree.SubElement(cib.find("configuration/resources"), "primitive").set(
+            "id", "R"
+        )
+        env.push_cib()
+        self.mock_write_tmpfile.assert_not_called()
+
+    def test_push_diff(self):
+        self.config.runner.cib.push_diff(
+            cib_diff="""
+                <diff format="2">
+                  <change operation="create" path="/cib/configuration/resources"
+                    position="0"
+                  >
+                    <primitive id="R"/>
+                  </change>
+                </diff>
+            """
+        )
+        env = self.env_assist.get_env()
+        cib = env.get_cib()
+        etree.SubElement(cib.find("configuration/resources"), "primitive").set(
+            "id", "R"
+        )
+        env.push_cib()
+        self.mock_write_tmpfile.assert_not_called()
+
+    def test_push_tracked_changes(self):
+        self.config.runner.cib.push_diff(
+            cib_diff="""
+                <diff format="2">
+                  <change operation="create" path="/cib/configuration/resources"
+                    position="0"
+                  >
+                    <primitive id="R"/>
+                  </change>
+                </diff>
+            """
+        )
+        env = self.env_assist.get_env()
+        cib = env.get_cib(track_changes=True)
+        append_new_element(
+            cib.find("configuration/resources"), "primitive", {"id": "R"}
+        )
+        with mock.patch("pcs.lib.pacemaker.diff.diff_cibs_xml") as full_diff:
+            env.push_cib()
+        full_diff.assert_not_called()
+        self.mock_write_tmpfile.assert_not_called()
+
+    def test_push_changes_bypassing_journal(self):
+        self.config.runner.cib.push_diff(
+            cib_diff="""
+                <diff format="2">
+                  <change operation="create" path="/cib/configuration/resources"
+                    position="0"
+                  >
+                    <primitive id="R"/>
+                  </change>
+                  <change operation="create" path="/cib/configuration/resources"
+                    position="1"
+                  >
+                    <primitive id="S"/>
+                  </change>
+                </diff>
+            """
+        )
+        env = self.env_assist.get_env()
+        cib = env.get_cib(track_changes=True)
+        resources = cib.find("configuration/resources")
+        append_new_element(resources, "primitive", {"id": "R"})
+        etree.SubElement(resources, "primitive").set("id", "S")
+        env.push_cib()
+        self.mock_write_tmpfile.assert_not_called()
+
+    def test_fallback_to_crm_diff(self):
+        (
+            self.config.runner.cib.diff(
+                self.tmpfile_old.name, self.tmpfile_new.name
+            ).runner.cib.push_diff()
+        )
+        env = self.env_assist.get_env()
+        cib = env.get_cib()
+        cib.find("configuration/resources").append(etree.Comment("comment"))
+        env.push_cib()
+        self.assertEqual(2, self.mock_write_tmpfile.call_count)
+        self.env_assist.assert_reports(
+            [
+                fixture.debug(report_codes.TMP_FILE_WRITE, **kwargs)
+                for kwargs in (
+                    dict(
+                        file_path=self.tmpfile_old.name,
+                        content=self.config.calls.get("runner.cib.load").stdout,
+                    ),
+                    dict(
+                        file_path=self.tmpfile_new.name,
+                        content=etree_to_str(cib),
+                    ),
+                )
+            ]
+        )
+
+
+def _set_epoch_558(cib):
+    cib.set("epoch", "558")
+
+
+class PushLoadedCibRebase(TestCase):
+    def setUp(self):
+        sleep_patcher = mock.patch("pcs.lib.env.time.sleep")
+        self.addCleanup(sleep_patcher.stop)
+        self.mock_sleep = sleep_patcher.start()
+        self.env_assist, self.config = get_env_tools(test_case=self)
+        self.config.runner.cib.load(filename="cib-empty-2.0.xml")
+        self.rebase_calls = []
+        self.diff_r = """
+            <diff format="2">
+              <change operation="create" path="/cib/configuration/resources"
+                position="0"
+              >
+                <primitive id="R"/>
+              </change>
+            </diff>
+        """
+
+    def rebase(self, cib):
+        self.rebase_calls.append(cib)
+        append_new_element(
+            cib.find("configuration/resources"), "primitive", {"id": "R"}
+        )
+
+    def load_and_push(self):
+        env = self.env_assist.get_env()
+        self.rebase(env.get_cib(track_changes=True))
+        env.push_cib(rebase=self.rebase)
+        return env
+
+    def test_no_conflict(self):
+        (
+            self.config.runner.cib.load_epoch().runner.cib.push_diff(
+                cib_diff=self.diff_r
+            )
+        )
+        self.load_and_push()
+        self.assertEqual(1, len(self.rebase_calls))
+        self.mock_sleep.assert_not_called()
+
+    def test_conflict_rebase(self):
+        (
+            self.config.runner.cib.load_epoch(name="load_epoch_1", epoch=558)
+            .runner.cib.load(
+                name="load_2",
+                filename="cib-empty-2.0.xml",
+                modifiers=[_set_epoch_558],
+            )
+            .runner.cib.load_epoch(name="load_epoch_2", epoch=558)
+            .runner.cib.push_diff(cib_diff=self.diff_r)
+        )
+        self.load_and_push()
+        self.assertEqual(2, len(self.rebase_calls))
+        self.assertEqual("558", self.rebase_calls[1].get("epoch"))
+        self.mock_sleep.assert_called_once()
+        self.env_assist.assert_reports(
+            [fixture.debug(report_codes.CIB_PUSH_REBASED, retry_count=1)]
+        )
+
+    def test_admin_epoch_conflict(self):
+        (
+            self.config.runner.cib.load_epoch(
+                name="load_epoch_1", admin_epoch=1
+            )
+            .runner.cib.load(name="load_2", filename="cib-empty-2.0.xml")
+            .runner.cib.load_epoch(name="load_epoch_2")
+            .runner.cib.push_diff(cib_diff=self.diff_r)
+        )
+        self.load_and_push()
+        self.assertEqual(2, len(self.rebase_calls))
+        self.env_assist.assert_reports(
+            [fixture.debug(report_codes.CIB_PUSH_REBASED, retry_count=1)]
+        )
+
+    def test_push_fails_due_to_conflict(self):
+        (
+            self.config.runner.cib.load_epoch(name="load_epoch_1")
+            .runner.cib.push_diff(
+                name="push_1",
+                cib_diff=self.diff_r,
+                stderr="patch failed",
+                returncode=1,
+            )
+            .runner.cib.load_epoch(name="load_epoch_2", epoch=558)
+            .runner.cib.load(
+                name="load_2",
+                filename="cib-empty-2.0.xml",
+                modifiers=[_set_epoch_558],
+            )
+            .runner.cib.load_epoch(name="load_epoch_3", epoch=558)
+            .runner.cib.push_diff(name="push_2", cib_diff=self.diff_r)
+        )
+        self.load_and_push()
+        self.env_assist.assert_reports(
+            [fixture.debug(report_codes.CIB_PUSH_REBASED, retry_count=1)]
+        )
+
+    def test_push_fails_no_conflict(self):
+        (
+            self.config.runner.cib.load_epoch(name="load_epoch_1")
+            .runner.cib.push_diff(
+                cib_diff=self.diff_r, stderr="patch failed", returncode=1,
+            )
+            .runner.cib.load_epoch(name="load_epoch_2")
+        )
+        self.env_assist.assert_raise_library_error(
+            self.load_and_push,
+            [
+                fixture.error(
+                    report_codes.CIB_PUSH_ERROR,
+                    reason="patch failed",
+                    pushed_cib="",
+                )
+            ],
+            expected_in_processor=False,
+        )
+        self.assertEqual(1, len(self.rebase_calls))
+
+    def test_rebase_fails(self):
+        self.config.runner.cib.load_epoch(epoch=558)
+        self.config.runner.cib.load(name="load_2", filename="cib-empty.xml")
+
+        def rebase(cib):
+            raise LibraryError()
+
+        env = self.env_assist.get_env()
+        env.get_cib()
+        self.assertRaises(LibraryError, lambda: env.push_cib(rebase=rebase))
+
+    @mock.patch("pcs.settings.cib_push_conflict_retry_max", 1)
+    def test_retries_exhausted(self):
+        (
+            self.config.runner.cib.load_epoch(name="load_epoch_1", epoch=558)
+            .runner.cib.load(
+                name="load_2",
+                filename="cib-empty-2.0.xml",
+                modifiers=[_set_epoch_558],
+            )
+            .runner.cib.load_epoch(name="load_epoch_2", epoch=559)
+        )
+        self.env_assist.assert_raise_library_error(
+            self.load_and_push,
+            [fixture.error(report_codes.CIB_PUSH_CONFLICT, retry_count=1)],
+            expected_in_processor=False,
+        )
+        self.assertEqual(2, len(self.rebase_calls))
+
+    def test_not_live(self):
+        self.config.env.set_cib_data("<cib/>")
+        self.config.runner.cib.push_diff(cib_diff=self.diff_r)
+        self.load_and_push()
+        self.assertEqual(1, len(self.rebase_calls))
+
+
+class CibTransaction(TestCase, ManageCibAssertionMixin):
+    def setUp(self):
+        tmpfile_patcher = mock.patch("pcs.lib.pacemaker.live.write_tmpfile")
+        self.addCleanup(tmpfile_patcher.stop)
+        self.mock_write_tmpfile = tmpfile_patcher.start()
+        self.env_assist, self.config = get_env_tools(test_case=self)
+        self.diff_r_s = """
+            <diff format="2">
+              <change operation="create" path="/cib/configuration/resources"
+                position="0"
+              >
+                <primitive id="R"/>
+              </change>
+              <change operation="create" path="/cib/configuration/resources"
+                position="1"
+              >
+                <primitive id="S"/>
+              </change>
+            </diff>
+        """
+
+    def test_one_load_and_push(self):
+        (
+            self.config.runner.cib.load(
+                filename="cib-empty-2.0.xml"
+            ).runner.cib.push_diff(cib_diff=self.diff_r_s)
+        )
+        env = self.env_assist.get_env()
+        env.begin_cib_transaction()
+        cib = env.get_cib(load_status=False, track_changes=True)
+        append_new_element(
+            cib.find("configuration/resources"), "primitive", {"id": "R"}
+        )
+        env.push_cib()
+        self.assertIs(cib, env.get_cib(track_changes=True))
+        append_new_element(
+            cib.find("configuration/resources"), "primitive", {"id": "S"}
+        )
+        env.push_cib()
+        env.commit_cib_transaction()
+        self.mock_write_tmpfile.assert_not_called()
+
+    def test_commit_wait(self):
+        (
+            self.config.runner.pcmk.can_wait()
+            .runner.cib.load(filename="cib-empty-2.0.xml")
+            .runner.cib.push_diff(cib_diff=self.diff_r_s)
+            .runner.pcmk.wait(timeout=10)
+        )
+        env = self.env_assist.get_env()
+        env.ensure_wait_satisfiable(10)
+        env.begin_cib_transaction()
+        cib = env.get_cib()
+        resources = cib.find("configuration/resources")
+        etree.SubElement(resources, "primitive").set("id", "R")
+        env.push_cib()
+        etree.SubElement(resources, "primitive").set("id", "S")
+        env.push_cib()
+        env.commit_cib_transaction(wait=10)
+
+    def test_commit_nothing_pushed(self):
+        self.config.runner.cib.load(filename="cib-empty-2.0.xml")
+        env = self.env_assist.get_env()
+        env.begin_cib_transaction()
+        cib = env.get_cib()
+        env.commit_cib_transaction()
+        self.assertIsNone(get_element_index(cib))
+        self.assert_raises_cib_not_loaded(lambda: env.cib)
+
+    def test_cancel(self):
+        self.config.runner.cib.load(filename="cib-empty-2.0.xml")
+        env = self.env_assist.get_env()
+        env.begin_cib_transaction()
+        cib = env.get_cib()
+        etree.SubElement(cib.find("configuration/resources"), "primitive")
+        env.push_cib()
+        env.cancel_cib_transaction()
+        self.assert_raises_cib_not_loaded(lambda: env.cib)
+
+    def test_upgrade_pushes_pending_changes(self):
+        (
+            self.config.runner.cib.load(
+                name="load_cib_old", filename="cib-empty-2.6.xml"
+            )
+            .runner.cib.push_diff(
+                cib_diff="""
+                    <diff format="2">
+                      <change operation="create"
+                        path="/cib/configuration/resources" position="0"
+                      >
+                        <primitive id="R"/>
+                      </change>
+                    </diff>
+                """
+            )
+            .runner.cib.load(
+                name="load_cib_old_2", filename="cib-empty-2.6.xml"
+            )
+            .runner.cib.upgrade()
+            .runner.cib.load(filename="cib-empty-2.8.xml")
+        )
+        env = self.env_assist.get_env()
+        env.begin_cib_transaction()
+        cib = env.get_cib()
+        etree.SubElement(cib.find("configuration/resources"), "primitive").set(
+            "id", "R"
+        )
+        env.push_cib()
+        env.get_cib(Version(2, 8, 0))
+        env.commit_cib_transaction()
+        self.env_assist.assert_reports(
+            [fixture.info(report_codes.CIB_UPGRADE_SUCCESSFUL)]
+        )
+
+    def test_no_wait_inside(self):
+        self.config.runner.cib.load(filename="cib-empty-2.0.xml")
+        env = self.env_assist.get_env()
+        env.begin_cib_transaction()
+        env.get_cib()
+        self.assert_raises_cib_error(
+            lambda: env.push_cib(wait=10),
+            "Cannot wait in a CIB transaction, wait when committing it",
+        )
+
+    def test_no_custom_cib_inside(self):
+        env = self.env_assist.get_env()
+        env.begin_cib_transaction()
+        self.assert_raises_cib_error(
+            lambda: env.push_cib(etree.XML("<cib/>")),
+            "Cannot push custom CIB in a CIB transaction",
+        )
+
+    def test_begin_twice(self):
+        env = self.env_assist.get_env()
+        env.begin_cib_transaction()
+        self.assert_raises_cib_error(
+            env.begin_cib_transaction, "CIB transaction has already begun"
+        )
+
+    def test_begin_after_load(self):
+        self.config.runner.cib.load(filename="cib-empty-2.0.xml")
+        env = self.env_assist.get_env()
+        env.get_cib()
+        self.assert_raises_cib_already_loaded(env.begin_cib_transaction)
+
+    def test_commit_not_begun(self):
+        env = self.env_assist.get_env()
+        self.assert_raises_cib_error(
+            env.commit_cib_transaction, "CIB transaction has not begun"
+        )
+
+
 class PushCustomCib(TestCase, ManageCibAssertionMixin):
     custom_cib = "<custom_cib />"
     wait_timeout = 10
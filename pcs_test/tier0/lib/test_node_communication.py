@@ -21,6 +21,8 @@ from pcs.common.host import (
     PcsKnownHost,
 )
 from pcs.common.node_communicator import (
+    CurlHandlePoolStats,
+    DebugCaptureLevel,
     Request,
     RequestData,
     RequestTarget,
@@ -633,3 +635,43 @@ class CommunicatorLoggerTest(TestCase):
             )
         )
         self.assertEqual([logger_call], self.logger.mock_calls)
+
+    def test_log_pool_stats(self):
+        self.com_logger.log_pool_stats(CurlHandlePoolStats(5, 3, 2, 4))
+        self.reporter.assert_reports(
+            [
+                fixture.debug(
+                    report_codes.NODE_COMMUNICATION_CONNECTION_POOL_STATS,
+                    created=5,
+                    reused=3,
+                    connections_reused=2,
+                    idle=4,
+                )
+            ]
+        )
+        logger_call = mock.call.debug(
+            "Connection pool: 5 handles created, 3 handles reused, 2 "
+            "connections reused, 4 handles idle"
+        )
+        self.assertEqual([logger_call], self.logger.mock_calls)
+
+
+class CommunicatorLoggerDebugCaptureLevelTest(TestCase):
+    def setUp(self):
+        self.logger = mock.MagicMock(spec_set=logging.Logger)
+
+    def get_level(self, debug_reports, debug_log):
+        self.logger.isEnabledFor.return_value = debug_log
+        return lib.LibCommunicatorLogger(
+            self.logger, MockLibraryReportProcessor(debug=debug_reports)
+        ).get_debug_capture_level()
+
+    def test_debug_reports(self):
+        self.assertEqual(DebugCaptureLevel.FULL, self.get_level(True, False))
+
+    def test_debug_log(self):
+        self.assertEqual(DebugCaptureLevel.HEADERS, self.get_level(False, True))
+        self.logger.isEnabledFor.assert_called_once_with(logging.DEBUG)
+
+    def test_no_debug(self):
+        self.assertEqual(DebugCaptureLevel.OFF, self.get_level(False, False))
@@ -386,3 +386,198 @@ class RemoveOneElement(TestCase):
     def test_remove_element_without_parent(self):
         lib.remove_one_element(self.root)
         assert_xml_equal("<root><sub/></root>", etree_to_str(self.root))
+
+
+class AppendNewElement(TestCase):
+    def setUp(self):
+        self.root = etree.Element("root")
+        etree.SubElement(self.root, "first")
+
+    def test_append(self):
+        lib.append_new_element(self.root, "new", {"id": "a"})
+        assert_xml_equal(
+            '<root><first/><new id="a"/></root>', etree_to_str(self.root)
+        )
+
+    def test_index(self):
+        lib.append_new_element(self.root, "new", index=0)
+        assert_xml_equal("<root><new/><first/></root>", etree_to_str(self.root))
+
+
+class ChangeJournal(TestCase):
+    def setUp(self):
+        self.root = etree.fromstring(
+            """
+            <root>
+                <a id="a" x="1"><b id="b"/></a>
+                <c id="c"/>
+            </root>
+            """
+        )
+        self.journal = lib.start_change_journal(self.root)
+        self.addCleanup(lib.stop_change_journal, self.journal)
+
+    def test_initial_count(self):
+        self.assertEqual(4, self.journal.initial_element_count)
+        self.assertEqual(4, self.journal.initial_attribute_count)
+
+    def test_record_created(self):
+        new_el = lib.append_new_element(self.root.find("a"), "new")
+        sub_el = lib.get_sub_element(self.root, "sub")
+        useful_el = lib.append_when_useful(
+            self.root, etree.Element("useful", x="1")
+        )
+        lib.append_new_element(new_el, "nested")
+        self.assertEqual([new_el, sub_el, useful_el], self.journal.created)
+        self.assertTrue(self.journal.is_created(new_el[0]))
+        self.assertFalse(self.journal.is_created(self.root.find("a")))
+
+    def test_record_deleted(self):
+        el_a = self.root.find("a")
+        lib.append_new_element(el_a, "new")
+        lib.remove_one_element(el_a)
+        self.assertEqual([(el_a, self.root, 0, 2)], self.journal.deleted)
+
+    def test_record_modified(self):
+        el_a = self.root.find("a")
+        lib.update_attribute_remove_empty(el_a, "x", "2")
+        lib.update_attribute_remove_empty(el_a, "x", "")
+        lib.update_attribute_remove_empty(self.root.find("c"), "x", "")
+        self.assertEqual({el_a: {"id": "a", "x": "1"}}, self.journal.modified)
+
+    def test_record_moved(self):
+        el_c = self.root.find("c")
+        lib.move_elements([el_c], self.root.find("a"))
+        self.assertEqual([(el_c, self.root, 1, 1)], self.journal.deleted)
+        self.assertEqual([el_c], self.journal.created)
+
+    def test_consistent(self):
+        el_a = self.root.find("a")
+        lib.update_attribute_remove_empty(el_a, "x", "2")
+        new_el = lib.append_new_element(el_a, "new")
+        new_el.set("y", "1")
+        lib.move_elements([self.root.find("c")], new_el)
+        lib.remove_one_element(el_a.find("b"))
+        self.assertTrue(self.journal.is_consistent())
+
+    def test_not_consistent(self):
+        def set_attribute(root):
+            root.find("c").set("x", "1")
+
+        def remove_attribute(root):
+            del root.find("a").attrib["x"]
+
+        def remove_element(root):
+            root.find("a").remove(root.find("a/b"))
+
+        def replace_element(root):
+            root.remove(root.find("c"))
+            etree.SubElement(root, "c", id="c", x="1")
+
+        for change in (
+            set_attribute,
+            remove_attribute,
+            remove_element,
+            replace_element,
+        ):
+            with self.subTest(change=change.__name__):
+                root = etree.fromstring(
+                    '<root><a id="a" x="1"><b id="b"/></a><c id="c"/></root>'
+                )
+                journal = lib.start_change_journal(root)
+                self.addCleanup(lib.stop_change_journal, journal)
+                change(root)
+                self.assertFalse(journal.is_consistent())
+
+    def test_other_tree_not_recorded(self):
+        other = etree.Element("root")
+        lib.append_new_element(other, "new")
+        self.assertEqual([], self.journal.created)
+
+    def test_stopped(self):
+        lib.stop_change_journal(self.journal)
+        lib.append_new_element(self.root, "new")
+        self.assertEqual([], self.journal.created)
+        self.assertFalse(self.journal.is_active)
+
+    def test_stopped_by_new_journal(self):
+        journal = lib.start_change_journal(etree.Element("other"))
+        self.addCleanup(lib.stop_change_journal, journal)
+        lib.append_new_element(self.root, "new")
+        self.assertEqual([], self.journal.created)
+        self.assertFalse(self.journal.is_active)
+        self.assertTrue(journal.is_active)
+
+
+class ElementIndex(TestCase):
+    def setUp(self):
+        self.root = etree.fromstring(
+            '<root><a id="a"><b id="b"/></a><c id="a"/></root>'
+        )
+        self.index = lib.attach_element_index(self.root)
+        self.addCleanup(lib.detach_element_index, self.index)
+
+    def test_get_elements(self):
+        self.assertEqual(
+            [self.root[0], self.root[1]], self.index.get_elements_by_id("a")
+        )
+        self.assertEqual([self.root[0][0]], self.index.get_elements_by_id("b"))
+        self.assertEqual([], self.index.get_elements_by_id("x"))
+
+    def test_get_index(self):
+        self.assertIs(self.index, lib.get_element_index(self.root[0][0]))
+        self.assertIsNone(lib.get_element_index(etree.Element("root")))
+
+    def test_detach(self):
+        lib.detach_element_index(self.index)
+        self.assertIsNone(lib.get_element_index(self.root))
+
+    def test_attach_another(self):
+        another_root = etree.Element("root")
+        another_index = lib.attach_element_index(another_root)
+        self.assertIsNone(lib.get_element_index(self.root))
+        self.assertIs(another_index, lib.get_element_index(another_root))
+        lib.detach_element_index(self.index)
+        self.assertIs(another_index, lib.get_element_index(another_root))
+        lib.detach_element_index(another_index)
+
+    def test_new_elements_added(self):
+        self.index.get_elements_by_id("a")
+        new = lib.append_new_element(self.root[1], "d", {"id": "d"})
+        sub = lib.get_sub_element(new, "e", new_id="e")
+        self.assertEqual([new], self.index.get_elements_by_id("d"))
+        self.assertEqual([sub], self.index.get_elements_by_id("e"))
+
+    def test_get_elements_by_name(self):
+        self.root[1].set("name", "x")
+        self.assertEqual([self.root[1]], self.index.get_elements_by_name("x"))
+        new = lib.append_new_element(self.root, "d", {"name": "x"})
+        lib.update_attribute_remove_empty(self.root[0], "name", "x")
+        self.assertEqual(
+            [self.root[1], new, self.root[0]],
+            self.index.get_elements_by_name("x"),
+        )
+        self.assertEqual([], self.index.get_elements_by_name("y"))
+
+    def test_changed_id_added(self):
+        self.index.get_elements_by_id("a")
+        lib.update_attribute_remove_empty(self.root[1], "id", "c")
+        self.assertEqual([self.root[1]], self.index.get_elements_by_id("c"))
+
+    def test_not_added_before_use(self):
+        new = lib.append_new_element(self.root, "d", {"id": "d"})
+        self.assertEqual([new], self.index.get_elements_by_id("d"))
+
+
+class IsDescendant(TestCase):
+    def setUp(self):
+        self.root = etree.fromstring("<root><a><b/></a><c/></root>")
+
+    def test_descendant(self):
+        self.assertTrue(lib.is_descendant(self.root[0][0], self.root))
+        self.assertTrue(lib.is_descendant(self.root[0][0], self.root[0]))
+
+    def test_not_descendant(self):
+        self.assertFalse(lib.is_descendant(self.root, self.root))
+        self.assertFalse(lib.is_descendant(self.root[0][0], self.root[1]))
+        self.assertFalse(lib.is_descendant(self.root[0], self.root[0][0]))
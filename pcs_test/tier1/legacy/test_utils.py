@@ -1,15 +1,17 @@
 # pylint: disable=too-many-lines
 from io import StringIO
 import sys
-from time import sleep
 from unittest import mock, TestCase
 import xml.dom.minidom
 import xml.etree.ElementTree as ET
 
+from pcs_test.tools.custom_mock import MockCurlSimple
 from pcs_test.tools.xml import dom_get_child_elements
 from pcs_test.tools.misc import get_test_resource as rc
 
 from pcs import utils
+from pcs.common import pcs_pycurl as pycurl
+from pcs.common.node_communicator import Response
 
 # pylint: disable=line-too-long
 # pylint: disable=invalid-name
@@ -1873,42 +1875,157 @@ class UtilsTest(TestCase):
             self.assertEqual(node.tagName, tag)
 
 
-class RunParallelTest(TestCase):
-    @staticmethod
-    def fixture_create_worker(log, name, sleepSeconds=0):
-        def worker():
-            sleep(sleepSeconds)
-            log.append(name)
+class FakeCommunicator:
+    def __init__(self, get_response):
+        self._get_response = get_response
+        self.request_list = []
+        self.delay_list = []
+        self._queue = []
 
-        return worker
+    def add_requests(self, request_list, delay=None):
+        self.request_list.extend(request_list)
+        self.delay_list.extend([delay] * len(request_list))
+        self._queue.extend(request_list)
 
-    def test_run_all_workers(self):
-        log = []
-        utils.run_parallel(
-            [
-                self.fixture_create_worker(log, "first"),
-                self.fixture_create_worker(log, "second"),
-            ],
-            wait_seconds=0.1,
+    def start_loop(self):
+        while self._queue:
+            yield self._get_response(self._queue.pop(0))
+
+
+def fixture_response(request, code=200, output="", error_msg=None):
+    handle = MockCurlSimple(
+        info={pycurl.RESPONSE_CODE: code}, output=output, request=request
+    )
+    if error_msg:
+        return Response.connection_failure(handle, 7, error_msg)
+    return Response.connection_successful(handle)
+
+
+@mock.patch("pcs.utils.read_known_hosts_file", lambda: {})
+class RunNodeRequestsTest(TestCase):
+    def setUp(self):
+        self.communicator = None
+        patcher = mock.patch("pcs.utils.get_lib_env")
+        self.get_lib_env = patcher.start()
+        self.addCleanup(patcher.stop)
+        get_communicator = self.get_lib_env.return_value.get_node_communicator
+        get_communicator.side_effect = (
+            lambda request_timeout=None: self.communicator
+        )
+
+    def test_results_and_repeat(self):
+        status_list = {"node1": ["pending", "done"], "node2": ["done"]}
+        self.communicator = FakeCommunicator(
+            lambda request: fixture_response(
+                request, output=status_list[request.host_label].pop(0)
+            )
         )
+        result_list = []
 
-        self.assertEqual(sorted(log), sorted(["first", "second"]))
+        def process_result(node, returncode, output):
+            result_list.append((node, returncode, output))
+            return 2 if output == "pending" else None
 
+        utils.run_node_requests(
+            [
+                utils.get_node_request(node, "remote/status")
+                for node in ["node1", "node2"]
+            ],
+            process_result,
+            timeout=10,
+            delay=1,
+        )
+        self.assertEqual(
+            [
+                ("node1", 0, "pending"),
+                ("node2", 0, "done"),
+                ("node1", 0, "done"),
+            ],
+            result_list,
+        )
+        self.assertEqual([1, 1, 2], self.communicator.delay_list)
+        self.assertEqual(
+            ["node1", "node2", "node1"],
+            [request.host_label for request in self.communicator.request_list],
+        )
+        get_communicator = self.get_lib_env.return_value.get_node_communicator
+        get_communicator.assert_called_once_with(request_timeout=10)
 
-class NodeActionTaskTest(TestCase):
-    def test_can_run_action(self):
-        def action(node, arg, kwarg=None):
-            return (0, ":".join([node, arg, kwarg]))
+    def test_error_results(self):
+        def get_response(request):
+            if request.host_label == "node1":
+                return fixture_response(request, code=401)
+            if request.host_label == "node2":
+                return fixture_response(request, code=500)
+            return fixture_response(request, error_msg="Connection refused")
 
-        report_list = []
+        self.communicator = FakeCommunicator(get_response)
+        result_list = []
+        utils.run_node_requests(
+            [
+                utils.get_node_request(node, "remote/status")
+                for node in ["node1", "node2", "node3"]
+            ],
+            lambda node, returncode, output: result_list.append(
+                (node, returncode, output)
+            ),
+        )
+        self.assertEqual(
+            [
+                (
+                    "node1",
+                    3,
+                    "Unable to authenticate to node1 - (HTTP error: 401), "
+                    "try running 'pcs host auth node1'",
+                ),
+                ("node2", 1, "Error connecting to node2 - (HTTP error: 500)"),
+                (
+                    "node3",
+                    2,
+                    "Unable to connect to node3, try setting higher timeout "
+                    "in --request-timeout option (Connection refused)",
+                ),
+            ],
+            result_list,
+        )
 
-        def report(node, returncode, output):
-            report_list.append("|".join([node, str(returncode), output]))
+    @mock.patch("pcs.utils.print")
+    def test_send_to_nodes(self, mock_print):
+        attempts = {"node2": 0}
 
-        task = utils.create_task(report, action, "node", "arg", kwarg="kwarg")
-        task()
+        def get_response(request):
+            if request.host_label == "node1":
+                return fixture_response(request, output="Stopped\n")
+            attempts["node2"] += 1
+            if attempts["node2"] < 3:
+                return fixture_response(
+                    request, error_msg="Operation timed out after 10 ms"
+                )
+            return fixture_response(request, code=500)
 
-        self.assertEqual(["node|0|node:arg:kwarg"], report_list)
+        self.communicator = FakeCommunicator(get_response)
+        node_errors = utils.send_http_request_to_nodes(
+            ["node1", "node2"],
+            "remote/cluster_stop",
+            [("force", 1)],
+            repeat_on_timeout=True,
+        )
+        self.assertEqual(
+            {"node2": "node2: Error connecting to node2 - (HTTP error: 500)"},
+            node_errors,
+        )
+        self.assertEqual([None, None, 0, 0], self.communicator.delay_list)
+        self.assertEqual(
+            "force=1", self.communicator.request_list[0].data,
+        )
+        mock_print.assert_has_calls(
+            [
+                mock.call("node1: Stopped"),
+                mock.call(
+                    "node2: Error connecting to node2 - (HTTP error: 500)"
+                ),
+            ]
+        )
 
 
 class TouchCibFile(TestCase):
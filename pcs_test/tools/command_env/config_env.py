@@ -1,8 +1,11 @@
+from lxml import etree
+
 from pcs_test.tools.command_env.mock_push_cib import Call as PushCibCall
 from pcs_test.tools.command_env.mock_push_corosync_conf import (
     Call as PushCorosyncConfCall,
 )
 from pcs_test.tools.fixture_cib import modify_cib
+from pcs_test.tools.xml import etree_to_str
 
 from pcs import settings
 from pcs.common.host import PcsKnownHost, Destination
@@ -106,9 +109,13 @@ class EnvConfig:
             MODIFIER_GENERATORS - please refer it when you are adding params
             here)
         """
-        cib_xml = modify_cib(
-            self.__calls.get(load_key).stdout, modifiers, **modifier_shortcuts
-        )
+        cib_xml = self.__calls.get(load_key).stdout
+        if f"{load_key}.root" in self.__calls.names:
+            # the cib element and the configuration have been loaded separately
+            cib = etree.fromstring(self.__calls.get(f"{load_key}.root").stdout)
+            cib.append(etree.fromstring(cib_xml))
+            cib_xml = etree_to_str(cib)
+        cib_xml = modify_cib(cib_xml, modifiers, **modifier_shortcuts)
         self.__calls.place(
             name,
             PushCibCall(cib_xml, wait=wait, exception=exception),
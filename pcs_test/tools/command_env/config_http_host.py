@@ -231,6 +231,7 @@ class HostShortcuts:
         pacemaker_started_node_list=(),
         pacemaker_not_started_node_list=(),
         communication_list=None,
+        wait_timeout=settings.node_start_wait_request_max,
         name="http.host.check_pacemaker_started",
     ):
         """
@@ -241,6 +242,7 @@ class HostShortcuts:
         pacemaker_not_started_node_list list -- listof node names on which
             pacemaker is not fully started yet
         communication_list list -- create custom responses
+        int wait_timeout -- how long nodes are asked to wait for pacemaker
         name string -- the key of this call
         """
         if bool(
@@ -271,6 +273,7 @@ class HostShortcuts:
             name,
             communication_list,
             action="remote/pacemaker_node_status",
+            param_list=[("wait", str(wait_timeout))] if wait_timeout else None,
         )
 
     def get_quorum_status(
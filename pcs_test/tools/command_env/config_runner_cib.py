@@ -1,9 +1,12 @@
+from lxml import etree
+
 from pcs_test.tools.command_env.mock_runner import (
     Call as RunnerCall,
     CheckStdinEqualXml,
 )
 from pcs_test.tools.fixture_cib import modify_cib
 from pcs_test.tools.misc import get_test_resource as rc
+from pcs_test.tools.xml import etree_to_str
 
 
 CIB_FILENAME = "cib-empty.xml"
@@ -26,6 +29,7 @@ class CibShortcuts:
         returncode=0,
         stderr=None,
         instead=None,
+        load_status=True,
         **modifier_shortcuts,
     ):
         """
@@ -40,6 +44,9 @@ class CibShortcuts:
         string stderr
         string instead -- key of call instead of which this new call is to be
             placed
+        bool load_status -- if False, create calls for loading the cib element
+            and the configuration section separately, the first one is placed
+            under the key name + ".root"
         dict modifier_shortcuts -- a new modifier is generated from each
             modifier shortcut.
             As key there can be keys of MODIFIER_GENERATORS.
@@ -56,6 +63,19 @@ class CibShortcuts:
                 " parameters 'modifiers', 'filename' and 'modifier_shortcuts'"
             )
 
+        if not load_status:
+            self.__load_without_status(
+                name,
+                filename,
+                modifiers,
+                modifier_shortcuts,
+                returncode,
+                stderr,
+                before,
+                instead,
+            )
+            return
+
         command = "cibadmin --local --query"
         if returncode != 0:
             call = RunnerCall(command, stderr=stderr, returncode=returncode)
@@ -68,8 +88,72 @@ class CibShortcuts:
                 )
                 call = RunnerCall(command, stdout=cib)
 
+        self.__remove_root_call(instead)
         self.__calls.place(name, call, before=before, instead=instead)
 
+    def __load_without_status(
+        self,
+        name,
+        filename,
+        modifiers,
+        modifier_shortcuts,
+        returncode,
+        stderr,
+        before,
+        instead,
+    ):
+        root_name = f"{name}.root"
+        root_command = "cibadmin --local --query --no-children"
+        if returncode != 0:
+            call_list = [
+                (
+                    root_name,
+                    RunnerCall(
+                        root_command, stderr=stderr, returncode=returncode
+                    ),
+                )
+            ]
+        else:
+            with open(
+                rc(filename if filename else self.cib_filename)
+            ) as cib_file:
+                cib = etree.fromstring(
+                    modify_cib(cib_file.read(), modifiers, **modifier_shortcuts)
+                )
+            call_list = [
+                (
+                    root_name,
+                    RunnerCall(
+                        root_command,
+                        stdout=etree_to_str(
+                            etree.Element(cib.tag, dict(cib.attrib))
+                        ),
+                    ),
+                ),
+                (
+                    name,
+                    RunnerCall(
+                        "cibadmin --local --query --scope=configuration",
+                        stdout=etree_to_str(cib.find("configuration")),
+                    ),
+                ),
+            ]
+
+        if instead:
+            self.__remove_root_call(instead)
+            for call_name, call in call_list[:-1]:
+                self.__calls.place(call_name, call, before=instead)
+            self.__calls.place(*call_list[-1], instead=instead)
+        else:
+            for call_name, call in call_list:
+                self.__calls.place(call_name, call, before=before)
+
+    def __remove_root_call(self, instead):
+        # a call loading the cib element is replaced together with the call
+        # loading the configuration section
+        if instead and f"{instead}.root" in self.__calls.names:
+            self.__calls.remove(f"{instead}.root")
+
     def load_content(
         self,
         cib,
@@ -97,6 +181,27 @@ class CibShortcuts:
             call = RunnerCall(command, stdout=cib)
         self.__calls.place(name, call, before=before, instead=instead)
 
+    def load_epoch(
+        self, epoch=557, admin_epoch=0, name="runner.cib.load_epoch",
+    ):
+        """
+        Create call for loading the cib element to check the CIB epoch
+
+        int epoch -- epoch of the CIB
+        int admin_epoch -- admin_epoch of the CIB
+        string name -- key of the call
+        """
+        self.__calls.place(
+            name,
+            RunnerCall(
+                "cibadmin --local --query --no-children",
+                stdout=(
+                    f'<cib epoch="{epoch}" num_updates="0" '
+                    f'admin_epoch="{admin_epoch}"/>'
+                ),
+            ),
+        )
+
     def push(
         self,
         modifiers=None,
@@ -119,10 +119,14 @@ def _communication_to_response(
     was_connected,
     errno,
     error_msg,
+    total_time,
 ):
     return Response(
         MockCurlSimple(
-            info={pycurl.RESPONSE_CODE: response_code},
+            info={
+                pycurl.RESPONSE_CODE: response_code,
+                pycurl.TOTAL_TIME: total_time,
+            },
             output=output,
             debug_output=debug_output,
             request=Request(
@@ -153,6 +157,7 @@ def create_communication(
     was_connected=True,
     errno=0,
     error_msg=None,
+    total_time=0.0,
 ):
     """
     list of dict communication_list -- each dict describes one request-response
@@ -168,6 +173,7 @@ def create_communication(
             bool was_connected -- see Response
             int errno -- see Response
             string error_msg -- see Response
+            float total_time -- how long the request took, see ResponseTiming
         if some key is not present, it is put here from common values - rest
         args of this fuction(except name, communication_list,
         error_msg_template)
@@ -179,6 +185,7 @@ def create_communication(
     bool was_connected -- see Response
     int errno -- see Response
     string error_msg -- see Response
+    float total_time -- how long the request took, see ResponseTiming
     """
     # We don't care about tokens, see _communication_to_response.
     common = dict(
@@ -190,6 +197,7 @@ def create_communication(
         was_connected=was_connected,
         errno=errno,
         error_msg=error_msg,
+        total_time=total_time,
     )
 
     response_list = []
@@ -340,7 +348,8 @@ class NodeCommunicator:
     def __init__(self, call_queue=None):
         self.__call_queue = call_queue
 
-    def add_requests(self, request_list):
+    def add_requests(self, request_list, delay=None):
+        # pylint: disable=unused-argument
         _, add_request_call = self.__call_queue.take(
             CALL_TYPE_HTTP_ADD_REQUESTS, request_list,
         )
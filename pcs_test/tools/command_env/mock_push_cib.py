@@ -18,7 +18,8 @@ class Call:
 
 
 def get_push_cib(call_queue):
-    def push_cib(lib_env, custom_cib=None, wait=False):
+    # pylint: disable=unused-argument
+    def push_cib(lib_env, custom_cib=None, wait=False, rebase=None):
         i, expected_call = call_queue.take(CALL_TYPE_PUSH_CIB)
 
         if custom_cib is None and expected_call.custom_cib:
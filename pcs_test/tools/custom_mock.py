@@ -40,6 +40,9 @@ class MockLibraryReportProcessor(ReportProcessor):
         self.debug = debug
         self.items = []
 
+    def is_debug_enabled(self):
+        return self.debug
+
     def _do_report(self, report_item):
         if self.debug or report_item.severity != ReportItemSeverity.DEBUG:
             self.items.append(report_item)
@@ -87,6 +90,9 @@ class MockCurl:
     def reset(self):
         self._opts = {}
 
+    def close(self):
+        self.closed = True
+
     def setopt(self, opt, val):
         if isinstance(val, list):
             # in tests we use set operations (e.g. assertLessEqual) which
@@ -211,3 +217,80 @@ class MockCurlMulti:
                 err_list.append((handle, errno, msg))
             self._proccessed_list.append(handle)
         return (0, ok_list, err_list)
+
+
+class MockCurlMultiSocket:
+    """
+    CurlMulti used by socket callbacks, each request gets a socket pair and it
+    is finished once its socket is readable, see finish
+    """
+
+    def __init__(self):
+        self._opts = {}
+        self._handle_list = []
+        self._socket_dict = {}
+        self._finished_list = []
+
+    def setopt(self, opt, val):
+        self._opts[opt] = val
+
+    def add_handle(self, handle):
+        if not isinstance(handle, MockCurl):
+            raise AssertionError("Only MockCurl objects are allowed")
+        self._handle_list.append(handle)
+        # curl lets the caller know it needs to be called right away
+        self._opts[pycurl.M_TIMERFUNCTION](0)
+
+    def remove_handle(self, handle):
+        if handle not in self._handle_list:
+            # same error as real CurlMulti object
+            raise pycurl.error("curl object not on this multi-stack")
+        self._handle_list.remove(handle)
+
+    def assert_no_handle_left(self):
+        if self._handle_list:
+            raise AssertionError(
+                "{0} handle(s) left to process".format(len(self._handle_list))
+            )
+
+    @property
+    def waiting_handle_list(self):
+        return [handle for handle, _, _ in self._socket_dict.values()]
+
+    def finish(self, handle):
+        """
+        Make the request of the handle finish once the event loop runs
+        """
+        for waiting_handle, _, write_socket in self._socket_dict.values():
+            if waiting_handle is handle:
+                write_socket.send(b"x")
+
+    def socket_action(self, fd, event_mask):
+        # pylint: disable=unused-argument
+        if fd == pycurl.SOCKET_TIMEOUT:
+            started_list = [item[0] for item in self._socket_dict.values()]
+            for handle in self._handle_list:
+                if handle not in started_list:
+                    read_socket, write_socket = socket.socketpair()
+                    self._socket_dict[read_socket.fileno()] = (
+                        handle,
+                        read_socket,
+                        write_socket,
+                    )
+                    self._opts[pycurl.M_SOCKETFUNCTION](
+                        pycurl.POLL_IN, read_socket.fileno(), self, None
+                    )
+        else:
+            handle, read_socket, write_socket = self._socket_dict.pop(fd)
+            self._opts[pycurl.M_SOCKETFUNCTION](
+                pycurl.POLL_REMOVE, fd, self, None
+            )
+            read_socket.close()
+            write_socket.close()
+            handle.perform()
+            self._finished_list.append(handle)
+        return (0, len(self._socket_dict))
+
+    def info_read(self):
+        ok_list, self._finished_list = self._finished_list, []
+        return (0, ok_list, [])
@@ -1,4 +1,5 @@
 require 'fileutils'
+require 'tempfile'
 require 'rexml/document'
 require 'digest/sha1'
 
@@ -218,7 +219,31 @@ module Cfgsync
       if not File.directory?(dirname)
         FileUtils.mkdir_p(dirname, :mode => 0700)
       end
-      super
+      # Write the hosts to a temporary file and rename it, so that readers
+      # never see a partially written file and can detect the file has been
+      # changed by its inode.
+      tmp_path = nil
+      begin
+        file = Tempfile.new(
+          [File.basename(self.class.file_path), '.tmp'], dirname
+        )
+        tmp_path = file.path
+        file.chmod(self.class.file_perm)
+        file.write(self.text)
+        file.close()
+        File.rename(tmp_path, self.class.file_path)
+        tmp_path = nil
+        $logger.info(
+          "Saved config '#{self.class.name}' version #{self.version} #{self.hash} to '#{self.class.file_path}'"
+        )
+      rescue => e
+        $logger.error(
+          "Cannot save config '#{self.class.name}': #{e.message}"
+        )
+        raise
+      ensure
+        File.unlink(tmp_path) if tmp_path and File.exist?(tmp_path)
+      end
     end
 
     protected
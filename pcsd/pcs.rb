@@ -910,10 +910,32 @@ def is_cib_true(var)
   return ['true', 'on', 'yes', 'y', '1'].include?(var.downcase)
 end
 
+# Known hosts are needed for each request to a node. Parsing the file every
+# time gets expensive with many hosts, so the parsed hosts are kept until the
+# file changes. The file is replaced atomically on every save, see
+# Cfgsync::PcsdKnownHosts#save.
+$known_hosts_cache = nil
+
+def get_known_hosts_file_identity()
+  stat = File.stat(Cfgsync::PcsdKnownHosts.file_path)
+  return [stat.ino, stat.size, stat.mtime.to_i, stat.mtime.nsec]
+rescue SystemCallError
+  return nil
+end
+
 def get_known_hosts()
-  return CfgKnownHosts.new(
+  identity = get_known_hosts_file_identity()
+  cache = $known_hosts_cache
+  if identity and cache and cache[:identity] == identity
+    return cache[:known_hosts]
+  end
+  known_hosts = CfgKnownHosts.new(
     Cfgsync::PcsdKnownHosts.from_file().text()
-  ).known_hosts
+  ).known_hosts.freeze
+  $known_hosts_cache = (
+    identity ? {:identity => identity, :known_hosts => known_hosts} : nil
+  )
+  return known_hosts
 end
 
 def is_auth_against_nodes(auth_user, node_names, timeout=10)
@@ -57,6 +57,7 @@ def remote(params, request, auth_user)
       :node_available => method(:remote_node_available),
       :cluster_add_nodes => method(:cluster_add_nodes),
       :cluster_remove_nodes => method(:cluster_remove_nodes),
+      :relay_requests => method(:relay_requests),
       :cluster_destroy => method(:cluster_destroy),
       :get_cluster_known_hosts => method(:get_cluster_known_hosts),
       :known_hosts_change => method(:known_hosts_change),
@@ -88,9 +89,10 @@ def remote(params, request, auth_user)
       :check_host => method(:check_host),
       :reload_corosync_conf => method(:reload_corosync_conf),
       :remove_nodes_from_cib => method(:remove_nodes_from_cib),
+      # handles pacemaker not running itself, it may wait for it to start
+      :pacemaker_node_status => method(:remote_pacemaker_node_status),
   }
   remote_cmd_with_pacemaker = {
-      :pacemaker_node_status => method(:remote_pacemaker_node_status),
       :resource_start => method(:resource_start),
       :resource_stop => method(:resource_stop),
       :resource_cleanup => method(:resource_cleanup),
@@ -825,6 +827,17 @@ def cluster_remove_nodes(params, request, auth_user)
   )
 end
 
+# Send a request to other nodes on behalf of the calling node. The request is
+# authenticated by the targets using tokens supplied by the calling node.
+def relay_requests(params, request, auth_user)
+  if not allowed_for_local_cluster(auth_user, Permissions::FULL)
+    return 403, 'Permission denied'
+  end
+  return pcs_internal_proxy(
+    auth_user, params.fetch(:data_json, ""), "cluster.relay_requests"
+  )
+end
+
 def cluster_setup(params, request, auth_user)
   if not allowed_for_superuser(auth_user)
     return 403, 'Permission denied'
@@ -838,7 +851,17 @@ def remote_pacemaker_node_status(params, request, auth_user)
   if not allowed_for_local_cluster(auth_user, Permissions::READ)
     return 403, 'Permission denied'
   end
-  output, stderr, retval = run_cmd(auth_user, PCS, 'node', 'pacemaker-status')
+  # When waiting is requested, the response is sent once pacemaker is fully
+  # started on this node or the wait times out, so that clients waiting for
+  # nodes to start do not need to poll them.
+  cmd = [PCS, 'node', 'pacemaker-status']
+  if params[:wait] and params[:wait] =~ /\A\d+\z/ and params[:wait].to_i > 0
+    # do not let clients hold the request and a pcs process for too long
+    cmd << "--wait=#{[params[:wait].to_i, NODE_START_WAIT_REQUEST_MAX].min}"
+  elsif not pacemaker_running?
+    return [200, '{"pacemaker_not_running":true}']
+  end
+  output, stderr, retval = run_cmd(auth_user, *cmd)
   if retval != 0
     return [400, stderr]
   else
@@ -30,5 +30,9 @@ COROSYNC_QDEVICE_NET_SERVER_CA_FILE = (
 COROSYNC_QDEVICE_NET_CLIENT_CERTS_DIR = "/etc/corosync/qdevice/net/nssdb"
 COROSYNC_AUTHKEY = "/etc/corosync/authkey"
 
+# in seconds, requests waiting for pacemaker to start on this node are held
+# for at most this long, keep in sync with node_start_wait_request_max in pcs
+NODE_START_WAIT_REQUEST_MAX = 30
+
 SUPERUSER = 'hacluster'
 ADMIN_GROUP = 'haclient'